@@ -0,0 +1,294 @@
+"""
+Network Monitoring Detection API
+Library entry point for embedding the detectors in other programs
+
+    import api
+
+    result = api.scan(detectors=['proxy', 'connection'], timeout=10)
+    for module in result.modules:
+        for finding in module.findings:
+            print(module.key, finding.severity, finding.type, finding.detail)
+
+    async for event in api.monitor(interval=10):
+        print(event.cycle, event.new_findings)
+
+Results are returned as objects instead of report files, so a check costs
+neither a process spawn nor a JSON round trip. Detector keys are the keys
+of detectors.registry.DETECTORS.
+"""
+import asyncio
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from detectors.registry import DETECTORS, build_detectors, scheduled_detectors
+from utils.i18n import TranslationManager
+
+# A finding of a module; attributes holds the correlation attributes (port,
+# pid, ip, interface) when the detector provides them
+Finding = namedtuple('Finding', ['type', 'detail', 'severity', 'attributes'])
+
+# Result of one detector. error is None, or the reason the detector did not
+# produce a result (its exception, or 'timeout')
+ModuleResult = namedtuple('ModuleResult', ['key', 'name', 'risk_level', 'findings', 'duration', 'error'])
+
+# Result of a scan; modules are in registry order, followed by the
+# correlated incidents when correlation is enabled
+ScanResult = namedtuple('ScanResult', ['timestamp', 'overall_risk', 'modules'])
+
+# A finding that appeared in or disappeared from a module
+FindingChange = namedtuple('FindingChange', ['module', 'finding'])
+
+# A module whose risk level changed
+RiskChange = namedtuple('RiskChange', ['module', 'previous', 'current'])
+
+# One monitoring cycle; the first event of a session is the baseline, with
+# no changes
+ChangeEvent = namedtuple('ChangeEvent', [
+    'cycle', 'timestamp', 'overall_risk', 'modules',
+    'new_findings', 'resolved_findings', 'risk_changes', 'baseline',
+])
+
+RISK_ORDER = {'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
+
+
+def scan(detectors=None, timeout=None, quick=False, lang='en', correlate=True, snapshot=None):
+    """
+    Runs the detectors once.
+
+    Args:
+        detectors: Detector keys to run (default: all, or all but the slow
+            ones with quick=True).
+        timeout: Seconds to wait for the detectors; those still running are
+            reported with error 'timeout'.
+        quick: Skip the slow detectors when detectors is not given.
+        lang: Language of the module names ('en' or 'zh').
+        correlate: Whether to append the correlated incidents.
+        snapshot: SystemSnapshot to read the inputs from (default: the live system).
+
+    Returns:
+        ScanResult: The results.
+
+    Raises:
+        ValueError: If a detector key is unknown.
+        RuntimeError: If called from a running event loop (use scan_async).
+    """
+    return asyncio.run(scan_async(detectors, timeout, quick, lang, correlate, snapshot))
+
+
+async def scan_async(detectors=None, timeout=None, quick=False, lang='en', correlate=True, snapshot=None):
+    """
+    Runs the detectors once, concurrently, without blocking the event loop.
+
+    Each detector runs in a worker thread and reads the same snapshot, so
+    every input is still collected once. A detector that times out keeps
+    running in its thread until it finishes, but its result is discarded.
+
+    Args:
+        See scan().
+
+    Returns:
+        ScanResult: The results.
+
+    Raises:
+        ValueError: If a detector key is unknown.
+    """
+    from utils.snapshot import SystemSnapshot
+
+    keys = _detector_keys(detectors, quick)
+    translator = TranslationManager(lang)
+    snapshot = snapshot or SystemSnapshot()
+    snapshot.refresh()
+    built = build_detectors(keys, translator, snapshot)
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=len(built) or 1, thread_name_prefix='netmon-scan')
+    try:
+        tasks = [loop.run_in_executor(executor, _run_detector, detector) for _, detector in built]
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+    finally:
+        executor.shutdown(wait=False)
+
+    results = []
+    modules = []
+    for key, task in zip(keys, tasks):
+        # The name the detector's results carry, for modules without results
+        name = translator.t(DETECTORS[key][3])
+        if not task.done():
+            task.cancel()
+            modules.append(ModuleResult(key, name, 'LOW', (), None, 'timeout'))
+            continue
+        result, duration, error = task.result()
+        if result is None:
+            modules.append(ModuleResult(key, name, 'LOW', (), duration, error))
+            continue
+        results.append(result)
+        modules.append(_module_result(key, result, duration))
+
+    if correlate:
+        from utils.correlation import CorrelationEngine
+        modules.append(_module_result('correlation', CorrelationEngine(translator).correlate(results), 0.0))
+
+    return ScanResult(snapshot.captured_at, _overall_risk(modules), tuple(modules))
+
+
+async def monitor(interval=30, detectors=None, quick=False, lang='en', cadence=None,
+                  include_unchanged=False, snapshot=None):
+    """
+    Runs the monitoring loop and yields its cycles as change events.
+
+    The loop runs in a background thread; closing the generator (leaving an
+    `async for` loop) stops it after the current cycle.
+
+    Args:
+        interval: Seconds between cycles.
+        detectors: Detector keys to run (default: all, or all but the slow
+            ones with quick=True).
+        quick: Skip the slow detectors when detectors is not given.
+        lang: Language of the module names ('en' or 'zh').
+        cadence: Optional utils.cadence.AdaptiveCadence.
+        include_unchanged: Also yield cycles without changes.
+        snapshot: SystemSnapshot to read the inputs from (default: the live system).
+
+    Yields:
+        ChangeEvent: The baseline, then every cycle with changes.
+
+    Raises:
+        ValueError: If a detector key is unknown.
+    """
+    from utils.monitoring_service import MonitoringService
+    from utils.snapshot import SystemSnapshot
+
+    keys = _detector_keys(detectors, quick)
+    translator = TranslationManager(lang)
+    snapshot = snapshot or SystemSnapshot()
+    service = MonitoringService(
+        translator=translator,
+        detectors=build_detectors(keys, translator, snapshot),
+        reporter=_SilentReporter(),
+        interval=interval,
+        snapshot=snapshot,
+        cadence=cadence,
+        install_signal_handlers=False
+    )
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    service.add_observer(_QueueObserver(loop, queue))
+
+    def run():
+        outcome = None
+        try:
+            service.start()
+        except BaseException as e:
+            outcome = e
+        try:
+            if outcome is not None:
+                loop.call_soon_threadsafe(queue.put_nowait, outcome)
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+        except RuntimeError:
+            # The event loop was closed without closing the generator
+            pass
+
+    thread = threading.Thread(target=run, name='netmon-monitor', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            event = _change_event(*item)
+            if event.baseline or include_unchanged or event.new_findings \
+                    or event.resolved_findings or event.risk_changes:
+                yield event
+    finally:
+        service.stop()
+        await asyncio.to_thread(thread.join)
+
+
+def _detector_keys(detectors, quick):
+    if detectors is None:
+        return scheduled_detectors(quick=quick)
+    unknown = [key for key in detectors if key not in DETECTORS]
+    if unknown:
+        raise ValueError(f"unknown detectors: {', '.join(unknown)}")
+    # Registry order, so that results are ordered as in reports
+    return [key for key in DETECTORS if key in detectors]
+
+
+def _run_detector(detector):
+    """Returns (result or None, seconds, error or None)."""
+    started = time.perf_counter()
+    try:
+        result, error = detector.detect(), None
+    except Exception as e:
+        result, error = None, e
+    return result, time.perf_counter() - started, error
+
+
+def _finding(finding):
+    return Finding(finding['type'], finding['detail'], finding['severity'], finding.get('attributes', {}))
+
+
+def _module_result(key, result, duration):
+    return ModuleResult(key, result['name'], result['risk_level'],
+                        tuple(_finding(f) for f in result['findings']), duration, None)
+
+
+def _overall_risk(modules):
+    highest = max((RISK_ORDER.get(m.risk_level, 0) for m in modules), default=0)
+    for level, value in RISK_ORDER.items():
+        if value == highest:
+            return level
+    return 'LOW'
+
+
+def _change_event(cycle, timestamp, results, changes, keys):
+    modules = tuple(_module_result(keys.get(id(r), 'correlation'), r, None) for r in results)
+    new, resolved, risks = [], [], []
+    if changes:
+        for change in changes.get('new_findings', ()):
+            new.extend(FindingChange(change['module'], _finding(f)) for f in change['findings'])
+        for change in changes.get('removed_findings', ()):
+            resolved.extend(FindingChange(change['module'], _finding(f)) for f in change['findings'])
+        for change in changes.get('risk_changes', ()):
+            risks.append(RiskChange(change['module'], change['from'], change['to']))
+    return ChangeEvent(cycle, timestamp, _overall_risk(modules), modules,
+                       tuple(new), tuple(resolved), tuple(risks), changes is None)
+
+
+class _QueueObserver:
+    """MonitoringService observer handing the cycles to an event loop."""
+
+    def __init__(self, loop, queue):
+        self.loop = loop
+        self.queue = queue
+
+    def on_cycle(self, service, results, changes):
+        # Result -> registry key, through the detector class of each carried result
+        classes = {entry[1]: key for key, entry in DETECTORS.items()}
+        keys = {id(result): classes.get(name, name) for name, result in service.last_results.items()}
+        item = (service.cycle_count, service.snapshot.captured_at, results, changes, keys)
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, item)
+
+
+class _SilentReporter:
+    """MonitorReporter stand-in; embedding applications get events instead."""
+
+    def print_monitoring_header(self, interval, cadence=None):
+        pass
+
+    def print_change_alert(self, changes):
+        pass
+
+    def print_status_update(self, cycle, timestamp):
+        pass
+
+    def print_rules_reloaded(self, count):
+        pass
+
+    def print_rules_reload_failed(self, error):
+        pass
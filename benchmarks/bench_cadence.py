@@ -0,0 +1,132 @@
+"""
+Cadence Benchmarks
+Simulates a day of monitoring in virtual time with synthetic detector costs,
+and compares the CPU share and the reaction time after a change of fixed
+intervals, adaptive intervals and adaptive intervals under a CPU budget
+"""
+import random
+from utils.cadence import AdaptiveCadence
+from benchmarks.harness import measure
+
+# Detector key -> CPU seconds per run (a slow TLS check, a few mid-sized
+# table scans and cheap checks)
+DETECTOR_COSTS = {
+    'certificate': 0.8,
+    'listener': 0.12,
+    'connection': 0.05,
+    'injection': 0.04,
+    'environ': 0.03,
+    'firewall': 0.02,
+    'process': 0.01,
+    'proxy': 0.002,
+}
+INTERVAL = 30
+# Simulated seconds; incidents hit a random detector at this mean spacing,
+# each one a burst of changes a minute apart
+DURATION = {
+    'quick': 86400,
+    'full': 7 * 86400,
+}
+INCIDENT_SPACING = 3600
+INCIDENT_CHANGES = 5
+BUDGETS = [None, 0.01, 0.002]
+
+
+def run(scale):
+    """
+    Runs the cadence benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results.
+    """
+    duration = DURATION[scale['name']]
+    changes = _make_changes(duration)
+    results = [_measure('cadence.fixed_interval', scale, duration, changes, None)]
+    for budget in BUDGETS:
+        name = 'cadence.adaptive' if budget is None else f'cadence.adaptive_budget_{budget * 100:g}pct'
+        results.append(_measure(name, scale, duration, changes, AdaptiveCadence(INTERVAL, cpu_budget=budget)))
+    return results
+
+
+def _make_changes(duration, seed=0):
+    """Returns [(time, detector key)] of simulated module changes."""
+    rng = random.Random(seed)
+    changes = []
+    at = rng.expovariate(1 / INCIDENT_SPACING)
+    while at < duration:
+        key = rng.choice(list(DETECTOR_COSTS))
+        changes.extend((at + 60 * index, key) for index in range(INCIDENT_CHANGES))
+        at += rng.expovariate(1 / INCIDENT_SPACING)
+    changes.sort()
+    return changes
+
+
+def _measure(name, scale, duration, changes, cadence_template):
+    """Times the simulation and records its CPU share and reaction times."""
+    outcome = {}
+
+    def simulate(_):
+        cadence = None
+        if cadence_template is not None:
+            cadence = AdaptiveCadence(INTERVAL, cpu_budget=cadence_template.cpu_budget)
+        outcome.update(_simulate(cadence, duration, changes))
+
+    result = measure(name, simulate, items=1, repeat=scale['repeat'], track_memory=False)
+    result['params'].update({
+        'simulated_seconds': duration,
+        'cpu_budget': cadence_template.cpu_budget if cadence_template else None,
+        **outcome,
+    })
+    return result
+
+
+def _simulate(cadence, duration, changes):
+    """
+    Runs the monitoring loop in virtual time.
+
+    Returns:
+        dict: {'cpu_share', 'cycles', 'runs', 'reaction_p50', 'reaction_max'}.
+    """
+    now = 0.0
+    cpu = 0.0
+    cycles = runs = 0
+    pending = []  # (time, key) changes not yet seen by a run of their detector
+    reactions = []
+    upcoming = list(changes)
+    while now < duration:
+        while upcoming and upcoming[0][0] <= now:
+            pending.append(upcoming.pop(0))
+
+        costs = {}
+        for key, cost in DETECTOR_COSTS.items():
+            if cadence is None or cadence.due(key, now):
+                costs[key] = cost
+        cpu += sum(costs.values())
+        runs += len(costs)
+        cycles += 1
+
+        changed = set()
+        for change in list(pending):
+            if change[1] in costs:
+                reactions.append(now - change[0])
+                changed.add(change[1])
+                pending.remove(change)
+
+        if cadence is None:
+            now += INTERVAL
+        else:
+            end = now + sum(costs.values())
+            cadence.end_cycle(costs, changed, now=end, cpu=cpu)
+            now = end + max(cadence.next_due(end), 0.001)
+
+    reactions.sort()
+    return {
+        'cpu_share': round(cpu / duration, 5),
+        'cycles': cycles,
+        'runs': runs,
+        'reaction_p50': round(reactions[len(reactions) // 2], 1) if reactions else None,
+        'reaction_max': round(reactions[-1], 1) if reactions else None,
+    }
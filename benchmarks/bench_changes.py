@@ -0,0 +1,73 @@
+"""
+Change Detection Benchmarks
+Measures ChangeDetector and the cross-module correlation on large
+synthetic result sets
+"""
+from utils.change_detector import ChangeDetector
+from utils.correlation import CorrelationEngine
+from utils.i18n import TranslationManager
+from benchmarks import fixtures
+from benchmarks.harness import measure
+
+
+def run(scale):
+    """
+    Runs the change detection benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results.
+    """
+    detector = ChangeDetector(TranslationManager(language='en'))
+    results = []
+
+    for count in scale['findings']:
+        previous = fixtures.make_results(count)
+        unchanged = fixtures.make_results(count)
+        changed = fixtures.make_results(count, churn=0.05)
+
+        results.append(measure(
+            f'change_detector.unchanged_{count}',
+            lambda _: detector.detect_changes(previous, unchanged),
+            items=count, repeat=scale['repeat'], params={'findings': count, 'churn': 0.0},
+        ))
+        results.append(measure(
+            f'change_detector.churn5_{count}',
+            lambda _: detector.detect_changes(previous, changed),
+            items=count, repeat=scale['repeat'], params={'findings': count, 'churn': 0.05},
+        ))
+
+        translator = TranslationManager(language='en')
+        base = fixtures.make_results(count, attributes=True)
+        same = fixtures.make_results(count, attributes=True)
+        churned = fixtures.make_results(count, churn=0.05, attributes=True)
+        # Only the first module changes
+        one_changed = [churned[0]] + same[1:]
+
+        def warm_engine():
+            engine = CorrelationEngine(translator)
+            engine.correlate(base)
+            return engine
+
+        results.append(measure(
+            f'correlation.join_{count}',
+            lambda engine: engine.correlate(base),
+            setup=lambda: CorrelationEngine(translator),
+            items=count, repeat=scale['repeat'], params={'findings': count},
+        ))
+        results.append(measure(
+            f'correlation.unchanged_{count}',
+            lambda engine: engine.correlate(same),
+            setup=warm_engine,
+            items=count, repeat=scale['repeat'], params={'findings': count, 'churn': 0.0},
+        ))
+        results.append(measure(
+            f'correlation.one_module_changed_{count}',
+            lambda engine: engine.correlate(one_changed),
+            setup=warm_engine,
+            items=count, repeat=scale['repeat'], params={'findings': count, 'churn': 0.05},
+        ))
+
+    return results
@@ -0,0 +1,43 @@
+"""
+Conntrack Benchmarks
+Streams synthetic connection tracking tables; throughput should be flat and
+peak memory should not grow with the number of flows
+"""
+import os
+import tempfile
+from utils.conntrack import CHUNK_SIZE, scan_conntrack
+from benchmarks import fixtures
+from benchmarks.harness import measure
+
+# Flows per synthetic table (about 185 bytes each)
+CONNTRACK_FLOWS = {
+    'quick': [200000],
+    'full': [200000, 2000000],
+}
+CHUNK_SIZES = [64 * 1024, CHUNK_SIZE]
+
+
+def run(scale):
+    """
+    Runs the conntrack benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for flows in CONNTRACK_FLOWS[scale['name']]:
+            path = os.path.join(tmp_dir, f'nf_conntrack-{flows}')
+            size = fixtures.write_conntrack_dump(path, flows)
+            for chunk_size in CHUNK_SIZES:
+                results.append(measure(
+                    f'conntrack.scan_flows_{flows}_chunk_{chunk_size // 1024}k',
+                    lambda _: scan_conntrack(path, local_addresses={'192.168.1.1'}, chunk_size=chunk_size),
+                    items=flows, repeat=scale['repeat'],
+                    params={'flows': flows, 'bytes': size, 'chunk_size': chunk_size},
+                ))
+            os.unlink(path)
+    return results
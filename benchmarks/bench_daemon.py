@@ -0,0 +1,59 @@
+"""
+Daemon Benchmarks
+Measures status query latency against a StatusServer under concurrent clients
+"""
+import os
+import tempfile
+import threading
+from types import SimpleNamespace
+from utils.snapshot import SystemSnapshot
+from utils.status_client import query
+from utils.status_server import StatusServer
+from benchmarks import fixtures
+from benchmarks.harness import measure
+
+CLIENT_COUNTS = [1, 16, 128]
+QUERIES_PER_CLIENT = 20
+
+
+def run(scale):
+    """
+    Runs the daemon benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results.
+    """
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        server = StatusServer(os.path.join(tmp_dir, 'bench.sock'))
+        server.start()
+        try:
+            service = SimpleNamespace(snapshot=SystemSnapshot(), cycle_count=1)
+            server.on_cycle(service, fixtures.make_results(scale['findings'][0]), None)
+
+            for clients in CLIENT_COUNTS:
+                def query_concurrently(_):
+                    def client():
+                        for _ in range(QUERIES_PER_CLIENT):
+                            query('status', server.socket_path)
+
+                    threads = [threading.Thread(target=client) for _ in range(clients)]
+                    for thread in threads:
+                        thread.start()
+                    for thread in threads:
+                        thread.join()
+
+                results.append(measure(
+                    f'status_server.status_clients_{clients}', query_concurrently,
+                    items=clients * QUERIES_PER_CLIENT, repeat=scale['repeat'],
+                    params={'clients': clients, 'queries_per_client': QUERIES_PER_CLIENT},
+                    track_memory=False,
+                ))
+        finally:
+            server.stop()
+
+    return results
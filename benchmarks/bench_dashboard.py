@@ -0,0 +1,103 @@
+"""
+Dashboard Benchmarks
+Measures frame composition and the terminal output of a frame at
+200x60 when 1%, 10% or all rows changed, against redrawing every cell
+"""
+from types import SimpleNamespace
+from utils.dashboard import Dashboard, Row, HIGH, INFO, text_width
+from utils.i18n import TranslationManager
+from benchmarks import fixtures
+from benchmarks.harness import measure
+
+WIDTH = 200
+HEIGHT = 60
+CHANGED_SHARES = [0.01, 0.1, 1.0]
+
+
+class _CountingScreen:
+    """Curses window stand-in counting the cells written"""
+
+    def __init__(self):
+        self.calls = 0
+        self.cells = 0
+
+    def getmaxyx(self):
+        return HEIGHT, WIDTH
+
+    def erase(self):
+        pass
+
+    def noutrefresh(self):
+        pass
+
+    def addstr(self, y, x, text, attribute):
+        self.calls += 1
+        self.cells += text_width(text)
+
+
+_CURSES = SimpleNamespace(error=Exception, doupdate=lambda: None)
+
+
+def _frame(cycle, changed_rows):
+    """Returns a frame whose changed_rows show the cycle number and a moving sparkline."""
+    rows = []
+    for y in range(HEIGHT):
+        stamp = cycle if y in changed_rows else 0
+        row = Row().add(f" Module {y:<30}", INFO).add(f"{stamp:>10}  ")
+        row.add('▁▂▃▄▅▆▇█'[stamp % 8] * 20, HIGH).add(' detail' * 15)
+        rows.append(row.fit(WIDTH))
+    return rows
+
+
+def run(scale):
+    """
+    Runs the dashboard benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results.
+    """
+    translator = TranslationManager(language='en')
+    results = []
+
+    dashboard = Dashboard(translator)
+    dashboard.results = fixtures.make_results(1000, modules=12)
+    dashboard.cycle = 1
+    for result in dashboard.results:
+        for finding in result['findings'][:20]:
+            dashboard.changes.append(('00:00:00', True, result['name'], finding, None))
+    results.append(measure(
+        f'dashboard.compose_{WIDTH}x{HEIGHT}', lambda _: dashboard.compose(WIDTH, HEIGHT),
+        items=HEIGHT, repeat=scale['repeat'] * 20, params={'width': WIDTH, 'height': HEIGHT},
+    ))
+
+    def write(state):
+        dashboard, frame = state
+        dashboard.write_frame(_CURSES, frame)
+
+    for share in CHANGED_SHARES:
+        changed_rows = set(range(max(1, int(HEIGHT * share))))
+        previous, current = _frame(1, changed_rows), _frame(2, changed_rows)
+
+        for differential in (True, False):
+            def setup():
+                dashboard = Dashboard(translator)
+                dashboard._screen = _CountingScreen()
+                dashboard._attributes = {code: 0 for code in range(8)}
+                # The previous frame is on screen, unless every cell is redrawn
+                dashboard._previous = previous if differential else None
+                return dashboard, current
+
+            state = setup()
+            write(state)
+            name = 'differential' if differential else 'full'
+            results.append(measure(
+                f'dashboard.write_{name}_{int(share * 100)}pct', write,
+                setup=setup, items=HEIGHT, repeat=scale['repeat'] * 20,
+                params={'changed_rows': len(changed_rows), 'cells': state[0]._screen.cells,
+                        'addstr_calls': state[0]._screen.calls},
+            ))
+
+    return results
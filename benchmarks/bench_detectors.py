@@ -0,0 +1,234 @@
+"""
+Detector Benchmarks
+Drives the snapshot-based detectors against synthetic socket, process and
+interface tables
+"""
+import os
+import tempfile
+from detectors.arp_detector import ArpDetector
+from detectors.connection_detector import ConnectionDetector
+from detectors.network_detector import NetworkDetector
+from detectors.process_detector import ProcessDetector
+from utils.i18n import TranslationManager
+from utils.neighbors import NeighborIndex, parse_arp_table, parse_default_gateways
+from utils.proc_environ import ProcessEnvironmentScanner
+from utils.proc_maps import ProcessMapsScanner
+from utils.rules import rules
+from utils.trust_store import TrustStore, DEFAULT_BUNDLES
+from utils.x509 import PEM_CERTIFICATE
+from benchmarks import fixtures
+from benchmarks.harness import measure
+
+# Certificate files in the synthetic trust directory per scale
+TRUST_STORE_FILES = {
+    'quick': [300],
+    'full': [300, 3000],
+}
+
+# Neighbor table entries per scale
+ARP_NEIGHBORS = {
+    'quick': [5000],
+    'full': [5000, 50000],
+}
+
+
+def run(scale):
+    """
+    Runs the detector benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results.
+    """
+    translator = TranslationManager(language='en')
+    repeat = scale['repeat']
+    results = []
+
+    for count in scale['sockets']:
+        snapshot = fixtures.FixtureSnapshot(
+            connections=fixtures.make_connections(count),
+            interfaces=fixtures.make_interfaces(scale['interfaces'][0]),
+        )
+        results.append(measure(
+            f'connection_detector.sockets_{count}',
+            lambda detector: detector.detect(),
+            setup=lambda: ConnectionDetector(translator, snapshot),
+            items=count, repeat=repeat, params={'sockets': count},
+        ))
+        results.append(measure(
+            f'network_detector.sockets_{count}',
+            lambda detector: detector.detect(),
+            setup=lambda: NetworkDetector(translator, snapshot),
+            items=count, repeat=repeat, params={'sockets': count},
+        ))
+
+    for count in scale['interfaces']:
+        snapshot = fixtures.FixtureSnapshot(interfaces=fixtures.make_interfaces(count))
+        results.append(measure(
+            f'network_detector.interfaces_{count}',
+            lambda detector: detector._check_network_interfaces(),
+            setup=lambda: NetworkDetector(translator, snapshot),
+            items=count, repeat=repeat, params={'interfaces': count},
+        ))
+
+    for count in scale['processes']:
+        snapshot = fixtures.FixtureSnapshot(processes=fixtures.make_processes(count))
+        results.append(measure(
+            f'process_detector.processes_{count}',
+            lambda detector: detector.detect(),
+            setup=lambda: ProcessDetector(translator, snapshot),
+            items=count, repeat=repeat, params={'processes': count},
+        ))
+
+    results.extend(_run_trust_store(scale))
+    results.extend(_run_process_environments(scale))
+    results.extend(_run_neighbors(scale, translator))
+    return results
+
+
+def _system_pem_blocks():
+    """Returns the PEM certificates of the first system CA bundle found."""
+    for path in DEFAULT_BUNDLES:
+        try:
+            with open(path, 'rb') as f:
+                return [match.group(0) for match in PEM_CERTIFICATE.finditer(f.read())]
+        except OSError:
+            continue
+    return []
+
+
+def _run_trust_store(scale):
+    """Measures cold (parse everything) and warm (stat only) trust store scans."""
+    blocks = _system_pem_blocks()
+    if not blocks:
+        return []
+
+    results = []
+    for count in TRUST_STORE_FILES[scale['name']]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for index in range(count):
+                with open(os.path.join(tmp_dir, f'ca-{index}.pem'), 'wb') as f:
+                    f.write(blocks[index % len(blocks)])
+
+            def make_store():
+                return TrustStore(bundles=[], directories=[tmp_dir], nss_databases=[], nss_profile_roots=[])
+
+            def make_warm_store():
+                store = make_store()
+                store.scan()
+                return store
+
+            results.append(measure(
+                f'trust_store.cold_scan_files_{count}',
+                lambda store: store.scan(),
+                setup=make_store,
+                items=count, repeat=scale['repeat'], params={'files': count},
+            ))
+            results.append(measure(
+                f'trust_store.warm_scan_files_{count}',
+                lambda store: store.scan(),
+                setup=make_warm_store,
+                items=count, repeat=scale['repeat'], params={'files': count},
+            ))
+    return results
+
+
+def _run_process_environments(scale):
+    """Measures cold (read every file) and warm (stat only) process environment and maps scans."""
+    results = []
+    for count in scale['processes']:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fixtures.write_proc_tree(tmp_dir, count)
+
+            def make_scanner():
+                return ProcessEnvironmentScanner(proc=tmp_dir)
+
+            def make_warm_scanner():
+                scanner = make_scanner()
+                scanner.scan()
+                return scanner
+
+            results.append(measure(
+                f'proc_environ.cold_scan_processes_{count}',
+                lambda scanner: scanner.scan(),
+                setup=make_scanner,
+                items=count, repeat=scale['repeat'], params={'processes': count},
+            ))
+            results.append(measure(
+                f'proc_environ.warm_scan_processes_{count}',
+                lambda scanner: scanner.scan(),
+                setup=make_warm_scanner,
+                items=count, repeat=scale['repeat'], params={'processes': count},
+            ))
+
+            def make_maps_scanner():
+                return ProcessMapsScanner(rules.get('injected_libraries'), proc=tmp_dir)
+
+            def make_warm_maps_scanner():
+                scanner = make_maps_scanner()
+                scanner.scan()
+                return scanner
+
+            results.append(measure(
+                f'proc_maps.cold_scan_processes_{count}',
+                lambda scanner: scanner.scan(),
+                setup=make_maps_scanner,
+                items=count, repeat=scale['repeat'], params={'processes': count},
+            ))
+            results.append(measure(
+                f'proc_maps.warm_scan_processes_{count}',
+                lambda scanner: scanner.scan(),
+                setup=make_warm_maps_scanner,
+                items=count, repeat=scale['repeat'], params={'processes': count},
+            ))
+    return results
+
+
+def _run_neighbors(scale, translator):
+    """Measures neighbor table parsing, and cold, unchanged and churned ARP index updates."""
+    results = []
+    for count in ARP_NEIGHBORS[scale['name']]:
+        arp_text, route_text = fixtures.make_neighbor_tables(count)
+        table = parse_arp_table(arp_text)
+        churned = parse_arp_table(fixtures.make_neighbor_tables(count, churn=0.01)[0])
+        snapshot = fixtures.FixtureSnapshot(neighbors={
+            'arp': table, 'gateways': parse_default_gateways(route_text)
+        })
+
+        def make_warm_detector():
+            detector = ArpDetector(translator, snapshot)
+            detector.detect()
+            return detector
+
+        def make_warm_index():
+            index = NeighborIndex()
+            index.update(table)
+            return index
+
+        results.append(measure(
+            f'neighbors.parse_entries_{count}',
+            lambda text: parse_arp_table(text),
+            setup=lambda: arp_text,
+            items=count, repeat=scale['repeat'], params={'entries': count},
+        ))
+        results.append(measure(
+            f'arp_detector.cold_entries_{count}',
+            lambda detector: detector.detect(),
+            setup=lambda: ArpDetector(translator, snapshot),
+            items=count, repeat=scale['repeat'], params={'entries': count},
+        ))
+        results.append(measure(
+            f'arp_detector.unchanged_entries_{count}',
+            lambda detector: detector.detect(),
+            setup=make_warm_detector,
+            items=count, repeat=scale['repeat'], params={'entries': count},
+        ))
+        results.append(measure(
+            f'neighbors.churn_1pct_entries_{count}',
+            lambda index: index.update(churned),
+            setup=make_warm_index,
+            items=count, repeat=scale['repeat'], params={'entries': count, 'churn': 0.01},
+        ))
+    return results
@@ -0,0 +1,65 @@
+"""
+Report Diff Benchmarks
+Compares two exported reports with the streaming diff and by loading both
+documents and running ChangeDetector, measuring time and peak memory
+"""
+import json
+import os
+import tempfile
+from utils.change_detector import ChangeDetector
+from utils.i18n import TranslationManager
+from utils.report_diff import ReportDiff
+from benchmarks import fixtures
+from benchmarks.harness import measure
+
+CHURN = 0.05
+# Loading both documents is only measured up to this size
+LOAD_LIMIT = 100000
+
+
+def run(scale):
+    """
+    Runs the report diff benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results.
+    """
+    translator = TranslationManager(language='en')
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for count in scale['findings']:
+            previous_path = os.path.join(tmp_dir, f'previous_{count}.json')
+            current_path = os.path.join(tmp_dir, f'current_{count}.json')
+            for path, churn in ((previous_path, 0.0), (current_path, CHURN)):
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump({'timestamp': '2024-01-01T00:00:00', 'overall_risk': 'LOW',
+                               'results': fixtures.make_results(count, churn=churn)},
+                              f, indent=2, ensure_ascii=False)
+            size = os.path.getsize(previous_path) + os.path.getsize(current_path)
+
+            def streaming(_):
+                for _ in ReportDiff(previous_path, current_path).changes():
+                    pass
+
+            def loaded(_):
+                with open(previous_path, encoding='utf-8') as f:
+                    previous = json.load(f)
+                with open(current_path, encoding='utf-8') as f:
+                    current = json.load(f)
+                ChangeDetector(translator).detect_changes(previous['results'], current['results'])
+
+            results.append(measure(
+                f'report_diff.stream_{count}', streaming, items=count, repeat=scale['repeat'],
+                params={'findings': count, 'bytes': size, 'churn': CHURN},
+            ))
+            if count <= LOAD_LIMIT:
+                results.append(measure(
+                    f'report_diff.load_{count}', loaded, items=count, repeat=scale['repeat'],
+                    params={'findings': count, 'bytes': size, 'churn': CHURN},
+                ))
+
+    return results
@@ -0,0 +1,109 @@
+"""
+Fleet Benchmarks
+Runs a FleetCollector and many local agent processes on loopback, and
+measures ingest throughput and query latency
+"""
+import multiprocessing
+import threading
+import time
+from utils.change_detector import ChangeDetector
+from utils.fleet import FleetAgent, FleetCollector, fleet_query
+from utils.i18n import TranslationManager
+from benchmarks import fixtures
+from benchmarks.harness import measure
+
+# (agent processes, agents per process) per scale
+FLEET_SIZES = {
+    'quick': [(4, 25)],
+    'full': [(4, 25), (8, 250)],
+}
+DELTA_CYCLES = 5
+FINDINGS_PER_AGENT = 200
+
+
+def _agent_process(address, process_index, agents, barrier):
+    """Simulates several agents: one baseline and DELTA_CYCLES deltas each."""
+    detector = ChangeDetector(TranslationManager(language='en'))
+    states = [fixtures.make_results(FINDINGS_PER_AGENT, seed=cycle, churn=0.05 if cycle else 0.0)
+              for cycle in range(DELTA_CYCLES + 1)]
+    changes = [detector.detect_changes(states[cycle - 1], states[cycle])
+               for cycle in range(1, DELTA_CYCLES + 1)]
+
+    fleet = [FleetAgent(address, host_id=f'host-{process_index}-{i}') for i in range(agents)]
+    barrier.wait()
+    for agent in fleet:
+        agent.send_cycle(states[0], None, 0)
+    for cycle in range(DELTA_CYCLES):
+        for agent in fleet:
+            agent.send_cycle(states[cycle + 1], changes[cycle], cycle + 1)
+    for agent in fleet:
+        agent.close()
+
+
+def run(scale):
+    """
+    Runs the fleet benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results.
+    """
+    results = []
+
+    for processes, agents_per_process in FLEET_SIZES[scale['name']]:
+        collector = FleetCollector('127.0.0.1:0')
+        thread = threading.Thread(target=collector.run, daemon=True)
+        thread.start()
+        collector.ready.wait()
+        address = f'127.0.0.1:{collector.port}'
+        agents = processes * agents_per_process
+        # hello + state + deltas per agent
+        expected_frames = agents * (DELTA_CYCLES + 2)
+
+        try:
+            barrier = multiprocessing.Barrier(processes + 1)
+            workers = [multiprocessing.Process(target=_agent_process,
+                                               args=(address, index, agents_per_process, barrier))
+                       for index in range(processes)]
+            for worker in workers:
+                worker.start()
+            barrier.wait()
+            start = time.perf_counter()
+            while collector.frames_received < expected_frames and any(w.is_alive() for w in workers):
+                time.sleep(0.005)
+            while collector.frames_received < expected_frames and time.perf_counter() - start < 30:
+                time.sleep(0.005)
+            elapsed = time.perf_counter() - start
+            for worker in workers:
+                worker.join()
+
+            results.append({
+                'name': f'fleet_collector.ingest_agents_{agents}',
+                'params': {'agents': agents, 'processes': processes,
+                           'frames': collector.frames_received, 'delta_cycles': DELTA_CYCLES},
+                'items': collector.frames_received,
+                'repeat': 1,
+                'latency_ms': {key: elapsed * 1000 for key in ('min', 'p50', 'p90', 'p99', 'max', 'mean')},
+                'throughput_per_s': collector.frames_received / elapsed if elapsed else None,
+                'peak_memory_bytes': None,
+            })
+
+            for name, request in (
+                ('hosts_high', {'op': 'hosts', 'risk': 'HIGH'}),
+                # Selective text match, like "hosts where the Zscaler issuer appeared"
+                ('appeared_hour', {'op': 'appeared', 'match': 'module 0 item 7 peer', 'since': 3600}),
+                ('appeared_hour_broad', {'op': 'appeared', 'match': 'suspicious process', 'since': 3600}),
+            ):
+                results.append(measure(
+                    f'fleet_collector.query_{name}_agents_{agents}',
+                    lambda _: fleet_query(address, request),
+                    items=1, repeat=scale['repeat'] * 4, params={'agents': agents},
+                    track_memory=False,
+                ))
+        finally:
+            collector.stop()
+            thread.join(timeout=5)
+
+    return results
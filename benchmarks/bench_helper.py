@@ -0,0 +1,129 @@
+"""
+Snapshot Helper Benchmarks
+Compares the helper's binary frames with the JSON encoding of recordings,
+and measures one helper answering many clients from a single collection
+"""
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from datetime import datetime
+from utils.helper import FRAME_HEADER, REQUEST_SNAPSHOT, SnapshotHelper, decode_frame, encode_frame
+from utils.snapshot import decode_section, encode_section
+from benchmarks import fixtures
+from benchmarks.harness import measure
+
+# Sockets per synthetic table (one process per 10 sockets)
+HELPER_SOCKETS = {
+    'quick': [10000],
+    'full': [10000, 100000],
+}
+# Clients fetching from one helper per cycle
+HELPER_CLIENTS = [1, 16]
+
+
+def run(scale):
+    """
+    Runs the snapshot helper benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results.
+    """
+    results = []
+    for sockets in HELPER_SOCKETS[scale['name']]:
+        connections = fixtures.make_connections(sockets)
+        processes = fixtures.make_processes(sockets // 10)
+        namespaces = {proc['pid']: 4026531840 for proc in processes}
+        sections = {
+            'connections': (True, connections),
+            'processes': (True, processes),
+            'namespaces': (True, namespaces),
+        }
+        frame = encode_frame(sections, datetime.now())
+        document = json.dumps({name: encode_section(name, value) for name, (_, value) in sections.items()})
+        params = {'sockets': sockets, 'frame_bytes': len(frame), 'json_bytes': len(document)}
+
+        results.append(measure(
+            f'helper.encode_frame_{sockets}',
+            lambda _: encode_frame(sections, datetime.now()),
+            items=sockets, repeat=scale['repeat'], params=params,
+        ))
+        results.append(measure(
+            f'helper.decode_frame_{sockets}',
+            lambda _: decode_frame(frame[FRAME_HEADER.size:]),
+            items=sockets, repeat=scale['repeat'], params=params,
+        ))
+        results.append(measure(
+            f'helper.json_roundtrip_{sockets}',
+            lambda _: {name: decode_section(name, value)
+                       for name, value in json.loads(json.dumps(
+                           {name: encode_section(name, value) for name, (_, value) in sections.items()}
+                       )).items()},
+            items=sockets, repeat=scale['repeat'], params=params,
+        ))
+
+        for clients in HELPER_CLIENTS:
+            results.append(_measure_clients(scale, connections, processes, namespaces, clients))
+    return results
+
+
+def _measure_clients(scale, connections, processes, namespaces, clients):
+    """
+    One request per client against a helper whose frame expires every
+    iteration. Clients read the raw frame without decoding it: real clients
+    are separate processes, here they would share one interpreter.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        helper = SnapshotHelper(os.path.join(tmp_dir, 'helper.sock'), max_age=3600)
+        helper.snapshot = fixtures.FixtureSnapshot(connections=connections, processes=processes,
+                                                   namespaces=namespaces)
+        thread = threading.Thread(target=helper.run, daemon=True)
+        thread.start()
+        while not os.path.exists(helper.socket_path):
+            time.sleep(0.01)
+
+        sockets = []
+        for _ in range(clients):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(helper.socket_path)
+            sockets.append(sock)
+
+        def setup():
+            helper._frame = None
+
+        def request(sock):
+            sock.sendall(REQUEST_SNAPSHOT)
+            _, _, length = FRAME_HEADER.unpack(_receive(sock, FRAME_HEADER.size))
+            _receive(sock, length)
+
+        def fetch_all(_):
+            threads = [threading.Thread(target=request, args=(sock,)) for sock in sockets]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        collections = helper.collections
+        result = measure(
+            f'helper.serve_{len(connections)}_sockets_{clients}_clients',
+            fetch_all, setup=setup, items=clients, repeat=scale['repeat'],
+            params={'sockets': len(connections), 'clients': clients}, track_memory=False,
+        )
+        result['params']['collections_per_cycle'] = (helper.collections - collections) / (scale['repeat'] + 1)
+        for sock in sockets:
+            sock.close()
+    return result
+
+
+def _receive(sock, size):
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        received += sock.recv_into(view[received:])
+    return buffer
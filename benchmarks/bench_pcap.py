@@ -0,0 +1,55 @@
+"""
+Pcap Analysis Benchmarks
+Extracts server certificates from synthetic TLS captures, in process and
+with worker processes; peak memory should not grow with the capture size
+"""
+import os
+import ssl
+import tempfile
+from utils.pcap import analyze_capture
+from benchmarks import fixtures
+from benchmarks.harness import measure
+
+# TLS connections per capture (about 27 KB of packets each)
+CAPTURE_FLOWS = {
+    'quick': [2000],
+    'full': [2000, 20000],
+}
+WORKERS = [0, 2]
+
+
+def run(scale):
+    """
+    Runs the pcap analysis benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results (empty if openssl is unavailable).
+    """
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        certificate = fixtures.make_tls_certificate(tmp_dir, 'corporate-proxy.example')
+        if certificate is None:
+            return results
+        with open(certificate[0], 'r', encoding='ascii') as f:
+            certificate_der = ssl.PEM_cert_to_DER_cert(f.read())
+
+        for flows in CAPTURE_FLOWS[scale['name']]:
+            path = os.path.join(tmp_dir, f'tls-{flows}.pcap')
+            packets = fixtures.write_tls_capture(path, certificate_der, flows)
+            for workers in WORKERS:
+                results.append(measure(
+                    f'pcap.analyze_capture_flows_{flows}_workers_{workers}',
+                    lambda _: analyze_capture(path, workers=workers),
+                    items=packets, repeat=scale['repeat'],
+                    params={'flows': flows, 'packets': packets, 'workers': workers,
+                            'bytes': os.path.getsize(path)},
+                    # Worker processes are outside tracemalloc's view
+                    track_memory=workers == 0,
+                ))
+            os.unlink(path)
+
+    return results
@@ -0,0 +1,68 @@
+"""
+Listener Probe Benchmarks
+Fingerprints hundreds of local stand-in proxies and services concurrently,
+on first sight and from the per-process cache
+"""
+import os
+import tempfile
+from datetime import datetime
+from utils.proxy_probe import ListenerProber, PROBE_HOSTNAME
+from benchmarks import fixtures
+from benchmarks.harness import measure
+
+# Listeners probed per cycle, an even mix of proxies and plain services
+LISTENERS = {
+    'quick': [200],
+    'full': [200, 1000],
+}
+KINDS = ['http', 'socks5', 'socks4', 'tls', 'web']
+
+
+def run(scale):
+    """
+    Runs the listener probe benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results (empty if openssl is unavailable).
+    """
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        certificate = fixtures.make_tls_certificate(tmp_dir, PROBE_HOSTNAME)
+        if certificate is None:
+            return results
+
+        for count in LISTENERS[scale['name']]:
+            servers = fixtures.ProxyStandIns([KINDS[i % len(KINDS)] for i in range(count)], *certificate)
+            servers.start()
+            try:
+                # The stand-ins run in this process, so the cache key has a
+                # create time like a real listener's
+                listeners = [('127.0.0.1', port, os.getpid()) for _, port in servers.listeners]
+
+                def probe(prober):
+                    return prober.probe(listeners, datetime.now())
+
+                def make_warm_prober():
+                    prober = ListenerProber()
+                    probe(prober)
+                    return prober
+
+                results.append(measure(
+                    f'listener_prober.probe_cold_{count}', probe,
+                    setup=ListenerProber,
+                    items=count, repeat=scale['repeat'], params={'listeners': count},
+                    track_memory=False,
+                ))
+                results.append(measure(
+                    f'listener_prober.probe_cached_{count}', probe,
+                    setup=make_warm_prober,
+                    items=count, repeat=scale['repeat'], params={'listeners': count},
+                ))
+            finally:
+                servers.stop()
+
+    return results
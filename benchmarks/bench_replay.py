@@ -0,0 +1,48 @@
+"""
+Replay Benchmarks
+Replays a recorded snapshot file (--record) through the detectors, using
+real captured system state as the performance corpus
+"""
+from detectors.connection_detector import ConnectionDetector
+from detectors.network_detector import NetworkDetector
+from detectors.process_detector import ProcessDetector
+from detectors.proxy_detector import ProxyDetector
+from utils.i18n import TranslationManager
+from utils.snapshot import ReplaySnapshot, iter_frames
+from benchmarks.harness import measure
+
+
+def run(scale):
+    """
+    Runs the replay benchmark when a corpus is given (--corpus FILE).
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results.
+    """
+    corpus = scale.get('corpus')
+    if not corpus:
+        return []
+
+    translator = TranslationManager(language='en')
+    frames = sum(1 for _ in iter_frames(corpus))
+
+    def replay_all(_):
+        snapshot = ReplaySnapshot(corpus)
+        detectors = [
+            ProxyDetector(translator, snapshot),
+            ProcessDetector(translator, snapshot),
+            NetworkDetector(translator, snapshot),
+            ConnectionDetector(translator, snapshot),
+        ]
+        while snapshot.refresh():
+            for detector in detectors:
+                detector.detect()
+        snapshot.close()
+
+    return [measure(
+        'replay.detectors', replay_all, items=frames, repeat=scale['repeat'],
+        params={'corpus': corpus, 'frames': frames},
+    )]
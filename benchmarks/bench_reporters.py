@@ -0,0 +1,103 @@
+"""
+Reporter Benchmarks
+Measures report rendering and JSON export on large synthetic result sets,
+and the number of write calls the rendering makes
+"""
+import io
+import os
+import tempfile
+from contextlib import redirect_stdout
+from utils.change_detector import ChangeDetector
+from utils.i18n import TranslationManager
+from utils.monitor_reporter import MonitorReporter
+from utils.reporter import Reporter
+from benchmarks import fixtures
+from benchmarks.harness import measure
+
+
+# Rendering is measured at this size on every scale
+RENDER_FINDINGS = 100000
+
+
+class _NullWriter(io.TextIOBase):
+    """Text sink that discards output but still pays (and counts) the write calls"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return len(text)
+
+
+def run(scale):
+    """
+    Runs the reporter benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results.
+    """
+    translator = TranslationManager(language='en')
+    results = []
+    sink = _NullWriter()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        export_path = os.path.join(tmp_dir, 'report.json')
+
+        for count in sorted(set(scale['findings']) | {RENDER_FINDINGS}):
+            render_only = count not in scale['findings']
+            report_results = fixtures.make_results(count)
+            changes = ChangeDetector(translator).detect_changes(
+                report_results, fixtures.make_results(count, churn=0.05))
+
+            def make_reporter():
+                reporter = Reporter(translator)
+                for result in report_results:
+                    reporter.add_result(result)
+                return reporter
+
+            def print_report(reporter):
+                with redirect_stdout(sink):
+                    reporter.print_report()
+
+            def print_change_alert(reporter):
+                with redirect_stdout(sink):
+                    reporter.print_change_alert(changes)
+
+            def export_json(reporter):
+                with redirect_stdout(sink):
+                    reporter.export_json(export_path)
+
+            results.append(measure(
+                f'reporter.print_report_{count}', print_report,
+                setup=make_reporter, items=count, repeat=scale['repeat'],
+                params={'findings': count, 'writes': _count_writes(sink, print_report, make_reporter())},
+            ))
+            if not render_only:
+                results.append(measure(
+                    f'reporter.export_json_{count}', export_json,
+                    setup=make_reporter, items=count, repeat=scale['repeat'],
+                    params={'findings': count},
+                ))
+            changed_items = sum(len(item['findings']) for key in ('new_findings', 'removed_findings')
+                                for item in changes[key])
+            results.append(measure(
+                f'monitor_reporter.print_change_alert_{count}', print_change_alert,
+                setup=lambda: MonitorReporter(translator), items=changed_items,
+                repeat=scale['repeat'],
+                params={'findings': count, 'changed': changed_items,
+                        'writes': _count_writes(sink, print_change_alert, MonitorReporter(translator))},
+            ))
+
+    return results
+
+
+def _count_writes(sink, render, reporter):
+    """Returns the number of write calls of one rendering."""
+    before = sink.writes
+    render(reporter)
+    return sink.writes - before
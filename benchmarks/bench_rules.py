@@ -0,0 +1,95 @@
+"""
+Rule Engine Benchmarks
+Compiles synthetic rule packs and matches a process table against them,
+with the substring automaton, from the memo, and with the linear scan it
+replaces; and reloads an unchanged rule file
+"""
+import json
+import os
+import tempfile
+from utils.rules import RuleBook, RuleSet, parse_rules
+from benchmarks import fixtures
+from benchmarks.harness import measure
+
+# Signatures per rule pack
+RULE_PACKS = {
+    'quick': [100000],
+    'full': [10000, 100000],
+}
+# Process names matched by the linear scan baseline (it is too slow for all)
+LINEAR_SAMPLE = 20
+
+
+def run(scale):
+    """
+    Runs the rule engine benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results.
+    """
+    results = []
+    processes = fixtures.make_processes(scale['processes'][0])
+    names = [proc['name'] for proc in processes]
+
+    for count in RULE_PACKS[scale['name']]:
+        document = fixtures.make_rule_pack(count)
+        spec = parse_rules(document)['suspicious_processes']
+        params = {'signatures': count, 'processes': len(names)}
+
+        # Compiling is the slow part of loading a pack; a few runs are enough
+        results.append(measure(
+            f'rules.compile_signatures_{count}',
+            lambda _: RuleSet('suspicious_processes', spec),
+            items=count, repeat=2, params={'signatures': count},
+        ))
+
+        ruleset = RuleSet('suspicious_processes', spec)
+
+        def match_all(ruleset):
+            return [ruleset.match_all(name) for name in names]
+
+        def cold_ruleset():
+            ruleset.memo.clear()
+            return ruleset
+
+        results.append(measure(
+            f'rules.match_processes_{count}', match_all,
+            setup=cold_ruleset,
+            items=len(names), repeat=scale['repeat'], params=params,
+        ))
+        results.append(measure(
+            f'rules.match_processes_memoized_{count}', match_all,
+            setup=lambda: ruleset,
+            items=len(names), repeat=scale['repeat'], params=params,
+        ))
+
+        # What the detectors did before: one substring test per signature
+        substrings = list(spec['contains'])
+        sample = [name.lower() for name in names[:LINEAR_SAMPLE]]
+        results.append(measure(
+            f'rules.linear_scan_{count}',
+            lambda _: [[s for s in substrings if s in name] for name in sample],
+            items=len(sample), repeat=scale['repeat'],
+            params={'signatures': count, 'processes': len(sample)},
+            track_memory=False,
+        ))
+
+        # SIGHUP with an unchanged file: parse and compare, no recompilation
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'pack.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(document, f)
+            book = RuleBook([path])
+            book.load()
+            results.append(measure(
+                f'rules.reload_unchanged_{count}',
+                lambda book: book.reload(),
+                setup=lambda: book,
+                items=count, repeat=scale['repeat'], params={'signatures': count},
+                track_memory=False,
+            ))
+
+    return results
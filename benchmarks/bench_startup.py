@@ -0,0 +1,71 @@
+"""
+Startup Benchmarks
+Measures wall-clock time of short-lived command line invocations, each in a
+fresh interpreter, against the bare interpreter startup as a reference, and
+of the same scan through the library API of a running program
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from benchmarks.harness import measure
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+
+
+def run(scale):
+    """
+    Runs the startup benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results.
+    """
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # No daemon listens here: measures startup and a refused connection
+        socket_path = os.path.join(tmp_dir, 'absent.sock')
+        invocations = [
+            ('interpreter', [sys.executable, '-c', 'pass']),
+            ('help', [sys.executable, MAIN, '--help']),
+            ('status', [sys.executable, MAIN, 'status', '--socket', socket_path]),
+            ('quick_scan', [sys.executable, MAIN, '--quick', '--lang', 'en']),
+        ]
+        report_path = os.path.join(tmp_dir, 'report.json')
+        json_command = [sys.executable, MAIN, '--quick', '--lang', 'en', '--json', report_path]
+
+        for name, command in invocations:
+            results.append(measure(
+                f'startup.{name}',
+                lambda _: subprocess.run(command, stdout=subprocess.DEVNULL,
+                                         stderr=subprocess.DEVNULL),
+                items=1, repeat=scale['repeat'] * 2, params={'argv': command[1:]},
+                track_memory=False,
+            ))
+
+        # What an agent shelling out to the command line pays per check
+        def scan_to_json(_):
+            subprocess.run(json_command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            with open(report_path, encoding='utf-8') as f:
+                return json.load(f)
+
+        results.append(measure(
+            'startup.quick_scan_json', scan_to_json,
+            items=1, repeat=scale['repeat'] * 2, params={'argv': json_command[1:]},
+            track_memory=False,
+        ))
+
+    # The same scan from a program that imported the API once
+    import api
+
+    results.append(measure(
+        'startup.api_quick_scan',
+        lambda _: api.scan(quick=True),
+        items=1, repeat=scale['repeat'] * 2, track_memory=False,
+    ))
+
+    return results
@@ -0,0 +1,106 @@
+"""
+TLS Probe Benchmarks
+Probes a local TLS stand-in server to measure the cost of a full and of a
+resumed certificate check, and how many cycles the latency profiler needs to flag an injected
+handshake delay
+"""
+import ssl
+import tempfile
+import time
+from detectors.certificate_detector import CertificateDetector
+from utils.i18n import TranslationManager
+from utils.snapshot import SystemSnapshot
+from benchmarks import fixtures
+from benchmarks.harness import measure
+
+# Handshake delay added by the stand-in after the baseline is complete
+INJECTED_DELAY = 0.05
+MAX_DETECTION_CYCLES = 50
+
+
+def _probe_cycle(snapshot, detector):
+    snapshot.refresh()
+    detector.findings = []
+    detector._test_tls_interception()
+    return detector.findings
+
+
+def run(scale):
+    """
+    Runs the TLS probe benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results (empty if openssl is unavailable).
+    """
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        certificate = fixtures.make_tls_certificate(tmp_dir)
+        if certificate is None:
+            return results
+        certfile, keyfile = certificate
+
+        server = fixtures.TLSStandIn(certfile, keyfile)
+        server.start()
+        try:
+            translator = TranslationManager(language='en')
+            snapshot = SystemSnapshot()
+
+            def make_detector():
+                return CertificateDetector(
+                    translator, snapshot, targets=[('localhost', server.port)],
+                    ssl_context=ssl.create_default_context(cafile=certfile))
+
+            def make_warm_detector():
+                detector = make_detector()
+                _probe_cycle(snapshot, detector)
+                return detector
+
+            # First probe: full handshake and full certificate check
+            results.append(measure(
+                'certificate_detector.tls_probe_localhost',
+                lambda detector: _probe_cycle(snapshot, detector),
+                setup=make_detector,
+                items=1, repeat=scale['repeat'] * 4, params={'targets': 1},
+                track_memory=False,
+            ))
+            # Repeat probe: resumed session, pinned certificate
+            results.append(measure(
+                'certificate_detector.tls_probe_localhost_resumed',
+                lambda detector: _probe_cycle(snapshot, detector),
+                setup=make_warm_detector,
+                items=1, repeat=scale['repeat'] * 4, params={'targets': 1},
+                track_memory=False,
+            ))
+
+            # Build a baseline, inject a delay and count the cycles until it is flagged
+            detector = make_detector()
+            for _ in range(40):
+                _probe_cycle(snapshot, detector)
+            server.handshake_delay = INJECTED_DELAY
+            start = time.perf_counter()
+            cycles = None
+            for cycle in range(1, MAX_DETECTION_CYCLES + 1):
+                findings = _probe_cycle(snapshot, detector)
+                if any(f['type'] == 'TLS Latency Shift' for f in findings):
+                    cycles = cycle
+                    break
+            elapsed = time.perf_counter() - start
+
+            # Latency here is the time from injecting the delay to the first finding
+            results.append({
+                'name': 'certificate_detector.latency_shift_detection',
+                'params': {'injected_delay_ms': INJECTED_DELAY * 1000, 'cycles_to_detect': cycles},
+                'items': cycles or 0,
+                'repeat': 1,
+                'latency_ms': {key: elapsed * 1000 for key in ('min', 'p50', 'p90', 'p99', 'max', 'mean')},
+                'throughput_per_s': None,
+                'peak_memory_bytes': None,
+            })
+        finally:
+            server.stop()
+
+    return results
@@ -0,0 +1,127 @@
+"""
+Detector Worker Benchmarks
+Measures monitoring cycles of the socket and process detectors run in the
+monitor process and in persistent worker processes, with the socket table
+parsed from synthetic /proc/net/tcp text as psutil does on Linux
+"""
+import functools
+import os
+import socket
+from detectors.registry import build_detectors
+from utils.i18n import TranslationManager
+from utils.monitoring_service import MonitoringService
+from utils.snapshot import SystemSnapshot, addr, sconn
+from utils.worker_pool import DetectorPool, WORKER_SECTIONS
+from benchmarks import fixtures
+from benchmarks.harness import measure
+
+# /proc/net/tcp state codes
+TCP_STATES = {'ESTABLISHED': '01', 'TIME_WAIT': '06', 'LISTEN': '0A'}
+TCP_STATE_NAMES = {code: name for name, code in TCP_STATES.items()}
+
+# Processes per socket of the synthetic tables
+PROCESS_SHARE = 0.04
+
+
+class ProcNetSnapshot(SystemSnapshot):
+    """
+    Snapshot parsing a synthetic socket table on every cycle.
+
+    Args:
+        sockets: Number of sockets.
+        processes: Number of processes.
+    """
+
+    def __init__(self, sockets, processes):
+        super().__init__()
+        self.lines = []
+        self.owners = {}
+        for conn in fixtures.make_connections(sockets):
+            inode = 100000 + conn.fd
+            self.owners[inode] = conn.pid
+            remote = conn.raddr or addr('0.0.0.0', 0)
+            self.lines.append(
+                f"{conn.fd:6}: {_hex_address(conn.laddr)} {_hex_address(remote)} {TCP_STATES[conn.status]} "
+                f"00000000:00000000 00:00000000 00000000  1000        0 {inode} 1 0000000000000000 20 4 30 10 -1"
+            )
+        self.process_table = fixtures.make_processes(processes)
+
+    def connections(self):
+        return self._capture('connections', self._parse_connections)
+
+    def processes(self):
+        return self._capture('processes', lambda: [dict(proc) for proc in self.process_table])
+
+    def _parse_connections(self):
+        connections = []
+        for line in self.lines:
+            fields = line.split()
+            local, remote = _parse_address(fields[1]), _parse_address(fields[2])
+            inode = int(fields[9])
+            connections.append(sconn(inode, socket.AF_INET, socket.SOCK_STREAM, local,
+                                     remote if remote.port else (), TCP_STATE_NAMES[fields[3]],
+                                     self.owners.get(inode)))
+        return connections
+
+
+def _hex_address(address):
+    packed = socket.inet_aton(address.ip)[::-1]
+    return f"{packed.hex().upper()}:{address.port:04X}"
+
+
+def _parse_address(text):
+    ip, port = text.split(':')
+    return addr(socket.inet_ntoa(bytes.fromhex(ip)[::-1]), int(port, 16))
+
+
+def run(scale):
+    """
+    Runs the detector worker benchmarks.
+
+    Args:
+        scale: A scale dictionary from benchmarks.harness.SCALES.
+
+    Returns:
+        list: Benchmark results.
+    """
+    translator = TranslationManager(language='en')
+    sockets = max(scale['sockets'])
+    processes = int(sockets * PROCESS_SHARE)
+    factory = functools.partial(ProcNetSnapshot, sockets, processes)
+    params = {'sockets': sockets, 'processes': processes, 'cpus': os.cpu_count()}
+    results = []
+
+    # Cycles running only the pooled detectors, and cycles where a detector
+    # of the monitor reads the socket table as well (network, firewall and
+    # listener checks do), so the workers' table is decoded
+    for shared in (False, True):
+        suffix = '_shared' if shared else ''
+        for workers in (False, True):
+            snapshot = factory()
+            pool = DetectorPool(list(WORKER_SECTIONS), translator.language, snapshot_factory=factory) \
+                if workers else None
+            service = MonitoringService(
+                translator=translator,
+                detectors=build_detectors(list(WORKER_SECTIONS), translator, snapshot),
+                reporter=None, interval=1, snapshot=snapshot,
+                install_signal_handlers=False, pool=pool
+            )
+
+            def cycle(_):
+                snapshot.refresh()
+                service._run_detection_cycle()
+                if shared:
+                    snapshot.connections()
+
+            try:
+                results.append(measure(
+                    f"workers.cycle_{'pool' if workers else 'in_process'}{suffix}_{sockets}",
+                    cycle, items=sockets, repeat=scale['repeat'],
+                    params=dict(params, workers=len(WORKER_SECTIONS) if workers else 0),
+                    track_memory=False,
+                ))
+            finally:
+                if pool is not None:
+                    pool.close()
+
+    return results
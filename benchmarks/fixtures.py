@@ -0,0 +1,669 @@
+"""
+Benchmark Fixtures Module
+Generates deterministic, psutil-shaped synthetic system state for benchmarks
+"""
+import asyncio
+import os
+import random
+import socket
+import ssl
+import struct
+import subprocess
+import threading
+import time
+from utils.snapshot import SystemSnapshot, addr, sconn, snicstats, snetio
+
+# Ports that the detectors treat as interesting, mixed into the fixtures
+# at a low rate so the finding paths are exercised as well
+INTERESTING_PORTS = [8888, 8080, 3128, 1080, 9050, 1194, 51820]
+
+PROCESS_NAMES = [
+    'systemd', 'sshd', 'bash', 'python3', 'chrome', 'firefox', 'code',
+    'dockerd', 'containerd', 'nginx', 'postgres', 'redis-server', 'java',
+]
+SUSPICIOUS_PROCESS_NAMES = ['wireshark', 'tcpdump', 'mitmproxy', 'Fiddler.exe']
+
+INTERFACE_NAMES = ['eth', 'wlan', 'docker', 'veth', 'br-', 'tun', 'wg', 'lo']
+
+SEVERITIES = ['HIGH', 'MEDIUM', 'LOW', 'INFO']
+FINDING_TYPES = [
+    'Suspicious Listening Port', 'Multiple Connections',
+    'Suspicious Remote Connection', 'Suspicious Process', 'Environment Proxy',
+]
+
+
+class FixtureSnapshot(SystemSnapshot):
+    """
+    Snapshot serving synthetic inputs instead of the live system.
+
+    Args:
+        connections: List of sconn tuples.
+        processes: List of {'pid', 'name'} dicts.
+        interfaces: Dict of interface name -> snicstats.
+        io_counters: snetio tuple.
+        environment: Dict of environment variables.
+        neighbors: {'arp', 'gateways'} dict as returned by neighbors.read_neighbors.
+        namespaces: Dict of PID -> network namespace inode.
+    """
+
+    def __init__(self, connections=(), processes=(), interfaces=None, io_counters=None,
+                 environment=None, neighbors=None, namespaces=None):
+        super().__init__()
+        self.fixture = {
+            'connections': list(connections),
+            'processes': list(processes),
+            'interfaces': interfaces or {},
+            'io_counters': io_counters or snetio(0, 0, 0, 0, 0, 0, 0, 0),
+            'environment': environment or {},
+            'neighbors': neighbors or {'arp': {}, 'gateways': []},
+            'namespaces': namespaces or {},
+        }
+
+    def _capture(self, section, collect):
+        return self.fixture[section]
+
+
+def make_connections(count, seed=0, remote_hosts=None):
+    """
+    Generates a synthetic socket table.
+
+    Args:
+        count: Number of sockets.
+        seed: Random seed, so that runs are comparable between versions.
+        remote_hosts: Number of distinct remote peers (default: count // 20).
+
+    Returns:
+        list: A list of sconn tuples.
+    """
+    rng = random.Random(seed)
+    remote_hosts = remote_hosts or max(1, count // 20)
+    peers = [f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}" for i in range(remote_hosts)]
+
+    connections = []
+    for i in range(count):
+        roll = rng.random()
+        pid = rng.randint(1, 65535)
+        if roll < 0.1:
+            port = rng.choice(INTERESTING_PORTS) if rng.random() < 0.05 else rng.randint(1024, 65535)
+            connections.append(sconn(i, socket.AF_INET, socket.SOCK_STREAM,
+                                     addr('0.0.0.0', port), (), 'LISTEN', pid))
+        else:
+            rport = rng.choice(INTERESTING_PORTS) if rng.random() < 0.01 else rng.choice((443, 80, 22, 5432))
+            status = 'ESTABLISHED' if roll < 0.9 else 'TIME_WAIT'
+            connections.append(sconn(i, socket.AF_INET, socket.SOCK_STREAM,
+                                     addr('192.168.1.10', rng.randint(32768, 60999)),
+                                     addr(rng.choice(peers), rport), status, pid))
+    return connections
+
+
+def make_processes(count, seed=0):
+    """
+    Generates a synthetic process table.
+
+    Args:
+        count: Number of processes.
+        seed: Random seed.
+
+    Returns:
+        list: A list of {'pid', 'name'} dicts.
+    """
+    rng = random.Random(seed)
+    processes = []
+    for pid in range(1, count + 1):
+        if rng.random() < 0.001:
+            name = rng.choice(SUSPICIOUS_PROCESS_NAMES)
+        else:
+            name = f"{rng.choice(PROCESS_NAMES)}-{rng.randint(0, 999)}"
+        processes.append({'pid': pid, 'name': name})
+    return processes
+
+
+def make_rule_pack(count, seed=0, regex_share=0.001):
+    """
+    Generates a rule file with a large process name rule set.
+
+    Signatures are built from a small syllable set, so that they share
+    prefixes and suffixes the way vendor and tool names do.
+
+    Args:
+        count: Number of signatures.
+        seed: Random seed.
+        regex_share: Fraction of the signatures that are regex rules.
+
+    Returns:
+        dict: Rule file document with one 'suspicious_processes' rule set.
+    """
+    rng = random.Random(seed)
+    syllables = ['mon', 'trace', 'cap', 'snif', 'net', 'log', 'spy', 'hook', 'agent', 'proxy',
+                 'tap', 'dump', 'ward', 'lens', 'scope', 'shark', 'watch', 'guard', 'kit', 'x']
+    contains = {}
+    regex = {}
+    while len(contains) + len(regex) < count:
+        name = ''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) + str(rng.randint(0, 99))
+        if rng.random() < regex_share:
+            regex[f'^{name}(-\\d+)?$'] = f'Regex signature {len(regex)}'
+        else:
+            contains[name] = f'Signature {len(contains)}'
+    return {'version': 1, 'rulesets': {'suspicious_processes': {'contains': contains, 'regex': regex}}}
+
+
+def make_interfaces(count, seed=0):
+    """
+    Generates a synthetic interface table.
+
+    Args:
+        count: Number of interfaces.
+        seed: Random seed.
+
+    Returns:
+        dict: Interface name -> snicstats.
+    """
+    rng = random.Random(seed)
+    return {
+        f"{rng.choice(INTERFACE_NAMES)}{i}": snicstats(True, 2, 1000, 1500)
+        for i in range(count)
+    }
+
+
+def make_neighbor_tables(count, seed=0, churn=0.0, spoof=False):
+    """
+    Generates /proc/net/arp and /proc/net/route contents.
+
+    Args:
+        count: Number of neighbor entries; 192.168.0.1 is the default gateway.
+        seed: Random seed.
+        churn: Fraction of the entries whose MAC differs from the seed's table.
+        spoof: Whether a host also claims the gateway's IP with its own MAC.
+
+    Returns:
+        tuple: (ARP table text, route table text).
+    """
+    rng = random.Random(seed)
+    churned = random.Random(seed + 1)
+    macs = []
+    for i in range(count):
+        mac = ':'.join(f'{rng.randrange(256):02x}' for _ in range(6))
+        if churned.random() < churn:
+            mac = ':'.join(f'{churned.randrange(256):02x}' for _ in range(6))
+        macs.append(mac)
+    if spoof and count > 1:
+        # The attacker answers for the gateway with the MAC of its own IP
+        macs[0] = macs[1]
+
+    lines = ['IP address       HW type     Flags       HW address            Mask     Device']
+    for i, mac in enumerate(macs):
+        ip = f"192.168.{(i + 1) >> 8}.{(i + 1) & 255}"
+        # A few unresolved entries, as on real hosts
+        flags, mac = ('0x0', '00:00:00:00:00:00') if i and rng.random() < 0.01 else ('0x2', mac)
+        lines.append(f"{ip:<16} 0x1         {flags:<11} {mac}     *        eth0")
+    routes = ('Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT\n'
+              'eth0\t00000000\t0100A8C0\t0003\t0\t0\t100\t00000000\t0\t0\t0\n'
+              'eth0\t0000A8C0\t00000000\t0001\t0\t0\t100\t0000FFFF\t0\t0\t0\n')
+    return '\n'.join(lines) + '\n', routes
+
+
+def write_conntrack_dump(path, count, seed=0, redirect_share=0.01, destinations=5000):
+    """
+    Writes a synthetic /proc/net/nf_conntrack table.
+
+    Most flows are forwarded LAN clients, masqueraded to the gateway's
+    public address; a share of the web flows are redirected to a local
+    transparent proxy on port 3128.
+
+    Args:
+        path: Output file path.
+        count: Number of flows.
+        seed: Random seed.
+        redirect_share: Fraction of the flows that are redirected.
+        destinations: Number of distinct destinations.
+
+    Returns:
+        int: Size of the file in bytes.
+    """
+    rng = random.Random(seed)
+    peers = [f"{rng.randint(1, 223)}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randint(1, 254)}"
+             for _ in range(destinations)]
+    tcp = ('ipv4     2 tcp      6 {timeout} ESTABLISHED src=192.168.1.{client} dst={peer} sport={sport} '
+           'dport={dport} src={reply} dst={public} sport={rport} dport={nport} [ASSURED] mark=0 zone=0 use=2\n')
+    udp = ('ipv4     2 udp      17 {timeout} src=192.168.1.{client} dst={peer} sport={sport} dport=53 '
+           '[UNREPLIED] src={peer} dst={public} sport=53 dport={nport} mark=0 zone=0 use=2\n')
+    with open(path, 'w', encoding='ascii') as f:
+        batch = []
+        for i in range(count):
+            peer = peers[min(int(rng.paretovariate(1.2)) - 1, destinations - 1)]
+            sport = rng.randint(32768, 60999)
+            values = {
+                'timeout': rng.randint(1, 431999), 'client': rng.randint(2, 254), 'peer': peer,
+                'sport': sport, 'public': '203.0.113.7', 'nport': sport,
+            }
+            roll = rng.random()
+            if roll < 0.1:
+                line = udp.format(**values)
+            elif roll < 0.1 + redirect_share:
+                line = tcp.format(dport=rng.choice((80, 443)), reply='192.168.1.1', rport=3128,
+                                  **dict(values, public=f"192.168.1.{values['client']}"))
+            else:
+                line = tcp.format(dport=443, reply=peer, rport=443, **values)
+            batch.append(line)
+            if len(batch) == 10000:
+                f.write(''.join(batch))
+                batch = []
+        f.write(''.join(batch))
+    return os.path.getsize(path)
+
+
+def make_results(findings_count, modules=5, seed=0, churn=0.0, attributes=False):
+    """
+    Generates detector results in the shape returned by detect().
+
+    Args:
+        findings_count: Total number of findings, spread across modules.
+        modules: Number of modules.
+        seed: Random seed.
+        churn: Fraction of findings replaced by fresh ones, used to build
+            a "next cycle" state that differs from a base state.
+        attributes: Whether findings carry correlation attributes, drawn
+            from pools small enough that modules share some of them.
+
+    Returns:
+        list: A list of result dictionaries.
+    """
+    rng = random.Random(seed)
+    churn_rng = random.Random(seed + 1)
+    per_module = findings_count // modules
+    results = []
+    for m in range(modules):
+        findings = []
+        for i in range(per_module):
+            serial = i
+            if churn and churn_rng.random() < churn:
+                serial = per_module + i
+            finding = {
+                "type": FINDING_TYPES[(m + serial) % len(FINDING_TYPES)],
+                "detail": f"module {m} item {serial} peer 10.0.{serial % 256}.{serial // 256 % 256}",
+                "severity": SEVERITIES[rng.randrange(len(SEVERITIES))],
+            }
+            if attributes:
+                # Pools grow with the table, so incidents stay a few findings each
+                pool = max(per_module, 16)
+                kind = (m + serial) % 4
+                if kind == 0:
+                    finding["attributes"] = {'port': 1024 + (serial * 7 + m) % pool}
+                elif kind == 1:
+                    finding["attributes"] = {'pid': 100 + (serial * 13 + m) % pool}
+                elif kind == 2:
+                    finding["attributes"] = {'port': 1024 + (serial * 5) % pool,
+                                             'pid': 100 + (serial * 3) % pool}
+                else:
+                    finding["attributes"] = {'ip': f"10.0.{serial % 256}.{serial // 256 % 256}"}
+            findings.append(finding)
+        results.append({
+            "name": f"Module {m}",
+            "risk_level": 'MEDIUM' if churn else 'LOW',
+            "findings": findings,
+        })
+    return results
+
+
+def make_tls_certificate(directory, hostname='localhost'):
+    """
+    Creates a self-signed certificate for a local TLS stand-in server.
+
+    Requires the openssl command line tool.
+
+    Args:
+        directory: Directory the PEM files are written to.
+        hostname: Subject common name and DNS subjectAltName.
+
+    Returns:
+        tuple: (certificate path, key path), or None if openssl is unavailable.
+    """
+    certfile = os.path.join(directory, 'standin-cert.pem')
+    keyfile = os.path.join(directory, 'standin-key.pem')
+    try:
+        subprocess.run(
+            ['openssl', 'req', '-x509', '-newkey', 'ec', '-pkeyopt', 'ec_paramgen_curve:prime256v1',
+             '-nodes', '-days', '2', '-subj', f'/CN={hostname}/O=Stand-In Test CA',
+             '-addext', f'subjectAltName=DNS:{hostname}',
+             '-keyout', keyfile, '-out', certfile],
+            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return certfile, keyfile
+
+
+class TLSStandIn:
+    """
+    Local TLS server standing in for a probed site.
+
+    Each connection is served by its own thread: the server waits
+    handshake_delay seconds before the TLS handshake and response_delay
+    seconds before answering the first request, which is how an
+    intercepting proxy shows up in the probe timings. Both delays can be
+    changed while the server runs.
+
+    Args:
+        certfile: Server certificate (PEM).
+        keyfile: Server private key (PEM).
+        handshake_delay: Seconds added before the handshake.
+        response_delay: Seconds added before the HTTP response.
+    """
+
+    def __init__(self, certfile, keyfile, handshake_delay=0.0, response_delay=0.0):
+        self.handshake_delay = handshake_delay
+        self.response_delay = response_delay
+        self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.context.load_cert_chain(certfile, keyfile)
+        self._listener = socket.create_server(('127.0.0.1', 0))
+        self.port = self._listener.getsockname()[1]
+        self._thread = None
+
+    def start(self):
+        """Starts accepting connections in a background thread."""
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops accepting connections."""
+        self._listener.close()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        try:
+            if self.handshake_delay:
+                time.sleep(self.handshake_delay)
+            with self.context.wrap_socket(conn, server_side=True) as tls:
+                if tls.recv(4096):
+                    if self.response_delay:
+                        time.sleep(self.response_delay)
+                    tls.sendall(b'HTTP/1.1 204 No Content\r\nConnection: close\r\n\r\n')
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+
+class ProxyStandIns:
+    """
+    Local listeners standing in for proxies and ordinary services.
+
+    All listeners are served by one asyncio loop in a background thread,
+    so hundreds of them cost a single thread. Kinds:
+
+      'http'    HTTP proxy: answers CONNECT with 502 and a Proxy-Agent header
+      'socks5'  SOCKS5 server accepting the no-authentication method
+      'socks4'  SOCKS4 server rejecting the request
+      'tls'     TLS server presenting the given certificate, as an
+                intercepting proxy minting one for the requested name would
+      'web'     Plain HTTP server answering everything with 400
+      'silent'  Accepts connections and never answers
+
+    Args:
+        kinds: Kind of each listener to open.
+        certfile: Certificate (PEM) of the 'tls' listeners.
+        keyfile: Private key (PEM) of the 'tls' listeners.
+    """
+
+    def __init__(self, kinds, certfile=None, keyfile=None):
+        self.kinds = list(kinds)
+        self.context = None
+        if certfile:
+            self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self.context.load_cert_chain(certfile, keyfile)
+        # (kind, port) of each listener, once started
+        self.listeners = []
+        self._loop = None
+        self._thread = None
+
+    def start(self):
+        """Opens the listeners and serves them in a background thread."""
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, args=(ready,), daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop(self):
+        """Closes the listeners."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+    def _run(self, ready):
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        servers = []
+        for kind in self.kinds:
+            handler = getattr(self, f'_serve_{kind}')
+            server = loop.run_until_complete(asyncio.start_server(
+                handler, '127.0.0.1', 0, ssl=self.context if kind == 'tls' else None))
+            servers.append(server)
+            self.listeners.append((kind, server.sockets[0].getsockname()[1]))
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            for server in servers:
+                server.close()
+            loop.close()
+
+    async def _reply(self, writer, reply):
+        try:
+            if reply:
+                writer.write(reply)
+                await writer.drain()
+        except (OSError, ssl.SSLError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_http(self, reader, writer):
+        try:
+            request = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError):
+            request = b''
+        if request.startswith(b'CONNECT '):
+            reply = b'HTTP/1.1 502 Bad Gateway\r\nProxy-Agent: stand-in\r\nContent-Length: 0\r\n\r\n'
+        elif request:
+            reply = b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n'
+        else:
+            reply = None
+        await self._reply(writer, reply)
+
+    async def _serve_socks5(self, reader, writer):
+        greeting = await reader.read(257)
+        await self._reply(writer, b'\x05\x00' if greeting[:1] == b'\x05' else None)
+
+    async def _serve_socks4(self, reader, writer):
+        request = await reader.read(512)
+        await self._reply(writer, b'\x00\x5b' + bytes(6) if request[:1] == b'\x04' else None)
+
+    async def _serve_tls(self, reader, writer):
+        # The handshake has completed (or failed) by the time this runs
+        await self._reply(writer, None)
+
+    async def _serve_web(self, reader, writer):
+        request = await reader.read(4096)
+        await self._reply(writer, b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n' if request else None)
+
+    async def _serve_silent(self, reader, writer):
+        try:
+            while await reader.read(4096):
+                pass
+        except OSError:
+            pass
+        writer.close()
+
+
+def _tls_record(content_type, body):
+    return bytes([content_type, 3, 3]) + len(body).to_bytes(2, 'big') + body
+
+
+def _tls_handshake(message_type, body):
+    return bytes([message_type]) + len(body).to_bytes(3, 'big') + body
+
+
+def _client_hello(hostname):
+    name = hostname.encode('ascii')
+    server_name = b'\x00' + len(name).to_bytes(2, 'big') + name
+    server_name = len(server_name).to_bytes(2, 'big') + server_name
+    extensions = b'\x00\x00' + len(server_name).to_bytes(2, 'big') + server_name
+    body = (b'\x03\x03' + bytes(32) + b'\x00' + b'\x00\x02\xc0\x2f' + b'\x01\x00'
+            + len(extensions).to_bytes(2, 'big') + extensions)
+    return _tls_record(22, _tls_handshake(1, body))
+
+
+def _server_flight(certificate_der):
+    server_hello = _tls_handshake(2, b'\x03\x03' + bytes(32) + b'\x00' + b'\xc0\x2f' + b'\x00')
+    chain = len(certificate_der).to_bytes(3, 'big') + certificate_der
+    certificate = _tls_handshake(11, len(chain).to_bytes(3, 'big') + chain)
+    done = _tls_handshake(14, b'')
+    return _tls_record(22, server_hello + certificate + done)
+
+
+def write_tls_capture(path, certificate_der, flows, data_packets=20, seed=0):
+    """
+    Writes a pcap file of TLS 1.2 connections over Ethernet and IPv4.
+
+    Each connection carries a handshake with SNI, the server's certificate
+    split over several segments (one pair of them swapped, and one segment
+    retransmitted), then data_packets packets of application data.
+    Connections are interleaved as on a busy gateway.
+
+    Args:
+        path: Output file path.
+        certificate_der: Leaf certificate presented by every server (DER).
+        flows: Number of connections.
+        data_packets: Application data packets per connection.
+        seed: Random seed.
+
+    Returns:
+        int: Number of packets written.
+    """
+    rng = random.Random(seed)
+    ethernet = bytes(6) + bytes(6) + b'\x08\x00'
+    application_data = _tls_record(23, bytes(1200))
+
+    def packet(src, sport, dst, dport, seq, flags, payload):
+        tcp = (sport.to_bytes(2, 'big') + dport.to_bytes(2, 'big') + seq.to_bytes(4, 'big')
+               + bytes(4) + b'\x50' + bytes([flags]) + b'\xff\xff' + bytes(4))
+        length = 20 + len(tcp) + len(payload)
+        ip = (b'\x45\x00' + length.to_bytes(2, 'big') + bytes(4) + b'\x40\x06' + bytes(2)
+              + src + dst)
+        return ethernet + ip + tcp + payload
+
+    def connection(index):
+        client = bytes([10, 0, index >> 8 & 0xff, index & 0xff])
+        server = bytes([192, 0, 2, index % 250 + 1])
+        sport = 32768 + index % 28000
+        client_seq = rng.getrandbits(32)
+        server_seq = rng.getrandbits(32)
+        yield packet(client, sport, server, 443, client_seq, 0x02, b'')
+        yield packet(server, 443, client, sport, server_seq, 0x12, b'')
+        client_seq = (client_seq + 1) % (1 << 32)
+        server_seq = (server_seq + 1) % (1 << 32)
+        hello = _client_hello(f'host{index}.example')
+        yield packet(client, sport, server, 443, client_seq, 0x18, hello)
+        client_seq = (client_seq + len(hello)) % (1 << 32)
+
+        flight = _server_flight(certificate_der)
+        segments = []
+        for offset in range(0, len(flight), 1000):
+            segments.append(((server_seq + offset) % (1 << 32), flight[offset:offset + 1000]))
+        server_seq = (server_seq + len(flight)) % (1 << 32)
+        if len(segments) > 2:
+            segments[1], segments[2] = segments[2], segments[1]
+        segments.insert(1, segments[0])
+        for seq, payload in segments:
+            yield packet(server, 443, client, sport, seq, 0x18, payload)
+
+        for _ in range(data_packets):
+            yield packet(server, 443, client, sport, server_seq, 0x18, application_data)
+            server_seq = (server_seq + len(application_data)) % (1 << 32)
+
+    count = 0
+    active = []
+    next_flow = 0
+    with open(path, 'wb') as f:
+        f.write(b'\xd4\xc3\xb2\xa1' + (2).to_bytes(2, 'little') + (4).to_bytes(2, 'little')
+                + bytes(8) + (65535).to_bytes(4, 'little') + (1).to_bytes(4, 'little'))
+        while next_flow < flows or active:
+            # Keep up to 64 connections in flight at once
+            while next_flow < flows and len(active) < 64:
+                active.append(connection(next_flow))
+                next_flow += 1
+            flow = rng.choice(active)
+            data = next(flow, None)
+            if data is None:
+                active.remove(flow)
+                continue
+            f.write(struct.pack('<IIII', count // 1000000, count % 1000000, len(data), len(data)))
+            f.write(data)
+            count += 1
+    return count
+
+
+def write_proc_tree(directory, count, seed=0, environment_size=3000, libraries=40):
+    """
+    Writes a procfs-shaped tree of <pid>/stat, <pid>/environ and <pid>/maps files.
+
+    About one process in fifty has a proxy variable set, one in two hundred
+    SSLKEYLOGFILE and one in two hundred LD_PRELOAD. Processes map libraries
+    from a shared pool of 400 paths, and one in five hundred maps a Frida
+    agent.
+
+    Args:
+        directory: Directory standing in for /proc.
+        count: Number of processes.
+        seed: Random seed.
+        environment_size: Approximate size of each environment in bytes.
+        libraries: Libraries mapped by each process.
+    """
+    rng = random.Random(seed)
+    library_pool = [f'/usr/lib/x86_64-linux-gnu/lib{name}{index}.so.{index % 7}'
+                    for index, name in enumerate(['ssl', 'crypto', 'gtk', 'qt', 'z', 'ffi', 'glib', 'dbus'] * 50)]
+    filler = []
+    while sum(len(entry) + 1 for entry in filler) < environment_size:
+        filler.append(f'VAR_{len(filler)}={"x" * rng.randint(10, 80)}'.encode('ascii'))
+
+    for index in range(count):
+        pid = 1000 + index
+        os.makedirs(os.path.join(directory, str(pid)))
+        name = PROCESS_NAMES[index % len(PROCESS_NAMES)]
+        stat = f'{pid} ({name}) S 1 {pid} {pid} 0 -1 4194560 ' + ' '.join(['0'] * 12) + f' {100000 + index} 0'
+        with open(os.path.join(directory, str(pid), 'stat'), 'w', encoding='ascii') as f:
+            f.write(stat)
+
+        entries = list(filler)
+        if index % 50 == 0:
+            entries.insert(rng.randrange(len(entries)), b'HTTPS_PROXY=http://10.0.0.1:3128')
+        if index % 200 == 0:
+            entries.insert(rng.randrange(len(entries)), b'SSLKEYLOGFILE=/tmp/keys.log')
+        if index % 200 == 100:
+            entries.insert(rng.randrange(len(entries)), b'LD_PRELOAD=/tmp/hook.so')
+        with open(os.path.join(directory, str(pid), 'environ'), 'wb') as f:
+            f.write(b'\0'.join(entries) + b'\0')
+
+        mapped = rng.sample(library_pool, libraries)
+        if index % 500 == 250:
+            mapped.append('/tmp/frida-agent-64.so')
+        lines = []
+        address = 0x7f0000000000
+        for path in mapped:
+            # Each library maps a read-only, an executable and a data segment
+            for perms in ('r--p', 'r-xp', 'rw-p'):
+                lines.append(f'{address:x}-{address + 0x1000:x} {perms} 00000000 08:01 {len(lines) + 1000} '
+                             f'                   {path}')
+                address += 0x1000
+        lines.append(f'{address:x}-{address + 0x21000:x} rw-p 00000000 00:00 0                          [heap]')
+        with open(os.path.join(directory, str(pid), 'maps'), 'w', encoding='ascii') as f:
+            f.write('\n'.join(lines) + '\n')
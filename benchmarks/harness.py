@@ -0,0 +1,112 @@
+"""
+Benchmark Harness Module
+Timing, percentile and peak-memory measurement shared by all benchmark suites
+"""
+import gc
+import time
+import tracemalloc
+
+# Fixture sizes per scale. "quick" is meant for a pre-commit sanity run,
+# "full" covers the sizes we care about on busy hosts and gateways.
+SCALES = {
+    'quick': {
+        'sockets': [1000, 10000],
+        'processes': [1000],
+        'interfaces': [64],
+        'findings': [10000],
+        'repeat': 5,
+    },
+    'full': {
+        'sockets': [1000, 10000, 100000, 500000],
+        'processes': [1000, 20000],
+        'interfaces': [64, 1024],
+        'findings': [10000, 100000, 1000000],
+        'repeat': 5,
+    },
+}
+
+
+def percentile(sorted_values, pct):
+    """
+    Computes a percentile with linear interpolation.
+
+    Args:
+        sorted_values: Values sorted in ascending order.
+        pct: Percentile between 0 and 100.
+
+    Returns:
+        float: The interpolated percentile value.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def measure(name, func, setup=None, items=1, repeat=5, params=None, track_memory=True):
+    """
+    Runs a benchmark case and collects latency, throughput and memory.
+
+    The timed runs and the memory run are separate, so that tracemalloc
+    overhead does not distort the latency numbers.
+
+    Args:
+        name: Benchmark case name (stable across versions, used for comparison).
+        func: Callable taking the value returned by setup.
+        setup: Optional callable run before each iteration, outside the timer.
+        items: Number of items processed per call, for throughput.
+        repeat: Number of timed iterations.
+        params: Dict of parameters recorded with the result.
+        track_memory: Whether to run an extra iteration under tracemalloc.
+
+    Returns:
+        dict: The benchmark result.
+    """
+    setup = setup or (lambda: None)
+
+    # Warm-up run, not recorded
+    func(setup())
+
+    samples = []
+    for _ in range(repeat):
+        state = setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func(state)
+            samples.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+
+    peak_memory = None
+    if track_memory:
+        state = setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func(state)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    samples.sort()
+    mean = sum(samples) / len(samples)
+    return {
+        'name': name,
+        'params': params or {},
+        'items': items,
+        'repeat': repeat,
+        'latency_ms': {
+            'min': samples[0] * 1000,
+            'p50': percentile(samples, 50) * 1000,
+            'p90': percentile(samples, 90) * 1000,
+            'p99': percentile(samples, 99) * 1000,
+            'max': samples[-1] * 1000,
+            'mean': mean * 1000,
+        },
+        'throughput_per_s': items / samples[0] if samples[0] > 0 else None,
+        'peak_memory_bytes': peak_memory,
+    }
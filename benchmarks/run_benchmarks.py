@@ -0,0 +1,148 @@
+"""
+Benchmark Runner
+Runs the benchmark suites offline and writes machine-readable results
+
+Usage:
+  python -m benchmarks.run_benchmarks                       # quick scale, all suites
+  python -m benchmarks.run_benchmarks --scale full -o new.json
+  python -m benchmarks.run_benchmarks --suite changes --compare old.json
+  python -m benchmarks.run_benchmarks --suite replay --corpus cycles.snap
+"""
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from benchmarks.harness import SCALES
+
+# Suite name -> module implementing run(scale)
+SUITES = {
+    'detectors': 'benchmarks.bench_detectors',
+    'changes': 'benchmarks.bench_changes',
+    'reporters': 'benchmarks.bench_reporters',
+    'replay': 'benchmarks.bench_replay',
+    'daemon': 'benchmarks.bench_daemon',
+    'fleet': 'benchmarks.bench_fleet',
+    'startup': 'benchmarks.bench_startup',
+    'tls': 'benchmarks.bench_tls',
+    'pcap': 'benchmarks.bench_pcap',
+    'probe': 'benchmarks.bench_probe',
+    'rules': 'benchmarks.bench_rules',
+    'conntrack': 'benchmarks.bench_conntrack',
+    'helper': 'benchmarks.bench_helper',
+    'cadence': 'benchmarks.bench_cadence',
+    'dashboard': 'benchmarks.bench_dashboard',
+    'diff': 'benchmarks.bench_diff',
+    'workers': 'benchmarks.bench_workers',
+}
+
+
+def _git_revision():
+    """Returns the current git revision, or None outside a checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=5, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_suites(suite_names, scale_name, corpus=None):
+    """
+    Runs the selected suites.
+
+    Args:
+        suite_names: Names from SUITES.
+        scale_name: Key into SCALES.
+        corpus: Optional snapshot recording replayed by the replay suite.
+
+    Returns:
+        dict: The full result document.
+    """
+    scale = dict(SCALES[scale_name], name=scale_name, corpus=corpus)
+    document = {
+        'timestamp': datetime.now().isoformat(),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': scale_name,
+        'results': [],
+    }
+
+    for suite_name in suite_names:
+        module = importlib.import_module(SUITES[suite_name])
+        for result in module.run(scale):
+            result['suite'] = suite_name
+            document['results'].append(result)
+            _print_result(result)
+
+    return document
+
+
+def _print_result(result):
+    """Prints a one-line summary of a benchmark result."""
+    latency = result['latency_ms']
+    memory = result['peak_memory_bytes']
+    memory_text = f"{memory / 1048576:8.1f} MiB" if memory is not None else '       n/a'
+    throughput = result['throughput_per_s']
+    throughput_text = f"{throughput:14,.0f}/s" if throughput else '             n/a'
+    print(f"{result['name']:<48} p50 {latency['p50']:10.2f} ms  "
+          f"p99 {latency['p99']:10.2f} ms  {throughput_text}  {memory_text}",
+          flush=True)
+
+
+def compare(baseline, current):
+    """
+    Prints the p50 latency and peak memory ratio of current vs baseline.
+
+    Args:
+        baseline: A result document from a previous run.
+        current: The result document of this run.
+    """
+    previous = {r['name']: r for r in baseline['results']}
+    print(f"\nComparison against {baseline.get('revision') or 'baseline'} "
+          f"({baseline.get('timestamp', '?')}):")
+    for result in current['results']:
+        old = previous.get(result['name'])
+        if old is None:
+            continue
+        old_p50 = old['latency_ms']['p50']
+        ratio = result['latency_ms']['p50'] / old_p50 if old_p50 else float('inf')
+        line = f"  {result['name']:<48} p50 x{ratio:6.2f}"
+        if result['peak_memory_bytes'] and old.get('peak_memory_bytes'):
+            line += f"  memory x{result['peak_memory_bytes'] / old['peak_memory_bytes']:6.2f}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run offline performance benchmarks')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='quick',
+                        help='Fixture sizes to run (default: quick)')
+    parser.add_argument('--suite', action='append', choices=sorted(SUITES),
+                        help='Suite to run, may be repeated (default: all)')
+    parser.add_argument('-o', '--output', metavar='FILE',
+                        help='Write results as JSON to FILE')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='Compare against a previous JSON result file')
+    parser.add_argument('--corpus', metavar='FILE',
+                        help='Snapshot recording (main.py --record) for the replay suite')
+    args = parser.parse_args()
+
+    document = run_suites(args.suite or list(SUITES), args.scale, args.corpus)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(json.load(f), document)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
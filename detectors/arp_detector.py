@@ -0,0 +1,104 @@
+"""
+ARP Detector Module
+Detects ARP spoofing on the local network from the neighbor table
+"""
+from utils.neighbors import NeighborIndex, read_neighbors
+from utils.snapshot import SystemSnapshot
+
+# IPs listed in a finding before the rest are summarized as a count
+MAX_LISTED_IPS = 5
+
+
+class ArpDetector:
+    def __init__(self, translator, snapshot=None):
+        self.findings = []
+        self.risk_level = "LOW"
+        self.translator = translator
+        self.snapshot = snapshot or SystemSnapshot()
+        self.index = NeighborIndex()
+        # (device, gateway IP) -> MAC first seen for it, for the default
+        # routes in gateway_routes
+        self.gateway_macs = {}
+        self.gateway_routes = frozenset()
+
+    def detect(self):
+        """Run ARP spoofing detection"""
+        self.findings = []
+        self.risk_level = "LOW"
+        self._check_neighbors()
+        return {
+            "name": self.translator.t('modules.arp_detection'),
+            "risk_level": self.risk_level,
+            "findings": self.findings
+        }
+
+    def _check_neighbors(self):
+        """Check the neighbor table for changed and duplicated MAC addresses"""
+        try:
+            tables = self.snapshot.neighbors(read_neighbors)
+        except OSError:
+            # No procfs neighbor table (not Linux)
+            return
+
+        changes = self.index.update(tables['arp'])
+        gateways = {ip: device for device, ip in tables['gateways']}
+        routes = frozenset(tables['gateways'])
+        if routes != self.gateway_routes:
+            # The default route changed: the old baselines no longer apply
+            self.gateway_macs.clear()
+            self.gateway_routes = routes
+
+        for device, ip in sorted(routes):
+            key = (device, ip)
+            entry = self.index.table.get(ip)
+            if entry is None or entry[1] != device:
+                # No neighbor entry on the route's device: learn it afresh
+                self.gateway_macs.pop(key, None)
+                continue
+            baseline = self.gateway_macs.setdefault(key, entry[0])
+            if entry[0] != baseline:
+                self.findings.append({
+                    "type": "Gateway MAC Changed",
+                    "detail": f"Gateway {ip} on {device}: MAC changed from {baseline} to {entry[0]}",
+                    "severity": "HIGH",
+                    "attributes": {'ip': ip, 'interface': device}
+                })
+                self.risk_level = "HIGH"
+                # Reported once; later changes are compared to the new MAC
+                self.gateway_macs[key] = entry[0]
+
+        for ip, before, after in changes:
+            if before is None or after is None or before[0] == after[0] or ip in gateways:
+                continue
+            self.findings.append({
+                "type": "Neighbor MAC Changed",
+                "detail": f"{ip} on {after[1]}: MAC changed from {before[0]} to {after[0]}",
+                "severity": "LOW",
+                "attributes": {'ip': ip, 'interface': after[1]}
+            })
+
+        for mac in sorted(self.index.shared):
+            ips = sorted(self.index.macs[mac])
+            device = self.index.table[ips[0]][1]
+            listed = ', '.join(ips[:MAX_LISTED_IPS])
+            if len(ips) > MAX_LISTED_IPS:
+                listed += f" and {len(ips) - MAX_LISTED_IPS} more"
+            gateway = next((ip for ip in ips if ip in gateways), None)
+            if gateway is not None:
+                # Another host answering for the gateway: classic ARP spoofing
+                self.findings.append({
+                    "type": "Duplicate MAC Address",
+                    "detail": f"MAC {mac} claims {len(ips)} IPs including gateway {gateway}: {listed}",
+                    "severity": "HIGH",
+                    "attributes": {'ip': gateway, 'interface': gateways[gateway]}
+                })
+                self.risk_level = "HIGH"
+            else:
+                self.findings.append({
+                    "type": "Duplicate MAC Address",
+                    "detail": f"MAC {mac} claims {len(ips)} IPs on {device}: {listed}",
+                    "severity": "MEDIUM",
+                    "attributes": {'interface': device}
+                })
+                if self.risk_level == "LOW":
+                    self.risk_level = "MEDIUM"
@@ -2,19 +2,59 @@
 Certificate Detector Module
 Detects suspicious SSL/TLS certificates that may indicate MITM attacks
 """
+import hashlib
+import os
 import ssl
 import socket
+import sys
+import time
 from datetime import datetime
+from utils.histogram import LatencyBaseline
+from utils.pin_store import PinStore
+from utils.rules import rules
+from utils.snapshot import SystemSnapshot
+from utils.trust_store import TrustStore, load_fingerprints
+from utils.x509 import CertificateError, parse_certificate
+
+# SPKI fingerprints of the public roots shipped with Mozilla/Debian
+KNOWN_ROOTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'known_roots.txt')
+
+# Sites probed for TLS interception
+DEFAULT_TARGETS = [
+    ('www.google.com', 443),
+    ('www.github.com', 443),
+]
+
+# Probe phases whose latency is profiled, with their display names
+LATENCY_PHASES = {
+    'connect': 'TCP connect',
+    'handshake': 'TLS handshake',
+    'resumed_handshake': 'resumed TLS handshake',
+    'first_byte': 'first byte',
+}
 
 
 class CertificateDetector:
-    def __init__(self, translator):
+    def __init__(self, translator, snapshot=None, targets=None, ssl_context=None, pin_ttl=3600):
         self.findings = []
         self.risk_level = "LOW"
         self.translator = translator
+        self.snapshot = snapshot or SystemSnapshot()
+        self.targets = targets or DEFAULT_TARGETS
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        # Checked certificates pinned by SPKI, and TLS sessions for resumption
+        self.pins = PinStore(ttl=pin_ttl)
+        self.tls_sessions = {}
+        # (hostname, port, phase) -> LatencyBaseline, kept across cycles
+        self.latency = {}
+        self.trust_store = TrustStore()
+        self.known_roots = None
+        self.baseline_anchors = None
 
     def detect(self):
         """Run certificate detection"""
+        self.findings = []
+        self.risk_level = "LOW"
         self._check_system_certificates()
         self._test_tls_interception()
         return {
@@ -24,53 +64,80 @@ class CertificateDetector:
         }
 
     def _check_system_certificates(self):
-        """Check for suspicious system certificates"""
+        """Check the system trust stores for injected root certificates"""
         # On Windows, checking system certificates requires pywin32 or similar
-        # For now, we'll skip this and focus on TLS interception test
-        pass
+        # For now, only the Linux trust stores are inspected
+        if not sys.platform.startswith('linux'):
+            return
+
+        try:
+            anchors = self.snapshot.trust_anchors(self.trust_store.scan)
+        except OSError:
+            return
+
+        if self.known_roots is None:
+            self.known_roots = load_fingerprints(KNOWN_ROOTS_FILE)
+
+        suspicious_issuers = rules.get('suspicious_issuers')
+        for spki, anchor in sorted(anchors.items()):
+            if spki in self.known_roots:
+                continue
+
+            name = anchor['name'] or spki[:16]
+            sources = anchor['sources'][0]
+            if len(anchor['sources']) > 1:
+                sources += f" (+{len(anchor['sources']) - 1})"
+            label = f"{anchor['name']} {anchor['organization']}".lower()
+
+            if suspicious_issuers.match(label):
+                self.findings.append({
+                    "type": "Suspicious Root Certificate",
+                    "detail": f"{name}: Trusted root from an interception vendor in {sources} (SPKI {spki[:16]})",
+                    "severity": "HIGH"
+                })
+                self.risk_level = "HIGH"
+            elif self.baseline_anchors is not None and spki not in self.baseline_anchors:
+                self.findings.append({
+                    "type": "New Root Certificate",
+                    "detail": f"{name}: Root certificate added since monitoring started in {sources} (SPKI {spki[:16]})",
+                    "severity": "HIGH"
+                })
+                self.risk_level = "HIGH"
+            else:
+                self.findings.append({
+                    "type": "Unknown Root Certificate",
+                    "detail": f"{name}: Trusted root not in the public CA set in {sources} (SPKI {spki[:16]})",
+                    "severity": "MEDIUM"
+                })
+                if self.risk_level == "LOW":
+                    self.risk_level = "MEDIUM"
+
+        # The first scan is the baseline that later cycles are compared against
+        if self.baseline_anchors is None:
+            self.baseline_anchors = set(anchors)
 
     def _test_tls_interception(self):
         """Test for TLS/SSL interception by connecting to known sites"""
-        test_sites = [
-            ('www.google.com', 443),
-            ('www.github.com', 443),
-        ]
-
-        for hostname, port in test_sites:
+        for hostname, port in self.targets:
             try:
-                context = ssl.create_default_context()
-
-                with socket.create_connection((hostname, port), timeout=5) as sock:
-                    with context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                        cert = ssock.getpeercert()
-
-                        # Check issuer
-                        issuer = dict(x[0] for x in cert['issuer'])
-                        subject = dict(x[0] for x in cert['subject'])
-
-                        # Check for common corporate/proxy certificates
-                        issuer_org = issuer.get('organizationName', '')
-                        suspicious_issuers = [
-                            'proxy', 'firewall', 'corporate', 'company',
-                            'zscaler', 'bluecoat', 'forcepoint', 'checkpoint'
-                        ]
-
-                        if any(sus.lower() in issuer_org.lower() for sus in suspicious_issuers):
-                            self.findings.append({
-                                "type": "Suspicious Certificate Issuer",
-                                "detail": f"{hostname}: Issued by {issuer_org} (possible MITM)",
-                                "severity": "HIGH"
-                            })
-                            self.risk_level = "HIGH"
-
-                        # Check if certificate is self-signed
-                        if issuer == subject:
-                            self.findings.append({
-                                "type": "Self-Signed Certificate",
-                                "detail": f"{hostname}: Certificate is self-signed (possible MITM)",
-                                "severity": "HIGH"
-                            })
-                            self.risk_level = "HIGH"
+                probe = self.snapshot.tls_probe(
+                    hostname, port,
+                    lambda: self._probe(hostname, port)
+                )
+
+                # Same key and rules as at the last full check: its findings
+                # still apply (a reload replaces the rule objects)
+                target = (hostname, port)
+                now = self.snapshot.captured_at
+                ruleset = rules.get('suspicious_issuers')
+                findings = self.pins.lookup(target, probe['spki_sha256'], now, ruleset)
+                if findings is None:
+                    findings = self._check_certificate(hostname, probe['certificate'])
+                    self.pins.pin(target, probe['leaf_sha256'], probe['spki_sha256'], findings, now, ruleset)
+                for finding in findings:
+                    self._add_finding(dict(finding))
+
+                self._check_latency(hostname, port, probe['timings'])
 
             except ssl.SSLError as e:
                 self.findings.append({
@@ -88,3 +155,119 @@ class CertificateDetector:
             except Exception as e:
                 # Other errors - not necessarily suspicious
                 pass
+
+    def _probe(self, hostname, port):
+        """Perform a TLS handshake and an HTTP request, timing each phase"""
+        target = (hostname, port)
+        # Resume the previous session while the pin is fresh; an expired
+        # pin gets a full handshake, so the chain is verified again
+        session = None
+        if not self.pins.expired(target, self.snapshot.captured_at):
+            session = self.tls_sessions.get(target)
+
+        start = time.perf_counter()
+        with socket.create_connection((hostname, port), timeout=5) as sock:
+            connected = time.perf_counter()
+            with self.ssl_context.wrap_socket(sock, server_hostname=hostname, session=session) as ssock:
+                handshaken = time.perf_counter()
+                resumed = ssock.session_reused
+                cert = ssock.getpeercert()
+                leaf = ssock.getpeercert(binary_form=True)
+                timings = {
+                    'connect': connected - start,
+                    'resumed_handshake' if resumed else 'handshake': handshaken - connected,
+                }
+                try:
+                    ssock.sendall(f'HEAD / HTTP/1.1\r\nHost: {hostname}\r\nConnection: close\r\n\r\n'.encode('ascii'))
+                    if ssock.recv(1):
+                        timings['first_byte'] = time.perf_counter() - handshaken
+                except OSError:
+                    # The certificate is what matters; first byte is best effort
+                    pass
+                # TLS 1.3 session tickets arrive after the handshake
+                if ssock.session is not None:
+                    self.tls_sessions[target] = ssock.session
+
+        try:
+            spki_sha256 = parse_certificate(leaf)['spki_sha256']
+        except CertificateError:
+            spki_sha256 = None
+
+        return {
+            'certificate': cert,
+            'leaf_sha256': hashlib.sha256(leaf).hexdigest(),
+            'spki_sha256': spki_sha256,
+            'resumed': resumed,
+            'timings': timings,
+        }
+
+    def _check_latency(self, hostname, port, timings):
+        """Check the probe phases for latency shifts against the host's baseline"""
+        for phase, seconds in timings.items():
+            baseline = self.latency.get((hostname, port, phase))
+            if baseline is None:
+                baseline = self.latency[(hostname, port, phase)] = LatencyBaseline()
+            baseline.add(seconds)
+
+            shift = baseline.shift()
+            if shift is not None:
+                self.findings.append({
+                    "type": "TLS Latency Shift",
+                    "detail": f"{hostname}: {LATENCY_PHASES.get(phase, phase)} latency significantly above "
+                              f"its baseline of {shift['baseline_us'] / 1000:.0f} ms (possible interception)",
+                    "severity": "MEDIUM"
+                })
+                if self.risk_level == "LOW":
+                    self.risk_level = "MEDIUM"
+
+    def _add_finding(self, finding):
+        """Add a finding and raise the risk level to its severity"""
+        self.findings.append(finding)
+        if finding['severity'] == "HIGH":
+            self.risk_level = "HIGH"
+        elif finding['severity'] == "MEDIUM" and self.risk_level == "LOW":
+            self.risk_level = "MEDIUM"
+
+    def _check_certificate(self, hostname, cert):
+        """Check a peer certificate for signs of interception, returning the findings"""
+        return check_peer_certificate(hostname, cert)
+
+
+def check_peer_certificate(hostname, cert):
+    """
+    Checks a peer certificate for signs of interception.
+
+    Shared by the live TLS probes and offline capture analysis.
+
+    Args:
+        hostname: Name the certificate was presented for.
+        cert: Certificate in getpeercert() form ('issuer' and 'subject' RDNs).
+
+    Returns:
+        list: Findings.
+    """
+    findings = []
+
+    # Check issuer
+    issuer = dict(x[0] for x in cert['issuer'])
+    subject = dict(x[0] for x in cert['subject'])
+
+    # Check for common corporate/proxy certificates
+    issuer_org = issuer.get('organizationName', '')
+
+    if rules.get('suspicious_issuers').match(issuer_org):
+        findings.append({
+            "type": "Suspicious Certificate Issuer",
+            "detail": f"{hostname}: Issued by {issuer_org} (possible MITM)",
+            "severity": "HIGH"
+        })
+
+    # Check if certificate is self-signed
+    if issuer == subject:
+        findings.append({
+            "type": "Self-Signed Certificate",
+            "detail": f"{hostname}: Certificate is self-signed (possible MITM)",
+            "severity": "HIGH"
+        })
+
+    return findings
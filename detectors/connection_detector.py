@@ -4,27 +4,21 @@ Analyzes network connections for suspicious patterns
 """
 import psutil
 from collections import defaultdict
+from utils.rules import rules
+from utils.snapshot import SystemSnapshot
 
 
 class ConnectionDetector:
-    def __init__(self, translator):
+    def __init__(self, translator, snapshot=None):
         self.findings = []
         self.risk_level = "LOW"
         self.translator = translator
-
-        # Suspicious ports that might indicate monitoring
-        self.suspicious_ports = {
-            8888: 'Common Proxy Port',
-            8080: 'HTTP Proxy',
-            3128: 'Squid Proxy',
-            1080: 'SOCKS Proxy',
-            9050: 'Tor SOCKS',
-            8118: 'Privoxy',
-            9150: 'Tor Browser',
-        }
+        self.snapshot = snapshot or SystemSnapshot()
 
     def detect(self):
         """Run connection analysis"""
+        self.findings = []
+        self.risk_level = "LOW"
         self._check_listening_ports()
         self._check_established_connections()
         self._analyze_connection_patterns()
@@ -37,7 +31,9 @@ class ConnectionDetector:
     def _check_listening_ports(self):
         """Check for suspicious listening ports"""
         try:
-            connections = psutil.net_connections(kind='inet')
+            connections = self.snapshot.connections()
+            # Suspicious ports that might indicate monitoring
+            suspicious_ports = rules.get('suspicious_ports').ports
 
             listening_ports = []
             for conn in connections:
@@ -45,11 +41,12 @@ class ConnectionDetector:
                     port = conn.laddr.port
                     listening_ports.append(port)
 
-                    if port in self.suspicious_ports:
+                    if port in suspicious_ports:
                         self.findings.append({
                             "type": "Suspicious Listening Port",
-                            "detail": f"Port {port} ({self.suspicious_ports[port]}) - PID: {conn.pid}",
-                            "severity": "MEDIUM"
+                            "detail": f"Port {port} ({suspicious_ports[port]}) - PID: {conn.pid}",
+                            "severity": "MEDIUM",
+                            "attributes": {'port': port, 'pid': conn.pid}
                         })
                         if self.risk_level == "LOW":
                             self.risk_level = "MEDIUM"
@@ -70,7 +67,8 @@ class ConnectionDetector:
     def _check_established_connections(self):
         """Check established connections for suspicious patterns"""
         try:
-            connections = psutil.net_connections(kind='inet')
+            connections = self.snapshot.connections()
+            suspicious_ports = rules.get('suspicious_ports').ports
 
             # Count connections by remote address
             remote_addrs = defaultdict(int)
@@ -84,11 +82,11 @@ class ConnectionDetector:
                     remote_addrs[remote_ip] += 1
 
                     # Check for suspicious remote ports
-                    if remote_port in self.suspicious_ports:
+                    if remote_port in suspicious_ports:
                         suspicious_connections.append({
                             'ip': remote_ip,
                             'port': remote_port,
-                            'description': self.suspicious_ports[remote_port]
+                            'description': suspicious_ports[remote_port]
                         })
 
             # Report if too many connections to single IP
@@ -97,7 +95,8 @@ class ConnectionDetector:
                     self.findings.append({
                         "type": "Multiple Connections",
                         "detail": f"{count} connections to {ip}",
-                        "severity": "LOW"
+                        "severity": "LOW",
+                        "attributes": {'ip': ip}
                     })
 
             # Report suspicious connections
@@ -105,7 +104,8 @@ class ConnectionDetector:
                 self.findings.append({
                     "type": "Suspicious Remote Connection",
                     "detail": f"Connected to {conn['ip']}:{conn['port']} ({conn['description']})",
-                    "severity": "MEDIUM"
+                    "severity": "MEDIUM",
+                    "attributes": {'ip': conn['ip']}
                 })
                 if self.risk_level == "LOW":
                     self.risk_level = "MEDIUM"
@@ -123,7 +123,7 @@ class ConnectionDetector:
         """Analyze overall connection patterns"""
         try:
             # Get network I/O statistics
-            net_io = psutil.net_io_counters()
+            net_io = self.snapshot.io_counters()
 
             # Just informational
             self.findings.append({
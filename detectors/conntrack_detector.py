@@ -0,0 +1,100 @@
+"""
+Conntrack Detector Module
+Detects forwarded and locally generated flows redirected to proxies from the
+connection tracking table
+"""
+import sys
+from utils.conntrack import scan_conntrack
+from utils.rules import rules
+from utils.snapshot import SystemSnapshot
+
+# Destinations listed in the statistics finding
+TOP_LISTED = 5
+
+
+class ConntrackDetector:
+    def __init__(self, translator, snapshot=None):
+        self.findings = []
+        self.risk_level = "LOW"
+        self.translator = translator
+        self.snapshot = snapshot or SystemSnapshot()
+
+    def detect(self):
+        """Run connection tracking analysis"""
+        self.findings = []
+        self.risk_level = "LOW"
+        self._check_conntrack()
+        return {
+            "name": self.translator.t('modules.conntrack_analysis'),
+            "risk_level": self.risk_level,
+            "findings": self.findings
+        }
+
+    def _check_conntrack(self):
+        """Check the connection tracking table for redirected flows"""
+        if not sys.platform.startswith('linux'):
+            return
+
+        try:
+            local_addresses = self.snapshot.local_addresses()
+        except Exception:
+            local_addresses = []
+
+        try:
+            table = self.snapshot.conntrack(lambda: scan_conntrack(local_addresses=local_addresses))
+        except FileNotFoundError:
+            # Connection tracking is not loaded
+            return
+        except PermissionError:
+            self.findings.append({
+                "type": "Permission",
+                "detail": "Connection tracking table could not be read (try running as root)",
+                "severity": "INFO"
+            })
+            return
+        except OSError as e:
+            self.findings.append({
+                "type": "Error",
+                "detail": f"Failed to read the connection tracking table: {str(e)}",
+                "severity": "INFO"
+            })
+            return
+
+        proxy_ports = rules.get('suspicious_ports').ports
+        # Flow counts change every cycle, so the details name only the ports
+        # and the target; the counts are in the statistics finding
+        for target in table['targets']:
+            ports = ', '.join(str(port) for port in target['original_ports'])
+            ports = f"ports {ports}" if len(target['original_ports']) > 1 else f"port {ports}"
+            description = proxy_ports.get(target['port'])
+            known = f" ({description})" if description else ""
+            if target['local']:
+                self.findings.append({
+                    "type": "Transparent Proxy Redirect",
+                    "detail": f"Flows to {ports} redirected to local port "
+                              f"{target['port']}{known}",
+                    "severity": "HIGH" if description else "MEDIUM",
+                    "attributes": {'port': target['port']}
+                })
+            else:
+                self.findings.append({
+                    "type": "NAT Redirect",
+                    "detail": f"Flows to {ports} forwarded to "
+                              f"{target['address']}:{target['port']}{known}",
+                    "severity": "MEDIUM" if description else "LOW",
+                    "attributes": {'ip': target['address']}
+                })
+
+        severities = {f['severity'] for f in self.findings}
+        if "HIGH" in severities:
+            self.risk_level = "HIGH"
+        elif "MEDIUM" in severities:
+            self.risk_level = "MEDIUM"
+
+        busiest = ', '.join(f"{address} ({flows})" for address, flows in table['destinations'][:TOP_LISTED])
+        self.findings.append({
+            "type": "Conntrack Statistics",
+            "detail": f"{table['flows']} tracked flows, {table['redirected']} redirected"
+                      + (f"; busiest destinations: {busiest}" if busiest else ""),
+            "severity": "INFO"
+        })
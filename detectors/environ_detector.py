@@ -0,0 +1,73 @@
+"""
+Environment Detector Module
+Detects proxies, TLS key logging and library preloading in the environment
+of running processes
+"""
+import sys
+from utils.correlation import proxy_attributes
+from utils.proc_environ import KEY_LOG_VARIABLES, PRELOAD_VARIABLES, ProcessEnvironmentScanner
+from utils.snapshot import SystemSnapshot
+
+
+class EnvironDetector:
+    def __init__(self, translator, snapshot=None):
+        self.findings = []
+        self.risk_level = "LOW"
+        self.translator = translator
+        self.snapshot = snapshot or SystemSnapshot()
+        self.scanner = ProcessEnvironmentScanner()
+
+    def detect(self):
+        """Run process environment detection"""
+        self.findings = []
+        self.risk_level = "LOW"
+        self._check_process_environments()
+        return {
+            "name": self.translator.t('modules.environ_detection'),
+            "risk_level": self.risk_level,
+            "findings": self.findings
+        }
+
+    def _check_process_environments(self):
+        """Check the environment of every process for variables of interest"""
+        # Only Linux exposes other processes' environments in /proc
+        if not sys.platform.startswith('linux'):
+            return
+
+        try:
+            scan = self.snapshot.process_environments(self.scanner.scan)
+        except OSError:
+            return
+
+        for proc in scan['processes']:
+            for var, value in sorted(proc['variables'].items()):
+                if not value:
+                    continue
+                detail = f"{var}={value} (PID: {proc['pid']}, Name: {proc['name']})"
+                attributes = {'pid': proc['pid']}
+                if var in KEY_LOG_VARIABLES:
+                    # TLS session keys are written to a file anyone with access can decrypt with
+                    self._add_finding({"type": "TLS Key Logging", "detail": detail, "severity": "HIGH",
+                                       "attributes": attributes})
+                elif var in PRELOAD_VARIABLES:
+                    self._add_finding({"type": "Library Preload", "detail": detail, "severity": "MEDIUM",
+                                       "attributes": attributes})
+                else:
+                    attributes.update(proxy_attributes(value))
+                    self._add_finding({"type": "Process Proxy", "detail": detail, "severity": "MEDIUM",
+                                       "attributes": attributes})
+
+        if scan['denied']:
+            self.findings.append({
+                "type": "Permission",
+                "detail": f"Environment of {scan['denied']} processes could not be read (try running as root)",
+                "severity": "INFO"
+            })
+
+    def _add_finding(self, finding):
+        """Add a finding and raise the risk level to its severity"""
+        self.findings.append(finding)
+        if finding['severity'] == "HIGH":
+            self.risk_level = "HIGH"
+        elif finding['severity'] == "MEDIUM" and self.risk_level == "LOW":
+            self.risk_level = "MEDIUM"
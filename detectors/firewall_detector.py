@@ -0,0 +1,111 @@
+"""
+Firewall Detector Module
+Detects transparent proxies set up with iptables/nftables REDIRECT, DNAT and
+TPROXY rules, and the processes listening behind them
+"""
+import sys
+from utils.firewall import FirewallRuleIndex, is_local_address, matches_ports, read_rulesets
+from utils.rules import rules
+from utils.snapshot import SystemSnapshot
+
+
+class FirewallDetector:
+    def __init__(self, translator, snapshot=None):
+        self.findings = []
+        self.risk_level = "LOW"
+        self.translator = translator
+        self.snapshot = snapshot or SystemSnapshot()
+        self.index = FirewallRuleIndex()
+
+    def detect(self):
+        """Run transparent proxy rule detection"""
+        self.findings = []
+        self.risk_level = "LOW"
+        self._check_rules()
+        return {
+            "name": self.translator.t('modules.firewall_detection'),
+            "risk_level": self.risk_level,
+            "findings": self.findings
+        }
+
+    def _check_rules(self):
+        """Check the firewall rules for traffic diverted to local ports"""
+        if not sys.platform.startswith('linux'):
+            return
+
+        try:
+            dump = self.snapshot.firewall_rules(read_rulesets)
+        except OSError:
+            return
+        if dump['denied'] and not dump['rulesets']:
+            self.findings.append({
+                "type": "Permission",
+                "detail": "Firewall rules could not be read (try running as root)",
+                "severity": "INFO"
+            })
+            return
+
+        watched = rules.get('diverted_ports').ports
+        try:
+            local_addresses = set(self.snapshot.local_addresses())
+        except Exception:
+            local_addresses = set()
+        listeners = self._listeners()
+        names = {}
+        try:
+            names = {proc['pid']: proc['name'] for proc in self.snapshot.processes()}
+        except Exception:
+            pass
+
+        reported = set()
+        for diversion in self.index.update(dump['rulesets']):
+            ports = matches_ports(diversion, watched)
+            if not ports or not is_local_address(diversion['address'], local_addresses):
+                continue
+            # Rules for traffic already addressed to this host, e.g. a
+            # container's embedded DNS server, intercept nothing
+            if diversion['destination'] and is_local_address(diversion['destination'].split('/')[0],
+                                                             local_addresses):
+                continue
+            # iptables-nft rules also show up in the nftables dump
+            key = (diversion['protocol'], tuple(ports), diversion['action'], diversion['port'])
+            if key in reported:
+                continue
+            reported.add(key)
+
+            services = ', '.join(f"{port} ({watched[port]})" for port in ports)
+            services = f"ports {services}" if len(ports) > 1 else f"port {services}"
+            target = diversion['port'] if diversion['port'] is not None else ports[0]
+            location = f"{diversion['table']}/{diversion['chain']}"
+            if target in listeners:
+                pid = listeners[target]
+                self.findings.append({
+                    "type": "Transparent Proxy Rule",
+                    "detail": f"{location}: {diversion['action']} of {services} to local port {target}, "
+                              f"served by PID {pid} ({names.get(pid, '?')})",
+                    "severity": "HIGH",
+                    "attributes": {'port': target, 'pid': pid}
+                })
+                self.risk_level = "HIGH"
+            else:
+                self.findings.append({
+                    "type": "Transparent Proxy Rule",
+                    "detail": f"{location}: {diversion['action']} of {services} to local port {target} "
+                              f"(no listener found)",
+                    "severity": "MEDIUM",
+                    "attributes": {'port': target}
+                })
+                if self.risk_level == "LOW":
+                    self.risk_level = "MEDIUM"
+
+    def _listeners(self):
+        """Returns local port -> PID of the listening sockets"""
+        listeners = {}
+        try:
+            for conn in self.snapshot.connections():
+                # TCP listeners, and unconnected UDP sockets (DNS)
+                if conn.laddr and (conn.status == 'LISTEN' or (conn.status == 'NONE' and not conn.raddr)):
+                    listeners.setdefault(conn.laddr.port, conn.pid)
+        except Exception:
+            pass
+        return listeners
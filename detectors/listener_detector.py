@@ -0,0 +1,67 @@
+"""
+Listener Detector Module
+Detects local proxies by probing every TCP listener, whatever its port
+"""
+import os
+from utils.proxy_probe import ListenerProber, TLS_PROXY, listener_targets
+from utils.snapshot import SystemSnapshot
+
+
+class ListenerDetector:
+    def __init__(self, translator, snapshot=None):
+        self.findings = []
+        self.risk_level = "LOW"
+        self.translator = translator
+        self.snapshot = snapshot or SystemSnapshot()
+        self.prober = ListenerProber()
+
+    def detect(self):
+        """Run local proxy detection"""
+        self.findings = []
+        self.risk_level = "LOW"
+        self._probe_listeners()
+        return {
+            "name": self.translator.t('modules.listener_detection'),
+            "risk_level": self.risk_level,
+            "findings": self.findings
+        }
+
+    def _probe_listeners(self):
+        """Probe the local TCP listeners for proxy behavior"""
+        try:
+            proxies = self.snapshot.listener_probes(lambda: self.prober.probe(
+                listener_targets(self.snapshot.connections(), exclude_pids={os.getpid()}),
+                self.snapshot.captured_at
+            ))
+        except Exception:
+            # Without the socket table there is nothing to probe; the
+            # connection detector reports why
+            return
+
+        names = {}
+        try:
+            names = {proc['pid']: proc['name'] for proc in self.snapshot.processes()}
+        except Exception:
+            pass
+
+        for proxy in proxies:
+            process = names.get(proxy['pid'], '?')
+            if proxy['kind'] == TLS_PROXY:
+                # Mints certificates for any name: it can intercept TLS
+                self.findings.append({
+                    "type": "TLS Intercepting Listener",
+                    "detail": f"Port {proxy['port']}: {proxy['kind']} issuing certificates for any host - "
+                              f"PID: {proxy['pid']} ({process})",
+                    "severity": "HIGH",
+                    "attributes": {'port': proxy['port'], 'pid': proxy['pid']}
+                })
+                self.risk_level = "HIGH"
+            else:
+                self.findings.append({
+                    "type": "Local Proxy Listener",
+                    "detail": f"Port {proxy['port']}: {proxy['kind']} - PID: {proxy['pid']} ({process})",
+                    "severity": "MEDIUM",
+                    "attributes": {'port': proxy['port'], 'pid': proxy['pid']}
+                })
+                if self.risk_level == "LOW":
+                    self.risk_level = "MEDIUM"
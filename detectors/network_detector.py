@@ -3,19 +3,25 @@ Network Detector Module
 Detects network interface configurations that may indicate monitoring
 """
 import psutil
-import platform
+from collections import Counter
+from utils.rules import rules
+from utils.snapshot import SystemSnapshot
 
 
 class NetworkDetector:
-    def __init__(self, translator):
+    def __init__(self, translator, snapshot=None):
         self.findings = []
         self.risk_level = "LOW"
         self.translator = translator
+        self.snapshot = snapshot or SystemSnapshot()
 
     def detect(self):
         """Run network interface detection"""
+        self.findings = []
+        self.risk_level = "LOW"
         self._check_network_interfaces()
         self._check_vpn_connections()
+        self._check_namespaces()
         return {
             "name": self.translator.t('modules.network_detection'),
             "risk_level": self.risk_level,
@@ -25,7 +31,7 @@ class NetworkDetector:
     def _check_network_interfaces(self):
         """Check network interfaces for suspicious configurations"""
         try:
-            interfaces = psutil.net_if_stats()
+            interfaces = self.snapshot.interfaces()
 
             for interface_name, stats in interfaces.items():
                 # Check for promiscuous mode (not easily detectable on Windows without admin)
@@ -36,7 +42,8 @@ class NetworkDetector:
                     self.findings.append({
                         "type": "Virtual Network Adapter",
                         "detail": f"Interface: {interface_name} (may indicate VPN or VM)",
-                        "severity": "MEDIUM"
+                        "severity": "MEDIUM",
+                        "attributes": {'interface': interface_name}
                     })
                     if self.risk_level == "LOW":
                         self.risk_level = "MEDIUM"
@@ -50,28 +57,14 @@ class NetworkDetector:
 
     def _is_virtual_adapter(self, interface_name):
         """Check if interface is a virtual adapter"""
-        virtual_keywords = [
-            'vmware', 'virtualbox', 'vbox', 'virtual', 'tap', 'tun',
-            'vpn', 'openvpn', 'wireguard', 'nordvpn', 'expressvpn',
-            'tunnelbear', 'protonvpn', 'mullvad', 'hyper-v'
-        ]
-
-        interface_lower = interface_name.lower()
-        return any(keyword in interface_lower for keyword in virtual_keywords)
+        return rules.get('virtual_adapters').match(interface_name) is not None
 
     def _check_vpn_connections(self):
         """Check for active VPN connections"""
         try:
             # Check network connections for VPN-related ports
-            connections = psutil.net_connections()
-
-            vpn_ports = {
-                1194: 'OpenVPN',
-                1723: 'PPTP VPN',
-                500: 'IKEv2/IPSec',
-                4500: 'IPSec NAT-T',
-                51820: 'WireGuard'
-            }
+            connections = self.snapshot.connections()
+            vpn_ports = rules.get('vpn_ports').ports
 
             vpn_found = set()
             for conn in connections:
@@ -98,3 +91,37 @@ class NetworkDetector:
                 "detail": f"Failed to check VPN connections: {str(e)}",
                 "severity": "INFO"
             })
+
+    def _check_namespaces(self):
+        """Check for processes in other network namespaces, whose sockets are not in the socket table"""
+        try:
+            namespaces = self.snapshot.namespaces()
+        except Exception:
+            return
+        if not namespaces:
+            return
+
+        # The namespace of init, or the most common one if init cannot be inspected
+        host = namespaces.get(1) or Counter(namespaces.values()).most_common(1)[0][0]
+        others = {}
+        for pid, inode in sorted(namespaces.items()):
+            if inode != host:
+                others.setdefault(inode, []).append(pid)
+        if not others:
+            return
+
+        names = {}
+        try:
+            names = {proc['pid']: proc['name'] for proc in self.snapshot.processes()}
+        except Exception:
+            pass
+        listed = ', '.join(f"{inode} (PID {pids[0]} {names.get(pids[0], '?')})"
+                           for inode, pids in sorted(others.items())[:3])
+        if len(others) > 3:
+            listed += f" and {len(others) - 3} more"
+        self.findings.append({
+            "type": "Network Namespaces",
+            "detail": f"{sum(len(pids) for pids in others.values())} processes in {len(others)} other "
+                      f"network namespaces, whose sockets are not checked: {listed}",
+            "severity": "INFO"
+        })
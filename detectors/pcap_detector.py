@@ -0,0 +1,58 @@
+"""
+Pcap Detector Module
+Detects TLS interception in a packet capture by checking the certificates
+servers presented in it
+"""
+from detectors.certificate_detector import check_peer_certificate
+from utils.pcap import analyze_capture
+
+
+class PcapDetector:
+    def __init__(self, translator, path, workers=0):
+        self.findings = []
+        self.risk_level = "LOW"
+        self.translator = translator
+        self.path = path
+        self.workers = workers
+
+    def detect(self):
+        """Run certificate checks over a capture file"""
+        self.findings = []
+        self.risk_level = "LOW"
+
+        certificates, stats = analyze_capture(self.path, workers=self.workers)
+
+        seen = set()
+        for record in sorted(certificates, key=lambda r: (r['server_name'] or '', r['server'])):
+            # Name the server as the client did, falling back to its address
+            hostname = record['server_name'] or record['server']
+            for finding in check_peer_certificate(hostname, record):
+                key = (finding['type'], finding['detail'])
+                if key not in seen:
+                    seen.add(key)
+                    self._add_finding(finding)
+
+        detail = f"{stats['packets']} packets, {stats['tls_handshakes']} TLS handshakes, " \
+                 f"{len(certificates)} server certificates checked, " \
+                 f"{stats['tls13_handshakes']} TLS 1.3 handshakes (certificates encrypted)"
+        if stats.get('malformed_records'):
+            detail += f", {stats['malformed_records']} malformed records skipped"
+        self.findings.append({
+            "type": "PCAP Summary",
+            "detail": detail,
+            "severity": "INFO"
+        })
+
+        return {
+            "name": self.translator.t('modules.pcap_analysis'),
+            "risk_level": self.risk_level,
+            "findings": self.findings
+        }
+
+    def _add_finding(self, finding):
+        """Add a finding and raise the risk level to its severity"""
+        self.findings.append(finding)
+        if finding['severity'] == "HIGH":
+            self.risk_level = "HIGH"
+        elif finding['severity'] == "MEDIUM" and self.risk_level == "LOW":
+            self.risk_level = "MEDIUM"
@@ -2,18 +2,25 @@
 Proxy Detector Module
 Detects system and environment proxy settings
 """
-import os
-import platform
+import sys
+from utils.correlation import proxy_attributes
+from utils.proxy_config import ProxyConfigIndex, ProxyConfigWatcher
+from utils.snapshot import SystemSnapshot
 
 
 class ProxyDetector:
-    def __init__(self, translator):
+    def __init__(self, translator, snapshot=None):
         self.findings = []
         self.risk_level = "LOW"
         self.translator = translator
+        self.snapshot = snapshot or SystemSnapshot()
+        self.config_index = ProxyConfigIndex()
+        self.watcher = None
 
     def detect(self):
         """Run all proxy detection checks"""
+        self.findings = []
+        self.risk_level = "LOW"
         self._check_env_proxies()
         self._check_system_proxies()
         return {
@@ -27,20 +34,62 @@ class ProxyDetector:
         proxy_vars = ['HTTP_PROXY', 'HTTPS_PROXY', 'FTP_PROXY', 'ALL_PROXY',
                      'http_proxy', 'https_proxy', 'ftp_proxy', 'all_proxy']
 
+        environment = self.snapshot.environment(proxy_vars)
         for var in proxy_vars:
-            value = os.environ.get(var)
+            value = environment.get(var)
             if value:
                 self.findings.append({
                     "type": "Environment Proxy",
                     "detail": f"{var}={value}",
-                    "severity": "MEDIUM"
+                    "severity": "MEDIUM",
+                    "attributes": proxy_attributes(value)
                 })
                 self.risk_level = "MEDIUM"
 
     def _check_system_proxies(self):
         """Check system-level proxy settings"""
-        if platform.system() == "Windows":
+        if sys.platform == 'win32':
             self._check_windows_proxy()
+        elif sys.platform.startswith('linux'):
+            self._check_config_files()
+
+    def _check_config_files(self):
+        """Check proxy settings in Linux system and user configuration files"""
+        try:
+            settings = self.snapshot.proxy_config(self.config_index.scan)
+        except OSError:
+            return
+
+        for entry in settings:
+            self.findings.append({
+                "type": "Configured Proxy",
+                "detail": f"{entry['source']}: {entry['setting']}={entry['value']}",
+                "severity": "MEDIUM",
+                "attributes": proxy_attributes(entry['value'])
+            })
+            self.risk_level = "MEDIUM"
+
+    def start_watching(self, on_change):
+        """
+        Watch the proxy configuration files and call on_change when one changes.
+
+        Returns:
+            bool: False if the files cannot be watched (not Linux, or no inotify).
+        """
+        if not sys.platform.startswith('linux'):
+            return False
+        try:
+            self.watcher = ProxyConfigWatcher(self.config_index, on_change)
+        except OSError:
+            return False
+        self.watcher.start()
+        return True
+
+    def stop_watching(self):
+        """Stop watching the proxy configuration files"""
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
 
     def _check_windows_proxy(self):
         """Check Windows registry for proxy settings"""
@@ -61,7 +110,8 @@ class ProxyDetector:
                             self.findings.append({
                                 "type": "Windows System Proxy",
                                 "detail": f"Proxy Server: {proxy_server}",
-                                "severity": "MEDIUM"
+                                "severity": "MEDIUM",
+                                "attributes": proxy_attributes(proxy_server)
                             })
                             self.risk_level = "MEDIUM"
                         except FileNotFoundError:
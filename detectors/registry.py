@@ -0,0 +1,82 @@
+"""
+Detector Registry Module
+Describes the available detectors and builds only the ones that are scheduled
+"""
+import importlib
+
+# Detector key -> (module path, class name, progress message key, module name key)
+# Order is the order in which detectors run and appear in reports.
+DETECTORS = {
+    'proxy': ('detectors.proxy_detector', 'ProxyDetector', 'progress.checking_proxy',
+              'modules.proxy_detection'),
+    'firewall': ('detectors.firewall_detector', 'FirewallDetector', 'progress.reading_firewall_rules',
+                 'modules.firewall_detection'),
+    'process': ('detectors.process_detector', 'ProcessDetector', 'progress.scanning_processes',
+                'modules.process_detection'),
+    'environ': ('detectors.environ_detector', 'EnvironDetector', 'progress.reading_environments',
+                'modules.environ_detection'),
+    'injection': ('detectors.injection_detector', 'InjectionDetector', 'progress.scanning_memory_maps',
+                  'modules.injection_detection'),
+    'network': ('detectors.network_detector', 'NetworkDetector', 'progress.analyzing_network',
+                'modules.network_detection'),
+    'arp': ('detectors.arp_detector', 'ArpDetector', 'progress.checking_neighbors',
+            'modules.arp_detection'),
+    'connection': ('detectors.connection_detector', 'ConnectionDetector', 'progress.examining_connections',
+                   'modules.connection_analysis'),
+    'conntrack': ('detectors.conntrack_detector', 'ConntrackDetector', 'progress.reading_conntrack',
+                  'modules.conntrack_analysis'),
+    'listener': ('detectors.listener_detector', 'ListenerDetector', 'progress.probing_listeners',
+                 'modules.listener_detection'),
+    'certificate': ('detectors.certificate_detector', 'CertificateDetector', 'progress.testing_certificates',
+                    'modules.certificate_detection'),
+}
+
+# Detectors skipped by --quick: those that connect to remote or local
+# services, spawn subprocesses or read every process's /proc files
+SLOW_DETECTORS = {'firewall', 'environ', 'injection', 'conntrack', 'listener', 'certificate'}
+
+
+def scheduled_detectors(quick=False):
+    """
+    Returns the keys of the detectors to run.
+
+    Args:
+        quick: Whether slow detectors are skipped.
+
+    Returns:
+        list: Detector keys in run order.
+    """
+    return [key for key in DETECTORS if not (quick and key in SLOW_DETECTORS)]
+
+
+def load_detector_class(key):
+    """
+    Imports a detector module on demand and returns its class.
+
+    Args:
+        key: Detector key from DETECTORS.
+
+    Returns:
+        type: The detector class.
+    """
+    module_path, class_name, _, _ = DETECTORS[key]
+    return getattr(importlib.import_module(module_path), class_name)
+
+
+def build_detectors(keys, translator, snapshot):
+    """
+    Imports and instantiates the given detectors.
+
+    Args:
+        keys: Detector keys to build, in run order.
+        translator: Translator manager instance.
+        snapshot: SystemSnapshot shared by the detectors.
+
+    Returns:
+        list: [(progress message, detector), ...] as used by MonitoringService.
+    """
+    detectors = []
+    for key in keys:
+        detector_class = load_detector_class(key)
+        detectors.append((translator.t(DETECTORS[key][2]), detector_class(translator, snapshot)))
+    return detectors
@@ -3,48 +3,76 @@ Network Monitoring Detection Tool
 Main entry point for detecting network monitoring and surveillance
 """
 import argparse
+import json
 import sys
-from detectors.proxy_detector import ProxyDetector
-from detectors.process_detector import ProcessDetector
-from detectors.network_detector import NetworkDetector
-from detectors.connection_detector import ConnectionDetector
-from detectors.certificate_detector import CertificateDetector
-from utils.reporter import Reporter
-from utils.monitor_reporter import MonitorReporter
-from utils.monitoring_service import MonitoringService
-from utils.i18n import translator
-
-
-def main():
+from detectors.registry import DETECTORS, SLOW_DETECTORS, scheduled_detectors, build_detectors
+from utils.status_client import COMMANDS as STATUS_COMMANDS, query as query_daemon
+from utils.fleet_client import DEFAULT_PORT, fleet_query
+from utils.i18n import translator, detect_language
+
+# Everything else (psutil, colorama, asyncio, the detectors themselves) is
+# imported in the code path that needs it, so that short-lived invocations
+# such as 'status' or '--help' start quickly.
+
+
+class TranslatedHelpFormatter(argparse.RawDescriptionHelpFormatter):
+    """
+    Help formatter that treats help, description and epilog strings as
+    translation keys and translates them only when help is rendered.
+    """
+
+    def _get_help_string(self, action):
+        return translator.t(action.help)
+
+    def _format_text(self, text):
+        return super()._format_text(translator.t(text))
+
+
+def build_parser():
+    """
+    Builds the command line parser.
+
+    Help strings are translation keys, so building the parser does not
+    translate anything.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
     parser = argparse.ArgumentParser(
-        description=translator.t('cli.description'),
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=translator.t('cli.epilog')
+        description='cli.description',
+        formatter_class=TranslatedHelpFormatter,
+        epilog='cli.epilog'
     )
 
     parser.add_argument(
         '--json',
         metavar='FILE',
-        help=translator.t('cli.help_json')
+        help='cli.help_json'
     )
 
     parser.add_argument(
         '--quick',
         action='store_true',
-        help=translator.t('cli.help_quick')
+        help='cli.help_quick'
     )
 
     parser.add_argument(
         '--lang',
         choices=['zh', 'en'],
         default='zh',
-        help=translator.t('cli.help_lang')
+        help='cli.help_lang'
     )
 
     parser.add_argument(
         '--monitor',
         action='store_true',
-        help=translator.t('cli.help_monitor')
+        help='cli.help_monitor'
+    )
+
+    parser.add_argument(
+        '--dashboard',
+        action='store_true',
+        help='cli.help_dashboard'
     )
 
     parser.add_argument(
@@ -52,47 +80,424 @@ def main():
         type=int,
         default=30,
         metavar='SECONDS',
-        help=translator.t('cli.help_interval')
+        help='cli.help_interval'
+    )
+
+    parser.add_argument(
+        '--cert-interval',
+        type=int,
+        default=0,
+        metavar='SECONDS',
+        help='cli.help_cert_interval'
+    )
+
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='cli.help_adaptive'
+    )
+
+    parser.add_argument(
+        '--min-interval',
+        type=float,
+        metavar='SECONDS',
+        help='cli.help_min_interval'
+    )
+
+    parser.add_argument(
+        '--max-interval',
+        type=float,
+        metavar='SECONDS',
+        help='cli.help_max_interval'
+    )
+
+    parser.add_argument(
+        '--cpu-budget',
+        type=float,
+        metavar='PERCENT',
+        help='cli.help_cpu_budget'
+    )
+
+    parser.add_argument(
+        '--detector-workers',
+        action='store_true',
+        help='cli.help_detector_workers'
+    )
+
+    record_group = parser.add_mutually_exclusive_group()
+
+    record_group.add_argument(
+        '--record',
+        metavar='FILE',
+        help='cli.help_record'
+    )
+
+    record_group.add_argument(
+        '--replay',
+        metavar='FILE',
+        help='cli.help_replay'
+    )
+
+    record_group.add_argument(
+        '--helper',
+        nargs='?',
+        const='',
+        metavar='PATH',
+        help='cli.help_helper'
+    )
+
+    parser.add_argument(
+        '--pcap',
+        metavar='FILE',
+        help='cli.help_pcap'
+    )
+
+    parser.add_argument(
+        '--pcap-workers',
+        type=int,
+        default=0,
+        metavar='N',
+        help='cli.help_pcap_workers'
+    )
+
+    parser.add_argument(
+        '--rules',
+        action='append',
+        default=[],
+        metavar='FILE',
+        help='cli.help_rules'
+    )
+
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='cli.help_daemon'
+    )
+
+    parser.add_argument(
+        '--socket',
+        metavar='PATH',
+        help='cli.help_socket'
+    )
+
+    parser.add_argument(
+        '--agent',
+        metavar='HOST:PORT',
+        help='cli.help_agent'
+    )
+
+    parser.add_argument(
+        '--host-id',
+        metavar='NAME',
+        help='cli.help_host_id'
+    )
+
+    subparsers = parser.add_subparsers(dest='command')
+
+    status_parser = subparsers.add_parser(
+        'status',
+        help='cli.help_status',
+        formatter_class=TranslatedHelpFormatter
+    )
+
+    status_parser.add_argument(
+        'query',
+        nargs='?',
+        choices=STATUS_COMMANDS,
+        default='status',
+        help='cli.help_status_query'
+    )
+
+    status_parser.add_argument(
+        '--socket',
+        metavar='PATH',
+        default=argparse.SUPPRESS,
+        help='cli.help_socket'
+    )
+
+    status_parser.add_argument(
+        '--raw',
+        action='store_true',
+        help='cli.help_raw'
+    )
+
+    collector_parser = subparsers.add_parser(
+        'collector',
+        help='cli.help_collector',
+        formatter_class=TranslatedHelpFormatter
+    )
+
+    collector_parser.add_argument(
+        '--listen',
+        metavar='HOST:PORT',
+        default=f'127.0.0.1:{DEFAULT_PORT}',
+        help='cli.help_listen'
+    )
+
+    collector_parser.add_argument(
+        '--retention',
+        type=int,
+        default=86400,
+        metavar='SECONDS',
+        help='cli.help_retention'
+    )
+
+    helper_parser = subparsers.add_parser(
+        'helper',
+        help='cli.help_helper_command',
+        formatter_class=TranslatedHelpFormatter
+    )
+
+    helper_parser.add_argument(
+        '--listen',
+        metavar='PATH',
+        help='cli.help_helper_listen'
+    )
+
+    helper_parser.add_argument(
+        '--group',
+        metavar='NAME',
+        help='cli.help_group'
+    )
+
+    helper_parser.add_argument(
+        '--max-age',
+        type=float,
+        default=5.0,
+        metavar='SECONDS',
+        help='cli.help_max_age'
+    )
+
+    diff_parser = subparsers.add_parser(
+        'diff',
+        help='cli.help_diff',
+        formatter_class=TranslatedHelpFormatter
+    )
+
+    diff_parser.add_argument(
+        'previous',
+        metavar='OLD.json',
+        help='cli.help_diff_previous'
+    )
+
+    diff_parser.add_argument(
+        'current',
+        metavar='NEW.json',
+        help='cli.help_diff_current'
+    )
+
+    diff_parser.add_argument(
+        '--format',
+        choices=['text', 'ndjson'],
+        default='text',
+        help='cli.help_diff_format'
+    )
+
+    fleet_parser = subparsers.add_parser(
+        'fleet',
+        help='cli.help_fleet',
+        formatter_class=TranslatedHelpFormatter
+    )
+
+    fleet_parser.add_argument(
+        'op',
+        choices=['summary', 'hosts', 'appeared', 'host'],
+        help='cli.help_fleet_op'
+    )
+
+    fleet_parser.add_argument(
+        'value',
+        nargs='?',
+        help='cli.help_fleet_value'
+    )
+
+    fleet_parser.add_argument(
+        '--collector',
+        metavar='HOST:PORT',
+        default=f'127.0.0.1:{DEFAULT_PORT}',
+        help='cli.help_collector_address'
+    )
+
+    fleet_parser.add_argument(
+        '--since',
+        type=int,
+        default=3600,
+        metavar='SECONDS',
+        help='cli.help_since'
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Select the language before parsing, so --help is rendered in it
+    translator.set_language(detect_language(argv))
+
+    args = build_parser().parse_args(argv)
 
     # Update language based on user selection
     translator.set_language(args.lang)
 
-    # Prepare detector list
-    detectors = [
-        (translator.t('progress.checking_proxy'), ProxyDetector(translator)),
-        (translator.t('progress.scanning_processes'), ProcessDetector(translator)),
-        (translator.t('progress.analyzing_network'), NetworkDetector(translator)),
-        (translator.t('progress.examining_connections'), ConnectionDetector(translator)),
-    ]
+    if args.command == 'status':
+        return print_daemon_status(args)
+
+    if args.command == 'collector':
+        from utils.fleet import FleetCollector
+        collector = FleetCollector(args.listen, retention=args.retention)
+        print(translator.t('messages.collector_listening', address=args.listen))
+        collector.run()
+        return 0
+
+    if args.command == 'fleet':
+        return print_fleet_query(args)
+
+    if args.command == 'diff':
+        return print_report_diff(args)
+
+    if args.command == 'helper':
+        from utils.helper import SnapshotHelper
+        helper = SnapshotHelper(args.listen, max_age=args.max_age, group=args.group)
+        print(translator.t('messages.helper_listening', path=helper.socket_path))
+        helper.run()
+        return 0
+
+    # The adaptive interval bounds mean nothing with fixed intervals
+    if (args.min_interval is not None or args.max_interval is not None) and not (args.adaptive or args.cpu_budget):
+        print(translator.t('messages.interval_bounds_ignored'), file=sys.stderr)
+
+    # Rule files are compiled up front, so that a broken file is reported
+    # before any scan starts
+    from utils.rules import RuleError, rules
+    rules.configure(args.rules)
+    try:
+        rules.load()
+    except (OSError, RuleError) as e:
+        print(translator.t('messages.rules_invalid', error=str(e)), file=sys.stderr)
+        return 2
+
+    if args.pcap:
+        return analyze_pcap(args)
+
+    from utils.snapshot import SystemSnapshot, RecordingSnapshot, ReplaySnapshot
+
+    # Raw system inputs shared by all detectors, collected once per cycle
+    if args.record:
+        snapshot = RecordingSnapshot(args.record)
+    elif args.replay:
+        snapshot = ReplaySnapshot(args.replay)
+    elif args.helper is not None:
+        # Sockets, processes and namespaces come from the privileged helper
+        from utils.helper import HelperSnapshot
+        snapshot = HelperSnapshot(args.helper or None)
+        try:
+            snapshot.connect()
+        except OSError as e:
+            print(translator.t('messages.helper_unavailable', error=str(e)), file=sys.stderr)
+            return 2
+    else:
+        snapshot = SystemSnapshot()
+
+    # Check if monitoring mode is enabled (replaying a recording always
+    # runs through the monitoring loop, one recorded cycle at a time)
+    if args.monitor or args.replay or args.daemon or args.agent or args.dashboard:
+        from utils.monitor_reporter import MonitorReporter
+        from utils.monitoring_service import MonitoringService
 
-    # Check if monitoring mode is enabled
-    if args.monitor:
         # In monitoring mode, always include certificate detector
         # (frequency controlled by MonitoringService)
-        detectors.append((translator.t('progress.testing_certificates'), CertificateDetector(translator)))
+        detectors = build_detectors(scheduled_detectors(), translator, snapshot)
+
+        # Use MonitorReporter for monitoring mode, or the dashboard, which
+        # draws the cycles itself
+        dashboard = None
+        if args.dashboard:
+            if not (sys.stdin.isatty() and sys.stdout.isatty()):
+                print(translator.t('messages.dashboard_no_tty'))
+                return 2
+            from utils.dashboard import Dashboard
+            dashboard = Dashboard(translator)
+            reporter = dashboard
+        else:
+            reporter = MonitorReporter(translator)
+
+        # Per-detector adaptive intervals; a CPU budget implies them
+        cadence = None
+        if args.adaptive or args.cpu_budget:
+            from utils.cadence import AdaptiveCadence
+            cadence = AdaptiveCadence(
+                args.interval,
+                min_interval=args.min_interval,
+                max_interval=args.max_interval,
+                cpu_budget=args.cpu_budget / 100 if args.cpu_budget else None
+            )
 
-        # Use MonitorReporter for monitoring mode
-        reporter = MonitorReporter(translator)
+        # The socket and process detectors run in worker processes, on
+        # other cores than the rest of the cycle
+        pool = None
+        if args.detector_workers:
+            from utils.worker_pool import DetectorPool, WORKER_SECTIONS
+            pool = DetectorPool(list(WORKER_SECTIONS), translator.language)
 
         # Create and start monitoring service
         service = MonitoringService(
             translator=translator,
             detectors=detectors,
             reporter=reporter,
-            interval=args.interval
+            interval=args.interval,
+            snapshot=snapshot,
+            cert_interval=args.cert_interval,
+            cadence=cadence,
+            pool=pool
         )
 
-        service.start()
+        # In daemon mode, serve the warm state over the local query socket
+        status_server = None
+        if args.daemon:
+            from utils.status_server import StatusServer
+            status_server = StatusServer(args.socket)
+            status_server.start()
+            service.add_observer(status_server)
+            print(translator.t('monitor.daemon_listening', path=status_server.socket_path))
+
+        # In agent mode, stream change deltas to the fleet collector
+        agent = None
+        if args.agent:
+            from utils.fleet import FleetAgent
+            agent = FleetAgent(args.agent, host_id=args.host_id)
+            service.add_observer(agent)
+
+        try:
+            if dashboard is not None:
+                service.add_observer(dashboard)
+                dashboard.start(service)
+            service.start()
+        finally:
+            if dashboard is not None:
+                dashboard.close()
+            if status_server is not None:
+                status_server.stop()
+            if agent is not None:
+                agent.close()
+            if pool is not None:
+                pool.close()
+
+        if args.replay:
+            print(translator.t('monitor.replay_complete', cycles=service.cycle_count + 1))
     else:
+        from utils.reporter import Reporter
+
         # One-time detection mode
-        # Add certificate detector if not in quick mode
-        if not args.quick:
-            detectors.append((translator.t('progress.testing_certificates'), CertificateDetector(translator)))
-        else:
-            print(translator.t('progress.skipping_certificates'))
+        # Only the scheduled detectors are imported and built; quick mode
+        # skips the slow ones
+        if args.quick:
+            skipped = [translator.t(entry[3]) for key, entry in DETECTORS.items() if key in SLOW_DETECTORS]
+            print(translator.t('progress.skipping_slow', modules=', '.join(skipped)))
+        detectors = build_detectors(scheduled_detectors(quick=args.quick), translator, snapshot)
+
+        snapshot.refresh()
 
         # Use standard Reporter
         reporter = Reporter(translator)
@@ -118,6 +523,13 @@ def main():
                     }]
                 })
 
+        snapshot.close()
+
+        # Link the findings of different modules into incidents
+        from utils.correlation import CorrelationEngine
+        print(translator.t('progress.correlating_findings'))
+        reporter.add_result(CorrelationEngine(translator).correlate(reporter.results))
+
         # Print report
         reporter.print_report()
 
@@ -130,9 +542,125 @@ def main():
         print(translator.t('messages.note3'))
 
 
+def analyze_pcap(args):
+    """
+    Checks the TLS certificates in a packet capture and prints a report.
+
+    Args:
+        args: Parsed command line arguments.
+
+    Returns:
+        int: Process exit code (2 if the capture cannot be read).
+    """
+    from detectors.pcap_detector import PcapDetector
+    from utils.reporter import Reporter
+
+    print(translator.t('progress.analyzing_pcap', path=args.pcap))
+    try:
+        result = PcapDetector(translator, args.pcap, workers=args.pcap_workers).detect()
+    except (OSError, ValueError) as e:
+        print(translator.t('messages.pcap_unreadable', error=str(e)), file=sys.stderr)
+        return 2
+
+    reporter = Reporter(translator)
+    reporter.add_result(result)
+    reporter.print_report()
+
+    if args.json:
+        reporter.export_json(args.json)
+    return 0
+
+
+def print_daemon_status(args):
+    """
+    Queries a running daemon and prints its reply.
+
+    Args:
+        args: Parsed command line arguments.
+
+    Returns:
+        int: Process exit code (2 if the daemon is unreachable).
+    """
+    try:
+        reply = query_daemon(args.query, args.socket)
+    except (OSError, ValueError) as e:
+        print(translator.t('messages.daemon_unavailable', error=str(e)), file=sys.stderr)
+        return 2
+
+    if args.raw or args.query != 'status' or 'overall_risk' not in reply:
+        print(json.dumps(reply, indent=2, ensure_ascii=False))
+        return 0
+
+    risk_text = translator.t(f"risk_levels.{reply['overall_risk']}")
+    print(f"[{reply['timestamp']}] {translator.t('monitor.cycle_complete', cycle=reply['cycle'])} - "
+          f"{translator.t('report.overall_risk')}: {risk_text}")
+    for module in reply['modules']:
+        module_risk = translator.t(f"risk_levels.{module['risk_level']}")
+        print(f"  {module['name']}: {module_risk} "
+              f"({translator.t('report.findings_count')}: {module['findings']})")
+    return 0
+
+
+def print_report_diff(args):
+    """
+    Prints the changes between two JSON reports.
+
+    Args:
+        args: Parsed command line arguments.
+
+    Returns:
+        int: Process exit code (0 without changes, 1 with changes, 2 if a
+            report cannot be read).
+    """
+    from utils.report_diff import ReportDiff, write_ndjson, write_text
+
+    diff = ReportDiff(args.previous, args.current)
+    try:
+        if args.format == 'ndjson':
+            count = write_ndjson(diff.changes(), sys.stdout)
+        else:
+            count = write_text(diff.changes(), translator, sys.stdout)
+            print(translator.t('diff.summary', new=diff.counts['new'], resolved=diff.counts['resolved'],
+                               risk=diff.counts['risk']) if count else translator.t('diff.no_changes'))
+    except (OSError, ValueError) as e:
+        sys.stdout.flush()
+        print(translator.t('messages.diff_unreadable', error=str(e)), file=sys.stderr)
+        return 2
+    return 1 if count else 0
+
+
+def print_fleet_query(args):
+    """
+    Sends a fleet query to a collector and prints the reply as JSON.
+
+    Args:
+        args: Parsed command line arguments.
+
+    Returns:
+        int: Process exit code (2 if the collector is unreachable).
+    """
+    request = {'op': args.op}
+    if args.op == 'hosts':
+        request['risk'] = (args.value or 'HIGH').upper()
+    elif args.op == 'appeared':
+        request['match'] = args.value or ''
+        request['since'] = args.since
+    elif args.op == 'host':
+        request['host'] = args.value
+
+    try:
+        reply = fleet_query(args.collector, request)
+    except (OSError, ValueError) as e:
+        print(translator.t('messages.collector_unavailable', error=str(e)), file=sys.stderr)
+        return 2
+
+    print(json.dumps(reply, indent=2, ensure_ascii=False))
+    return 0
+
+
 if __name__ == "__main__":
     try:
-        main()
+        sys.exit(main())
     except KeyboardInterrupt:
         print(translator.t('messages.cancelled'))
         sys.exit(0)
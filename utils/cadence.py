@@ -0,0 +1,180 @@
+"""
+Cadence Module
+Adaptive per-detector scan intervals for the monitoring loop
+
+A detector whose module just changed is checked again after the minimum
+interval; while its module stays stable its interval doubles up to the
+maximum. With a CPU budget, the CPU time of each detector is measured and
+the intervals of the most expensive detectors are stretched until the
+expected CPU use of the monitor fits the budget. Cheap detectors keep their
+cadence, so a budget defers the slow checks first.
+"""
+import time
+
+# Weight of the newest sample in the cost and overhead averages
+SMOOTHING = 0.3
+
+
+class AdaptiveCadence:
+    """
+    Schedules detectors on individual, adaptive intervals.
+
+    Times are time.monotonic() seconds and CPU times time.process_time()
+    seconds, so the CPU used by every thread of the monitor is accounted.
+    A monitor running detectors in worker processes sets cpu_clock to a
+    clock that adds theirs.
+    """
+
+    def __init__(self, interval, min_interval=None, max_interval=None, cpu_budget=None, backoff=2.0):
+        """
+        Initializes the cadence.
+
+        Args:
+            interval: Interval of a detector before its first change, in seconds.
+            min_interval: Interval right after a change (default: interval / 4, at least 1).
+            max_interval: Longest interval of a stable detector (default: interval * 8).
+            cpu_budget: Share of one core the monitor may use (0.01 for 1%), or
+                None for no budget.
+            backoff: Interval multiplier per stable check.
+        """
+        self.interval = interval
+        self.min_interval = min_interval or max(1.0, interval / 4)
+        self.max_interval = max(max_interval or interval * 8, self.min_interval)
+        self.cpu_budget = cpu_budget
+        self.backoff = backoff
+        # key -> shortest interval regardless of changes (certificate interval)
+        self.floors = {}
+        # key -> {'interval', 'effective', 'cost', 'last_run', 'next_due', 'runs'}
+        self.detectors = {}
+        # CPU share used outside the detectors (snapshot refresh, change
+        # detection, reporting, watcher and status threads)
+        self.overhead = 0.0
+        self.cpu_clock = time.process_time
+        self.started = None
+        self._cpu_started = None
+        self._last_time = None
+        self._last_cpu = None
+
+    def due(self, key, now=None):
+        """
+        Whether a detector should run in this cycle.
+
+        Args:
+            key: Detector key.
+            now: Current monotonic time (default: now).
+
+        Returns:
+            bool: True if the detector never ran or its interval elapsed.
+        """
+        state = self.detectors.get(key)
+        if state is None:
+            return True
+        return (time.monotonic() if now is None else now) >= state['next_due']
+
+    def next_due(self, now=None):
+        """
+        Returns the seconds until the next detector is due (0 if one is due).
+
+        Args:
+            now: Current monotonic time (default: now).
+        """
+        now = time.monotonic() if now is None else now
+        if not self.detectors:
+            return 0.0
+        return max(0.0, min(state['next_due'] for state in self.detectors.values()) - now)
+
+    def reset(self, keys=None):
+        """
+        Makes detectors due now.
+
+        Args:
+            keys: Detector keys (default: all, e.g. after the rules were reloaded).
+        """
+        for key, state in self.detectors.items():
+            if keys is None or key in keys:
+                state['next_due'] = 0.0
+
+    def end_cycle(self, costs, changed, now=None, cpu=None):
+        """
+        Updates the intervals after a cycle.
+
+        Args:
+            costs: Key -> CPU seconds of the detectors that ran in the cycle.
+            changed: Keys of the detectors whose module reported changes.
+            now: Monotonic time at the end of the cycle (default: now).
+            cpu: Process CPU time at the end of the cycle (default: now).
+        """
+        now = time.monotonic() if now is None else now
+        cpu = self.cpu_clock() if cpu is None else cpu
+        if self.started is None:
+            self.started, self._cpu_started = now, cpu
+        elif now > self._last_time:
+            # CPU spent since the previous cycle that no detector accounts for
+            outside = max(0.0, (cpu - self._last_cpu) - sum(costs.values()))
+            self.overhead += SMOOTHING * (outside / (now - self._last_time) - self.overhead)
+        self._last_time, self._last_cpu = now, cpu
+
+        for key, cost in costs.items():
+            state = self.detectors.get(key)
+            if state is None:
+                state = self.detectors[key] = {
+                    'interval': self.interval, 'effective': self.interval,
+                    'cost': cost, 'last_run': now, 'next_due': 0.0, 'runs': 0,
+                }
+            else:
+                state['cost'] += SMOOTHING * (cost - state['cost'])
+                if key in changed:
+                    state['interval'] = self.min_interval
+                else:
+                    state['interval'] = min(state['interval'] * self.backoff, self.max_interval)
+            state['last_run'] = now
+            state['runs'] += 1
+
+        stretched = self._stretched_intervals()
+        for key, state in self.detectors.items():
+            # A changed budget also moves the detectors that did not run
+            state['effective'] = max(state['interval'], self.floors.get(key, 0.0), stretched.get(key, 0.0))
+            state['next_due'] = state['last_run'] + state['effective']
+
+    def _stretched_intervals(self):
+        """
+        Distributes the CPU budget over the detectors.
+
+        Each detector's CPU share is its cost divided by its interval. If the
+        shares exceed the budget, a cap is found such that the detectors below
+        it keep their share and the others are limited to it (water filling),
+        and a capped detector's interval becomes cost / cap.
+
+        Returns:
+            dict: Key -> minimum interval, for the detectors over the cap.
+        """
+        if not self.cpu_budget or not self.detectors:
+            return {}
+        # The overhead may not starve the detectors completely
+        available = max(self.cpu_budget - self.overhead, self.cpu_budget / 4)
+        shares = sorted((state['cost'] / state['interval'], key) for key, state in self.detectors.items())
+        if sum(share for share, _ in shares) <= available:
+            return {}
+
+        remaining = available
+        for index, (share, key) in enumerate(shares):
+            cap = remaining / (len(shares) - index)
+            if share > cap:
+                return {key: self.detectors[key]['cost'] / cap for share, key in shares[index:]}
+            remaining -= share
+        return {}
+
+    def usage(self, now=None, cpu=None):
+        """
+        Returns the CPU share of one core the monitor used since the first cycle.
+
+        Args:
+            now: Current monotonic time (default: now).
+            cpu: Current process CPU time (default: now).
+        """
+        if self.started is None:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        cpu = self.cpu_clock() if cpu is None else cpu
+        elapsed = now - self.started
+        return (cpu - self._cpu_started) / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,200 @@
+"""
+Conntrack Module
+Streams the netfilter connection tracking table and aggregates the flows
+that were redirected (REDIRECT/DNAT) and the busiest destinations
+
+The table is read in fixed-size chunks and each chunk is parsed with one
+regular expression pass, so memory use depends on the chunk size and the
+aggregate sizes, not on the number of tracked flows. Forwarded and NAT'd
+flows of a gateway appear here although no local socket belongs to them.
+"""
+import ipaddress
+import re
+from collections import Counter
+from operator import itemgetter
+
+# Tables exposed by nf_conntrack (and by ip_conntrack on old kernels)
+CONNTRACK_FILES = ['/proc/net/nf_conntrack', '/proc/net/ip_conntrack']
+
+CHUNK_SIZE = 1 << 20
+
+# Destinations whose flow counts are kept (heavy hitters)
+TOP_DESTINATIONS = 1024
+# Redirect targets (address, port) that are aggregated
+MAX_TARGETS = 256
+# Original destination ports listed per redirect target
+MAX_TARGET_PORTS = 16
+
+# A flow with ports: the original tuple's destination and destination port,
+# then the reply tuple's source and source port. A reply from another
+# address or port than the original destination means the flow was
+# redirected there. The pattern starts with a literal, so the scan skips
+# ahead to each 'src=' instead of trying every position of a line.
+FLOW = re.compile(rb'src=\S+ dst=(\S+) sport=\d+ dport=(\d+) [^\n]*?src=(\S+) dst=\S+ sport=(\d+)')
+
+
+class TopCounter:
+    """
+    Bounded counter of the most frequent keys.
+
+    Counts are merged in batches and the counter is truncated back to its
+    capacity after each batch. Counts are lower bounds of the true counts,
+    short by at most `error`, the largest count dropped so far.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = Counter()
+        self.error = 0
+
+    def update(self, counts):
+        """Adds a batch of counts (a Counter or key -> count mapping)."""
+        self.counts.update(counts)
+        if len(self.counts) > self.capacity:
+            kept = self.counts.most_common(self.capacity + 1)
+            # The first key dropped has the largest dropped count
+            self.error = max(self.error, kept.pop()[1])
+            self.counts = Counter(dict(kept))
+
+    def most_common(self, count=None):
+        return self.counts.most_common(count)
+
+
+class ConntrackAggregator:
+    """
+    Aggregates conntrack table lines fed in chunks.
+
+    Args:
+        local_addresses: Addresses of this host; a redirect to one of them
+            (or to loopback) is a local REDIRECT, to any other a DNAT.
+    """
+
+    def __init__(self, local_addresses=()):
+        self.local_addresses = set(local_addresses)
+        self.flows = 0
+        self.redirected = 0
+        self.destinations = TopCounter(TOP_DESTINATIONS)
+        # (address, port) -> [flows, set of original destination ports]
+        self.targets = {}
+        self.dropped_targets = 0
+        self._tail = b''
+
+    def feed(self, chunk):
+        """
+        Parses a chunk of the table; a partial last line is kept for the next chunk.
+
+        Args:
+            chunk: Bytes read from the table.
+        """
+        data = self._tail + chunk
+        end = data.rfind(b'\n') + 1
+        self._tail = data[end:]
+        if end:
+            self._parse(data[:end] if end < len(data) else data)
+
+    def close(self):
+        """Parses the last line if the table did not end with a newline."""
+        if self._tail:
+            self._parse(self._tail + b'\n')
+            self._tail = b''
+
+    def _parse(self, lines):
+        self.flows += lines.count(b'\n')
+        flows = FLOW.findall(lines)
+        self.destinations.update(Counter(map(itemgetter(0), flows)))
+
+        # Flows answered by their original destination were not redirected
+        redirects = [flow for flow in flows if flow[0] != flow[2] or flow[1] != flow[3]]
+        if not redirects:
+            return
+        self.redirected += len(redirects)
+        targets = self.targets
+        for _, original_port, address, port in redirects:
+            key = (address, port)
+            target = targets.get(key)
+            if target is None:
+                if len(targets) >= MAX_TARGETS:
+                    self.dropped_targets += 1
+                    continue
+                target = targets[key] = [0, set()]
+            target[0] += 1
+            if len(target[1]) < MAX_TARGET_PORTS:
+                target[1].add(original_port)
+
+    def result(self):
+        """
+        Returns the aggregates.
+
+        Returns:
+            dict: {'flows', 'redirected', 'destinations': [[address, flows], ...],
+                   'error': undercount bound of the destination counts,
+                   'targets': [{'address', 'port', 'local', 'flows', 'original_ports'}],
+                   'dropped_targets': redirected flows to targets beyond MAX_TARGETS}.
+        """
+        targets = []
+        for (address, port), (flows, original_ports) in self.targets.items():
+            address = address.decode('ascii', 'replace')
+            targets.append({
+                'address': address,
+                'port': int(port),
+                'local': self._is_local(address),
+                'flows': flows,
+                'original_ports': sorted(int(p) for p in original_ports),
+            })
+        targets.sort(key=lambda t: (-t['flows'], t['address'], t['port']))
+        return {
+            'flows': self.flows,
+            'redirected': self.redirected,
+            'destinations': [[address.decode('ascii', 'replace'), flows]
+                             for address, flows in self.destinations.most_common()],
+            'error': self.destinations.error,
+            'targets': targets,
+            'dropped_targets': self.dropped_targets,
+        }
+
+    def _is_local(self, address):
+        if address in self.local_addresses:
+            return True
+        try:
+            return ipaddress.ip_address(address).is_loopback
+        except ValueError:
+            return False
+
+
+def scan_conntrack(path=None, local_addresses=(), chunk_size=CHUNK_SIZE):
+    """
+    Streams a conntrack table and aggregates it.
+
+    Args:
+        path: Table path (default: the first of CONNTRACK_FILES that exists).
+        local_addresses: Addresses of this host, see ConntrackAggregator.
+        chunk_size: Bytes read per chunk.
+
+    Returns:
+        dict: Aggregates, as ConntrackAggregator.result().
+
+    Raises:
+        OSError: If the table cannot be read (FileNotFoundError when
+            connection tracking is not loaded).
+    """
+    if path is None:
+        for candidate in CONNTRACK_FILES:
+            try:
+                f = open(candidate, 'rb', buffering=0)
+                break
+            except FileNotFoundError:
+                continue
+        else:
+            raise FileNotFoundError(CONNTRACK_FILES[0])
+    else:
+        f = open(path, 'rb', buffering=0)
+
+    aggregator = ConntrackAggregator(local_addresses)
+    with f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            aggregator.feed(chunk)
+    aggregator.close()
+    return aggregator.result()
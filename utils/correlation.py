@@ -0,0 +1,215 @@
+"""
+Correlation Module
+Links the findings of different modules that share a port, process, address
+or interface into incidents
+"""
+import ipaddress
+from urllib.parse import urlsplit
+
+# Finding attributes that findings are joined on, with their display format.
+# 'port' is a local TCP port (a listener, or a proxy on this host).
+JOIN_ATTRIBUTES = {
+    'port': 'Port {}',
+    'pid': 'PID {}',
+    'ip': 'IP {}',
+    'interface': 'Interface {}',
+}
+
+SEVERITIES = ['INFO', 'LOW', 'MEDIUM', 'HIGH']
+
+
+def proxy_attributes(value):
+    """
+    Returns the join attributes of a proxy setting.
+
+    A proxy on this host is joined by its port, one elsewhere by its
+    address; proxies given by host name get no attributes.
+
+    Args:
+        value: Proxy URL or host:port, e.g. 'http://127.0.0.1:8888'.
+
+    Returns:
+        dict: {'port': int} or {'ip': str}, or an empty dict.
+    """
+    # Windows lists per-protocol proxies as 'http=host:port;https=host:port'
+    value = value.split(';')[0].split('=')[-1].strip()
+    if '://' not in value:
+        value = 'http://' + value
+    try:
+        parts = urlsplit(value)
+        host = parts.hostname
+        port = parts.port
+    except ValueError:
+        return {}
+    if not host:
+        return {}
+    if host == 'localhost':
+        return {'port': port} if port else {}
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return {}
+    if address.is_loopback or address.is_unspecified:
+        return {'port': port} if port else {}
+    return {'ip': str(address)}
+
+
+class CorrelationEngine:
+    """
+    Correlates the findings of one cycle across modules.
+
+    Every finding with join attributes is posted under each (attribute,
+    value) key; findings posted under the same key are merged with a
+    union-find, so the join is linear in the number of findings. Groups
+    that span at least two modules become incidents. The postings of a
+    module are extracted again only when its findings changed, and when no
+    module changed the previous incidents are returned as they are.
+    """
+
+    def __init__(self, translator):
+        """
+        Initializes the engine.
+
+        Args:
+            translator: Translator manager instance.
+        """
+        self.translator = translator
+        # module name -> (findings, [((attribute, value), finding index), ...])
+        self.modules = {}
+        self.result = None
+        self.correlations = 0
+
+    def correlate(self, results):
+        """
+        Returns the correlated incidents of a cycle as a module result.
+
+        Args:
+            results: Detection results of the cycle (module dicts).
+
+        Returns:
+            dict: Module result with one "Correlated Incident" finding per incident.
+        """
+        name = self.translator.t('modules.correlation')
+        modules = {}
+        changed = False
+        for result in results:
+            if result['name'] == name:
+                continue
+            findings = result['findings']
+            cached = self.modules.get(result['name'])
+            # The carried-forward certificate result is the same list object
+            if cached is not None and (cached[0] is findings or cached[0] == findings):
+                modules[result['name']] = cached
+            else:
+                modules[result['name']] = (findings, _postings(findings))
+                changed = True
+
+        if modules.keys() != self.modules.keys():
+            changed = True
+        self.modules = modules
+        if changed or self.result is None or self.result['name'] != name:
+            self.correlations += 1
+            self.result = self._join(name)
+        return self.result
+
+    def _join(self, name):
+        """Joins the postings of all modules into incidents."""
+        nodes = []  # node id -> (module, finding)
+        parent = []
+        first = {}  # key -> (node id, module) of the first finding posted under it
+        shared = {}  # key -> True once findings of two modules were posted under it
+
+        def find(node):
+            root = node
+            while parent[root] != root:
+                root = parent[root]
+            while parent[node] != root:
+                parent[node], node = root, parent[node]
+            return root
+
+        for module, (findings, postings) in self.modules.items():
+            node_of = {}
+            for key, index in postings:
+                node = node_of.get(index)
+                if node is None:
+                    node = node_of[index] = len(nodes)
+                    nodes.append((module, findings[index]))
+                    parent.append(node)
+                seen = first.get(key)
+                if seen is None:
+                    first[key] = (node, module)
+                    continue
+                if seen[1] != module:
+                    shared[key] = True
+                root, other = find(node), find(seen[0])
+                if root != other:
+                    parent[root] = other
+
+        groups = {}
+        for node in range(len(nodes)):
+            groups.setdefault(find(node), []).append(node)
+        labels = {}
+        for key in shared:
+            labels.setdefault(find(first[key][0]), []).append(key)
+
+        incidents = []
+        for root, members in groups.items():
+            modules = []
+            for node in members:
+                if nodes[node][0] not in modules:
+                    modules.append(nodes[node][0])
+            if len(modules) < 2:
+                continue
+            findings = [nodes[node][1] for node in members]
+            types = []
+            for finding in findings:
+                if finding['type'] not in types:
+                    types.append(finding['type'])
+            keys = ', '.join(JOIN_ATTRIBUTES[attribute].format(value)
+                             for attribute, value in sorted(labels.get(root, []), key=_key_order))
+            incidents.append({
+                "type": "Correlated Incident",
+                "detail": f"{keys}: {', '.join(types)} ({len(modules)} modules)",
+                "severity": _combined_severity(findings, len(modules)),
+            })
+
+        incidents.sort(key=lambda f: (-SEVERITIES.index(f['severity']), f['detail']))
+        risk_level = "LOW"
+        if incidents:
+            risk_level = max((f['severity'] for f in incidents), key=SEVERITIES.index)
+        return {
+            "name": name,
+            "risk_level": risk_level,
+            "findings": incidents
+        }
+
+
+def _postings(findings):
+    """Returns the ((attribute, value), finding index) join keys of findings."""
+    postings = []
+    for index, finding in enumerate(findings):
+        attributes = finding.get('attributes')
+        if not attributes:
+            continue
+        for attribute in JOIN_ATTRIBUTES:
+            value = attributes.get(attribute)
+            if value is not None and value != '':
+                postings.append(((attribute, value), index))
+    return postings
+
+
+def _key_order(key):
+    return list(JOIN_ATTRIBUTES).index(key[0]), str(key[1])
+
+
+def _combined_severity(findings, module_count):
+    """
+    Returns the severity of an incident.
+
+    The highest severity of its findings, raised to at least MEDIUM, since
+    independent modules agree; three or more modules make it HIGH.
+    """
+    if module_count >= 3:
+        return "HIGH"
+    highest = max((f['severity'] for f in findings), key=SEVERITIES.index)
+    return highest if SEVERITIES.index(highest) >= SEVERITIES.index("MEDIUM") else "MEDIUM"
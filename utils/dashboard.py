@@ -0,0 +1,538 @@
+"""
+Dashboard Module
+Full-screen curses view of monitoring mode
+
+Frames are composed as rows of text with one style code per character and
+compared with the previous frame; only the changed span of each changed
+row is written to the terminal. Frames are drawn by their own thread at
+most every redraw_interval seconds, however often cycles complete, so
+sub-second intervals and slow remote terminals do not hold up the monitor.
+"""
+import locale
+import re
+import socket
+import threading
+import time
+import unicodedata
+from collections import deque
+
+# Style codes, one per character of a row (stored as chr(code))
+NORMAL, BOLD, HIGH, MEDIUM, LOW, INFO, HEADER, DIM = range(8)
+RISK_STYLES = {'HIGH': HIGH, 'MEDIUM': MEDIUM, 'LOW': LOW}
+SEVERITY_STYLES = {'HIGH': HIGH, 'MEDIUM': MEDIUM, 'LOW': INFO, 'INFO': NORMAL}
+
+SPARK_UTF8 = ' ▁▂▃▄▅▆▇█'
+SPARK_ASCII = ' .:-=+*#@'
+
+# Samples kept per sparkline, and changes kept for the changes panel
+HISTORY = 40
+RECENT_CHANGES = 200
+
+# Ctrl-L: redraw the whole screen
+KEY_REDRAW = 12
+
+# Characters that move the cursor or take no cell, which would shift the
+# rest of the row; finding details are free text
+CONTROL_CHARACTERS = re.compile('[\x00-\x1f\x7f-\x9f\u200b-\u200f\u2028-\u202e\u2060-\u2064\ufeff]')
+
+
+def text_width(text):
+    """Terminal cells taken by a string (East Asian wide characters take two)."""
+    if text.isascii():
+        return len(text)
+    return sum(2 if unicodedata.east_asian_width(char) in 'WF' else 1 for char in text)
+
+
+def sparkline(values, width, symbols=SPARK_UTF8):
+    """
+    Renders the last values as a sparkline scaled to their maximum.
+
+    Args:
+        values: Numbers, oldest first.
+        width: Number of characters.
+        symbols: Characters from empty to full.
+
+    Returns:
+        str: The sparkline, padded to width characters.
+    """
+    values = list(values)[-width:]
+    peak = max(values, default=0)
+    top = len(symbols) - 1
+    if peak <= 0:
+        line = symbols[0] * len(values)
+    else:
+        line = ''.join(symbols[min(top, int(round(value / peak * top)))] for value in values)
+    return line.ljust(width)
+
+
+class Row:
+    """A row under construction: text and one style code per character."""
+
+    def __init__(self):
+        self.parts = []
+        self.styles = []
+
+    def add(self, text, style=NORMAL):
+        if not text.isprintable():
+            text = CONTROL_CHARACTERS.sub(' ', text)
+        self.parts.append(text)
+        self.styles.append(chr(style) * len(text))
+        return self
+
+    def fit(self, width):
+        """
+        Returns (text, styles) truncated or padded to width terminal cells.
+        """
+        text = ''.join(self.parts)
+        styles = ''.join(self.styles)
+        used = text_width(text)
+        if used > width:
+            # Cut at a character boundary, leaving a wide character out whole
+            cells = 0
+            for index, char in enumerate(text):
+                cells += text_width(char)
+                if cells > width:
+                    text, styles = text[:index], styles[:index]
+                    used = cells - text_width(char)
+                    break
+        return text + ' ' * (width - used), styles + chr(NORMAL) * (width - used)
+
+
+def diff_rows(previous, rows):
+    """
+    Finds the spans of a frame that differ from the previous frame.
+
+    Args:
+        previous: (text, styles) rows of the previous frame, or None to draw everything.
+        rows: (text, styles) rows of the new frame.
+
+    Returns:
+        list: (row, start index, text, styles) spans, where the start index
+            is a character index into the row.
+    """
+    spans = []
+    for y, (text, styles) in enumerate(rows):
+        if previous is not None and y < len(previous):
+            old_text, old_styles = previous[y]
+            if old_text == text and old_styles == styles:
+                continue
+            # Common prefix and suffix of text and styles together
+            start = min(_common_prefix(text, old_text), _common_prefix(styles, old_styles))
+            tail = min(_common_suffix(text, old_text, start), _common_suffix(styles, old_styles, start))
+            # Rows have the same width in cells, so the common suffix is in the
+            # same columns even when wide characters changed before it
+            stop = len(text) - tail
+            spans.append((y, start, text[start:stop], styles[start:stop]))
+        else:
+            spans.append((y, 0, text, styles))
+    return spans
+
+
+def _common_prefix(a, b):
+    """Length of the common prefix, found by bisection over slice comparisons."""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(a, b, limit):
+    """Length of the common suffix, leaving at least limit characters of both."""
+    low, high = 0, min(len(a), len(b)) - limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:len(a) - low] == b[len(b) - middle:len(b) - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+class Dashboard:
+    """
+    Curses dashboard for monitoring mode.
+
+    Acts as the MonitoringService reporter (it prints nothing) and as an
+    observer receiving every cycle. Call start(service) before the service
+    starts and close() after it stopped.
+    """
+
+    def __init__(self, translator, redraw_interval=0.25):
+        """
+        Initializes the dashboard.
+
+        Args:
+            translator: Translator manager instance.
+            redraw_interval: Shortest time between two frames, in seconds.
+        """
+        self.translator = translator
+        self.redraw_interval = redraw_interval
+        self.host = socket.gethostname()
+        self.interval = None
+        self.cadence = None
+        self.service = None
+        self.results = []
+        self.cycle = None
+        self.captured_at = None
+        self.started = time.monotonic()
+        self.cpu_started = time.process_time()
+        # Detector class -> deque of seconds per run
+        self.timings = {}
+        self.sent = deque(maxlen=HISTORY)
+        self.received = deque(maxlen=HISTORY)
+        self.changes = deque(maxlen=RECENT_CHANGES)
+        # (message, style) of the last rule reload, shown in the footer
+        self.notice = None
+        self.frames = 0
+        self.cells_written = 0
+        self.frame_seconds = 0.0
+        self.symbols = SPARK_UTF8
+        self._keys = {}
+        self._io = None
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread = None
+        self._error = None
+        self._screen = None
+        self._previous = None
+
+    # MonitoringService reporter interface
+
+    def print_monitoring_header(self, interval, cadence=None):
+        self.interval = interval
+        self.cadence = cadence
+        self._dirty.set()
+
+    def print_change_alert(self, changes):
+        pass
+
+    def print_status_update(self, cycle, timestamp):
+        pass
+
+    def print_rules_reloaded(self, count):
+        with self._lock:
+            self.notice = (self.translator.t('monitor.rules_reloaded', count=count), INFO)
+        self._dirty.set()
+
+    def print_rules_reload_failed(self, error):
+        with self._lock:
+            self.notice = (self.translator.t('monitor.rules_reload_failed', error=error), MEDIUM)
+        self._dirty.set()
+
+    # MonitoringService observer interface
+
+    def on_cycle(self, service, results, changes):
+        """Records the state of a completed cycle for the next frame."""
+        classes = {id(result): name for name, result in service.last_results.items()}
+        io_rates = None
+        try:
+            counters = service.snapshot.io_counters()
+            now = service.snapshot.captured_at
+            if self._io is not None:
+                elapsed = (now - self._io[0]).total_seconds()
+                if elapsed > 0:
+                    io_rates = ((counters.bytes_sent - self._io[1].bytes_sent) / elapsed,
+                                (counters.bytes_recv - self._io[1].bytes_recv) / elapsed)
+            self._io = (now, counters)
+        except Exception:
+            pass
+
+        with self._lock:
+            self.results = results
+            self.cycle = service.cycle_count
+            self.captured_at = service.snapshot.captured_at
+            self._keys = {id(result): classes.get(id(result)) for result in results}
+            for name, seconds in service.cycle_durations.items():
+                self.timings.setdefault(name, deque(maxlen=HISTORY)).append(seconds)
+            if io_rates is not None:
+                self.sent.append(max(0.0, io_rates[0]))
+                self.received.append(max(0.0, io_rates[1]))
+            if changes:
+                stamp = self.captured_at.strftime('%H:%M:%S')
+                for kind, style in (('new_findings', None), ('removed_findings', LOW)):
+                    for item in changes.get(kind, ()):
+                        for finding in item['findings']:
+                            self.changes.appendleft((stamp, kind == 'new_findings', item['module'],
+                                                     finding, style))
+                for change in changes.get('risk_changes', ()):
+                    self.changes.appendleft((stamp, None, change['module'], change, None))
+        self._dirty.set()
+
+    # Drawing thread
+
+    def start(self, service):
+        """
+        Takes over the terminal and starts drawing.
+
+        Args:
+            service: The MonitoringService shown; 'q' stops it.
+
+        Raises:
+            RuntimeError: If the terminal cannot be initialized.
+        """
+        self.service = service
+        self._thread = threading.Thread(target=self._run, name='netmon-dashboard', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise RuntimeError(str(self._error))
+
+    def close(self):
+        """Stops drawing and restores the terminal."""
+        self._stop.set()
+        self._dirty.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        try:
+            import curses
+
+            locale.setlocale(locale.LC_ALL, '')
+            if 'utf' not in (locale.getpreferredencoding(False) or '').lower():
+                self.symbols = SPARK_ASCII
+            screen = curses.initscr()
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+            return
+
+        try:
+            curses.noecho()
+            curses.cbreak()
+            screen.keypad(True)
+            screen.nodelay(True)
+            try:
+                curses.curs_set(0)
+            except curses.error:
+                pass
+            self._attributes = self._init_colors(curses)
+            self._screen = screen
+            self._ready.set()
+
+            last_frame = 0.0
+            while not self._stop.is_set():
+                if self._handle_keys(curses):
+                    break
+                now = time.monotonic()
+                # Draw when there is something new, and once a second for the clock
+                if self._dirty.is_set() or now - last_frame >= 1.0:
+                    self._dirty.clear()
+                    self._draw(curses)
+                    last_frame = now
+                # Throttle: cycles completing in between are drawn together
+                self._stop.wait(max(0.0, self.redraw_interval - (time.monotonic() - now)))
+        finally:
+            screen.keypad(False)
+            curses.nocbreak()
+            curses.echo()
+            curses.endwin()
+
+    def _init_colors(self, curses):
+        """Returns style code -> curses attribute."""
+        attributes = {NORMAL: curses.A_NORMAL, BOLD: curses.A_BOLD, HIGH: curses.A_BOLD,
+                      MEDIUM: curses.A_BOLD, LOW: curses.A_NORMAL, INFO: curses.A_NORMAL,
+                      HEADER: curses.A_REVERSE, DIM: curses.A_DIM}
+        if curses.has_colors():
+            curses.start_color()
+            try:
+                curses.use_default_colors()
+                background = -1
+            except curses.error:
+                background = curses.COLOR_BLACK
+            for pair, (code, color, extra) in enumerate([
+                (HIGH, curses.COLOR_RED, curses.A_BOLD),
+                (MEDIUM, curses.COLOR_YELLOW, curses.A_BOLD),
+                (LOW, curses.COLOR_GREEN, curses.A_NORMAL),
+                (INFO, curses.COLOR_CYAN, curses.A_NORMAL),
+                (HEADER, curses.COLOR_CYAN, curses.A_REVERSE | curses.A_BOLD),
+            ], 1):
+                curses.init_pair(pair, color, background)
+                attributes[code] = curses.color_pair(pair) | extra
+        return attributes
+
+    def _handle_keys(self, curses):
+        """Processes pending keys; returns True when the dashboard should stop."""
+        while True:
+            key = self._screen.getch()
+            if key == -1:
+                return False
+            if key in (ord('q'), ord('Q')):
+                if self.service is not None:
+                    self.service.stop()
+                return True
+            if key in (curses.KEY_RESIZE, KEY_REDRAW):
+                self._previous = None
+
+    def _draw(self, curses):
+        started = time.perf_counter()
+        height, width = self._screen.getmaxyx()
+        self.write_frame(curses, self.compose(width, height))
+        curses.doupdate()
+        self.frames += 1
+        self.frame_seconds = time.perf_counter() - started
+
+    def write_frame(self, curses, rows):
+        """
+        Writes the parts of a frame that differ from the previous one.
+
+        Args:
+            curses: The curses module.
+            rows: (text, styles) rows from compose().
+
+        Returns:
+            int: Characters written.
+        """
+        previous = self._previous
+        if previous is None or len(previous) != len(rows) \
+                or (previous and text_width(previous[0][0]) != text_width(rows[0][0])):
+            # First frame, resize or redraw request
+            self._screen.erase()
+            previous = None
+        written = 0
+        for y, start, text, styles in diff_rows(previous, rows):
+            x = text_width(rows[y][0][:start])
+            written += self._put(curses, y, x, text, styles)
+        self._screen.noutrefresh()
+        self._previous = rows
+        self.cells_written += written
+        return written
+
+    def _put(self, curses, y, x, text, styles):
+        """Writes a span run by run of equal style; returns the characters written."""
+        index = 0
+        while index < len(text):
+            style = styles[index]
+            end = index + 1
+            while end < len(text) and styles[end] == style:
+                end += 1
+            run = text[index:end]
+            try:
+                self._screen.addstr(y, x, run, self._attributes[ord(style)])
+            except curses.error:
+                # Writing the bottom-right cell moves the cursor off screen
+                pass
+            x += text_width(run)
+            index = end
+        return len(text)
+
+    # Frame composition
+
+    def compose(self, width, height):
+        """
+        Composes a frame from the latest state.
+
+        Args:
+            width: Terminal columns.
+            height: Terminal rows.
+
+        Returns:
+            list: height (text, styles) rows of exactly width cells.
+        """
+        t = self.translator.t
+        with self._lock:
+            results = list(self.results)
+            keys = dict(self._keys)
+            timings = {name: list(values) for name, values in self.timings.items()}
+            changes = list(self.changes)
+            sent, received = list(self.sent), list(self.received)
+            cycle, captured_at = self.cycle, self.captured_at
+            notice = self.notice
+
+        rows = []
+        uptime = int(time.monotonic() - self.started)
+        elapsed = max(1e-9, time.monotonic() - self.started)
+        cpu = (time.process_time() - self.cpu_started) / elapsed * 100
+        header = Row().add(f" {t('dashboard.title')} - {self.host} ", HEADER)
+        header.add(f"  {t('dashboard.cycle')} #{cycle if cycle is not None else '-'}", BOLD)
+        header.add(f"  {t('dashboard.uptime')} {uptime // 3600}:{uptime // 60 % 60:02d}:{uptime % 60:02d}")
+        if self.cadence is not None:
+            header.add(f"  {t('dashboard.interval')} {self.cadence.min_interval:g}-{self.cadence.max_interval:g}s")
+        elif self.interval is not None:
+            header.add(f"  {t('dashboard.interval')} {self.interval}s")
+        header.add(f"  CPU {cpu:.1f}%")
+        if captured_at is not None:
+            header.add(f"  {captured_at.strftime('%H:%M:%S')}", DIM)
+        rows.append(header)
+
+        spark_width = max(8, min(HISTORY, (width - 40) // 2))
+        network = Row().add(f" {t('dashboard.network')}  ", BOLD)
+        network.add(f"↑ {_rate(sent[-1] if sent else 0):>10} ")
+        network.add(sparkline(sent, spark_width, self.symbols), INFO)
+        network.add(f"  ↓ {_rate(received[-1] if received else 0):>10} ")
+        network.add(sparkline(received, spark_width, self.symbols), INFO)
+        rows.append(network)
+        rows.append(Row())
+
+        name_width = max([text_width(r['name']) for r in results] + [text_width(t('dashboard.module')), 12])
+        name_width = min(name_width, max(12, width // 3))
+        columns = Row().add(' ' + _pad(t('dashboard.module'), name_width), BOLD)
+        columns.add('  ' + _pad(t('dashboard.risk'), 8), BOLD)
+        columns.add('  ' + _pad(t('dashboard.findings'), 8, right=True), BOLD)
+        columns.add('  ' + _pad(t('dashboard.time'), 9, right=True), BOLD)
+        columns.add('  ' + t('dashboard.history'), BOLD)
+        rows.append(columns)
+
+        risk_levels = self.translator.labels('risk_levels')
+        history_width = max(0, min(HISTORY, width - name_width - 46))
+        for result in results:
+            row = Row().add(' ' + _pad(result['name'], name_width))
+            row.add('  ' + _pad(risk_levels[result['risk_level']], 8), RISK_STYLES.get(result['risk_level'], NORMAL))
+            row.add('  ' + _pad(str(len(result['findings'])), 8, right=True))
+            values = timings.get(keys.get(id(result)), [])
+            row.add('  ' + _pad(f"{values[-1] * 1000:.1f} ms" if values else '-', 9, right=True))
+            if values and history_width:
+                row.add('  ' + sparkline(values, history_width, self.symbols), INFO)
+            rows.append(row)
+
+        rows.append(Row())
+        rows.append(Row().add(f" {t('dashboard.recent_changes')}", BOLD))
+        footer = Row().add(f" {t('dashboard.keys')}", DIM)
+        footer.add(f"  {t('dashboard.frame', ms=f'{self.frame_seconds * 1000:.1f}')}", DIM)
+        if notice is not None:
+            footer.add(f"  {notice[0]}", notice[1])
+
+        finding_types = self.translator.labels('findings')
+        severity_levels = self.translator.labels('severity_levels')
+        space = height - len(rows) - 1
+        for stamp, new, module, item, style in changes[:max(0, space)]:
+            row = Row().add(f" {stamp} ", DIM)
+            if new is None:
+                row.add(f"[{module}] {t('monitor.risk_changed')}: "
+                        f"{risk_levels[item['from']]} → {risk_levels[item['to']]}", MEDIUM)
+            elif new:
+                row.add(f"+ [{severity_levels[item['severity']]}] ", SEVERITY_STYLES.get(item['severity'], NORMAL))
+                row.add(f"[{module}] {finding_types[item['type']]}: {item['detail']}")
+            else:
+                row.add(f"- [{module}] {finding_types[item['type']]}: {item['detail']}", style)
+            rows.append(row)
+
+        rows = rows[:max(0, height - 1)]
+        while len(rows) < height - 1:
+            rows.append(Row())
+        if height:
+            rows.append(footer)
+        return [row.fit(width) for row in rows]
+
+
+def _pad(text, width, right=False):
+    """Pads or truncates text to width terminal cells."""
+    text, _ = Row().add(text).fit(width)
+    if right:
+        stripped = text.rstrip()
+        return ' ' * (width - text_width(stripped)) + stripped
+    return text
+
+
+def _rate(value):
+    """Formats a byte rate."""
+    for unit in ('B/s', 'KB/s', 'MB/s', 'GB/s'):
+        if value < 1024 or unit == 'GB/s':
+            return f"{value:.1f} {unit}"
+        value /= 1024
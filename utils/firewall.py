@@ -0,0 +1,318 @@
+"""
+Firewall Rules Module
+Reads the active iptables and nftables rulesets and extracts the rules that
+divert traffic to a local port (REDIRECT, DNAT to this host, TPROXY)
+
+Rulesets are split into tables and each table is hashed; a table is parsed
+again only when its hash changed, so a cycle with unchanged rules costs the
+dump commands and one hash per table.
+"""
+import hashlib
+import ipaddress
+import re
+import shlex
+import shutil
+import subprocess
+
+# Ruleset source -> dump command
+DUMP_COMMANDS = {
+    'iptables': ['iptables-save'],
+    'ip6tables': ['ip6tables-save'],
+    'nftables': ['nft', 'list', 'ruleset'],
+}
+
+# nftables: 'table <family> <name> {' at the start of a line, closed by '}'
+NFT_TABLE = re.compile(r'^table (\S+) (\S+) \{\n(.*?)^\}', re.MULTILINE | re.DOTALL)
+NFT_CHAIN = re.compile(r'^\tchain (\S+) \{\n(.*?)^\t\}', re.MULTILINE | re.DOTALL)
+NFT_SET = re.compile(r'^\tset (\S+) \{.*?elements = \{([^}]*)\}', re.MULTILINE | re.DOTALL)
+NFT_PORTS = re.compile(r'\b(tcp|udp|th) dport (\{[^}]*\}|@\S+|\S+)')
+NFT_PROTOCOL = re.compile(r'\bmeta l4proto (tcp|udp|\{[^}]*\})')
+NFT_DESTINATION = re.compile(r'\bip6? daddr (\S+)')
+# Statements are whole words: set names and comments may contain them too
+NFT_REDIRECT = re.compile(r'(?<!\S)redirect(?: to :?(\d+)(?:-\d+)?)?(?!\S)')
+NFT_DNAT = re.compile(r'(?<!\S)dnat(?: ip6?)? to (\S+)')
+NFT_TPROXY = re.compile(r'(?<!\S)tproxy(?: ip6?)? to (\S+)')
+NFT_COMMENT = re.compile(r'\bcomment "(?:[^"\\]|\\.)*"')
+NFT_ACTIONS = (('REDIRECT', NFT_REDIRECT), ('DNAT', NFT_DNAT), ('TPROXY', NFT_TPROXY))
+
+ACTIONS = ('REDIRECT', 'DNAT', 'TPROXY')
+
+
+def read_rulesets():
+    """
+    Dumps the active rulesets.
+
+    Returns:
+        dict: {'rulesets': source -> dump text, 'denied': sources that could
+               not be dumped for lack of privileges}. Sources whose command is
+               not installed are left out.
+    """
+    rulesets = {}
+    denied = []
+    for source, command in DUMP_COMMANDS.items():
+        if shutil.which(command[0]) is None:
+            continue
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=5,
+                                    env={'LC_ALL': 'C', 'PATH': '/usr/sbin:/sbin:/usr/bin:/bin'})
+        except (OSError, subprocess.SubprocessError):
+            continue
+        if result.returncode == 0:
+            rulesets[source] = result.stdout
+        elif 'ermission denied' in result.stderr or 'Operation not permitted' in result.stderr:
+            denied.append(source)
+    return {'rulesets': rulesets, 'denied': denied}
+
+
+def split_tables(source, text):
+    """
+    Splits a ruleset dump into its tables.
+
+    Args:
+        source: Key of DUMP_COMMANDS the dump came from.
+        text: Dump text.
+
+    Returns:
+        list: ((source, table name), table text) tuples.
+    """
+    if source == 'nftables':
+        return [((source, f'{family} {name}'), body) for family, name, body in NFT_TABLE.findall(text)]
+
+    tables = []
+    name = None
+    lines = []
+    for line in text.splitlines():
+        if line.startswith('*'):
+            name = line[1:].strip()
+            lines = []
+        elif line == 'COMMIT' and name is not None:
+            tables.append(((source, name), '\n'.join(lines)))
+            name = None
+        elif name is not None:
+            lines.append(line)
+    return tables
+
+
+def parse_iptables_table(table, text):
+    """
+    Extracts the diverting rules of an iptables-save table.
+
+    Args:
+        table: Table name (nat, mangle, ...).
+        text: Table lines between '*table' and 'COMMIT'.
+
+    Returns:
+        list: Diversion dicts, see _diversion().
+    """
+    diversions = []
+    for line in text.splitlines():
+        if not line.startswith('-A ') or not any(f'-j {action}' in line for action in ACTIONS):
+            continue
+        try:
+            tokens = shlex.split(line)
+        except ValueError:
+            continue
+        options = {}
+        negated = False
+        for index, token in enumerate(tokens):
+            if token == '!':
+                negated = True
+                continue
+            if token.startswith('-') and index + 1 < len(tokens):
+                # A negated match diverts everything but those values
+                options[token] = None if negated else tokens[index + 1]
+            negated = False
+
+        action = options.get('-j')
+        if action not in ACTIONS:
+            continue
+        ports = options.get('--dport') or options.get('--destination-port') or options.get('--dports')
+        address, port = None, None
+        if action == 'REDIRECT':
+            port = _first_port(options.get('--to-ports'))
+        elif action == 'DNAT':
+            address, port = _split_endpoint(options.get('--to-destination') or '')
+        else:
+            address = options.get('--on-ip')
+            port = _first_port(options.get('--on-port'))
+        diversions.append(_diversion(
+            table, options.get('-A'), options.get('-p') or 'all', _parse_ports(ports, ','),
+            options.get('-d'), action, address, port, line
+        ))
+    return diversions
+
+
+def parse_nft_table(table, text):
+    """
+    Extracts the diverting rules of an nftables table.
+
+    Args:
+        table: '<family> <name>'.
+        text: Table body.
+
+    Returns:
+        list: Diversion dicts, see _diversion().
+    """
+    sets = {name: elements for name, elements in NFT_SET.findall(text)}
+    diversions = []
+    for chain, body in NFT_CHAIN.findall(text):
+        for line in body.splitlines():
+            line = line.strip()
+            statement = NFT_COMMENT.sub('', line)
+            for action, pattern in NFT_ACTIONS:
+                match = pattern.search(statement)
+                if match is not None:
+                    break
+            else:
+                continue
+
+            address, port = None, None
+            if action == 'REDIRECT':
+                port = int(match.group(1)) if match.group(1) else None
+            else:
+                address, port = _split_endpoint(match.group(1))
+
+            protocol, ports = 'all', None
+            match = NFT_PORTS.search(statement)
+            if match is not None:
+                protocol = match.group(1) if match.group(1) != 'th' else 'all'
+                value = match.group(2)
+                if value.startswith('@'):
+                    value = sets.get(value[1:], '')
+                ports = _parse_ports(value.strip('{} '), ',')
+            else:
+                match = NFT_PROTOCOL.search(statement)
+                if match is not None and not match.group(1).startswith('{'):
+                    protocol = match.group(1)
+            match = NFT_DESTINATION.search(statement)
+            diversions.append(_diversion(
+                table, chain, protocol, ports, match.group(1) if match else None,
+                action, address, port, line
+            ))
+    return diversions
+
+
+def _diversion(table, chain, protocol, ports, destination, action, address, port, rule):
+    """
+    Builds a diversion.
+
+    Returns:
+        dict: {'table', 'chain', 'protocol', 'ports': [(low, high), ...] or
+               None for any port, 'destination': matched destination address
+               or None, 'action', 'address': target address or None for this
+               host, 'port': target port or None for the original port, 'rule'}.
+    """
+    return {
+        'table': table, 'chain': chain, 'protocol': protocol, 'ports': ports,
+        'destination': destination, 'action': action, 'address': address, 'port': port,
+        'rule': rule,
+    }
+
+
+def _parse_ports(value, separator):
+    """Parses '80', '80:90', '80-90' or '80,443' into [(low, high), ...]; None if absent or unparsable."""
+    if not value:
+        return None
+    ranges = []
+    for part in value.split(separator):
+        bounds = re.split(r'[:-]', part.strip(), maxsplit=1)
+        try:
+            low = int(bounds[0])
+            high = int(bounds[1]) if len(bounds) > 1 and bounds[1] else low
+        except ValueError:
+            # A service name or a variable: cannot tell which ports are matched
+            return None
+        ranges.append((low, high))
+    return ranges or None
+
+
+def _first_port(value):
+    """Returns the first port of '8080' or '8080-8090', or None."""
+    if not value:
+        return None
+    try:
+        return int(re.split(r'[:-]', value, maxsplit=1)[0])
+    except ValueError:
+        return None
+
+
+def _split_endpoint(value):
+    """Splits '1.2.3.4:80', '[::1]:80', ':80' or '1.2.3.4' into (address or None, port or None)."""
+    if value.startswith('['):
+        address, _, rest = value[1:].partition(']')
+        return address or None, _first_port(rest.lstrip(':'))
+    if value.count(':') > 1:
+        # Bare IPv6 address
+        return value, None
+    address, _, port = value.partition(':')
+    return address or None, _first_port(port)
+
+
+def is_local_address(address, local_addresses=()):
+    """Whether a diversion target address is this host (None: the receiving interface)."""
+    if address is None:
+        return True
+    address = address.split('-')[0]
+    if address in local_addresses:
+        return True
+    try:
+        return ipaddress.ip_address(address).is_loopback
+    except ValueError:
+        return False
+
+
+def matches_ports(diversion, ports):
+    """
+    Returns the given ports that a diversion matches.
+
+    Args:
+        diversion: Diversion dict.
+        ports: Iterable of port numbers.
+
+    Returns:
+        list: Matched ports, sorted.
+    """
+    if diversion['ports'] is None:
+        return sorted(ports)
+    return sorted(port for port in ports if any(low <= port <= high for low, high in diversion['ports']))
+
+
+class FirewallRuleIndex:
+    """
+    Diverting rules of the active rulesets, parsed per table.
+
+    Each table is identified by its source and name and keyed by a digest of
+    its text; update() re-parses only tables whose digest changed.
+    """
+
+    def __init__(self):
+        # (source, table) -> (digest, diversions)
+        self.tables = {}
+        self.parsed = 0
+
+    def update(self, rulesets):
+        """
+        Applies the current ruleset dumps.
+
+        Args:
+            rulesets: Source -> dump text, as read_rulesets()['rulesets'].
+
+        Returns:
+            list: Diversion dicts of all tables, in dump order.
+        """
+        tables = {}
+        diversions = []
+        for source, text in rulesets.items():
+            for key, body in split_tables(source, text):
+                digest = hashlib.blake2b(body.encode('utf-8', 'replace'), digest_size=16).digest()
+                cached = self.tables.get(key)
+                if cached is None or cached[0] != digest:
+                    if source == 'nftables':
+                        cached = (digest, parse_nft_table(key[1], body))
+                    else:
+                        cached = (digest, parse_iptables_table(key[1], body))
+                    self.parsed += 1
+                tables[key] = cached
+                diversions.extend(cached[1])
+        self.tables = tables
+        return diversions
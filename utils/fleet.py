@@ -0,0 +1,393 @@
+"""
+Fleet Module
+Streams change deltas from monitoring agents to a central collector and
+answers fleet-wide queries from the collector's in-memory state
+"""
+import asyncio
+import json
+import socket
+import threading
+import time
+from collections import deque
+from utils.fleet_client import DEFAULT_PORT, parse_address, encode_frame, fleet_query
+
+PROTOCOL_VERSION = 1
+RISK_ORDER = {'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
+
+# Largest single frame accepted by the collector (a full state frame)
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+def _encode_findings(findings):
+    return [[f['type'], f['detail'], f['severity']] for f in findings]
+
+
+class FleetAgent:
+    """
+    Monitoring observer that streams ChangeDetector deltas to a collector.
+
+    On (re)connection the agent sends one full state frame as the baseline;
+    after that only deltas (new/removed findings and risk changes) are sent,
+    plus a small heartbeat for cycles without changes. Sends are blocking
+    with a timeout, so a slow collector applies backpressure to the agent
+    instead of letting frames pile up in memory.
+    """
+
+    def __init__(self, address, host_id=None, timeout=5.0):
+        """
+        Initializes the agent.
+
+        Args:
+            address: Collector HOST:PORT.
+            host_id: Name reported to the collector (default: the host name).
+            timeout: Connect and send timeout in seconds.
+        """
+        self.address = parse_address(address)
+        self.host_id = host_id or socket.gethostname()
+        self.timeout = timeout
+        self._sock = None
+        self._sent_modules = None
+
+    def on_cycle(self, service, results, changes):
+        """
+        Sends the outcome of a monitoring cycle.
+
+        Args:
+            service: The MonitoringService that ran the cycle.
+            results: The detection results of the cycle.
+            changes: The change report, or None for the initial scan.
+        """
+        self.send_cycle(results, changes, service.cycle_count)
+
+    def send_cycle(self, results, changes, cycle=0):
+        """
+        Sends a state, delta or heartbeat frame for one cycle.
+
+        Args:
+            results: The detection results of the cycle.
+            changes: The change report, or None for the initial scan.
+            cycle: Cycle number.
+        """
+        modules = [r['name'] for r in results]
+
+        try:
+            if self._sock is None:
+                self._connect()
+
+            if changes is None or modules != self._sent_modules:
+                # Baseline: first cycle, new connection, or module set changed
+                # (ChangeDetector only diffs modules present in both cycles)
+                self._send({
+                    'type': 'state',
+                    'cycle': cycle,
+                    'modules': {r['name']: {
+                        'risk_level': r['risk_level'],
+                        'findings': _encode_findings(r['findings']),
+                    } for r in results},
+                })
+                self._sent_modules = modules
+            elif changes.get('has_changes'):
+                self._send({
+                    'type': 'delta',
+                    'cycle': cycle,
+                    'new': [{'module': item['module'], 'findings': _encode_findings(item['findings'])}
+                            for item in changes['new_findings']],
+                    'removed': [{'module': item['module'], 'findings': _encode_findings(item['findings'])}
+                                for item in changes['removed_findings']],
+                    'risk': [{'module': change['module'], 'to': change['to']}
+                             for change in changes['risk_changes']],
+                })
+            else:
+                self._send({'type': 'heartbeat', 'cycle': cycle})
+        except OSError:
+            # Collector unreachable; retry with a fresh baseline next cycle
+            self.close()
+
+    def close(self):
+        """Closes the connection to the collector."""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._sent_modules = None
+
+    def _connect(self):
+        self._sock = socket.create_connection(self.address, timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sent_modules = None
+        self._send({'type': 'hello', 'host': self.host_id, 'version': PROTOCOL_VERSION})
+
+    def _send(self, frame):
+        self._sock.sendall(encode_frame(frame))
+
+
+class HostState:
+    """Current state of one agent as seen by the collector"""
+
+    __slots__ = ('host', 'modules', 'overall_risk', 'last_seen', 'connected', 'cycle')
+
+    def __init__(self, host):
+        self.host = host
+        # module -> {'risk_level': str, 'findings': {key: [type, detail, severity]}}
+        self.modules = {}
+        self.overall_risk = 'LOW'
+        self.last_seen = 0.0
+        self.connected = False
+        self.cycle = 0
+
+    def to_dict(self):
+        return {
+            'host': self.host,
+            'overall_risk': self.overall_risk,
+            'connected': self.connected,
+            'last_seen': self.last_seen,
+            'cycle': self.cycle,
+            'modules': {name: {
+                'risk_level': module['risk_level'],
+                'findings': list(module['findings'].values()),
+            } for name, module in self.modules.items()},
+        }
+
+
+class FleetCollector:
+    """
+    Aggregates agent streams on a single asyncio event loop.
+
+    Per-host state is kept in memory together with two indexes that make
+    the common fleet queries cheap: hosts by overall risk level, and the
+    appearance times of each distinct finding text. The same findings tend
+    to show up on many hosts, so a text query scans the distinct texts
+    rather than every appearance. Each connection is read
+    one frame at a time, so TCP flow control pushes back on agents whose
+    frames arrive faster than they are applied.
+    """
+
+    def __init__(self, listen=f'127.0.0.1:{DEFAULT_PORT}', retention=86400, max_events=1000000):
+        """
+        Initializes the collector.
+
+        Args:
+            listen: HOST:PORT to listen on (port 0 picks a free port). The
+                protocol is unauthenticated, so only loopback by default.
+            retention: Seconds appearance events are kept for queries.
+            max_events: Upper bound on retained appearance events.
+        """
+        self.listen_host, self.port = parse_address(listen)
+        self.retention = retention
+        self.hosts = {}
+        self.hosts_by_risk = {level: set() for level in RISK_ORDER}
+        self.max_events = max_events
+        # lowercased "type|detail" -> deque of (received_at, host, module, finding)
+        self.events_by_text = {}
+        # (received_at, lowercased text) in arrival order, for expiry
+        self.events = deque()
+        self.frames_received = 0
+        self.ready = threading.Event()
+        self._loop = None
+        self._server = None
+
+    def run(self):
+        """Runs the collector until stop() is called."""
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._serve())
+        finally:
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self._loop.close()
+
+    def stop(self):
+        """Stops a collector running in another thread."""
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+
+    async def _serve(self):
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.listen_host, self.port,
+            limit=MAX_FRAME_BYTES, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.ready.set()
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    async def _handle_connection(self, reader, writer):
+        host = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    frame = json.loads(line)
+                except ValueError:
+                    break
+                if not isinstance(frame, dict):
+                    break
+                self.frames_received += 1
+                frame_type = frame.get('type')
+
+                if frame_type == 'query':
+                    writer.write(encode_frame(self.query(frame)))
+                    await writer.drain()
+                elif frame_type == 'hello':
+                    name = frame.get('host')
+                    if not isinstance(name, str) or not name:
+                        break
+                    host = self._host(name)
+                    host.connected = True
+                    host.last_seen = time.time()
+                elif host is not None:
+                    self._apply(host, frame)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        except (KeyError, TypeError, AttributeError):
+            # Malformed frame: drop the peer, keep serving the others
+            pass
+        finally:
+            if host is not None:
+                host.connected = False
+            writer.close()
+
+    def _host(self, name):
+        host = self.hosts.get(name)
+        if host is None:
+            host = self.hosts[name] = HostState(name)
+            self.hosts_by_risk[host.overall_risk].add(name)
+        return host
+
+    def _apply(self, host, frame):
+        """Applies a state, delta or heartbeat frame to a host."""
+        now = time.time()
+        host.last_seen = now
+        host.cycle = frame.get('cycle', host.cycle)
+        frame_type = frame.get('type')
+
+        if frame_type == 'state':
+            previous = host.modules
+            host.modules = {}
+            for name, module in frame['modules'].items():
+                findings = {f"{f[0]}|{f[1]}": f for f in module['findings']}
+                known = previous.get(name, {}).get('findings', {})
+                for key, finding in findings.items():
+                    if key not in known:
+                        self._record_event(now, host.host, name, finding)
+                host.modules[name] = {'risk_level': module['risk_level'], 'findings': findings}
+        elif frame_type == 'delta':
+            for item in frame.get('new', []):
+                module = self._module(host, item['module'])
+                for finding in item['findings']:
+                    module['findings'][f"{finding[0]}|{finding[1]}"] = finding
+                    self._record_event(now, host.host, item['module'], finding)
+            for item in frame.get('removed', []):
+                module = self._module(host, item['module'])
+                for finding in item['findings']:
+                    module['findings'].pop(f"{finding[0]}|{finding[1]}", None)
+            for change in frame.get('risk', []):
+                self._module(host, change['module'])['risk_level'] = change['to']
+        else:
+            return
+
+        self._update_risk(host)
+
+    def _module(self, host, name):
+        module = host.modules.get(name)
+        if module is None:
+            module = host.modules[name] = {'risk_level': 'LOW', 'findings': {}}
+        return module
+
+    def _update_risk(self, host):
+        max_risk = max((RISK_ORDER.get(m['risk_level'], 0) for m in host.modules.values()), default=0)
+        risk = next((level for level, value in RISK_ORDER.items() if value == max_risk), 'LOW')
+        if risk != host.overall_risk:
+            self.hosts_by_risk[host.overall_risk].discard(host.host)
+            self.hosts_by_risk[risk].add(host.host)
+            host.overall_risk = risk
+
+    def _record_event(self, now, host, module, finding):
+        text = f"{finding[0]}|{finding[1]}".lower()
+        appearances = self.events_by_text.get(text)
+        if appearances is None:
+            appearances = self.events_by_text[text] = deque()
+        appearances.append((now, host, module, finding))
+        self.events.append((now, text))
+        if len(self.events) > self.max_events:
+            self._pop_oldest_event()
+
+    def query(self, request):
+        """
+        Answers a fleet query.
+
+        Supported operations:
+            hosts    - hosts whose overall risk is at least 'risk' (default HIGH)
+            appeared - hosts where a finding whose type or detail contains
+                       'match' appeared within the last 'since' seconds
+                       (with up to 'limit' most recent events per host)
+            host     - full state of one 'host'
+            summary  - host counts per risk level
+
+        Args:
+            request: Query dictionary with an 'op' key.
+
+        Returns:
+            dict: The query result.
+        """
+        op = request.get('op', 'summary')
+
+        if op == 'hosts':
+            minimum = RISK_ORDER.get(request.get('risk', 'HIGH'), 3)
+            hosts = sorted(name for level, names in self.hosts_by_risk.items()
+                           if RISK_ORDER[level] >= minimum for name in names)
+            return {'op': op, 'hosts': hosts, 'count': len(hosts)}
+
+        if op == 'appeared':
+            cutoff = time.time() - min(float(request.get('since', 3600)), self.retention)
+            match = str(request.get('match', '')).lower()
+            limit = int(request.get('limit', 5))
+            self._expire_events()
+            hosts = {}
+            for text, appearances in self.events_by_text.items():
+                if match not in text:
+                    continue
+                # Appearances are in arrival order, so walk back from the newest
+                for received_at, host, module, finding in reversed(appearances):
+                    if received_at < cutoff:
+                        break
+                    host_events = hosts.setdefault(host, [])
+                    if len(host_events) < limit:
+                        host_events.append({
+                            'at': received_at, 'module': module, 'type': finding[0],
+                            'detail': finding[1], 'severity': finding[2],
+                        })
+            return {'op': op, 'hosts': sorted(hosts), 'count': len(hosts), 'events': hosts}
+
+        if op == 'host':
+            host = self.hosts.get(request.get('host'))
+            return {'op': op, 'host': host.to_dict() if host else None}
+
+        return {
+            'op': 'summary',
+            'hosts': len(self.hosts),
+            'connected': sum(1 for h in self.hosts.values() if h.connected),
+            'by_risk': {level: len(names) for level, names in self.hosts_by_risk.items()},
+            'events': len(self.events),
+            'frames_received': self.frames_received,
+        }
+
+    def _expire_events(self):
+        cutoff = time.time() - self.retention
+        while self.events and self.events[0][0] < cutoff:
+            self._pop_oldest_event()
+
+    def _pop_oldest_event(self):
+        _, text = self.events.popleft()
+        appearances = self.events_by_text[text]
+        appearances.popleft()
+        if not appearances:
+            del self.events_by_text[text]
@@ -0,0 +1,57 @@
+"""
+Fleet Client Module
+Minimal client for querying a fleet collector
+
+Like the status client, this depends on the standard library only, so the
+'fleet' subcommand does not pay for the collector's asyncio machinery.
+"""
+import json
+import socket
+
+DEFAULT_PORT = 47800
+
+
+def parse_address(address, default_host='127.0.0.1'):
+    """
+    Parses a HOST:PORT (or PORT) string.
+
+    Args:
+        address: Address string.
+        default_host: Host used when only a port is given.
+
+    Returns:
+        tuple: (host, port).
+    """
+    host, _, port = address.rpartition(':')
+    return host or default_host, int(port) if port else DEFAULT_PORT
+
+
+def encode_frame(frame):
+    """
+    Encodes one NDJSON protocol frame.
+
+    Args:
+        frame: Frame dictionary.
+
+    Returns:
+        bytes: Compact JSON followed by a newline.
+    """
+    return json.dumps(frame, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def fleet_query(address, request, timeout=5.0):
+    """
+    Sends one query to a collector and returns its reply.
+
+    Args:
+        address: Collector HOST:PORT.
+        request: Query dictionary (see FleetCollector.query).
+        timeout: Socket timeout in seconds.
+
+    Returns:
+        dict: The collector's reply.
+    """
+    with socket.create_connection(parse_address(address), timeout=timeout) as sock:
+        sock.sendall(encode_frame(dict(request, type='query')))
+        with sock.makefile('rb') as reply:
+            return json.loads(reply.readline())
@@ -0,0 +1,440 @@
+"""
+Snapshot Helper Module
+Privileged helper that collects the socket, process and network namespace
+tables and serves them to unprivileged monitors over a Unix socket
+
+The helper is the only part that runs as root. It collects the tables at
+most once per max_age, however many monitors and daemons ask, and sends
+every client the same pre-encoded frame. Frames use a compact binary
+layout: fixed-size socket records decoded with struct.iter_unpack, and a
+name blob for the process table.
+"""
+import asyncio
+import gc
+import json
+import os
+import socket
+import struct
+import time
+from utils.snapshot import SystemSnapshot, addr, sconn, encode_error, decode_error
+
+# Frame: FRAME_HEADER, then sections of SECTION_HEADER + data
+FRAME_MAGIC = b'NMH1'
+FRAME_HEADER = struct.Struct('<4sdI')  # magic, capture timestamp, payload length
+SECTION_HEADER = struct.Struct('<BI')  # section id, data length
+# Set in the section id when the data is a collection error (JSON)
+SECTION_ERROR = 0x80
+
+# Snapshot sections served by the helper, by section id
+SECTIONS = {'connections': 1, 'processes': 2, 'namespaces': 3}
+
+# fd, family, type, status index, flags, pid (-1: unknown), local port,
+# remote port, local address, remote address (IPv4 in the first 4 bytes)
+CONNECTION = struct.Struct('<iBBBBiHH16s16s')
+CONNECTION_LOCAL = 0x1
+CONNECTION_REMOTE = 0x2
+PROCESS = struct.Struct('<IH')  # pid, name length
+NAMESPACE = struct.Struct('<IQ')  # pid, network namespace inode
+COUNT = struct.Struct('<I')
+
+REQUEST_SNAPSHOT = b'S'
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+
+def default_helper_path():
+    """
+    Returns the default helper socket path.
+
+    Returns:
+        str: /run/netmon-helper.sock, or a path in the temp directory where
+             /run does not exist.
+    """
+    if os.path.isdir('/run'):
+        return '/run/netmon-helper.sock'
+    import tempfile
+
+    return os.path.join(tempfile.gettempdir(), 'netmon-helper.sock')
+
+
+def encode_frame(sections, captured_at):
+    """
+    Encodes collected sections into a frame.
+
+    Args:
+        sections: Section name -> (ok, value or exception).
+        captured_at: Capture time (datetime).
+
+    Returns:
+        bytes: The frame.
+    """
+    parts = []
+    for name, (ok, value) in sections.items():
+        section_id = SECTIONS[name]
+        if not ok:
+            data = json.dumps(encode_error(value)).encode('utf-8')
+            section_id |= SECTION_ERROR
+        elif name == 'connections':
+            data = _encode_connections(value)
+        elif name == 'processes':
+            data = _encode_processes(value)
+        else:
+            data = COUNT.pack(len(value)) + b''.join(NAMESPACE.pack(pid, inode) for pid, inode in value.items())
+        parts.append(SECTION_HEADER.pack(section_id, len(data)))
+        parts.append(data)
+    payload = b''.join(parts)
+    return FRAME_HEADER.pack(FRAME_MAGIC, captured_at.timestamp(), len(payload)) + payload
+
+
+def decode_frame(payload):
+    """
+    Decodes the payload of a frame.
+
+    Args:
+        payload: Frame bytes following FRAME_HEADER.
+
+    Returns:
+        dict: Section name -> (ok, value or exception).
+
+    Raises:
+        ValueError: If the payload is malformed.
+    """
+    names = {section_id: name for name, section_id in SECTIONS.items()}
+    sections = {}
+    view = memoryview(payload)
+    offset = 0
+    # Decoding allocates a few tuples per socket, none of which can form a
+    # cycle; left enabled, the cyclic collector runs over and over on
+    # large tables and dominates the decoding time
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        while offset < len(payload):
+            section_id, length = SECTION_HEADER.unpack_from(payload, offset)
+            offset += SECTION_HEADER.size
+            data = view[offset:offset + length]
+            offset += length
+            name = names.get(section_id & ~SECTION_ERROR)
+            if name is None:
+                continue
+            if section_id & SECTION_ERROR:
+                sections[name] = (False, decode_error(json.loads(bytes(data))))
+            elif name == 'connections':
+                sections[name] = (True, _decode_connections(data))
+            elif name == 'processes':
+                sections[name] = (True, _decode_processes(data))
+            else:
+                count, = COUNT.unpack_from(data)
+                sections[name] = (True, dict(NAMESPACE.iter_unpack(data[COUNT.size:COUNT.size + count * NAMESPACE.size])))
+    except (struct.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"malformed helper frame: {e}")
+    finally:
+        if collecting:
+            gc.enable()
+    return sections
+
+
+def _encode_connections(connections):
+    # Statuses are few: a table of them precedes the records
+    statuses = {}
+    pack = CONNECTION.pack
+    records = []
+    for conn in connections:
+        status = statuses.setdefault(conn.status, len(statuses))
+        flags = 0
+        local_ip = remote_ip = b''
+        local_port = remote_port = 0
+        if conn.laddr:
+            flags |= CONNECTION_LOCAL
+            local_ip = socket.inet_pton(conn.family, conn.laddr.ip.split('%')[0])
+            local_port = conn.laddr.port
+        if conn.raddr:
+            flags |= CONNECTION_REMOTE
+            remote_ip = socket.inet_pton(conn.family, conn.raddr.ip.split('%')[0])
+            remote_port = conn.raddr.port
+        records.append(pack(conn.fd, int(conn.family), int(conn.type), status, flags,
+                            -1 if conn.pid is None else conn.pid,
+                            local_port, remote_port, local_ip, remote_ip))
+    table = b''.join(bytes([len(name)]) + name.encode('ascii') for name in statuses)
+    return bytes([len(statuses)]) + table + COUNT.pack(len(records)) + b''.join(records)
+
+
+def _decode_connections(data):
+    offset = 1
+    statuses = []
+    for _ in range(data[0]):
+        length = data[offset]
+        statuses.append(bytes(data[offset + 1:offset + 1 + length]).decode('ascii'))
+        offset += 1 + length
+    count, = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    records = data[offset:offset + count * CONNECTION.size]
+
+    # Tables repeat a few local and remote addresses many times; IPv4
+    # addresses are zero-padded, so the cache is kept per family
+    caches = {}
+    connections = []
+    # The named tuples are built with tuple.__new__, skipping their
+    # Python-level __new__
+    new = tuple.__new__
+    for fd, family, kind, status, flags, pid, local_port, remote_port, local_ip, remote_ip \
+            in CONNECTION.iter_unpack(records):
+        ips = caches.get(family)
+        if ips is None:
+            ips = caches[family] = {}
+        laddr = raddr = ()
+        if flags & CONNECTION_LOCAL:
+            ip = ips.get(local_ip)
+            if ip is None:
+                ip = ips[local_ip] = _ntop(family, local_ip)
+            laddr = new(addr, (ip, local_port))
+        if flags & CONNECTION_REMOTE:
+            ip = ips.get(remote_ip)
+            if ip is None:
+                ip = ips[remote_ip] = _ntop(family, remote_ip)
+            raddr = new(addr, (ip, remote_port))
+        connections.append(new(sconn, (fd, family, kind, laddr, raddr, statuses[status],
+                                       None if pid < 0 else pid)))
+    return connections
+
+
+def _ntop(family, packed):
+    return socket.inet_ntop(family, packed[:4] if family == socket.AF_INET else packed)
+
+
+def _encode_processes(processes):
+    names = [p['name'].encode('utf-8')[:65535] for p in processes]
+    headers = b''.join(PROCESS.pack(p['pid'], len(name)) for p, name in zip(processes, names))
+    return COUNT.pack(len(names)) + headers + b''.join(names)
+
+
+def _decode_processes(data):
+    count, = COUNT.unpack_from(data)
+    offset = COUNT.size + count * PROCESS.size
+    blob = bytes(data[offset:])
+    processes = []
+    position = 0
+    for pid, length in PROCESS.iter_unpack(data[COUNT.size:offset]):
+        processes.append({'pid': pid, 'name': blob[position:position + length].decode('utf-8', 'replace')})
+        position += length
+    return processes
+
+
+class SnapshotHelper:
+    """
+    Privileged snapshot server.
+
+    Clients keep a connection open and send REQUEST_SNAPSHOT once per
+    cycle; each request is answered with one frame. A frame younger than
+    max_age is sent again as it is, and concurrent requests for a new frame
+    share a single collection, so the cost of the helper does not grow with
+    the number of clients.
+
+    The socket is created mode 0600, or 0660 owned by `group`, which is how
+    unprivileged monitors are given access.
+    """
+
+    def __init__(self, socket_path=None, max_age=5.0, group=None, client_timeout=3600.0):
+        """
+        Initializes the helper.
+
+        Args:
+            socket_path: Unix socket path (default: default_helper_path()).
+            max_age: Seconds a collected frame is served before collecting again.
+            group: Group name or id allowed to connect.
+            client_timeout: Seconds an idle client connection is kept open.
+        """
+        self.socket_path = socket_path or default_helper_path()
+        self.max_age = max_age
+        self.group = group
+        self.client_timeout = client_timeout
+        self.snapshot = SystemSnapshot()
+        self.collections = 0
+        self._frame = None
+        self._frame_time = 0.0
+        self._pending = None
+        self._server = None
+
+    def run(self):
+        """Serves clients until interrupted."""
+        try:
+            asyncio.run(self._serve())
+        finally:
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+    def collect(self):
+        """
+        Collects a new frame.
+
+        Returns:
+            bytes: The encoded frame.
+        """
+        self.snapshot.refresh()
+        sections = {}
+        for name in SECTIONS:
+            try:
+                sections[name] = (True, getattr(self.snapshot, name)())
+            except Exception as e:
+                sections[name] = (False, e)
+        self.collections += 1
+        return encode_frame(sections, self.snapshot.captured_at)
+
+    async def _serve(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        # Created with its final mode; the group is only widened by chown
+        # once it is already 0660
+        previous = os.umask(0o117 if self.group is not None else 0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        finally:
+            os.umask(previous)
+        if self.group is not None:
+            os.chown(self.socket_path, -1, _group_id(self.group))
+            os.chmod(self.socket_path, 0o660)
+        else:
+            os.chmod(self.socket_path, 0o600)
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                request = await asyncio.wait_for(reader.read(1), timeout=self.client_timeout)
+                # Anything but a snapshot request ends the connection
+                if request != REQUEST_SNAPSHOT:
+                    break
+                writer.write(await self._current_frame())
+                await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _current_frame(self):
+        if self._frame is not None and time.monotonic() - self._frame_time < self.max_age:
+            return self._frame
+        if self._pending is None:
+            self._pending = asyncio.get_running_loop().run_in_executor(None, self.collect)
+        pending = self._pending
+        try:
+            # Shielded: a client going away must not cancel the others' collection
+            frame = await asyncio.shield(pending)
+        finally:
+            if self._pending is pending and pending.done():
+                self._pending = None
+        if self._frame is not frame:
+            self._frame = frame
+            self._frame_time = time.monotonic()
+        return frame
+
+
+def _group_id(group):
+    if isinstance(group, int) or str(group).isdigit():
+        return int(group)
+    import grp
+
+    return grp.getgrnam(group).gr_gid
+
+
+class HelperSnapshot(SystemSnapshot):
+    """
+    Snapshot reading the privileged sections from a snapshot helper.
+
+    The socket, process and namespace tables come from the helper's frame,
+    fetched once per cycle over a persistent connection; everything else is
+    collected locally. If the helper cannot be reached, the cycle falls back
+    to local collection and `error` holds the reason.
+
+    Args:
+        socket_path: Helper socket path (default: default_helper_path()).
+        timeout: Socket timeout in seconds.
+    """
+
+    local = False
+
+    def __init__(self, socket_path=None, timeout=30.0):
+        super().__init__()
+        self.socket_path = socket_path or default_helper_path()
+        self.timeout = timeout
+        self.error = None
+        self._sock = None
+        self._sections = {}
+
+    def connect(self):
+        """
+        Connects to the helper.
+
+        Raises:
+            OSError: If the helper is not reachable.
+        """
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+
+    def refresh(self):
+        super().refresh()
+        try:
+            self._sections = self.fetch()
+            self.error = None
+        except (OSError, ValueError) as e:
+            self._sections = {}
+            self.error = e
+        return True
+
+    def fetch(self):
+        """
+        Requests a frame from the helper.
+
+        Returns:
+            dict: Section name -> (ok, value or exception).
+
+        Raises:
+            OSError: If the helper is not reachable.
+            ValueError: If the reply is not a valid frame.
+        """
+        # A connection dropped by a helper restart is retried once
+        for attempt in range(2):
+            try:
+                self.connect()
+                self._sock.sendall(REQUEST_SNAPSHOT)
+                magic, _, length = FRAME_HEADER.unpack(self._receive(FRAME_HEADER.size))
+                if magic != FRAME_MAGIC or length > MAX_FRAME_BYTES:
+                    raise ValueError("not a snapshot helper frame")
+                return decode_frame(self._receive(length))
+            except (OSError, ValueError):
+                self._disconnect()
+                if attempt:
+                    raise
+
+    def close(self):
+        self._disconnect()
+
+    def _disconnect(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _receive(self, size):
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            count = self._sock.recv_into(view[received:])
+            if not count:
+                raise ConnectionError("snapshot helper closed the connection")
+            received += count
+        return buffer
+
+    def _capture(self, section, collect):
+        if section not in self._cache and section in self._sections:
+            self._cache[section] = self._sections[section]
+        return super()._capture(section, collect)
@@ -0,0 +1,169 @@
+"""
+Histogram Module
+Fixed-memory log-bucketed latency histograms and baseline shift detection
+"""
+import math
+from collections import deque
+
+
+class LogHistogram:
+    """
+    HDR-style histogram of non-negative integer values (e.g. microseconds).
+
+    Values below 2**sub_bucket_bits are counted exactly. Above that, every
+    power of two is split into 2**sub_bucket_bits linear sub-buckets, so the
+    relative error is at most 2**-sub_bucket_bits (about 3% by default).
+    Recording is O(1) and the bucket array never grows.
+    """
+
+    def __init__(self, sub_bucket_bits=5, max_value=2 ** 26):
+        """
+        Initializes an empty histogram.
+
+        Args:
+            sub_bucket_bits: Precision; 5 gives 32 sub-buckets per power of two.
+            max_value: Largest distinguishable value; larger values are
+                counted in the last bucket (2**26 us is about 67 seconds).
+        """
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_buckets = 1 << sub_bucket_bits
+        self.max_value = max_value
+        self.counts = [0] * (self._index(max_value) + 1)
+        self.total = 0
+
+    def _index(self, value):
+        if value < self.sub_buckets:
+            return value
+        exponent = value.bit_length() - self.sub_bucket_bits - 1
+        return self.sub_buckets * (exponent + 1) + (value >> exponent) - self.sub_buckets
+
+    def bucket_bounds(self, index):
+        """
+        Returns the value range counted by a bucket.
+
+        Args:
+            index: Bucket index.
+
+        Returns:
+            tuple: (lowest value, highest value) of the bucket.
+        """
+        if index < self.sub_buckets:
+            return index, index
+        exponent = index // self.sub_buckets - 1
+        mantissa = index % self.sub_buckets + self.sub_buckets
+        return mantissa << exponent, ((mantissa + 1) << exponent) - 1
+
+    def record(self, value):
+        """Counts one value."""
+        value = min(max(int(value), 0), self.max_value)
+        self.counts[self._index(value)] += 1
+        self.total += 1
+
+    def percentile(self, pct):
+        """
+        Returns the value at a percentile (the midpoint of its bucket).
+
+        Args:
+            pct: Percentile between 0 and 100.
+
+        Returns:
+            int: Approximate value, or None if the histogram is empty.
+        """
+        if not self.total:
+            return None
+        rank = max(1, math.ceil(self.total * pct / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                low, high = self.bucket_bounds(index)
+                return (low + high) // 2
+        return self.max_value
+
+    def rank_sum(self, values):
+        """
+        Mann-Whitney U statistic of values against the recorded distribution.
+
+        Values falling into the same bucket as recorded ones count as ties.
+
+        Args:
+            values: Sample to compare.
+
+        Returns:
+            float: Number of (value, recorded) pairs where the value is larger.
+        """
+        below = []
+        running = 0
+        for count in self.counts:
+            below.append(running)
+            running += count
+
+        u = 0.0
+        for value in values:
+            index = self._index(min(max(int(value), 0), self.max_value))
+            u += below[index] + self.counts[index] / 2
+        return u
+
+
+class LatencyBaseline:
+    """
+    Detects upward shifts of a latency against its own baseline.
+
+    The first baseline_samples measurements form the baseline histogram,
+    which is then frozen. Later measurements go into a fixed-size window of
+    the most recent values, which is compared with the baseline using a
+    one-sided Mann-Whitney U test. A shift is reported only when it is both
+    significant and large enough to matter.
+    """
+
+    def __init__(self, baseline_samples=20, window=8, z_threshold=3.0,
+                 min_ratio=1.5, min_shift_us=10000):
+        """
+        Initializes the baseline.
+
+        Args:
+            baseline_samples: Measurements that make up the baseline.
+            window: Recent measurements compared against the baseline.
+            z_threshold: Minimum z-score of the U statistic (3.0 ~ p < 0.0014).
+            min_ratio: Minimum ratio of recent to baseline median.
+            min_shift_us: Minimum increase of the median in microseconds.
+        """
+        self.baseline_samples = baseline_samples
+        self.z_threshold = z_threshold
+        self.min_ratio = min_ratio
+        self.min_shift_us = min_shift_us
+        self.baseline = LogHistogram()
+        self.recent = deque(maxlen=window)
+
+    def add(self, seconds):
+        """Records one measurement given in seconds."""
+        value = int(seconds * 1000000)
+        if self.baseline.total < self.baseline_samples:
+            self.baseline.record(value)
+        else:
+            self.recent.append(value)
+
+    def shift(self):
+        """
+        Tests the recent window against the baseline.
+
+        Returns:
+            dict: {'baseline_us', 'recent_us', 'z'} if the latency shifted up,
+                  otherwise None.
+        """
+        if self.baseline.total < self.baseline_samples or len(self.recent) < self.recent.maxlen:
+            return None
+
+        n1 = len(self.recent)
+        n2 = self.baseline.total
+        u = self.baseline.rank_sum(self.recent)
+        sigma = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+        z = (u - n1 * n2 / 2) / sigma if sigma else 0.0
+
+        baseline_median = self.baseline.percentile(50)
+        recent_median = sorted(self.recent)[n1 // 2]
+        if (z >= self.z_threshold
+                and recent_median >= baseline_median * self.min_ratio
+                and recent_median - baseline_median >= self.min_shift_us):
+            return {'baseline_us': baseline_median, 'recent_us': recent_median, 'z': z}
+        return None
@@ -0,0 +1,121 @@
+"""
+Inotify Module
+Minimal ctypes binding of the Linux inotify API
+"""
+import errno
+import os
+import struct
+
+# Event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+# Changes to the entries of a watched directory that can alter a file's content
+DIRECTORY_CHANGES = (IN_CLOSE_WRITE | IN_ATTRIB | IN_CREATE | IN_DELETE
+                     | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF)
+
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        # Imported here, so that the constants can be used without ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        _libc = libc
+    return _libc
+
+
+def _get_errno():
+    import ctypes
+    return ctypes.get_errno()
+
+
+class Inotify:
+    """
+    Non-blocking inotify instance.
+
+    Raises OSError when inotify is not available (other platforms, or the
+    per-user instance limit is reached).
+    """
+
+    def __init__(self):
+        self._libc = _load_libc()
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            error = _get_errno()
+            raise OSError(error, os.strerror(error))
+        self.fd = fd
+
+    def fileno(self):
+        return self.fd
+
+    def add_watch(self, path, mask=DIRECTORY_CHANGES):
+        """
+        Watches a path.
+
+        Args:
+            path: File or directory path.
+            mask: Events of interest.
+
+        Returns:
+            int: Watch descriptor (the same one for a path already watched).
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            error = _get_errno()
+            raise OSError(error, os.strerror(error), path)
+        return wd
+
+    def remove_watch(self, wd):
+        """Stops watching a watch descriptor; errors for stale descriptors are ignored."""
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self):
+        """
+        Reads the pending events without blocking.
+
+        Returns:
+            list: (wd, mask, name) tuples; name is '' for events on the
+                  watched path itself.
+        """
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                events.append((wd, mask, name))
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
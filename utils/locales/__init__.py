@@ -0,0 +1 @@
+# Translation Catalogs Package
@@ -0,0 +1,261 @@
+"""
+English translations.
+"""
+
+TRANSLATIONS = {
+    # CLI Arguments
+    'cli': {
+        'description': 'Detect network monitoring and surveillance on your system',
+        'epilog': '''Examples:
+  python main.py                     # Run all checks
+  python main.py --json report.json  # Export results to JSON
+  python main.py --quick             # Skip slow checks
+  python main.py --lang zh           # Use Chinese output
+  python main.py --monitor           # Enable continuous monitoring
+  python main.py --dashboard         # Follow monitoring on a full-screen dashboard
+  python main.py --monitor --detector-workers  # Analyze sockets and processes on other cores
+  python main.py --monitor --record cycles.snap  # Record raw inputs of each cycle
+  python main.py --replay cycles.snap            # Replay a recording offline
+  python main.py --daemon            # Run as a daemon serving status queries
+  python main.py status              # Query the daemon's current state
+  python main.py --monitor --agent collector:47800  # Stream changes to a collector
+  python main.py fleet hosts HIGH    # Query hosts with HIGH risk
+  python main.py diff old.json new.json  # Compare two reports
+  python main.py --pcap capture.pcapng  # Check TLS certificates in a capture
+  python main.py --monitor --rules local.json  # Add detection rules (reloaded on SIGHUP)
+  sudo python main.py helper --group netmon  # Serve sockets and processes to unprivileged monitors
+  python main.py --monitor --helper   # Read them from the helper instead of running as root''',
+        'help_json': 'Export results to JSON file',
+        'help_quick': 'Skip slow checks (certificates, local listeners, firewall, conntrack, process environments and memory maps)',
+        'help_lang': 'Output language (zh=Chinese, en=English)',
+        'help_monitor': 'Enable continuous monitoring mode',
+        'help_interval': 'Monitoring detection interval in seconds (default: 30)',
+        'help_cert_interval': 'Minimum seconds between certificate checks in monitoring mode (default: 0, every cycle)',
+        'help_pcap': 'Analyze the TLS certificates in a pcap/pcapng capture offline',
+        'help_pcap_workers': 'Worker processes for --pcap, each reading a range of the file (default: 0, in-process)',
+        'help_rules': 'Additional rule file merged over the built-in rules (repeatable)',
+        'help_adaptive': 'Adapt each detector\'s interval: shorter after its module changes, backing off while it is stable',
+        'help_min_interval': 'Adaptive interval right after a change (default: a quarter of --interval)',
+        'help_max_interval': 'Longest adaptive interval of a stable detector (default: 8 times --interval)',
+        'help_cpu_budget': 'CPU budget in percent of one core; expensive detectors are deferred to stay within it (implies --adaptive)',
+        'help_detector_workers': 'Run the socket and process detectors in persistent worker processes, in parallel with the other detectors (monitor mode)',
+        'help_dashboard': 'Show monitoring mode as a full-screen terminal dashboard (implies --monitor)',
+        'help_record': "Record each cycle's raw system inputs to a binary file",
+        'help_replay': 'Replay the cycles of a recording at full speed (offline, deterministic)',
+        'help_daemon': 'Run monitoring as a daemon serving its state on a local socket',
+        'help_socket': 'Unix socket path of the daemon',
+        'help_status': 'Query a running daemon',
+        'help_status_query': 'What to query (status=summary, results=full results, changes=recent changes)',
+        'help_raw': 'Print the raw JSON reply',
+        'help_agent': 'Run as a fleet agent streaming change deltas to a collector',
+        'help_host_id': 'Host name reported to the collector (default: this host name)',
+        'help_helper': 'Read sockets, processes and namespaces from a privileged snapshot helper (default socket: /run/netmon-helper.sock)',
+        'help_helper_command': 'Run the privileged snapshot helper',
+        'help_helper_listen': 'Helper socket path (default: /run/netmon-helper.sock)',
+        'help_group': 'Group allowed to connect to the helper (default: root only)',
+        'help_max_age': 'Seconds a collected snapshot is served to clients before collecting again (default: 5)',
+        'help_collector': 'Run the fleet collector',
+        'help_listen': 'Collector listen address (default: 127.0.0.1:47800; the protocol is unauthenticated)',
+        'help_retention': 'Seconds finding appearance events are kept (default: 86400)',
+        'help_diff': 'Compare two JSON reports',
+        'help_diff_previous': 'Older report (written with --json)',
+        'help_diff_current': 'Newer report',
+        'help_diff_format': 'Output format (text=one line per change, ndjson=one JSON object per line)',
+        'help_fleet': 'Query a fleet collector',
+        'help_fleet_op': 'Query type (summary, hosts=hosts by risk, appeared=recently appeared findings, host=one host)',
+        'help_fleet_value': 'hosts: minimum risk level; appeared: text to match; host: host name',
+        'help_collector_address': 'Collector address (default: 127.0.0.1:47800)',
+        'help_since': 'Time window of the appeared query in seconds (default: 3600)',
+    },
+
+    # Progress Messages
+    'progress': {
+        'starting': 'Starting network monitoring detection...',
+        'please_wait': 'This may take a few moments...\n',
+        'checking_proxy': 'Checking proxy settings...',
+        'reading_firewall_rules': 'Reading firewall rules...',
+        'scanning_processes': 'Scanning for monitoring processes...',
+        'reading_environments': 'Reading process environments...',
+        'scanning_memory_maps': 'Scanning process memory maps...',
+        'analyzing_network': 'Analyzing network interfaces...',
+        'checking_neighbors': 'Checking the ARP neighbor table...',
+        'examining_connections': 'Examining network connections...',
+        'reading_conntrack': 'Streaming the connection tracking table...',
+        'probing_listeners': 'Probing local listeners for proxies...',
+        'testing_certificates': 'Testing TLS/SSL certificates...',
+        'correlating_findings': 'Correlating findings across modules...',
+        'skipping_slow': 'Skipping slow checks (--quick mode): {modules}\n',
+        'analyzing_pcap': 'Analyzing TLS certificates in {path}...',
+    },
+
+    # Module Names
+    'modules': {
+        'proxy_detection': 'Proxy Detection',
+        'firewall_detection': 'Transparent Proxy Rule Detection',
+        'process_detection': 'Process Detection',
+        'environ_detection': 'Process Environment Detection',
+        'injection_detection': 'Library Injection Detection',
+        'network_detection': 'Network Interface Detection',
+        'arp_detection': 'ARP Spoofing Detection',
+        'connection_analysis': 'Connection Analysis',
+        'conntrack_analysis': 'Connection Tracking Analysis',
+        'listener_detection': 'Local Proxy Detection',
+        'certificate_detection': 'Certificate Detection',
+        'correlation': 'Correlated Incidents',
+        'pcap_analysis': 'PCAP Analysis',
+    },
+
+    # Finding Types
+    'findings': {
+        'Environment Proxy': 'Environment Proxy',
+        'Windows System Proxy': 'Windows System Proxy',
+        'Windows Auto-Config Proxy': 'Windows Auto-Config Proxy',
+        'Configured Proxy': 'Configured Proxy',
+        'Transparent Proxy Rule': 'Transparent Proxy Rule',
+        'Suspicious Process': 'Suspicious Process',
+        'TLS Key Logging': 'TLS Key Logging',
+        'Library Preload': 'Library Preload',
+        'Process Proxy': 'Process Proxy',
+        'Injected Library': 'Injected Library',
+        'Virtual Network Adapter': 'Virtual Network Adapter',
+        'Network Namespaces': 'Network Namespaces',
+        'VPN Connection': 'VPN Connection',
+        'Gateway MAC Changed': 'Gateway MAC Changed',
+        'Neighbor MAC Changed': 'Neighbor MAC Changed',
+        'Duplicate MAC Address': 'Duplicate MAC Address',
+        'Suspicious Listening Port': 'Suspicious Listening Port',
+        'Local Proxy Listener': 'Local Proxy Listener',
+        'TLS Intercepting Listener': 'TLS Intercepting Listener',
+        'Correlated Incident': 'Correlated Incident',
+        'Permission': 'Permission',
+        'Multiple Connections': 'Multiple Connections',
+        'Suspicious Remote Connection': 'Suspicious Remote Connection',
+        'Transparent Proxy Redirect': 'Transparent Proxy Redirect',
+        'NAT Redirect': 'NAT Redirect',
+        'Conntrack Statistics': 'Conntrack Statistics',
+        'Network Statistics': 'Network Statistics',
+        'Suspicious Certificate Issuer': 'Suspicious Certificate Issuer',
+        'Self-Signed Certificate': 'Self-Signed Certificate',
+        'Unknown Root Certificate': 'Unknown Root Certificate',
+        'New Root Certificate': 'New Root Certificate',
+        'Suspicious Root Certificate': 'Suspicious Root Certificate',
+        'TLS Error': 'TLS Error',
+        'TLS Latency Shift': 'TLS Latency Shift',
+        'PCAP Summary': 'PCAP Summary',
+        'Error': 'Error',
+    },
+
+    # Detail Templates
+    'templates': {
+        'env_proxy': '{var}={value}',
+        'proxy_server': 'Proxy Server: {server}',
+        'auto_config_url': 'Auto-config URL: {url}',
+        'process_found': '{desc} (PID: {pid}, Name: {name})',
+        'virtual_adapter': 'Interface: {interface} (may indicate VPN or VM)',
+        'vpn_detected': 'Detected {vpn_type} connection',
+        'listening_port': 'Port {port} ({desc}) - PID: {pid}',
+        'permission_denied': 'Insufficient permissions to check all listening ports (try running as administrator)',
+        'multiple_conns': '{count} connections to {ip}',
+        'remote_conn': 'Connected to {ip}:{port} ({desc})',
+        'net_stats': 'Sent: {sent}, Received: {recv}',
+        'cert_issuer': '{hostname}: Issued by {org} (possible MITM)',
+        'self_signed': '{hostname}: Certificate is self-signed (possible MITM)',
+        'tls_error': '{hostname}: SSL Error - {error} (possible interception)',
+        'failed_to_run': 'Failed to run detector: {error}',
+        'failed_check': 'Failed to check: {error}',
+    },
+
+    # Report Labels
+    'report': {
+        'title': 'Network Monitoring Detection Report',
+        'generated': 'Generated',
+        'overall_risk': 'Overall Risk Level',
+        'risk_level': 'Risk Level',
+        'findings_count': 'Findings',
+        'summary': 'Summary',
+        'total_checks': 'Total Checks',
+        'total_findings': 'Total Findings',
+        'exported': 'Report exported to: {filename}',
+    },
+
+    # Risk Levels
+    'risk_levels': {
+        'HIGH': 'HIGH',
+        'MEDIUM': 'MEDIUM',
+        'LOW': 'LOW',
+    },
+
+    # Severity Levels
+    'severity_levels': {
+        'HIGH': 'HIGH',
+        'MEDIUM': 'MEDIUM',
+        'LOW': 'LOW',
+        'INFO': 'INFO',
+    },
+
+    # Final Messages
+    'messages': {
+        'note': 'Note: This tool provides indicators of potential monitoring.',
+        'note2': 'Some findings may be legitimate (corporate VPN, security software, etc.)',
+        'note3': 'Use your judgment to interpret the results.\n',
+        'cancelled': '\n\nOperation cancelled by user.',
+        'fatal_error': '\nFatal error: {error}',
+        'detector_error': 'Error running {detector}: {error}',
+        'daemon_unavailable': 'Monitoring daemon is not reachable: {error}',
+        'collector_listening': 'Fleet collector listening on {address}',
+        'collector_unavailable': 'Fleet collector is not reachable: {error}',
+        'pcap_unreadable': 'Cannot analyze capture: {error}',
+        'helper_listening': 'Snapshot helper listening on {path}',
+        'helper_unavailable': 'Snapshot helper is not reachable: {error}',
+        'dashboard_no_tty': 'The dashboard needs an interactive terminal',
+        'diff_unreadable': 'Cannot compare reports: {error}',
+        'rules_invalid': 'Cannot load rules: {error}',
+        'interval_bounds_ignored': 'Warning: --min-interval and --max-interval are ignored without --adaptive or --cpu-budget',
+    },
+
+    # Monitoring Mode
+    'monitor': {
+        'title': 'Continuous Monitoring Mode',
+        'started': 'Started',
+        'interval': 'Detection Interval',
+        'seconds': 'seconds',
+        'stop_hint': 'Stop monitoring',
+        'running_initial_scan': 'Running initial scan',
+        'adaptive_cadence': 'Adaptive intervals: {min}-{max} seconds per detector',
+        'cpu_budget': 'CPU budget: {budget}% of one core',
+        'cycle_complete': 'Cycle #{cycle} completed',
+        'no_changes': 'No changes detected',
+        'changes_detected': 'System state changes detected',
+        'new_activity_detected': 'New monitoring activity detected:',
+        'resolved_activity': 'Resolved monitoring activity:',
+        'risk_changed': 'Risk level changed',
+        'stopping': 'Stopping monitoring...',
+        'replay_complete': 'Replay finished after {cycles} cycles',
+        'daemon_listening': 'Status socket: {path}',
+        'rules_reloaded': 'Rules reloaded ({count} rules)',
+        'rules_reload_failed': 'Rules not reloaded, keeping the previous rules: {error}',
+    },
+
+    # Monitoring Dashboard
+    'dashboard': {
+        'title': 'Network Monitoring Dashboard',
+        'cycle': 'Cycle',
+        'uptime': 'Uptime',
+        'interval': 'Interval',
+        'network': 'Network',
+        'module': 'Module',
+        'risk': 'Risk',
+        'findings': 'Findings',
+        'time': 'Time',
+        'history': 'Time history',
+        'recent_changes': 'Recent changes',
+        'keys': 'q: quit  Ctrl-L: redraw',
+        'frame': 'frame {ms} ms',
+    },
+
+    # Report Diff
+    'diff': {
+        'summary': '{new} new, {resolved} resolved, {risk} risk level changes',
+        'no_changes': 'No differences',
+    },
+}
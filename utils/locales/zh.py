@@ -0,0 +1,261 @@
+"""
+Chinese translations.
+"""
+
+TRANSLATIONS = {
+    # CLI Arguments
+    'cli': {
+        'description': '检测系统上的网络监控和监视',
+        'epilog': '''示例:
+  python main.py                     # 运行所有检查
+  python main.py --json report.json  # 导出结果到JSON
+  python main.py --quick             # 跳过缓慢的检查
+  python main.py --lang en           # 使用英文输出
+  python main.py --monitor           # 启用持续监控模式
+  python main.py --dashboard         # 在全屏仪表盘上跟踪监控
+  python main.py --monitor --detector-workers  # 在其他CPU核心上分析套接字和进程
+  python main.py --monitor --record cycles.snap  # 记录每个周期的原始输入
+  python main.py --replay cycles.snap            # 离线回放记录
+  python main.py --daemon            # 以守护进程运行并提供状态查询
+  python main.py status              # 查询守护进程的当前状态
+  python main.py --monitor --agent collector:47800  # 向集群收集器发送变化
+  python main.py fleet hosts HIGH    # 查询高风险主机
+  python main.py diff old.json new.json  # 比较两个报告
+  python main.py --pcap capture.pcapng  # 检查抓包文件中的TLS证书
+  python main.py --monitor --rules local.json  # 添加检测规则(收到SIGHUP时重新加载)
+  sudo python main.py helper --group netmon  # 为非特权监控提供套接字和进程信息
+  python main.py --monitor --helper   # 从助手读取而无需以root运行''',
+        'help_json': '将结果导出到JSON文件',
+        'help_quick': '跳过缓慢的检查(证书、本地监听端口、防火墙、连接跟踪、进程环境和内存映射)',
+        'help_lang': '输出语言 (zh=中文, en=英文)',
+        'help_monitor': '启用持续监控模式',
+        'help_interval': '监控检测间隔(秒，默认30秒)',
+        'help_cert_interval': '监控模式下证书检查的最小间隔(秒，默认0，即每个周期)',
+        'help_pcap': '离线分析pcap/pcapng抓包文件中的TLS证书',
+        'help_pcap_workers': '--pcap使用的工作进程数，每个进程读取文件的一段(默认0，即在当前进程中)',
+        'help_rules': '合并到内置规则之上的附加规则文件(可重复指定)',
+        'help_adaptive': '自适应调整每个检测器的间隔: 模块变化后缩短，保持稳定时逐步延长',
+        'help_min_interval': '发生变化后的自适应间隔(默认: --interval 的四分之一)',
+        'help_max_interval': '稳定检测器的最长自适应间隔(默认: --interval 的8倍)',
+        'help_cpu_budget': 'CPU预算，以单核百分比表示；为保持在预算内会推迟开销大的检测器(隐含 --adaptive)',
+        'help_detector_workers': '在常驻工作进程中运行套接字和进程检测器，与其他检测器并行(监控模式)',
+        'help_dashboard': '以全屏终端仪表盘显示监控模式(隐含 --monitor)',
+        'help_record': '将每个周期的原始系统输入记录到二进制文件',
+        'help_replay': '以最快速度回放记录文件中的周期(离线、可重现)',
+        'help_daemon': '以守护进程运行监控，并通过本地套接字提供状态查询',
+        'help_socket': '守护进程的 Unix 套接字路径',
+        'help_status': '查询正在运行的守护进程',
+        'help_status_query': '查询内容 (status=摘要, results=完整结果, changes=最近变化)',
+        'help_raw': '输出原始JSON',
+        'help_agent': '以代理模式运行，将变化增量发送到集群收集器',
+        'help_host_id': '向收集器报告的主机名(默认: 本机主机名)',
+        'help_helper': '从特权快照助手读取套接字、进程和命名空间(默认套接字: /run/netmon-helper.sock)',
+        'help_helper_command': '运行特权快照助手',
+        'help_helper_listen': '助手套接字路径(默认: /run/netmon-helper.sock)',
+        'help_group': '允许连接助手的用户组(默认: 仅root)',
+        'help_max_age': '采集的快照在重新采集前提供给客户端的秒数(默认: 5)',
+        'help_collector': '运行集群收集器',
+        'help_listen': '收集器监听地址 (默认: 127.0.0.1:47800；协议没有认证)',
+        'help_retention': '保留发现出现事件的时长(秒，默认86400)',
+        'help_diff': '比较两个JSON报告',
+        'help_diff_previous': '较旧的报告(由 --json 导出)',
+        'help_diff_current': '较新的报告',
+        'help_diff_format': '输出格式(text=每个变化一行, ndjson=每行一个JSON对象)',
+        'help_fleet': '查询集群收集器',
+        'help_fleet_op': '查询类型 (summary=概要, hosts=按风险筛选主机, appeared=最近出现的发现, host=单个主机)',
+        'help_fleet_value': 'hosts: 最低风险级别; appeared: 匹配文本; host: 主机名',
+        'help_collector_address': '收集器地址 (默认: 127.0.0.1:47800)',
+        'help_since': 'appeared 查询的时间窗口(秒，默认3600)',
+    },
+
+    # Progress Messages
+    'progress': {
+        'starting': '开始网络监控检测...',
+        'please_wait': '这可能需要一些时间...\n',
+        'checking_proxy': '检查代理设置...',
+        'reading_firewall_rules': '读取防火墙规则...',
+        'scanning_processes': '扫描监控进程...',
+        'reading_environments': '读取进程环境变量...',
+        'scanning_memory_maps': '扫描进程内存映射...',
+        'analyzing_network': '分析网络接口...',
+        'checking_neighbors': '检查ARP邻居表...',
+        'examining_connections': '检查网络连接...',
+        'reading_conntrack': '流式读取连接跟踪表...',
+        'probing_listeners': '探测本地监听端口中的代理...',
+        'testing_certificates': '测试TLS/SSL证书...',
+        'correlating_findings': '关联各模块的发现...',
+        'skipping_slow': '跳过较慢的检查(快速模式): {modules}\n',
+        'analyzing_pcap': '正在分析 {path} 中的TLS证书...',
+    },
+
+    # Module Names
+    'modules': {
+        'proxy_detection': '代理检测',
+        'firewall_detection': '透明代理规则检测',
+        'process_detection': '进程检测',
+        'environ_detection': '进程环境检测',
+        'injection_detection': '库注入检测',
+        'network_detection': '网络接口检测',
+        'arp_detection': 'ARP欺骗检测',
+        'connection_analysis': '连接分析',
+        'conntrack_analysis': '连接跟踪分析',
+        'listener_detection': '本地代理检测',
+        'certificate_detection': '证书检测',
+        'correlation': '关联事件',
+        'pcap_analysis': '抓包分析',
+    },
+
+    # Finding Types
+    'findings': {
+        'Environment Proxy': '环境变量代理',
+        'Windows System Proxy': 'Windows系统代理',
+        'Windows Auto-Config Proxy': 'Windows自动配置代理',
+        'Configured Proxy': '配置文件代理',
+        'Transparent Proxy Rule': '透明代理规则',
+        'Suspicious Process': '可疑进程',
+        'TLS Key Logging': 'TLS密钥记录',
+        'Library Preload': '库预加载',
+        'Process Proxy': '进程代理',
+        'Injected Library': '注入的库',
+        'Virtual Network Adapter': '虚拟网络适配器',
+        'Network Namespaces': '网络命名空间',
+        'VPN Connection': 'VPN连接',
+        'Gateway MAC Changed': '网关MAC地址变更',
+        'Neighbor MAC Changed': '邻居MAC地址变更',
+        'Duplicate MAC Address': '重复的MAC地址',
+        'Suspicious Listening Port': '可疑监听端口',
+        'Local Proxy Listener': '本地代理监听',
+        'TLS Intercepting Listener': 'TLS拦截监听',
+        'Correlated Incident': '关联事件',
+        'Permission': '权限',
+        'Multiple Connections': '多个连接',
+        'Suspicious Remote Connection': '可疑远程连接',
+        'Transparent Proxy Redirect': '透明代理重定向',
+        'NAT Redirect': 'NAT重定向',
+        'Conntrack Statistics': '连接跟踪统计',
+        'Network Statistics': '网络统计',
+        'Suspicious Certificate Issuer': '可疑证书颁发者',
+        'Self-Signed Certificate': '自签名证书',
+        'Unknown Root Certificate': '未知根证书',
+        'New Root Certificate': '新增根证书',
+        'Suspicious Root Certificate': '可疑根证书',
+        'TLS Error': 'TLS错误',
+        'TLS Latency Shift': 'TLS延迟偏移',
+        'PCAP Summary': '抓包摘要',
+        'Error': '错误',
+    },
+
+    # Detail Templates
+    'templates': {
+        'env_proxy': '{var}={value}',
+        'proxy_server': '代理服务器: {server}',
+        'auto_config_url': '自动配置URL: {url}',
+        'process_found': '{desc} (PID: {pid}, 名称: {name})',
+        'virtual_adapter': '接口: {interface} (可能表示VPN或虚拟机)',
+        'vpn_detected': '检测到 {vpn_type} 连接',
+        'listening_port': '端口 {port} ({desc}) - PID: {pid}',
+        'permission_denied': '权限不足,无法检查所有监听端口(请尝试以管理员身份运行)',
+        'multiple_conns': '{count} 个连接到 {ip}',
+        'remote_conn': '连接到 {ip}:{port} ({desc})',
+        'net_stats': '发送: {sent}, 接收: {recv}',
+        'cert_issuer': '{hostname}: 由 {org} 颁发 (可能存在MITM)',
+        'self_signed': '{hostname}: 证书为自签名 (可能存在MITM)',
+        'tls_error': '{hostname}: SSL错误 - {error} (可能被拦截)',
+        'failed_to_run': '运行检测器失败: {error}',
+        'failed_check': '检查失败: {error}',
+    },
+
+    # Report Labels
+    'report': {
+        'title': '网络监控检测报告',
+        'generated': '生成时间',
+        'overall_risk': '总体风险级别',
+        'risk_level': '风险级别',
+        'findings_count': '发现',
+        'summary': '摘要',
+        'total_checks': '总检查数',
+        'total_findings': '总发现数',
+        'exported': '报告已导出到: {filename}',
+    },
+
+    # Risk Levels
+    'risk_levels': {
+        'HIGH': '高',
+        'MEDIUM': '中',
+        'LOW': '低',
+    },
+
+    # Severity Levels
+    'severity_levels': {
+        'HIGH': '高',
+        'MEDIUM': '中',
+        'LOW': '低',
+        'INFO': '信息',
+    },
+
+    # Final Messages
+    'messages': {
+        'note': '注意: 此工具提供潜在监控的指示器。',
+        'note2': '某些发现可能是合法的(企业VPN、安全软件等)',
+        'note3': '请根据实际情况判断结果。\n',
+        'cancelled': '\n\n操作已被用户取消。',
+        'fatal_error': '\n致命错误: {error}',
+        'detector_error': '运行 {detector} 时出错: {error}',
+        'daemon_unavailable': '无法连接监控守护进程: {error}',
+        'collector_listening': '集群收集器正在监听 {address}',
+        'collector_unavailable': '无法连接集群收集器: {error}',
+        'pcap_unreadable': '无法分析抓包文件: {error}',
+        'helper_listening': '快照助手正在监听 {path}',
+        'helper_unavailable': '无法连接快照助手: {error}',
+        'dashboard_no_tty': '仪表盘需要交互式终端',
+        'diff_unreadable': '无法比较报告: {error}',
+        'rules_invalid': '无法加载规则: {error}',
+        'interval_bounds_ignored': '警告: 未指定 --adaptive 或 --cpu-budget 时，--min-interval 和 --max-interval 不起作用',
+    },
+
+    # Monitoring Mode
+    'monitor': {
+        'title': '持续监控模式',
+        'started': '启动时间',
+        'interval': '检测间隔',
+        'seconds': '秒',
+        'stop_hint': '停止监控',
+        'running_initial_scan': '正在执行初始扫描',
+        'adaptive_cadence': '自适应间隔: 每个检测器 {min}-{max} 秒',
+        'cpu_budget': 'CPU预算: 单核的 {budget}%',
+        'cycle_complete': '周期 #{cycle} 完成',
+        'no_changes': '未发现变化',
+        'changes_detected': '检测到系统状态变化',
+        'new_activity_detected': '发现新的监控活动:',
+        'resolved_activity': '已解决的监控活动:',
+        'risk_changed': '风险级别变化',
+        'stopping': '正在停止监控...',
+        'replay_complete': '回放完成，共 {cycles} 个周期',
+        'daemon_listening': '状态查询套接字: {path}',
+        'rules_reloaded': '规则已重新加载(共 {count} 条规则)',
+        'rules_reload_failed': '规则未重新加载，继续使用之前的规则: {error}',
+    },
+
+    # Monitoring Dashboard
+    'dashboard': {
+        'title': '网络监控仪表盘',
+        'cycle': '周期',
+        'uptime': '运行时间',
+        'interval': '间隔',
+        'network': '网络',
+        'module': '模块',
+        'risk': '风险',
+        'findings': '发现',
+        'time': '耗时',
+        'history': '耗时历史',
+        'recent_changes': '最近变化',
+        'keys': 'q: 退出  Ctrl-L: 重绘',
+        'frame': '帧 {ms} 毫秒',
+    },
+
+    # Report Diff
+    'diff': {
+        'summary': '新增 {new} 项，已解决 {resolved} 项，风险级别变化 {risk} 项',
+        'no_changes': '没有差异',
+    },
+}
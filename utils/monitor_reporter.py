@@ -10,17 +10,23 @@ from utils.reporter import Reporter
 class MonitorReporter(Reporter):
     """Reporter specialized for monitoring mode"""
 
-    def print_monitoring_header(self, interval):
+    def print_monitoring_header(self, interval, cadence=None):
         """
         Prints the monitoring start information.
 
         Args:
             interval: Detection interval in seconds.
+            cadence: AdaptiveCadence, if the intervals are adaptive.
         """
         print("\n" + "=" * 70)
         print(f"{Fore.CYAN}{Style.BRIGHT}{self.translator.t('monitor.title')}{Style.RESET_ALL}")
         print(f"{self.translator.t('monitor.started')}: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{self.translator.t('monitor.interval')}: {interval} {self.translator.t('monitor.seconds')}")
+        if cadence is not None:
+            print(self.translator.t('monitor.adaptive_cadence',
+                                    min=f"{cadence.min_interval:g}", max=f"{cadence.max_interval:g}"))
+            if cadence.cpu_budget:
+                print(self.translator.t('monitor.cpu_budget', budget=f"{cadence.cpu_budget * 100:g}"))
         print(f"{self.translator.t('monitor.stop_hint')}: Ctrl+C")
         print("=" * 70)
         print(f"\n{self.translator.t('monitor.running_initial_scan')}...\n")
@@ -38,6 +44,24 @@ class MonitorReporter(Reporter):
               f"{self.translator.t('monitor.cycle_complete', cycle=cycle)} - "
               f"{self.translator.t('monitor.no_changes')}")
 
+    def print_rules_reloaded(self, count):
+        """
+        Prints the confirmation of a rule reload (SIGHUP).
+
+        Args:
+            count: Number of rules loaded.
+        """
+        print(self.translator.t('monitor.rules_reloaded', count=count))
+
+    def print_rules_reload_failed(self, error):
+        """
+        Prints why a rule reload failed; the previous rules stay in effect.
+
+        Args:
+            error: Error message.
+        """
+        print(f"{Fore.YELLOW}{self.translator.t('monitor.rules_reload_failed', error=error)}{Style.RESET_ALL}")
+
     def print_change_alert(self, changes):
         """
         Prints a change alert (highlighted).
@@ -45,49 +69,65 @@ class MonitorReporter(Reporter):
         Args:
             changes: A dictionary of changes, including new findings and risk level changes.
         """
+        self._write(self.render_change_alert(changes))
+
+    def render_change_alert(self, changes):
+        """
+        Renders a change alert into one string.
+
+        Args:
+            changes: A dictionary of changes, including new findings and risk level changes.
+
+        Returns:
+            str: The rendered alert.
+        """
+        t = self.translator.t
+        finding_types = self.translator.labels('findings')
         timestamp = changes['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
+        lines = []
+        add = lines.append
 
-        print("\n" + "!" * 70)
-        print(f"{Fore.YELLOW}{Style.BRIGHT}🔔 {self.translator.t('monitor.changes_detected')}!{Style.RESET_ALL}")
-        print(f"{self.translator.t('report.generated')}: {timestamp}")
-        print("!" * 70 + "\n")
+        add("\n" + "!" * 70)
+        add(f"{Fore.YELLOW}{Style.BRIGHT}🔔 {t('monitor.changes_detected')}!{Style.RESET_ALL}")
+        add(f"{t('report.generated')}: {timestamp}")
+        add("!" * 70 + "\n")
 
-        # Print new findings
+        # New findings
         if changes.get('new_findings'):
-            print(f" {Fore.RED}{Style.BRIGHT}⚠️ {self.translator.t('monitor.new_activity_detected')}{Style.RESET_ALL}")
+            severity_levels = self.translator.labels('severity_levels')
+            add(f" {Fore.RED}{Style.BRIGHT}⚠️ {t('monitor.new_activity_detected')}{Style.RESET_ALL}")
             for item in changes['new_findings']:
                 module_name = item['module']
                 severity = item['severity']
                 severity_color = self._get_severity_color(severity)
-                severity_text = self.translator.t(f'severity_levels.{severity}')
+                severity_text = severity_levels[severity]
 
-                print(f"  {Fore.YELLOW}[{module_name}]{Style.RESET_ALL} "
-                      f"{self.translator.t('report.risk_level')}: {severity_color}{severity_text}{Style.RESET_ALL}")
+                add(f"  {Fore.YELLOW}[{module_name}]{Style.RESET_ALL} "
+                    f"{t('report.risk_level')}: {severity_color}{severity_text}{Style.RESET_ALL}")
+                lines.extend(f"    • {finding_types[finding['type']]}: {finding['detail']}"
+                             for finding in item['findings'])
+                add('')
 
-                for finding in item['findings']:
-                    finding_type = self.translator.t(f"findings.{finding['type']}")
-                    print(f"    • {finding_type}: {finding['detail']}")
-                print()
-
-        # Print removed findings
+        # Removed findings
         if changes.get('removed_findings'):
-            print(f" {Fore.GREEN}{Style.BRIGHT}✓ {self.translator.t('monitor.resolved_activity')}{Style.RESET_ALL}")
+            add(f" {Fore.GREEN}{Style.BRIGHT}✓ {t('monitor.resolved_activity')}{Style.RESET_ALL}")
             for item in changes['removed_findings']:
                 module_name = item['module']
-                print(f"  {Fore.GREEN}[{module_name}]{Style.RESET_ALL}")
-
-                for finding in item['findings']:
-                    finding_type = self.translator.t(f"findings.{finding['type']}")
-                    print(f"    • {Fore.GREEN}{finding_type}: {finding['detail']}{Style.RESET_ALL}")
-                print()
+                add(f"  {Fore.GREEN}[{module_name}]{Style.RESET_ALL}")
+                lines.extend(f"    • {Fore.GREEN}{finding_types[finding['type']]}: {finding['detail']}{Style.RESET_ALL}"
+                             for finding in item['findings'])
+                add('')
 
-        # Print risk level changes
+        # Risk level changes
         if changes.get('risk_changes'):
+            risk_levels = self.translator.labels('risk_levels')
             for change in changes['risk_changes']:
-                from_level = self.translator.t(f'risk_levels.{change["from"]}')
-                to_level = self.translator.t(f'risk_levels.{change["to"]}')
+                from_level = risk_levels[change['from']]
+                to_level = risk_levels[change['to']]
 
-                print(f"  {Fore.YELLOW}[{change['module']}]{Style.RESET_ALL} "
-                      f"{self.translator.t('monitor.risk_changed')}: {from_level} → {to_level}")
+                add(f"  {Fore.YELLOW}[{change['module']}]{Style.RESET_ALL} "
+                    f"{t('monitor.risk_changed')}: {from_level} → {to_level}")
 
-        print("!" * 70 + "\n")
+        add("!" * 70 + "\n")
+        lines.append('')
+        return "\n".join(lines)
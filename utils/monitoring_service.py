@@ -2,17 +2,23 @@
 Monitoring Service Module
 Manages continuous monitoring loop and state
 """
-import time
 import signal
 import sys
+import threading
+import time
 from datetime import datetime
 from detectors.certificate_detector import CertificateDetector
+from utils.correlation import CorrelationEngine
+from utils.rules import RuleError, rules
+from utils.snapshot import SnapshotMissing, SystemSnapshot
+from utils.worker_pool import WorkerError
 
 
 class MonitoringService:
     """Continuous monitoring service"""
 
-    def __init__(self, translator, detectors, reporter, interval=30):
+    def __init__(self, translator, detectors, reporter, interval=30, snapshot=None, cert_interval=0,
+                 cadence=None, install_signal_handlers=True, pool=None):
         """
         Initializes the monitoring service.
 
@@ -21,43 +27,125 @@ class MonitoringService:
             detectors: List of detectors [(message, detector), ...].
             reporter: MonitorReporter instance.
             interval: Detection interval in seconds, default is 30 seconds.
+            snapshot: SystemSnapshot shared by the detectors, refreshed before
+                each cycle. A ReplaySnapshot runs the cycles back to back.
+            cert_interval: Minimum seconds between certificate checks; 0 checks
+                on every cycle (repeat probes resume the TLS session and reuse
+                pinned results, so they are cheap).
+            cadence: Optional AdaptiveCadence; each detector then runs on its
+                own interval and the results of the others are carried
+                forward. Ignored when replaying a recording.
+            install_signal_handlers: Whether SIGINT/SIGTERM stop the process
+                and SIGHUP reloads the rules. Only possible in the main
+                thread; embedding applications call stop() instead.
+            pool: Optional DetectorPool running the CPU-bound detectors in
+                worker processes. Ignored unless the snapshot collects the
+                inputs of this host itself (not with a replay or the helper).
         """
         self.translator = translator
         self.detectors = detectors
         self.reporter = reporter
         self.interval = interval
+        self.snapshot = snapshot or SystemSnapshot()
         self.previous_state = None
         self.running = False
         self.start_time = None
         self.cycle_count = 0
         self.last_cert_check = None
-        self.cert_check_interval = 300  # 5 minutes
+        self.cert_check_interval = cert_interval
+        self.observers = []
+        self.correlator = CorrelationEngine(translator)
+        self.cadence = cadence if self.snapshot.realtime else None
+        if self.cadence and cert_interval:
+            self.cadence.floors[CertificateDetector.__name__] = cert_interval
+        self.pool = pool if self.snapshot.local else None
+        if self.cadence and self.pool:
+            # The CPU budget covers the workers too
+            self.cadence.cpu_clock = self.pool.cpu_clock
+        # Detector key -> its last result, carried forward while it is not due
+        self.last_results = {}
+        self.cycle_costs = {}
+        self.cycle_durations = {}
+        # Set by detectors watching their inputs, to run a cycle right away
+        self.wake_event = threading.Event()
 
-        # Register signal handler (Ctrl+C)
-        signal.signal(signal.SIGINT, self._signal_handler)
+        if install_signal_handlers:
+            # Register signal handlers (Ctrl+C, and termination when running as a daemon)
+            signal.signal(signal.SIGINT, self._signal_handler)
+            signal.signal(signal.SIGTERM, self._signal_handler)
+            # SIGHUP reloads the rule files before the next cycle
+            if hasattr(signal, 'SIGHUP'):
+                signal.signal(signal.SIGHUP, self._reload_handler)
+
+    def add_observer(self, observer):
+        """
+        Registers an observer notified after every cycle.
+
+        Args:
+            observer: Object with an on_cycle(service, results, changes) method.
+                changes is None for the initial scan.
+        """
+        self.observers.append(observer)
+
+    def wake(self):
+        """
+        Runs the next detection cycle now instead of after the interval.
+
+        Safe to call from any thread; detectors that watch their inputs
+        (start_watching) call it when the inputs change.
+        """
+        self.wake_event.set()
 
     def start(self):
         """Starts continuous monitoring."""
         self.running = True
         self.start_time = datetime.now()
 
+        # Live inputs that can be watched push their changes into the loop
+        watching = []
+        if self.snapshot.realtime:
+            for _, detector in self.detectors:
+                if hasattr(detector, 'start_watching') and detector.start_watching(self.wake):
+                    watching.append(detector)
+
         # Print monitoring start information
-        self.reporter.print_monitoring_header(self.interval)
+        self.reporter.print_monitoring_header(self.interval, self.cadence)
+
+        try:
+            # First full detection cycle
+            self.previous_state = self._run_detection_cycle(is_first=True)
+            if self.cadence and self.previous_state is not None:
+                self.cadence.end_cycle(self.cycle_costs, set())
+            if self.previous_state is not None:
+                self._notify_observers(self.previous_state, None)
 
-        # First full detection cycle
-        self.previous_state = self._run_detection_cycle(is_first=True)
+            # Enter monitoring loop
+            while self.running and self.previous_state is not None:
+                if self.snapshot.realtime:
+                    timeout = self.cadence.next_due() if self.cadence else self.interval
+                    if self.wake_event.wait(timeout) and self.cadence:
+                        # Inputs of a watching detector changed: check it now
+                        self.cadence.reset({self._key(detector) for detector in watching})
+                    self.wake_event.clear()
 
-        # Enter monitoring loop
-        while self.running:
-            time.sleep(self.interval)
+                if not self.running:
+                    break
 
-            if not self.running:
-                break
+                current_state = self._run_detection_cycle()
+                if current_state is None:
+                    # Replayed recording exhausted
+                    break
 
-            current_state = self._run_detection_cycle()
-            self._handle_changes(current_state)
-            self.previous_state = current_state
-            self.cycle_count += 1
+                changes = self._handle_changes(current_state)
+                if self.cadence:
+                    self._update_cadence(changes)
+                self.previous_state = current_state
+                self.cycle_count += 1
+                self._notify_observers(current_state, changes)
+        finally:
+            for detector in watching:
+                detector.stop_watching()
+            self.snapshot.close()
 
     def _run_detection_cycle(self, is_first=False):
         """
@@ -67,27 +155,121 @@ class MonitoringService:
             is_first: Whether it is the first detection.
 
         Returns:
-            list: List of detection results.
+            list: List of detection results, or None if no more cycles are
+                available from the snapshot.
         """
+        if not self.snapshot.refresh():
+            return None
+
+        if rules.reload_requested:
+            self._reload_rules()
+
         results = []
+        # CPU seconds of the detectors that ran, for the cadence, and their
+        # wall-clock seconds, for observers
+        self.cycle_costs = {}
+        self.cycle_durations = {}
+        now = time.monotonic()
+
+        # Pooled detectors start first and run in their workers while the
+        # others run here; their results are collected afterwards
+        pooled = []
+        if self.pool:
+            pooled = [detector for _, detector in self.detectors if self.pool.handles(detector)
+                      and not (self.cadence and not self.cadence.due(self._key(detector), now))]
+            self.pool.dispatch(pooled, self.snapshot)
+        waiting = []
 
         for message, detector in self.detectors:
-            # Special handling for certificate detection
-            if isinstance(detector, CertificateDetector):
+            key = self._key(detector)
+            if self.cadence and not self.cadence.due(key, now):
+                if key in self.last_results:
+                    results.append(self.last_results[key])
+                continue
+
+            if detector in pooled:
+                waiting.append((len(results), key, detector))
+                results.append(None)
+                continue
+
+            # Special handling for certificate detection (the cadence
+            # applies the certificate interval itself)
+            if isinstance(detector, CertificateDetector) and not self.cadence:
                 if not self._should_run_certificate_check():
+                    # Carry the last result forward, so that the current
+                    # state stays complete between certificate checks
+                    if key in self.last_results:
+                        results.append(self.last_results[key])
                     continue
-                self.last_cert_check = datetime.now()
+                self.last_cert_check = self.snapshot.captured_at
 
-            try:
-                result = detector.detect()
+            result = self._run_detector(key, detector)
+            if result is not None:
                 results.append(result)
-            except Exception as e:
-                # Silently handle errors to avoid interrupting monitoring
-                # Can choose to log to a file
-                pass
+
+        for index, key, detector in waiting:
+            try:
+                result, cpu, wall = self.pool.result(detector)
+            except WorkerError:
+                # The worker died: run the detector here this time; the pool
+                # starts a new worker on the next cycle
+                result = self._run_detector(key, detector)
+            else:
+                self.cycle_costs[key] = cpu
+                self.cycle_durations[key] = wall
+                if result is not None:
+                    self.last_results[key] = result
+            results[index] = result
+        if waiting:
+            results = [result for result in results if result is not None]
+
+        # Link the findings of different modules into incidents
+        results.append(self.correlator.correlate(results))
 
         return results
 
+    def _run_detector(self, key, detector):
+        """
+        Runs a detector in this process, recording its costs.
+
+        Returns:
+            dict: Its result, the last one if its input was not recorded in
+                this cycle, or None.
+        """
+        started = time.process_time()
+        wall_started = time.perf_counter()
+        result = None
+        try:
+            result = detector.detect()
+            self.last_results[key] = result
+        except SnapshotMissing:
+            # Not recorded in this cycle of a recording
+            result = self.last_results.get(key)
+        except Exception as e:
+            # Silently handle errors to avoid interrupting monitoring
+            # Can choose to log to a file
+            pass
+        self.cycle_costs[key] = time.process_time() - started
+        self.cycle_durations[key] = time.perf_counter() - wall_started
+        return result
+
+    def _key(self, detector):
+        """Returns the key of a detector in the cadence and the carried results."""
+        return detector.__class__.__name__
+
+    def _update_cadence(self, changes):
+        """
+        Passes the cycle's detector costs and changed modules to the cadence.
+
+        Args:
+            changes: The change report of the cycle.
+        """
+        changed_modules = set()
+        for kind in ('new_findings', 'removed_findings', 'risk_changes'):
+            changed_modules.update(change['module'] for change in changes.get(kind, ()))
+        changed = {key for key, result in self.last_results.items() if result['name'] in changed_modules}
+        self.cadence.end_cycle(self.cycle_costs, changed)
+
     def _should_run_certificate_check(self):
         """
         Determines if the certificate check should be run.
@@ -98,7 +280,7 @@ class MonitoringService:
         if self.last_cert_check is None:
             return True
 
-        elapsed = (datetime.now() - self.last_cert_check).total_seconds()
+        elapsed = (self.snapshot.captured_at - self.last_cert_check).total_seconds()
         return elapsed >= self.cert_check_interval
 
     def _handle_changes(self, current_state):
@@ -107,6 +289,9 @@ class MonitoringService:
 
         Args:
             current_state: The current detection results.
+
+        Returns:
+            dict: The change report from ChangeDetector.
         """
         from utils.change_detector import ChangeDetector
 
@@ -114,15 +299,58 @@ class MonitoringService:
         changes = detector.detect_changes(self.previous_state, current_state)
 
         if changes['has_changes']:
-            # Changes detected, print an alert
+            # Changes detected, print an alert (stamped with the capture
+            # time, which is the recorded time when replaying)
+            changes['timestamp'] = self.snapshot.captured_at
             self.reporter.print_change_alert(changes)
         else:
             # No changes, brief status update
             self.reporter.print_status_update(
                 self.cycle_count + 1,
-                datetime.now()
+                self.snapshot.captured_at
             )
 
+        return changes
+
+    def _notify_observers(self, results, changes):
+        """
+        Passes a completed cycle to the registered observers.
+
+        Args:
+            results: The detection results of the cycle.
+            changes: The change report, or None for the initial scan.
+        """
+        for observer in self.observers:
+            try:
+                observer.on_cycle(self, results, changes)
+            except Exception:
+                # An observer must never stop the monitoring loop
+                pass
+
+    def _reload_rules(self):
+        """Reloads the rule files, keeping the detectors and their caches."""
+        try:
+            count = rules.reload()
+        except (OSError, RuleError) as e:
+            self.reporter.print_rules_reload_failed(str(e))
+            return
+        if self.pool:
+            self.pool.reload_rules()
+        self.reporter.print_rules_reloaded(count)
+
+    def _reload_handler(self, signum, frame):
+        """
+        Handles SIGHUP: schedules a rule reload and runs a cycle right away.
+
+        Args:
+            signum: Signal number.
+            frame: Stack frame.
+        """
+        rules.request_reload()
+        if self.cadence:
+            self.cadence.reset()
+        self.wake()
+
     def _signal_handler(self, signum, frame):
         """
         Handles the Ctrl+C signal.
@@ -136,5 +364,6 @@ class MonitoringService:
         sys.exit(0)
 
     def stop(self):
-        """Stops monitoring."""
+        """Stops monitoring after the current cycle; safe to call from any thread."""
         self.running = False
+        self.wake_event.set()
@@ -0,0 +1,145 @@
+"""
+Neighbor Table Module
+Parses the IPv4 neighbor (ARP) table and default routes from procfs, and
+keeps IP -> MAC and MAC -> IPs indexes updated incrementally across cycles
+"""
+import re
+import socket
+import struct
+
+ARP_TABLE_FILE = '/proc/net/arp'
+ROUTE_TABLE_FILE = '/proc/net/route'
+
+# IP address, HW type, flags, HW address, mask, device
+ARP_ENTRY = re.compile(r'^(\d+\.\d+\.\d+\.\d+)\s+0x[0-9a-f]+\s+(0x[0-9a-f]+)\s+([0-9a-f:]+)\s+\S+\s+(\S+)\s*$',
+                       re.MULTILINE | re.IGNORECASE)
+ATF_COM = 0x2  # Entry is complete (the MAC is known)
+# Addresses that never identify a neighbor
+IGNORED_MACS = {'00:00:00:00:00:00', 'ff:ff:ff:ff:ff:ff'}
+
+RTF_UP = 0x1
+RTF_GATEWAY = 0x2
+
+
+def parse_arp_table(text):
+    """
+    Parses the contents of /proc/net/arp.
+
+    Args:
+        text: File contents.
+
+    Returns:
+        dict: IP -> (lowercase MAC, device), for complete entries only.
+    """
+    table = {}
+    for ip, flags, mac, device in ARP_ENTRY.findall(text):
+        mac = mac.lower()
+        if int(flags, 16) & ATF_COM and mac not in IGNORED_MACS:
+            table[ip] = (mac, device)
+    return table
+
+
+def parse_default_gateways(text):
+    """
+    Parses the default routes from the contents of /proc/net/route.
+
+    Args:
+        text: File contents.
+
+    Returns:
+        list: (device, gateway IP) tuples.
+    """
+    gateways = []
+    for line in text.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) < 8 or fields[1] != '00000000' or fields[7] != '00000000':
+            continue
+        flags = int(fields[3], 16)
+        if flags & RTF_UP and flags & RTF_GATEWAY:
+            # The kernel prints the address as a native-endian integer
+            gateway = socket.inet_ntoa(struct.pack('=I', int(fields[2], 16)))
+            gateways.append((fields[0], gateway))
+    return gateways
+
+
+def read_neighbors(arp_file=ARP_TABLE_FILE, route_file=ROUTE_TABLE_FILE):
+    """
+    Reads the neighbor table and the default gateways.
+
+    Returns:
+        dict: {'arp': IP -> (MAC, device), 'gateways': [(device, IP), ...]}.
+
+    Raises:
+        OSError: If the tables cannot be read (not Linux).
+    """
+    with open(arp_file, 'r', encoding='ascii', errors='replace') as f:
+        arp = parse_arp_table(f.read())
+    with open(route_file, 'r', encoding='ascii', errors='replace') as f:
+        gateways = parse_default_gateways(f.read())
+    return {'arp': arp, 'gateways': gateways}
+
+
+class NeighborIndex:
+    """
+    IP -> MAC and MAC -> IPs indexes over successive neighbor tables.
+
+    Each new table is diffed against the previous one and only the entries
+    that changed are applied to the indexes, so an unchanged table costs a
+    dict comparison. The MACs claiming more than one IP are kept as a set,
+    updated along with the indexes.
+    """
+
+    def __init__(self):
+        # IP -> (MAC, device)
+        self.table = {}
+        # MAC -> set of IPs
+        self.macs = {}
+        # MACs with more than one IP
+        self.shared = set()
+        self.applied = 0
+
+    def update(self, table):
+        """
+        Applies a new neighbor table.
+
+        Args:
+            table: IP -> (MAC, device).
+
+        Returns:
+            list: (IP, old entry, new entry) for each changed entry; entries
+                  are None where the IP was absent.
+        """
+        if table == self.table:
+            return []
+
+        old = self.table
+        changed = {ip for ip, _ in set(old.items()).symmetric_difference(table.items())}
+        changes = []
+        for ip in sorted(changed):
+            before = old.get(ip)
+            after = table.get(ip)
+            if before is not None:
+                self._remove(ip, before[0])
+            if after is not None:
+                self._add(ip, after[0])
+            changes.append((ip, before, after))
+
+        self.table = dict(table)
+        self.applied += len(changes)
+        return changes
+
+    def _add(self, ip, mac):
+        ips = self.macs.get(mac)
+        if ips is None:
+            ips = self.macs[mac] = set()
+        ips.add(ip)
+        if len(ips) > 1:
+            self.shared.add(mac)
+
+    def _remove(self, ip, mac):
+        ips = self.macs[mac]
+        ips.discard(ip)
+        if len(ips) < 2:
+            self.shared.discard(mac)
+        if not ips:
+            del self.macs[mac]
@@ -0,0 +1,759 @@
+"""
+Packet Capture Module
+Streams pcap and pcapng files through a memory map and extracts the TLS
+certificates that servers present, reassembling TCP only as far as needed
+
+Memory use does not depend on the capture size: packets are read from the
+map one at a time, and per-flow state is kept in a bounded LRU table whose
+reassembly buffers also have a global byte budget. Flows stop being
+buffered as soon as their certificates (or the start of encrypted data)
+have been seen.
+
+In parallel, the file is split into byte ranges at record boundaries, and
+each worker reads only its range, plus the packets after it that belong to
+the handshakes it has started.
+"""
+import hashlib
+import mmap
+import socket
+import struct
+from collections import OrderedDict
+from utils.x509 import CertificateError, parse_certificate
+
+# pcap magic -> (byte order, timestamp unit)
+PCAP_MAGIC = {
+    b'\xd4\xc3\xb2\xa1': ('<', 1e-6),
+    b'\xa1\xb2\xc3\xd4': ('>', 1e-6),
+    b'\x4d\x3c\xb2\xa1': ('<', 1e-9),
+    b'\xa1\xb2\x3c\x4d': ('>', 1e-9),
+}
+PCAPNG_SECTION_HEADER = b'\x0a\x0d\x0d\x0a'
+PCAPNG_BYTE_ORDER_MAGIC = 0x1a2b3c4d
+PCAPNG_INTERFACE_DESCRIPTION = 1
+PCAPNG_SIMPLE_PACKET = 3
+PCAPNG_ENHANCED_PACKET = 6
+PCAPNG_OPTION_TSRESOL = 9
+
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LOOP = 108
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_IPV4 = 228
+LINKTYPE_IPV6 = 229
+LINKTYPE_LINUX_SLL2 = 276
+
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_IPV6 = 0x86dd
+ETHERTYPE_VLAN = (0x8100, 0x88a8, 0x9100)
+IPPROTO_TCP = 6
+IPV6_EXTENSION_HEADERS = (0, 43, 60)  # hop-by-hop, routing, destination options
+IPV6_FRAGMENT = 44
+
+TCP_SYN = 0x02
+TCP_ACK = 0x10
+
+TLS_CHANGE_CIPHER_SPEC = 20
+TLS_ALERT = 21
+TLS_HANDSHAKE = 22
+TLS_APPLICATION_DATA = 23
+HANDSHAKE_CLIENT_HELLO = 1
+HANDSHAKE_SERVER_HELLO = 2
+HANDSHAKE_CERTIFICATE = 11
+EXTENSION_SERVER_NAME = 0
+EXTENSION_SUPPORTED_VERSIONS = 43
+TLS13 = 0x0304
+
+SEQ_MOD = 1 << 32
+SEQ_HALF = 1 << 31
+
+
+class PcapError(ValueError):
+    """Raised for files that are not pcap or pcapng captures."""
+
+
+def iter_packets(path):
+    """
+    Iterates over the packets of a pcap or pcapng file.
+
+    Args:
+        path: Capture file path.
+
+    Yields:
+        tuple: (timestamp in seconds, link type, packet bytes).
+    """
+    for _, timestamp, linktype, data in _iter_records(path):
+        if data is not None:
+            yield timestamp, linktype, data
+
+
+def split_capture(path, count):
+    """
+    Splits a capture into byte ranges of about equal size, at record boundaries.
+
+    Only the record headers are read.
+
+    Args:
+        path: Capture file path.
+        count: Number of ranges.
+
+    Returns:
+        list: (start offset, end offset, reader state) per range, for
+              _iter_records(); fewer than count ranges for small files.
+
+    Raises:
+        PcapError: If the file is not a pcap or pcapng capture.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return []
+        try:
+            size = len(mm)
+            targets = [size * index // count for index in range(1, count)]
+            magic = mm[:4]
+            if magic in PCAP_MAGIC:
+                length = struct.Struct(PCAP_MAGIC[magic][0] + 'I')
+                offset = 24
+                starts = [(offset, None)]
+                for target in targets:
+                    while offset + 16 <= size and offset < target:
+                        offset += 16 + length.unpack_from(mm, offset + 8)[0]
+                    starts.append((offset, None))
+            elif magic == PCAPNG_SECTION_HEADER:
+                interfaces = []
+                blocks = _pcapng_blocks(mm, 0, '<', interfaces)
+                starts = [(0, ('<', ()))]
+                for target in targets:
+                    for offset, _, _, order in blocks:
+                        if offset >= target:
+                            # Interfaces declared by this block are added
+                            # after it is yielded, so they are not included
+                            starts.append((offset, (order, tuple(interfaces))))
+                            break
+                    else:
+                        break
+            else:
+                raise PcapError(f'{path}: not a pcap or pcapng file')
+        finally:
+            mm.close()
+
+    ranges = []
+    for index, (start, state) in enumerate(starts):
+        stop = starts[index + 1][0] if index + 1 < len(starts) else size
+        if start < stop:
+            ranges.append((start, stop, state))
+    return ranges
+
+
+def _iter_records(path, start=None, state=None):
+    """
+    Iterates over the packets of a capture with their file offsets.
+
+    Args:
+        path: Capture file path.
+        start: Offset of the first record to read (from split_capture), or
+            None for the whole file.
+        state: Reader state at that offset (from split_capture).
+
+    Yields:
+        tuple: (record offset, timestamp in seconds, link type, packet bytes);
+               malformed records have None for all but the offset.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            return
+        try:
+            if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            magic = mm[:4]
+            if magic in PCAP_MAGIC:
+                yield from _iter_pcap(mm, *PCAP_MAGIC[magic], start or 24)
+            elif magic == PCAPNG_SECTION_HEADER:
+                order, interfaces = state or ('<', ())
+                yield from _iter_pcapng(mm, start or 0, order, interfaces)
+            else:
+                raise PcapError(f'{path}: not a pcap or pcapng file')
+        finally:
+            mm.close()
+
+
+def _iter_pcap(mm, order, unit, offset):
+    header = struct.Struct(order + 'IIII')
+    linktype = struct.unpack_from(order + 'I', mm, 20)[0] & 0xffff
+    size = len(mm)
+    while offset + 16 <= size:
+        seconds, fraction, captured, _ = header.unpack_from(mm, offset)
+        start = offset + 16
+        if start + captured > size:
+            break  # Truncated last record
+        yield offset, seconds + fraction * unit, linktype, mm[start:start + captured]
+        offset = start + captured
+
+
+def _iter_pcapng(mm, offset, order, interfaces):
+    interfaces = list(interfaces)
+    for offset, block_type, block_length, order in _pcapng_blocks(mm, offset, order, interfaces):
+        body = offset + 8
+        end = offset + block_length - 4
+        try:
+            if block_type == PCAPNG_ENHANCED_PACKET:
+                interface, high, low, captured, _ = struct.unpack_from(order + 'IIIII', mm, body)
+                start = body + 20
+                if start + captured > end:
+                    raise struct.error('packet data exceeds block')
+                if interface < len(interfaces):
+                    linktype, unit = interfaces[interface]
+                    yield offset, ((high << 32) | low) * unit, linktype, mm[start:start + captured]
+            elif block_type == PCAPNG_SIMPLE_PACKET and interfaces:
+                original = struct.unpack_from(order + 'I', mm, body)[0]
+                if body + 4 > end:
+                    raise struct.error('block too short')
+                captured = min(original, end - body - 4)
+                linktype, _ = interfaces[0]
+                yield offset, 0.0, linktype, mm[body + 4:body + 4 + captured]
+        except struct.error:
+            # Truncated or corrupt block: skipped, the reader counts it
+            yield offset, None, None, None
+
+
+def _pcapng_blocks(mm, offset, order, interfaces):
+    """
+    Iterates over the blocks of a pcapng file, keeping the section state.
+
+    Yields (offset, block type, block length, byte order); section headers
+    have the type None. The interfaces list is updated in place, after an
+    interface description block has been yielded.
+    """
+    size = len(mm)
+    while offset + 12 <= size:
+        block_type = struct.unpack_from(order + 'I', mm, offset)[0]
+        if mm[offset:offset + 4] == PCAPNG_SECTION_HEADER:
+            # A new section may switch the byte order and resets interfaces
+            magic = mm[offset + 8:offset + 12]
+            order = '<' if struct.unpack('<I', magic)[0] == PCAPNG_BYTE_ORDER_MAGIC else '>'
+            block_type = None
+            interfaces.clear()
+        block_length = struct.unpack_from(order + 'I', mm, offset + 4)[0]
+        if block_length < 12 or offset + block_length > size:
+            break
+        yield offset, block_type, block_length, order
+
+        if block_type == PCAPNG_INTERFACE_DESCRIPTION:
+            body = offset + 8
+            linktype = struct.unpack_from(order + 'H', mm, body)[0]
+            interfaces.append((linktype, _pcapng_resolution(mm, order, body + 8, offset + block_length - 4)))
+        offset += block_length
+
+
+def _pcapng_resolution(mm, order, offset, end):
+    """Returns the timestamp unit of an interface from its if_tsresol option."""
+    while offset + 4 <= end:
+        code, length = struct.unpack_from(order + 'HH', mm, offset)
+        if code == 0:
+            break
+        if code == PCAPNG_OPTION_TSRESOL and length >= 1:
+            value = mm[offset + 4]
+            return 2.0 ** -(value & 0x7f) if value & 0x80 else 10.0 ** -value
+        offset += 4 + (length + 3) // 4 * 4
+    return 1e-6
+
+
+def parse_tcp(linktype, data):
+    """
+    Decodes the link, IP and TCP headers of a packet.
+
+    Args:
+        linktype: Link-layer header type of the capture.
+        data: Packet bytes.
+
+    Returns:
+        tuple: (source, source port, destination, destination port, seq,
+               flags, payload), where addresses are packed bytes; or None
+               for anything that is not an unfragmented TCP segment.
+    """
+    if linktype == LINKTYPE_ETHERNET:
+        if len(data) < 14:
+            return None
+        ethertype = (data[12] << 8) | data[13]
+        offset = 14
+        while ethertype in ETHERTYPE_VLAN and len(data) >= offset + 4:
+            ethertype = (data[offset + 2] << 8) | data[offset + 3]
+            offset += 4
+    elif linktype == LINKTYPE_LINUX_SLL:
+        if len(data) < 16:
+            return None
+        ethertype = (data[14] << 8) | data[15]
+        offset = 16
+    elif linktype == LINKTYPE_LINUX_SLL2:
+        if len(data) < 20:
+            return None
+        ethertype = (data[0] << 8) | data[1]
+        offset = 20
+    elif linktype in (LINKTYPE_NULL, LINKTYPE_LOOP):
+        ethertype = None
+        offset = 4
+    elif linktype in (LINKTYPE_RAW, LINKTYPE_IPV4, LINKTYPE_IPV6, 12, 14):
+        ethertype = None
+        offset = 0
+    else:
+        return None
+
+    if len(data) <= offset:
+        return None
+    if ethertype is None:
+        # Families differ between platforms, the IP version nibble does not
+        version = data[offset] >> 4
+        ethertype = ETHERTYPE_IPV4 if version == 4 else ETHERTYPE_IPV6 if version == 6 else 0
+
+    if ethertype == ETHERTYPE_IPV4:
+        if len(data) < offset + 20:
+            return None
+        header_length = (data[offset] & 0x0f) * 4
+        total_length = (data[offset + 2] << 8) | data[offset + 3]
+        fragment = ((data[offset + 6] << 8) | data[offset + 7]) & 0x3fff
+        if data[offset + 9] != IPPROTO_TCP or fragment:
+            return None
+        source = data[offset + 12:offset + 16]
+        destination = data[offset + 16:offset + 20]
+        # Ethernet pads short frames; the IP length is authoritative
+        end = min(len(data), offset + total_length) if total_length else len(data)
+        offset += header_length
+    elif ethertype == ETHERTYPE_IPV6:
+        if len(data) < offset + 40:
+            return None
+        next_header = data[offset + 6]
+        payload_length = (data[offset + 4] << 8) | data[offset + 5]
+        source = data[offset + 8:offset + 24]
+        destination = data[offset + 24:offset + 40]
+        end = min(len(data), offset + 40 + payload_length) if payload_length else len(data)
+        offset += 40
+        while next_header in IPV6_EXTENSION_HEADERS and offset + 8 <= end:
+            next_header, length = data[offset], data[offset + 1]
+            offset += (length + 1) * 8
+        if next_header != IPPROTO_TCP:
+            return None
+    else:
+        return None
+
+    if end < offset + 20:
+        return None
+    source_port = (data[offset] << 8) | data[offset + 1]
+    destination_port = (data[offset + 2] << 8) | data[offset + 3]
+    seq = int.from_bytes(data[offset + 4:offset + 8], 'big')
+    data_offset = (data[offset + 12] >> 4) * 4
+    flags = data[offset + 13]
+    return source, source_port, destination, destination_port, seq, flags, data[offset + data_offset:end]
+
+
+def format_endpoint(address, port):
+    """Formats a packed address and port as text."""
+    if len(address) == 4:
+        return f'{socket.inet_ntop(socket.AF_INET, address)}:{port}'
+    return f'[{socket.inet_ntop(socket.AF_INET6, address)}]:{port}'
+
+
+def _is_tls_record_start(payload):
+    """Whether a segment starts with a TLS handshake record header."""
+    return (len(payload) >= 5 and payload[0] == TLS_HANDSHAKE and payload[1] == 3
+            and payload[2] <= 4)
+
+
+class _HalfFlow:
+    """Reassembly state of one direction of a TCP connection."""
+
+    __slots__ = ('next_seq', 'buffer', 'handshake', 'pending', 'done', 'server_name')
+
+    def __init__(self):
+        self.next_seq = None
+        self.buffer = bytearray()
+        self.handshake = bytearray()
+        self.pending = {}
+        self.done = False
+        self.server_name = None
+
+    def buffered(self):
+        return len(self.buffer) + len(self.handshake) + sum(len(p) for p in self.pending.values())
+
+
+class TLSCertificateExtractor:
+    """
+    Extracts server certificates from the TLS handshakes in a capture.
+
+    Each direction of a connection is reassembled from its SYN, or from
+    the first segment that starts with a TLS handshake record when the
+    capture begins mid-connection. Only TLS 1.2 and earlier send the
+    certificate in the clear; TLS 1.3 handshakes are counted but cannot
+    be inspected.
+    """
+
+    def __init__(self, max_flows=4096, max_buffered_bytes=64 * 1024 * 1024,
+                 max_flow_bytes=256 * 1024, max_pending_segments=32, resume=True):
+        """
+        Initializes the extractor.
+
+        Args:
+            max_flows: Connection directions tracked at once (least recently
+                used ones are evicted).
+            max_buffered_bytes: Total reassembly buffer budget.
+            max_flow_bytes: Largest handshake buffered for one direction.
+            max_pending_segments: Out-of-order segments held per direction.
+            resume: Whether connections already open when the capture (or
+                the range being read) starts are picked up at a TLS record.
+                Without it, a connection is only tracked from its first SYN,
+                and its other direction from the SYN-ACK.
+        """
+        self.max_flows = max_flows
+        self.max_buffered_bytes = max_buffered_bytes
+        self.max_flow_bytes = max_flow_bytes
+        self.max_pending_segments = max_pending_segments
+        self.resume = resume
+        self.flows = OrderedDict()
+        # Tracked directions that still need data
+        self.open_flows = 0
+        self.buffered_bytes = 0
+        # (server endpoint, leaf SHA-256) -> certificate record
+        self.certificates = {}
+        self.stats = {
+            'packets': 0,
+            'tcp_segments': 0,
+            'tls_handshakes': 0,
+            'tls13_handshakes': 0,
+            'certificate_messages': 0,
+            'evicted_flows': 0,
+            'malformed_records': 0,
+        }
+
+    def run(self, path):
+        """
+        Processes a capture file.
+
+        Args:
+            path: pcap or pcapng file path.
+
+        Returns:
+            TLSCertificateExtractor: self, for chaining.
+        """
+        for _, _, linktype, data in _iter_records(path):
+            self.feed(linktype, data)
+        return self
+
+    def feed(self, linktype, data):
+        """Processes one packet (None: a malformed record, only counted)."""
+        if data is None:
+            self.stats['malformed_records'] += 1
+            return
+        self.stats['packets'] += 1
+        self._feed(linktype, data, False)
+
+    def follow(self, linktype, data):
+        """
+        Processes a packet read past the end of this extractor's range.
+
+        Only the connections already tracked are followed, and the packet
+        is not counted: it belongs to the next range.
+        """
+        if data is not None:
+            self._feed(linktype, data, True)
+
+    def _feed(self, linktype, data, following):
+        segment = parse_tcp(linktype, data)
+        if segment is None:
+            return
+        source, source_port, destination, destination_port, seq, flags, payload = segment
+        if not following:
+            self.stats['tcp_segments'] += 1
+
+        key = (source, source_port, destination, destination_port)
+        flow = self.flows.get(key)
+        if flow is None:
+            # Only start tracking at a point where the stream can be parsed
+            if not flags & TCP_SYN and not _is_tls_record_start(payload):
+                return
+            if (following or not self.resume) \
+                    and (destination, destination_port, source, source_port) not in self.flows:
+                # Not the other direction of a tracked connection: only its
+                # first SYN starts one, and only within the range
+                if following or flags & TCP_ACK:
+                    return
+            flow = self.flows[key] = _HalfFlow()
+            self.open_flows += 1
+            if len(self.flows) > self.max_flows:
+                self._evict_oldest()
+        else:
+            self.flows.move_to_end(key)
+
+        if flow.done:
+            return
+        if flow.next_seq is None:
+            if flags & TCP_SYN:
+                flow.next_seq = (seq + 1) % SEQ_MOD
+                return
+            flow.next_seq = seq
+        if not payload:
+            return
+
+        before = flow.buffered()
+        self._reassemble(flow, seq, payload)
+        if not flow.done:
+            self._parse_records(key, flow)
+        if flow.done or flow.buffered() > self.max_flow_bytes:
+            self._finish(flow)
+        self.buffered_bytes += flow.buffered() - before
+        while self.buffered_bytes > self.max_buffered_bytes and self.flows:
+            self._evict_oldest()
+
+    def results(self):
+        """
+        Returns the extracted certificates.
+
+        Returns:
+            list: One dict per distinct (server, leaf certificate), with
+                  server, server_name, subject, issuer, leaf_sha256 and
+                  spki_sha256.
+        """
+        return list(self.certificates.values())
+
+    def _reassemble(self, flow, seq, payload):
+        offset = (seq - flow.next_seq) % SEQ_MOD
+        if offset >= SEQ_HALF:
+            # Starts before the expected byte: keep only the new tail
+            overlap = SEQ_MOD - offset
+            if overlap >= len(payload):
+                return
+            payload = payload[overlap:]
+            offset = 0
+        if offset:
+            if len(flow.pending) >= self.max_pending_segments:
+                # Too many gaps to make sense of: give up on this direction
+                flow.done = True
+                return
+            flow.pending[seq] = payload
+            return
+
+        flow.buffer += payload
+        flow.next_seq = (flow.next_seq + len(payload)) % SEQ_MOD
+
+        # Append queued segments that have become contiguous
+        progress = True
+        while flow.pending and progress:
+            progress = False
+            for pending_seq in list(flow.pending):
+                offset = (pending_seq - flow.next_seq) % SEQ_MOD
+                if offset and offset < SEQ_HALF:
+                    continue
+                data = flow.pending.pop(pending_seq)
+                overlap = (SEQ_MOD - offset) % SEQ_MOD
+                if overlap < len(data):
+                    flow.buffer += data[overlap:]
+                    flow.next_seq = (flow.next_seq + len(data) - overlap) % SEQ_MOD
+                    progress = True
+
+    def _parse_records(self, key, flow):
+        buffer = flow.buffer
+        consumed = 0
+        while len(buffer) - consumed >= 5 and not flow.done:
+            content_type = buffer[consumed]
+            if buffer[consumed + 1] != 3 or content_type < TLS_CHANGE_CIPHER_SPEC \
+                    or content_type > TLS_APPLICATION_DATA:
+                flow.done = True  # Not TLS
+                break
+            length = (buffer[consumed + 3] << 8) | buffer[consumed + 4]
+            end = consumed + 5 + length
+            if len(buffer) < end:
+                break
+            if content_type == TLS_HANDSHAKE:
+                flow.handshake += buffer[consumed + 5:end]
+                self._parse_handshake(key, flow)
+            else:
+                # Alerts, ChangeCipherSpec or application data: anything
+                # interesting in this direction has already been sent
+                flow.done = True
+            consumed = end
+        del buffer[:consumed]
+
+    def _parse_handshake(self, key, flow):
+        handshake = flow.handshake
+        consumed = 0
+        while len(handshake) - consumed >= 4 and not flow.done:
+            message_type = handshake[consumed]
+            length = int.from_bytes(handshake[consumed + 1:consumed + 4], 'big')
+            end = consumed + 4 + length
+            if len(handshake) < end:
+                break
+            body = bytes(handshake[consumed + 4:end])
+            consumed = end
+
+            if message_type == HANDSHAKE_CLIENT_HELLO:
+                self.stats['tls_handshakes'] += 1
+                flow.server_name = _client_hello_server_name(body)
+                flow.done = True
+            elif message_type == HANDSHAKE_SERVER_HELLO:
+                if _server_hello_version(body) == TLS13:
+                    # The certificate follows encrypted
+                    self.stats['tls13_handshakes'] += 1
+                    flow.done = True
+            elif message_type == HANDSHAKE_CERTIFICATE:
+                self.stats['certificate_messages'] += 1
+                self._record_certificates(key, body)
+                flow.done = True
+        del handshake[:consumed]
+
+    def _record_certificates(self, key, body):
+        source, source_port, destination, destination_port = key
+        if len(body) < 3:
+            return
+        end = min(len(body), 3 + int.from_bytes(body[:3], 'big'))
+        offset = 3
+        if offset + 3 > end:
+            return
+        # The leaf is the first certificate of the chain
+        length = int.from_bytes(body[offset:offset + 3], 'big')
+        leaf = body[offset + 3:offset + 3 + length]
+        try:
+            parsed = parse_certificate(leaf)
+        except CertificateError:
+            return
+
+        client = self.flows.get((destination, destination_port, source, source_port))
+        server = format_endpoint(source, source_port)
+        leaf_sha256 = hashlib.sha256(leaf).hexdigest()
+        record_key = (server, leaf_sha256)
+        if record_key not in self.certificates:
+            self.certificates[record_key] = {
+                'server': server,
+                'server_name': client.server_name if client is not None else None,
+                'subject': parsed['subject'],
+                'issuer': parsed['issuer'],
+                'leaf_sha256': leaf_sha256,
+                'spki_sha256': parsed['spki_sha256'],
+            }
+
+    def _finish(self, flow):
+        """Releases the buffers of a direction that needs no more data."""
+        flow.done = True
+        self.open_flows -= 1
+        flow.buffer = bytearray()
+        flow.handshake = bytearray()
+        flow.pending = {}
+
+    def _evict_oldest(self):
+        _, flow = self.flows.popitem(last=False)
+        self.buffered_bytes -= flow.buffered()
+        if not flow.done:
+            self.open_flows -= 1
+            self.stats['evicted_flows'] += 1
+
+
+def _client_hello_server_name(body):
+    """Returns the SNI host name of a ClientHello body, or None."""
+    try:
+        offset = 2 + 32                                   # version, random
+        offset += 1 + body[offset]                        # session id
+        offset += 2 + int.from_bytes(body[offset:offset + 2], 'big')  # cipher suites
+        offset += 1 + body[offset]                        # compression methods
+        end = offset + 2 + int.from_bytes(body[offset:offset + 2], 'big')
+        offset += 2
+        while offset + 4 <= end:
+            ext_type = int.from_bytes(body[offset:offset + 2], 'big')
+            ext_length = int.from_bytes(body[offset + 2:offset + 4], 'big')
+            offset += 4
+            if ext_type == EXTENSION_SERVER_NAME:
+                # server_name_list length (2), name type (1), name length (2), name
+                name_length = int.from_bytes(body[offset + 3:offset + 5], 'big')
+                return body[offset + 5:offset + 5 + name_length].decode('ascii', 'replace')
+            offset += ext_length
+    except IndexError:
+        pass
+    return None
+
+
+def _server_hello_version(body):
+    """Returns the negotiated version of a ServerHello body."""
+    try:
+        version = int.from_bytes(body[:2], 'big')
+        offset = 2 + 32
+        offset += 1 + body[offset]                        # session id
+        offset += 2 + 1                                   # cipher suite, compression
+        if offset + 2 > len(body):
+            return version
+        end = offset + 2 + int.from_bytes(body[offset:offset + 2], 'big')
+        offset += 2
+        while offset + 4 <= end:
+            ext_type = int.from_bytes(body[offset:offset + 2], 'big')
+            ext_length = int.from_bytes(body[offset + 2:offset + 4], 'big')
+            offset += 4
+            if ext_type == EXTENSION_SUPPORTED_VERSIONS and ext_length == 2:
+                return int.from_bytes(body[offset:offset + 2], 'big')
+            offset += ext_length
+        return version
+    except IndexError:
+        return None
+
+
+def _analyze_range(path, index, start, stop, state, limits):
+    """
+    Worker: extracts the certificates of the connections opened in a range.
+
+    Past the end of the range, the handshakes still in progress are
+    followed, for at most another range length.
+    """
+    extractor = TLSCertificateExtractor(resume=index == 0, **limits)
+    limit = stop + (stop - start)
+    for offset, _, linktype, data in _iter_records(path, start, state):
+        if offset < stop:
+            extractor.feed(linktype, data)
+        elif extractor.open_flows and offset < limit:
+            extractor.follow(linktype, data)
+        else:
+            break
+    return extractor.results(), extractor.stats
+
+
+def analyze_capture(path, workers=0, **limits):
+    """
+    Extracts the server certificates of a capture, optionally in parallel.
+
+    With workers > 1, the file is split into one byte range per worker.
+    Each worker handles the connections that open in its range, following
+    them into the next range until their handshakes are done; connections
+    already open at the start of the capture are picked up by the first
+    worker.
+
+    Args:
+        path: pcap or pcapng file path.
+        workers: Number of worker processes (0 or 1: in this process).
+        **limits: TLSCertificateExtractor limits.
+
+    Returns:
+        tuple: (certificate records, statistics).
+    """
+    if workers <= 1:
+        extractor = TLSCertificateExtractor(**limits).run(path)
+        return extractor.results(), extractor.stats
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Fails early, in this process, on files that are not captures
+    ranges = split_capture(path, workers)
+    if len(ranges) <= 1:
+        extractor = TLSCertificateExtractor(**limits).run(path)
+        return extractor.results(), extractor.stats
+
+    certificates = {}
+    stats = {}
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        futures = [pool.submit(_analyze_range, path, index, start, stop, state, limits)
+                   for index, (start, stop, state) in enumerate(ranges)]
+        for future in futures:
+            range_certificates, range_stats = future.result()
+            # Earlier ranges saw the connection's start, with its server name
+            for record in range_certificates:
+                certificates.setdefault((record['server'], record['leaf_sha256']), record)
+            for name, value in range_stats.items():
+                stats[name] = stats.get(name, 0) + value
+    return list(certificates.values()), stats
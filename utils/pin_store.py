@@ -0,0 +1,79 @@
+"""
+Pin Store Module
+Per-target cache of checked TLS peer certificates, pinned by SPKI fingerprint
+"""
+
+
+class PinStore:
+    """
+    Remembers the outcome of the last full certificate check of each target.
+
+    A target's pin holds the SPKI fingerprint of the leaf certificate that
+    was checked and the findings of that check. As long as the target keeps
+    presenting the same public key and the pin is younger than the TTL, the
+    earlier findings still apply: an interceptor cannot present the site's
+    key without its private key. A different key, an expired pin, or rules
+    reloaded since the check call for a new full check.
+    """
+
+    def __init__(self, ttl=3600):
+        """
+        Initializes the pin store.
+
+        Args:
+            ttl: Seconds after which a pin expires and the target is fully
+                re-checked even if its key did not change.
+        """
+        self.ttl = ttl
+        self.pins = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, target, spki_sha256, now, ruleset=None):
+        """
+        Returns the pinned findings of a target if the pin still applies.
+
+        Args:
+            target: (hostname, port).
+            spki_sha256: SPKI fingerprint of the certificate presented now;
+                None (not extracted) never matches.
+            now: Current time (datetime).
+            ruleset: Rules the findings would be computed with now; a pin
+                made under other rules (before a reload) does not apply.
+
+        Returns:
+            list: Findings of the last full check, or None if a full check is needed.
+        """
+        pin = self.pins.get(target)
+        if (pin is None or spki_sha256 is None or pin['spki_sha256'] != spki_sha256
+                or pin['ruleset'] is not ruleset
+                or (now - pin['pinned_at']).total_seconds() >= self.ttl):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pin['findings']
+
+    def pin(self, target, leaf_sha256, spki_sha256, findings, now, ruleset=None):
+        """
+        Records the outcome of a full check.
+
+        Args:
+            target: (hostname, port).
+            leaf_sha256: SHA-256 of the leaf certificate (DER).
+            spki_sha256: SHA-256 of the leaf's SubjectPublicKeyInfo.
+            findings: Findings produced by the check.
+            now: Current time (datetime).
+            ruleset: Rules the findings were computed with.
+        """
+        self.pins[target] = {
+            'leaf_sha256': leaf_sha256,
+            'spki_sha256': spki_sha256,
+            'findings': findings,
+            'pinned_at': now,
+            'ruleset': ruleset,
+        }
+
+    def expired(self, target, now):
+        """Returns True if the target has no pin or its pin is older than the TTL."""
+        pin = self.pins.get(target)
+        return pin is None or (now - pin['pinned_at']).total_seconds() >= self.ttl
@@ -0,0 +1,152 @@
+"""
+Process Environment Module
+Scans the initial environment of every process (/proc/<pid>/environ) for
+proxy, TLS key log and library preload variables
+"""
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+# Variables of interest. Proxy variables are honored in both cases by most
+# clients; the others only in upper case.
+PROXY_VARIABLES = [
+    'HTTP_PROXY', 'HTTPS_PROXY', 'FTP_PROXY', 'ALL_PROXY',
+    'http_proxy', 'https_proxy', 'ftp_proxy', 'all_proxy',
+]
+KEY_LOG_VARIABLES = ['SSLKEYLOGFILE']
+PRELOAD_VARIABLES = ['LD_PRELOAD', 'LD_AUDIT']
+VARIABLES = PROXY_VARIABLES + KEY_LOG_VARIABLES + PRELOAD_VARIABLES
+
+# One pass over the raw NUL-separated buffer finds all variables; only the
+# matches are decoded. The buffer is searched with a leading NUL prepended,
+# so that every entry starts after one.
+VARIABLE_PATTERN = re.compile(
+    b'\\0(' + b'|'.join(re.escape(name.encode('ascii')) for name in VARIABLES) + b')=([^\\0]*)')
+
+
+def read_process_stat(pid, proc='/proc'):
+    """
+    Reads the name, start time and virtual memory size of a process from
+    /proc/<pid>/stat.
+
+    Together with the pid, the start time (in clock ticks since boot)
+    identifies one process lifetime.
+
+    Returns:
+        tuple: (name, start time, vsize in bytes).
+    """
+    with open(f'{proc}/{pid}/stat', 'rb') as f:
+        stat = f.read()
+    # The name may contain spaces and parentheses: it ends at the last ')'
+    end = stat.rindex(b')')
+    name = stat[stat.index(b'(') + 1:end].decode('utf-8', 'replace')
+    # Fields after the name start at field 3 (state); starttime and vsize
+    # are fields 22 and 23
+    fields = stat[end + 2:].split(None, 21)
+    return name, int(fields[19]), int(fields[20])
+
+
+def search_environment(data):
+    """
+    Finds the variables of interest in a raw environ buffer.
+
+    Args:
+        data: Contents of /proc/<pid>/environ.
+
+    Returns:
+        dict: Variable name -> value, for the variables that are set.
+    """
+    if not data:
+        return {}
+    return {name.decode('ascii'): value.decode('utf-8', 'replace')
+            for name, value in VARIABLE_PATTERN.findall(b'\0' + data)}
+
+
+class ProcessEnvironmentScanner:
+    """
+    Scanner of the variables of interest across all processes.
+
+    /proc/<pid>/environ is the environment a process was started with and
+    does not change during its lifetime, so each process is read once and
+    its result cached under (pid, start time); later scans only read the
+    stat file of each process to tell reused pids apart. New processes are
+    read by a bounded thread pool.
+    """
+
+    def __init__(self, workers=8, proc='/proc'):
+        """
+        Initializes the scanner.
+
+        Args:
+            workers: Maximum number of threads reading new processes.
+            proc: Mount point of procfs.
+        """
+        self.workers = workers
+        self.proc = proc
+        self.exclude = {os.getpid()}
+        # pid -> (start time, name, variables or None if access was denied)
+        self.cache = {}
+
+    def scan(self):
+        """
+        Returns the processes that have variables of interest set.
+
+        Returns:
+            dict: {'processes': [{'pid', 'name', 'variables'}], 'denied':
+                  number of processes whose environment could not be read}.
+        """
+        current = {}
+        new = []
+        for entry in os.listdir(self.proc):
+            if not entry.isdigit():
+                continue
+            pid = int(entry)
+            if pid in self.exclude:
+                continue
+            try:
+                name, start_time, _ = read_process_stat(pid, self.proc)
+            except (OSError, ValueError, IndexError):
+                continue  # Exited while scanning
+            cached = self.cache.get(pid)
+            # execve() keeps the pid and start time but replaces the
+            # environment; the command name changes with it
+            if cached is not None and cached[:2] == (start_time, name):
+                current[pid] = cached
+            else:
+                new.append((pid, start_time, name))
+
+        if new:
+            if len(new) > 1 and self.workers > 1:
+                with ThreadPoolExecutor(max_workers=min(self.workers, len(new))) as pool:
+                    read = list(pool.map(self._read, new))
+            else:
+                read = [self._read(process) for process in new]
+            for (pid, start_time, name), variables in zip(new, read):
+                if variables is not False:
+                    current[pid] = (start_time, name, variables)
+
+        # Processes that exited are dropped from the cache
+        self.cache = current
+
+        processes = []
+        denied = 0
+        for pid, (_, name, variables) in sorted(current.items()):
+            if variables is None:
+                denied += 1
+            elif variables:
+                processes.append({'pid': pid, 'name': name, 'variables': variables})
+        return {'processes': processes, 'denied': denied}
+
+    def _read(self, process):
+        """Returns the variables of a process, None if access is denied, or False if it exited."""
+        pid = process[0]
+        try:
+            with open(f'{self.proc}/{pid}/environ', 'rb') as f:
+                return search_environment(f.read())
+        except PermissionError:
+            return None
+        except FileNotFoundError:
+            return False
+        except OSError:
+            # Kernel threads and zombies have no environment (ESRCH)
+            return {}
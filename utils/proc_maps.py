@@ -0,0 +1,178 @@
+"""
+Process Maps Module
+Scans the executable mappings of every process (/proc/<pid>/maps) for
+libraries matching a signature list, incrementally and with shared paths
+evaluated once
+"""
+import os
+import re
+from utils.proc_environ import read_process_stat
+
+# Path of each executable mapping: address range, permissions with 'x',
+# offset, device and inode, then the path
+EXECUTABLE_MAPPING = re.compile(rb'^[0-9a-f]+-[0-9a-f]+ ..x. [0-9a-f]+ \S+ \d+ +(\S[^\n]*)$', re.MULTILINE)
+
+
+class PathTable:
+    """
+    Interned table of mapped paths.
+
+    Every distinct path gets a small integer id and is matched against the
+    signatures once, when it is first seen, no matter how many processes
+    map it. Processes hold sets of ids rather than path strings.
+    """
+
+    def __init__(self, signatures):
+        """
+        Initializes the table.
+
+        Args:
+            signatures: RuleSet of library path rules.
+        """
+        self.signatures = signatures
+        self.ids = {}
+        self.paths = []
+        # Path id -> description, for the paths that match a signature
+        self.matches = {}
+
+    def intern(self, path):
+        """Returns the id of a raw (bytes) path, matching it on first sight."""
+        path_id = self.ids.get(path)
+        if path_id is None:
+            path_id = self.ids[path] = len(self.paths)
+            self.paths.append(path)
+            description = self.signatures.match(os.fsdecode(path))
+            if description is not None:
+                self.matches[path_id] = description
+        return path_id
+
+    def rematch(self, signatures):
+        """Matches every interned path against new signatures, keeping the ids."""
+        self.signatures = signatures
+        self.matches = {}
+        for path_id, path in enumerate(self.paths):
+            description = signatures.match(os.fsdecode(path))
+            if description is not None:
+                self.matches[path_id] = description
+
+    def __len__(self):
+        return len(self.paths)
+
+
+class ProcessMapsScanner:
+    """
+    Scanner of the libraries mapped into all processes.
+
+    A process's maps file is read when the process is new, and again only
+    when its virtual memory size (from /proc/<pid>/stat) changed, since
+    loading a library maps new memory; otherwise the cached set of path ids
+    is reused. The size of a maps file cannot be used for this, as procfs
+    reports it as 0.
+    """
+
+    def __init__(self, signatures, proc='/proc', compact_threshold=65536):
+        """
+        Initializes the scanner.
+
+        Args:
+            signatures: RuleSet of library path rules.
+            proc: Mount point of procfs.
+            compact_threshold: Path table size above which paths no longer
+                mapped by any process are dropped.
+        """
+        self.signatures = signatures
+        self.proc = proc
+        self.compact_threshold = compact_threshold
+        self.table = PathTable(signatures)
+        self.exclude = {os.getpid()}
+        # pid -> (start time, vsize, name, frozenset of path ids or None if denied)
+        self.cache = {}
+        self.reads = 0
+
+    def set_signatures(self, signatures):
+        """
+        Replaces the signatures, for example after the rules were reloaded.
+
+        The cached mappings are kept; only the known paths are matched again.
+        """
+        self.signatures = signatures
+        self.table.rematch(signatures)
+
+    def scan(self):
+        """
+        Returns the processes that map libraries matching a signature.
+
+        Returns:
+            dict: {'processes': [{'pid', 'name', 'libraries': [[path,
+                  description], ...]}], 'denied': number of processes whose
+                  maps could not be read}.
+        """
+        current = {}
+        for entry in os.listdir(self.proc):
+            if not entry.isdigit():
+                continue
+            pid = int(entry)
+            if pid in self.exclude:
+                continue
+            try:
+                name, start_time, vsize = read_process_stat(pid, self.proc)
+            except (OSError, ValueError, IndexError):
+                continue  # Exited while scanning
+
+            cached = self.cache.get(pid)
+            if cached is not None and cached[0] == start_time and cached[1] == vsize:
+                current[pid] = cached
+                continue
+
+            path_ids = self._read(pid)
+            if path_ids is not False:
+                current[pid] = (start_time, vsize, name, path_ids)
+
+        self.cache = current
+        if len(self.table) > self.compact_threshold:
+            self._compact()
+
+        matches = self.table.matches
+        paths = self.table.paths
+        processes = []
+        denied = 0
+        for pid, (_, _, name, path_ids) in sorted(self.cache.items()):
+            if path_ids is None:
+                denied += 1
+                continue
+            libraries = [[os.fsdecode(paths[path_id]), matches[path_id]]
+                         for path_id in path_ids if path_id in matches]
+            if libraries:
+                processes.append({'pid': pid, 'name': name, 'libraries': sorted(libraries)})
+        return {'processes': processes, 'denied': denied}
+
+    def _read(self, pid):
+        """Returns the path ids mapped by a process, None if access is denied, or False if it exited."""
+        try:
+            with open(f'{self.proc}/{pid}/maps', 'rb') as f:
+                data = f.read()
+        except PermissionError:
+            return None
+        except OSError:
+            return False
+        self.reads += 1
+        intern = self.table.intern
+        return frozenset(intern(path) for path in set(EXECUTABLE_MAPPING.findall(data)))
+
+    def _compact(self):
+        """Rebuilds the path table with only the paths still mapped."""
+        live = set()
+        for _, _, _, path_ids in self.cache.values():
+            if path_ids:
+                live.update(path_ids)
+        if len(live) * 2 > len(self.table):
+            return
+
+        table = PathTable(self.signatures)
+        remap = {path_id: table.intern(self.table.paths[path_id]) for path_id in sorted(live)}
+        self.cache = {
+            pid: (start_time, vsize, name,
+                  frozenset(remap[path_id] for path_id in path_ids) if path_ids is not None else None)
+            for pid, (start_time, vsize, name, path_ids) in self.cache.items()
+        }
+        self.table = table
@@ -0,0 +1,374 @@
+"""
+Proxy Configuration Module
+Indexes the proxy settings of common Linux configuration files, re-parsing
+only the files that changed, and watches them with inotify
+"""
+import fnmatch
+import glob
+import json
+import os
+import re
+import select
+import shutil
+import subprocess
+import threading
+from utils.inotify import IN_DELETE_SELF, IN_ISDIR, IN_MOVE_SELF, IN_Q_OVERFLOW
+from utils.trust_store import stat_key
+
+PROXY_VARIABLES = ('http_proxy', 'https_proxy', 'ftp_proxy', 'all_proxy', 'socks_proxy')
+
+SHELL_ASSIGNMENT = re.compile(
+    r'^\s*(?:export\s+)?(' + '|'.join(PROXY_VARIABLES) + r')\s*=\s*["\']?([^"\'\s#;]+)',
+    re.IGNORECASE | re.MULTILINE)
+APT_PROXY = re.compile(r'Acquire::(\w+)::Proxy(?:::[\w.-]+)?\s+"([^"]*)"', re.IGNORECASE)
+APT_BLOCK_PROXY = re.compile(r'Acquire\s*::\s*(\w+)\s*\{[^}]*?\bProxy\s+"([^"]*)"', re.IGNORECASE | re.DOTALL)
+INI_PROXY = re.compile(r'^\s*(proxy|https?-proxy|https?_proxy)\s*=\s*(\S+)', re.IGNORECASE | re.MULTILINE)
+FIREFOX_PREF = re.compile(r'user_pref\("(network\.proxy\.[\w.]+)",\s*("?)([^")]*)\2\)')
+GSETTINGS_LINE = re.compile(r"^(org\.gnome\.system\.proxy(?:\.\w+)?) ([\w-]+) (.*)$", re.MULTILINE)
+
+# Values that explicitly disable a proxy
+DISABLED_VALUES = ('', 'false', 'direct', 'none', '_none_', '_unset_')
+
+# Firefox network.proxy.type values
+FIREFOX_MANUAL = '1'
+FIREFOX_PAC = '2'
+FIREFOX_WPAD = '4'
+
+
+def parse_shell_environment(path):
+    """Parses proxy variables assigned in /etc/environment style and shell files."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return [(name, value) for name, value in SHELL_ASSIGNMENT.findall(f.read())]
+
+
+def parse_apt(path):
+    """Parses Acquire::<scheme>::Proxy settings of an apt configuration file."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    settings = []
+    for scheme, value in APT_PROXY.findall(text) + APT_BLOCK_PROXY.findall(text):
+        if value.lower() not in DISABLED_VALUES:
+            settings.append((f'Acquire::{scheme}::Proxy', value))
+    return settings
+
+
+def parse_ini_proxy(path):
+    """Parses proxy= style settings (yum, dnf, npm)."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return [(name, value) for name, value in INI_PROXY.findall(f.read())
+                if value.lower() not in DISABLED_VALUES]
+
+
+def parse_gitconfig(path):
+    """Parses the proxy settings of the [http] and [https] sections of a git config."""
+    settings = []
+    section = None
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('['):
+                header = line.strip('[]').strip()
+                section = header.split()[0].lower() if header else None
+                continue
+            if section in ('http', 'https') and '=' in line:
+                key, _, value = line.partition('=')
+                if key.strip().lower() == 'proxy':
+                    value = value.strip().strip('"')
+                    if value.lower() not in DISABLED_VALUES:
+                        settings.append((f'{header}.proxy', value))
+    return settings
+
+
+def parse_docker_config(path):
+    """Parses the client proxy settings of a Docker config.json."""
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            config = json.load(f)
+        except ValueError:
+            return []
+    settings = []
+    proxies = config.get('proxies') if isinstance(config, dict) else None
+    for scope, values in (proxies or {}).items():
+        if not isinstance(values, dict):
+            continue
+        for name, value in values.items():
+            if name.lower() != 'noproxy' and value:
+                settings.append((f'proxies.{scope}.{name}', str(value)))
+    return settings
+
+
+def parse_firefox_prefs(path):
+    """Parses the effective proxy configuration of a Firefox profile's prefs.js."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        prefs = {name: value for name, _, value in FIREFOX_PREF.findall(f.read())}
+
+    mode = prefs.get('network.proxy.type')
+    if mode == FIREFOX_PAC and prefs.get('network.proxy.autoconfig_url'):
+        return [('network.proxy.autoconfig_url', prefs['network.proxy.autoconfig_url'])]
+    if mode == FIREFOX_WPAD:
+        return [('network.proxy.type', 'auto-detect (WPAD)')]
+    if mode != FIREFOX_MANUAL:
+        return []
+    settings = []
+    for scheme in ('http', 'ssl', 'socks'):
+        host = prefs.get(f'network.proxy.{scheme}')
+        if host:
+            port = prefs.get(f'network.proxy.{scheme}_port', '')
+            settings.append((f'network.proxy.{scheme}', f'{host}:{port}' if port else host))
+    return settings
+
+
+def read_gnome_proxy(path):
+    """
+    Reads the GNOME proxy settings stored in a dconf database.
+
+    The database is a binary GVariant file, so it is read through gsettings;
+    the file itself only tells when the settings changed.
+    """
+    if not os.path.exists(path) or shutil.which('gsettings') is None:
+        return []
+    try:
+        output = subprocess.run(
+            ['gsettings', 'list-recursively', 'org.gnome.system.proxy'],
+            capture_output=True, text=True, timeout=5, check=True
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return []
+
+    values = {f'{schema}.{key}': value.strip("'") for schema, key, value in GSETTINGS_LINE.findall(output)}
+    mode = values.get('org.gnome.system.proxy.mode')
+    if mode == 'auto':
+        url = values.get('org.gnome.system.proxy.autoconfig-url')
+        return [('org.gnome.system.proxy.autoconfig-url', url or 'auto-detect (WPAD)')]
+    if mode != 'manual':
+        return []
+    settings = []
+    for scheme in ('http', 'https', 'ftp', 'socks'):
+        host = values.get(f'org.gnome.system.proxy.{scheme}.host')
+        if host:
+            port = values.get(f'org.gnome.system.proxy.{scheme}.port', '0')
+            settings.append((f'org.gnome.system.proxy.{scheme}', f'{host}:{port}'))
+    return settings
+
+
+# (path pattern, parser); '~' is the home directory of the monitoring user
+DEFAULT_SOURCES = [
+    ('/etc/environment', parse_shell_environment),
+    ('/etc/profile.d/*.sh', parse_shell_environment),
+    ('/etc/apt/apt.conf', parse_apt),
+    ('/etc/apt/apt.conf.d/*', parse_apt),
+    ('/etc/yum.conf', parse_ini_proxy),
+    ('/etc/dnf/dnf.conf', parse_ini_proxy),
+    ('/etc/gitconfig', parse_gitconfig),
+    ('~/.gitconfig', parse_gitconfig),
+    ('~/.npmrc', parse_ini_proxy),
+    ('~/.docker/config.json', parse_docker_config),
+    ('~/.config/dconf/user', read_gnome_proxy),
+    ('~/.mozilla/firefox/*/prefs.js', parse_firefox_prefs),
+]
+
+
+class ProxyConfigIndex:
+    """
+    Index of the proxy settings found in configuration files.
+
+    Every file is parsed once and cached with its (inode, mtime, size)
+    signature. Without a watcher, scan() stats the files and re-parses the
+    ones whose signature changed. With a ProxyConfigWatcher attached, scan()
+    returns the cached settings without touching the file system until the
+    watcher reports a change, and then re-parses only the reported files
+    (plus any whose signature changed).
+    """
+
+    def __init__(self, sources=None):
+        """
+        Initializes the index.
+
+        Args:
+            sources: (path pattern, parser) pairs (default: DEFAULT_SOURCES).
+                Patterns may use '~' and glob wildcards.
+        """
+        self.sources = [(os.path.expanduser(pattern), parser)
+                        for pattern, parser in (sources or DEFAULT_SOURCES)]
+        # path -> (stat key, settings)
+        self.parsed = {}
+        self.entries = None
+        self.watched = False
+        self._stale = True
+        self._modified = set()
+        self._lock = threading.Lock()
+
+    def mark_modified(self, path=None):
+        """
+        Records a change reported by the watcher; called from its thread.
+
+        Args:
+            path: Modified file, or None when the set of files may have changed.
+        """
+        with self._lock:
+            self._stale = True
+            if path is not None:
+                self._modified.add(path)
+
+    def scan(self):
+        """
+        Returns the proxy settings of all configuration files.
+
+        Returns:
+            list: {'source', 'setting', 'value'} dicts, in source order.
+        """
+        with self._lock:
+            if self.watched and not self._stale and self.entries is not None:
+                return self.entries
+            self._stale = False
+            modified, self._modified = self._modified, set()
+
+        entries = []
+        parsed = {}
+        for pattern, parser in self.sources:
+            paths = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+            for path in paths:
+                key = stat_key(path)
+                if key is None:
+                    continue
+                cached = self.parsed.get(path)
+                if cached is None or cached[0] != key or path in modified:
+                    try:
+                        cached = (key, parser(path))
+                    except (OSError, UnicodeDecodeError):
+                        continue
+                parsed[path] = cached
+                for setting, value in cached[1]:
+                    entries.append({'source': path, 'setting': setting, 'value': value})
+
+        self.parsed = parsed
+        self.entries = entries
+        return entries
+
+
+class ProxyConfigWatcher:
+    """
+    Watches the directories of a ProxyConfigIndex's sources with inotify.
+
+    Directories are watched rather than files, so that editors replacing a
+    file by rename and files created later are noticed. For a source whose
+    directory does not exist yet, the nearest existing ancestor is watched
+    for the missing path component. Each relevant change marks the file in
+    the index and calls on_change from the watcher thread.
+
+    Raises OSError when inotify is not available.
+    """
+
+    def __init__(self, index, on_change):
+        """
+        Initializes the watcher.
+
+        Args:
+            index: ProxyConfigIndex to keep up to date.
+            on_change: Callable invoked after a relevant change.
+        """
+        from utils.inotify import Inotify
+
+        self.index = index
+        self.on_change = on_change
+        self.inotify = Inotify()
+        # wd -> (directory, [name patterns])
+        self.watches = {}
+        self._stop_read, self._stop_write = os.pipe()
+        self._thread = None
+
+    def start(self):
+        """Adds the watches and starts the watcher thread."""
+        self._add_watches()
+        self.index.watched = True
+        self._thread = threading.Thread(target=self._run, name='proxy-config-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the watcher thread and releases the inotify instance."""
+        self.index.watched = False
+        os.write(self._stop_write, b'\0')
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self.inotify.close()
+        os.close(self._stop_read)
+        os.close(self._stop_write)
+
+    def _add_watches(self):
+        """(Re)computes the watch points; watching an already watched path is a no-op."""
+        watches = {}
+        for pattern, _ in self.index.sources:
+            for directory, name in watch_points(pattern):
+                try:
+                    wd = self.inotify.add_watch(directory)
+                except OSError:
+                    continue
+                watches.setdefault(wd, (directory, []))[1].append(name)
+        self.watches = watches
+
+    def _run(self):
+        while True:
+            readable, _, _ = select.select([self.inotify.fileno(), self._stop_read], [], [])
+            if self._stop_read in readable:
+                return
+
+            changed = False
+            rewatch = False
+            for wd, mask, name in self.inotify.read_events():
+                if mask & IN_Q_OVERFLOW:
+                    # Events were lost: re-check everything
+                    self.index.mark_modified()
+                    changed = rewatch = True
+                    continue
+                watch = self.watches.get(wd)
+                if watch is None:
+                    continue
+                if not name and mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    # A watched directory went away: watch its ancestors instead
+                    self.index.mark_modified()
+                    changed = rewatch = True
+                    continue
+                directory, patterns = watch
+                if not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+                    continue
+                path = os.path.join(directory, name)
+                self.index.mark_modified(path)
+                changed = True
+                # Directories on the way to a source appeared or went away
+                if mask & IN_ISDIR or not self._is_source(path):
+                    rewatch = True
+
+            if rewatch:
+                self._add_watches()
+            if changed:
+                self.on_change()
+
+    def _is_source(self, path):
+        return any(fnmatch.fnmatch(path, pattern) for pattern, _ in self.index.sources)
+
+
+def watch_points(pattern):
+    """
+    Returns the directories to watch for a source pattern.
+
+    Args:
+        pattern: Absolute path pattern; wildcards may appear in the file
+            name and in the last directory component.
+
+    Returns:
+        list: (existing directory, name pattern) pairs.
+    """
+    directory, name = os.path.split(pattern)
+    points = []
+    if glob.has_magic(directory):
+        parent, child = os.path.split(directory)
+        points.extend((match, name) for match in glob.glob(directory) if os.path.isdir(match))
+        directory, name = parent, child
+
+    # Climb to the nearest existing ancestor, watching for the next component
+    while not os.path.isdir(directory):
+        directory, name = os.path.split(directory)
+        if not name:
+            return points
+    points.append((directory, name))
+    return points
@@ -0,0 +1,228 @@
+"""
+Proxy Probe Module
+Fingerprints local TCP listeners as HTTP, SOCKS or TLS-terminating proxies
+by probing them concurrently with asyncio
+"""
+import asyncio
+import ssl
+import psutil
+
+HTTP_PROXY = 'HTTP proxy'
+SOCKS5_PROXY = 'SOCKS5 proxy'
+SOCKS4_PROXY = 'SOCKS4 proxy'
+TLS_PROXY = 'TLS-terminating proxy'
+
+# Destination of the CONNECT and SOCKS4 probes: port 1 on loopback is
+# refused at once, so a proxy answers quickly and nothing leaves the host
+PROBE_DESTINATION = ('127.0.0.1', 1)
+# Name sent as SNI in the TLS probe. No legitimate local service has a
+# certificate for it; a proxy that mints certificates on the fly does.
+PROBE_HOSTNAME = 'netmon-probe.invalid'
+
+SOCKS5_GREETING = b'\x05\x01\x00'  # version 5, one method: no authentication
+SOCKS4_CONNECT = (b'\x04\x01' + PROBE_DESTINATION[1].to_bytes(2, 'big')
+                  + bytes(int(part) for part in PROBE_DESTINATION[0].split('.')) + b'\x00')
+HTTP_CONNECT = (f'CONNECT {PROBE_DESTINATION[0]}:{PROBE_DESTINATION[1]} HTTP/1.1\r\n'
+                f'Host: {PROBE_DESTINATION[0]}:{PROBE_DESTINATION[1]}\r\n\r\n').encode('ascii')
+
+# CONNECT replies only a proxy gives: tunnel established, proxy
+# authentication required, or upstream unreachable
+PROXY_STATUSES = (b'200', b'407', b'502', b'503', b'504')
+PROXY_HEADERS = (b'\r\nproxy-', b'\r\nvia:')
+
+
+def classify_socks5(reply):
+    """Whether a reply to the SOCKS5 greeting comes from a SOCKS5 server."""
+    return len(reply) >= 2 and reply[0] == 5 and reply[1] in (0, 1, 2, 0xff)
+
+
+def classify_socks4(reply):
+    """Whether a reply to the SOCKS4 CONNECT comes from a SOCKS4 server."""
+    return len(reply) >= 2 and reply[0] == 0 and 0x5a <= reply[1] <= 0x5d
+
+
+def classify_http_connect(reply):
+    """Whether a reply to the HTTP CONNECT comes from an HTTP proxy."""
+    if not reply.startswith(b'HTTP/1.'):
+        return False
+    status = reply[9:12]
+    headers = reply.split(b'\r\n\r\n', 1)[0].lower()
+    return status in PROXY_STATUSES or any(header in headers for header in PROXY_HEADERS)
+
+
+class ListenerProber:
+    """
+    Probes local TCP listeners for proxy behavior.
+
+    Each listener gets, in turn and on separate connections, an HTTP
+    CONNECT, a SOCKS5 greeting, a SOCKS4 CONNECT and a TLS handshake with
+    an unresolvable SNI name, stopping at the first that identifies it. All
+    listeners are probed concurrently, bounded by a semaphore, and every
+    exchange has a short timeout. Results are cached per (port, pid,
+    process create time), so a listener is probed once for the lifetime of
+    its process; listeners without a known pid are re-probed after ttl.
+    """
+
+    def __init__(self, timeout=0.5, concurrency=256, ttl=600):
+        """
+        Initializes the prober.
+
+        Args:
+            timeout: Seconds allowed for each connect and each reply.
+            concurrency: Maximum listeners probed at once.
+            ttl: Seconds after which results for listeners of unknown
+                processes are discarded.
+        """
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.ttl = ttl
+        # (port, pid, create time) -> (kind or None, probed at)
+        self.cache = {}
+        self.probes = 0
+        # Only the presented certificate matters, so nothing is verified
+        # and no CA store is loaded (that costs tens of milliseconds)
+        self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        self.context.check_hostname = False
+        self.context.verify_mode = ssl.CERT_NONE
+
+    def probe(self, listeners, now):
+        """
+        Returns the listeners that behave as proxies.
+
+        Args:
+            listeners: (host, port, pid) tuples; host is the address to
+                connect to (wildcard addresses already mapped to loopback).
+            now: Current time (datetime), for expiring uncached results.
+
+        Returns:
+            list: {'host', 'port', 'pid', 'kind'} dicts for the proxies found.
+        """
+        pending = []
+        results = []
+        seen = set()
+        create_times = {}
+        for host, port, pid in listeners:
+            if pid not in create_times:
+                create_times[pid] = _create_time(pid)
+            key = (port, pid, create_times[pid])
+            if key in seen:
+                continue  # The same socket on IPv4 and IPv6, or several workers
+            seen.add(key)
+            cached = self.cache.get(key)
+            if cached is not None and (key[2] is not None or (now - cached[1]).total_seconds() < self.ttl):
+                if cached[0] is not None:
+                    results.append({'host': host, 'port': port, 'pid': pid, 'kind': cached[0]})
+                continue
+            pending.append((key, host, port, pid))
+
+        if pending:
+            kinds = asyncio.run(self._probe_all([(host, port) for _, host, port, _ in pending]))
+            for (key, host, port, pid), kind in zip(pending, kinds):
+                self.cache[key] = (kind, now)
+                if kind is not None:
+                    results.append({'host': host, 'port': port, 'pid': pid, 'kind': kind})
+
+        # Forget listeners that are gone
+        self.cache = {key: value for key, value in self.cache.items() if key in seen}
+        return sorted(results, key=lambda r: (r['port'], r['pid'] or 0))
+
+    async def _probe_all(self, targets):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(host, port):
+            async with semaphore:
+                return await self.classify(host, port)
+
+        return await asyncio.gather(*(bounded(host, port) for host, port in targets))
+
+    async def classify(self, host, port):
+        """
+        Classifies one listener.
+
+        Returns:
+            str: HTTP_PROXY, SOCKS5_PROXY, SOCKS4_PROXY, TLS_PROXY, or None.
+        """
+        self.probes += 1
+        for payload, classify, kind in ((HTTP_CONNECT, classify_http_connect, HTTP_PROXY),
+                                        (SOCKS5_GREETING, classify_socks5, SOCKS5_PROXY),
+                                        (SOCKS4_CONNECT, classify_socks4, SOCKS4_PROXY)):
+            try:
+                reply = await self._exchange(host, port, payload)
+            except (OSError, asyncio.TimeoutError):
+                return None  # Not accepting connections from here
+            if reply is None:
+                # Each probe is a complete request that these proxies
+                # answer or reject at once. A TLS server instead reads the
+                # bytes as a record header and waits for the rest, so only
+                # the TLS probe is still worth its timeout.
+                break
+            if classify(reply):
+                return kind
+
+        if await self._mints_certificates(host, port):
+            return TLS_PROXY
+        return None
+
+    async def _exchange(self, host, port, payload, size=512):
+        """Sends a payload and returns the first bytes of the reply (b'' if closed, None on timeout)."""
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), self.timeout)
+        try:
+            writer.write(payload)
+            await writer.drain()
+            return await asyncio.wait_for(reader.read(size), self.timeout)
+        except asyncio.TimeoutError:
+            return None
+        except ConnectionError:
+            return b''
+        finally:
+            writer.close()
+
+    async def _mints_certificates(self, host, port):
+        """Whether the listener answers a TLS handshake with a certificate for PROBE_HOSTNAME."""
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=self.context, server_hostname=PROBE_HOSTNAME,
+                                        ssl_handshake_timeout=self.timeout),
+                self.timeout * 2)
+        except (OSError, asyncio.TimeoutError, ssl.SSLError):
+            return False
+        try:
+            certificate = writer.get_extra_info('ssl_object').getpeercert(binary_form=True) or b''
+        finally:
+            writer.close()
+        # The name appears as a DER string in the subject or subjectAltName
+        return PROBE_HOSTNAME.encode('ascii') in certificate
+
+
+def _create_time(pid):
+    """Returns the create time of a process, or None if unknown."""
+    if not pid:
+        return None
+    try:
+        return psutil.Process(pid).create_time()
+    except (psutil.Error, OSError):
+        return None
+
+
+def listener_targets(connections, exclude_pids=()):
+    """
+    Returns the addresses at which the TCP listeners of a socket table can be probed.
+
+    Args:
+        connections: psutil-shaped socket table.
+        exclude_pids: Processes whose listeners are skipped.
+
+    Returns:
+        list: (host, port, pid) tuples.
+    """
+    targets = []
+    for conn in connections:
+        if conn.status != 'LISTEN' or not conn.laddr or conn.pid in exclude_pids:
+            continue
+        host = conn.laddr.ip
+        if host in ('0.0.0.0', ''):
+            host = '127.0.0.1'
+        elif host == '::':
+            host = '::1'
+        targets.append((host, conn.laddr.port, conn.pid))
+    return targets
@@ -0,0 +1,391 @@
+"""
+Report Diff Module
+Compares two JSON reports written by Reporter.export_json
+
+Both reports are streamed with an incremental parser instead of being
+loaded, and the findings of the previous report are indexed by a hash of
+their module, type and detail (the identity ChangeDetector compares), so
+memory depends on the number of findings of one report and not on the
+size of either document. The previous report is read twice: once to build
+the index, and once after the current report to print the resolved
+findings, whose details are not kept.
+"""
+import json
+import re
+
+CHUNK_SIZE = 1 << 16
+
+# Lines buffered before a write by the output functions
+WRITE_BATCH = 1000
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class ReportFormatError(ValueError):
+    """Raised when a file is not a JSON report."""
+
+
+class JsonStream:
+    """
+    Incremental JSON reader over a text file.
+
+    The structure is walked one token at a time with members() and
+    elements(); values inside it are decoded whole with value(). Only the
+    unread part of the current chunk is kept in memory.
+    """
+
+    def __init__(self, handle, chunk_size=CHUNK_SIZE):
+        """
+        Initializes the reader.
+
+        Args:
+            handle: Text file opened for reading.
+            chunk_size: Characters read at a time.
+        """
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        # Characters dropped from the front of the buffer, for error offsets
+        self.offset = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size=None):
+        """Appends the next chunk to the buffer; returns False at the end of the file."""
+        if self.eof:
+            return False
+        chunk = self.handle.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Returns the next non-whitespace character without consuming it ('' at the end)."""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars):
+        """
+        Consumes the next character, which must be one of chars.
+
+        Raises:
+            ReportFormatError: If it is not.
+        """
+        char = self.peek()
+        if not char or char not in chars:
+            raise ReportFormatError(f"expected one of {chars!r} at {self._where()}, found {char or 'end of file'!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """
+        Decodes the next value whole.
+
+        Raises:
+            ReportFormatError: If it is not valid JSON.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # Incomplete value: read more, doubling the read for large values
+                if self._fill(max(self.chunk_size, len(self.buffer) - self.pos)):
+                    continue
+                raise ReportFormatError(f"{e.msg} at {self._where()}") from None
+            if end == len(self.buffer) and self._fill():
+                # A number may continue in the next chunk
+                continue
+            self.pos = end
+            return value
+
+    def members(self):
+        """
+        Iterates over the keys of an object.
+
+        The caller consumes each member's value before the next key.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ReportFormatError(f"expected an object key at {self._where()}")
+            self.expect(':')
+            yield key
+            if self.expect(',}') == '}':
+                return
+
+    def elements(self):
+        """
+        Iterates over the elements of an array, yielding their indexes.
+
+        The caller consumes each element before the next one.
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            if self.expect(',]') == ']':
+                return
+
+    def values(self):
+        """
+        Iterates over the elements of an array, decoding each one whole.
+
+        Equivalent to value() per element of elements(), in a tighter loop
+        for arrays of many small values.
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        # The C scanner behind raw_decode, without its wrapper
+        decode = self.decoder.scan_once
+        skip = WHITESPACE.match
+        while True:
+            buffer = self.buffer
+            # raw_decode does not skip whitespace, and its errors are costly
+            pos = skip(buffer, self.pos).end()
+            try:
+                value, end = decode(buffer, pos)
+                end = skip(buffer, end).end()
+                separator = buffer[end]
+            except (StopIteration, json.JSONDecodeError, IndexError):
+                # The value or its separator is not complete in this chunk
+                value = self.value()
+                separator = self.expect(',]')
+            else:
+                self.pos = end + 1
+                if separator not in ',]':
+                    raise ReportFormatError(f"expected one of ',]' at {self._where()}, found {separator!r}")
+            yield value
+            if separator == ']':
+                return
+
+    def _where(self):
+        return f"character {self.offset + self.pos}"
+
+
+def iter_report(handle):
+    """
+    Streams the parts of a report.
+
+    Args:
+        handle: Text file of a report written by Reporter.export_json.
+
+    Yields:
+        tuple: ('meta', key, value) for the top-level fields other than
+            results, ('finding', name, finding) for each finding with the
+            name of its module, and ('module', fields) after each module
+            with its fields other than findings.
+
+    Raises:
+        ReportFormatError: If the file is not a JSON report.
+    """
+    stream = JsonStream(handle)
+    if stream.peek() != '{':
+        raise ReportFormatError('not a JSON report')
+    for key in stream.members():
+        if key != 'results':
+            yield 'meta', key, stream.value()
+            continue
+        if stream.peek() != '[':
+            raise ReportFormatError('results is not a list')
+        for _ in stream.elements():
+            if stream.peek() != '{':
+                raise ReportFormatError(f"result is not an object at {stream._where()}")
+            fields = {}
+            # Findings seen before the module name; detectors put the name first
+            pending = []
+            for field in stream.members():
+                if field != 'findings':
+                    fields[field] = stream.value()
+                    continue
+                for finding in stream.values():
+                    if not isinstance(finding, dict) or 'type' not in finding or 'detail' not in finding:
+                        raise ReportFormatError(f"invalid finding at {stream._where()}")
+                    if 'name' in fields:
+                        yield 'finding', fields['name'], finding
+                    else:
+                        pending.append(finding)
+            for finding in pending:
+                yield 'finding', fields.get('name'), finding
+            yield 'module', fields
+    if stream.peek():
+        raise ReportFormatError(f"unexpected data at {stream._where()}")
+
+
+class ReportDiff:
+    """
+    Streams the changes between two reports.
+
+    Uses the semantics of ChangeDetector: only modules present in both
+    reports are compared, findings are identified by type and detail, and
+    a risk change is reported when a module's risk level differs.
+    """
+
+    def __init__(self, previous_path, current_path):
+        """
+        Initializes the diff.
+
+        Args:
+            previous_path: Path of the older report.
+            current_path: Path of the newer report.
+        """
+        self.previous_path = previous_path
+        self.current_path = current_path
+        self.previous_meta = {}
+        self.current_meta = {}
+        self.counts = {'new': 0, 'resolved': 0, 'risk': 0}
+
+    def changes(self):
+        """
+        Compares the reports.
+
+        Yields:
+            tuple: (kind, module, item): ('new', module, finding) in the
+                order of the current report, ('risk', module, {'from', 'to'})
+                after each module, then ('resolved', module, finding) in the
+                order of the previous report.
+
+        Raises:
+            ReportFormatError: If a file is not a JSON report.
+            OSError: If a file cannot be read.
+        """
+        # Hashes of the previous findings not seen in the current report
+        # yet, and of those already seen; together one entry per finding
+        unseen = set()
+        seen = set()
+        previous_risks = {}
+        with open(self.previous_path, encoding='utf-8') as handle:
+            for event in iter_report(handle):
+                if event[0] == 'finding':
+                    unseen.add(_finding_hash(event[1], event[2]))
+                elif event[0] == 'module':
+                    previous_risks[event[1].get('name')] = event[1].get('risk_level')
+                else:
+                    self.previous_meta[event[1]] = event[2]
+
+        compared = set()
+        with open(self.current_path, encoding='utf-8') as handle:
+            for event in iter_report(handle):
+                if event[0] == 'finding':
+                    name, finding = event[1], event[2]
+                    if name not in previous_risks:
+                        continue
+                    key = _finding_hash(name, finding)
+                    if key in unseen:
+                        unseen.remove(key)
+                        seen.add(key)
+                    elif key not in seen:
+                        self.counts['new'] += 1
+                        yield 'new', name, finding
+                elif event[0] == 'module':
+                    name = event[1].get('name')
+                    if name not in previous_risks:
+                        continue
+                    compared.add(name)
+                    risk = event[1].get('risk_level')
+                    if previous_risks[name] != risk:
+                        self.counts['risk'] += 1
+                        yield 'risk', name, {'from': previous_risks[name], 'to': risk}
+                else:
+                    self.current_meta[event[1]] = event[2]
+        # Only the unmatched previous findings are needed from here on
+        seen.clear()
+
+        if not unseen:
+            return
+        with open(self.previous_path, encoding='utf-8') as handle:
+            for event in iter_report(handle):
+                if event[0] == 'finding' and event[1] in compared \
+                        and _finding_hash(event[1], event[2]) in unseen:
+                    self.counts['resolved'] += 1
+                    yield 'resolved', event[1], event[2]
+
+
+def _finding_hash(module, finding):
+    """Compact key of a finding: a 64-bit hash of its module, type and detail."""
+    return hash((module, finding['type'], finding['detail']))
+
+
+def write_ndjson(changes, out):
+    """
+    Writes changes as newline-delimited JSON, one object per change.
+
+    Args:
+        changes: Iterable of (kind, module, item) from ReportDiff.changes().
+        out: Text stream.
+
+    Returns:
+        int: Number of changes written.
+    """
+    lines = []
+    count = 0
+    for kind, module, item in changes:
+        record = {'change': kind, 'module': module}
+        if kind == 'risk':
+            record.update(item)
+        else:
+            record['finding'] = item
+        lines.append(json.dumps(record, ensure_ascii=False))
+        count += 1
+        if len(lines) >= WRITE_BATCH:
+            out.write('\n'.join(lines) + '\n')
+            lines = []
+    if lines:
+        out.write('\n'.join(lines) + '\n')
+    return count
+
+
+def write_text(changes, translator, out):
+    """
+    Writes changes as text, one line per change.
+
+    New findings are prefixed with '+', resolved findings with '-' and risk
+    changes with '~'.
+
+    Args:
+        changes: Iterable of (kind, module, item) from ReportDiff.changes().
+        translator: Translator manager instance.
+        out: Text stream.
+
+    Returns:
+        int: Number of changes written.
+    """
+    finding_types = translator.labels('findings')
+    severity_levels = translator.labels('severity_levels')
+    risk_levels = translator.labels('risk_levels')
+    risk_changed = translator.t('monitor.risk_changed')
+    lines = []
+    count = 0
+    for kind, module, item in changes:
+        if kind == 'risk':
+            lines.append(f"~ [{module}] {risk_changed}: {risk_levels[item['from']]} → {risk_levels[item['to']]}")
+        else:
+            sign = '+' if kind == 'new' else '-'
+            lines.append(f"{sign} [{severity_levels[item.get('severity', 'INFO')]}] [{module}] "
+                         f"{finding_types[item['type']]}: {item['detail']}")
+        count += 1
+        if len(lines) >= WRITE_BATCH:
+            out.write('\n'.join(lines) + '\n')
+            lines = []
+    if lines:
+        out.write('\n'.join(lines) + '\n')
+    return count
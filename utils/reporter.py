@@ -3,6 +3,7 @@ Reporter Module
 Generates formatted reports from detection results
 """
 import json
+import sys
 from datetime import datetime
 from colorama import Fore, Style, init
 
@@ -21,54 +22,77 @@ class Reporter:
 
     def print_report(self):
         """Print colored terminal report"""
-        print("\n" + "=" * 70)
-        print(f"{Fore.CYAN}{Style.BRIGHT}{self.translator.t('report.title')}{Style.RESET_ALL}")
-        print(f"{self.translator.t('report.generated')}: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("=" * 70 + "\n")
+        self._write(self.render_report())
+
+    def render_report(self):
+        """Render the colored terminal report into one string"""
+        t = self.translator.t
+        risk_levels = self.translator.labels('risk_levels')
+        lines = []
+        add = lines.append
+
+        add("\n" + "=" * 70)
+        add(f"{Fore.CYAN}{Style.BRIGHT}{t('report.title')}{Style.RESET_ALL}")
+        add(f"{t('report.generated')}: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        add("=" * 70 + "\n")
 
         # Overall risk assessment
         overall_risk = self._calculate_overall_risk()
         risk_color = self._get_risk_color(overall_risk)
-        risk_level_translated = self.translator.t(f'risk_levels.{overall_risk}')
-        print(f"{Style.BRIGHT}{self.translator.t('report.overall_risk')}: {risk_color}{risk_level_translated}{Style.RESET_ALL}\n")
+        risk_level_translated = risk_levels[overall_risk]
+        add(f"{Style.BRIGHT}{t('report.overall_risk')}: {risk_color}{risk_level_translated}{Style.RESET_ALL}\n")
 
-        # Print each detection module result
+        # Render each detection module result
         for result in self.results:
-            self._print_module_result(result)
+            self._render_module_result(result, lines)
 
         # Summary
         total_findings = sum(len(r['findings']) for r in self.results)
-        print("\n" + "=" * 70)
-        print(f"{Style.BRIGHT}{self.translator.t('report.summary')}:{Style.RESET_ALL}")
-        print(f"  {self.translator.t('report.total_checks')}: {len(self.results)}")
-        print(f"  {self.translator.t('report.total_findings')}: {total_findings}")
-        print(f"  {self.translator.t('report.overall_risk')}: {risk_color}{risk_level_translated}{Style.RESET_ALL}")
-        print("=" * 70 + "\n")
-
-    def _print_module_result(self, result):
-        """Print a single module's results"""
+        add("\n" + "=" * 70)
+        add(f"{Style.BRIGHT}{t('report.summary')}:{Style.RESET_ALL}")
+        add(f"  {t('report.total_checks')}: {len(self.results)}")
+        add(f"  {t('report.total_findings')}: {total_findings}")
+        add(f"  {t('report.overall_risk')}: {risk_color}{risk_level_translated}{Style.RESET_ALL}")
+        add("=" * 70 + "\n")
+        lines.append('')
+        return "\n".join(lines)
+
+    def _render_module_result(self, result, lines):
+        """Render a single module's results, appending lines"""
+        t = self.translator.t
         risk_color = self._get_risk_color(result['risk_level'])
 
         # Translate module name if it's one of the standard detector names
         module_name = result['name']
 
         # Translate risk level
-        risk_level_translated = self.translator.t(f"risk_levels.{result['risk_level']}")
+        risk_level_translated = self.translator.labels('risk_levels')[result['risk_level']]
 
-        print(f"{Fore.YELLOW}{Style.BRIGHT}[{module_name}]{Style.RESET_ALL}")
-        print(f"  {self.translator.t('report.risk_level')}: {risk_color}{risk_level_translated}{Style.RESET_ALL}")
-        print(f"  {self.translator.t('report.findings_count')}: {len(result['findings'])}")
+        lines.append(f"{Fore.YELLOW}{Style.BRIGHT}[{module_name}]{Style.RESET_ALL}")
+        lines.append(f"  {t('report.risk_level')}: {risk_color}{risk_level_translated}{Style.RESET_ALL}")
+        lines.append(f"  {t('report.findings_count')}: {len(result['findings'])}")
 
         if result['findings']:
-            for i, finding in enumerate(result['findings'], 1):
-                severity_color = self._get_severity_color(finding['severity'])
-                # Translate finding type and severity
-                finding_type = self.translator.t(f"findings.{finding['type']}")
-                severity_translated = self.translator.t(f"severity_levels.{finding['severity']}")
-                print(f"    {i}. {severity_color}[{severity_translated}]{Style.RESET_ALL} "
-                      f"{finding_type}: {finding['detail']}")
-
-        print()
+            # Finding types and severities repeat: translate and color each once
+            finding_types = self.translator.labels('findings')
+            severities = self._severity_prefixes()
+            lines.extend(
+                f"    {i}. {severities[finding['severity']]} {finding_types[finding['type']]}: {finding['detail']}"
+                for i, finding in enumerate(result['findings'], 1)
+            )
+
+        lines.append('')
+
+    def _severity_prefixes(self):
+        """Colored '[severity]' prefixes of the current language"""
+        severity_levels = self.translator.labels('severity_levels')
+        return _Prefixes(lambda severity: f"{self._get_severity_color(severity)}"
+                                          f"[{severity_levels[severity]}]{Style.RESET_ALL}")
+
+    def _write(self, text):
+        """Write rendered output with a single write call"""
+        sys.stdout.write(text)
+        sys.stdout.flush()
 
     def export_json(self, filename='report.json'):
         """Export report as JSON"""
@@ -111,3 +135,15 @@ class Reporter:
             'INFO': Fore.WHITE
         }
         return colors.get(severity, Fore.WHITE)
+
+
+class _Prefixes(dict):
+    """Rendered strings of a few repeated keys, built on first use"""
+
+    def __init__(self, render):
+        super().__init__()
+        self.render = render
+
+    def __missing__(self, key):
+        value = self[key] = self.render(key)
+        return value
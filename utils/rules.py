@@ -0,0 +1,377 @@
+"""
+Rules Module
+Loads the detection rule files and compiles each rule set into indexed
+matchers: hash maps for ports and exact names, an Aho-Corasick automaton for
+substrings and compiled regular expressions for patterns
+"""
+import json
+import os
+import re
+from array import array
+from collections import deque
+
+# Rules shipped with the tool; files given with --rules are merged over it
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'detectors', 'rules.json')
+
+# Rule kinds, in the order their rules are numbered within a rule set
+KINDS = ('ports', 'exact', 'contains', 'regex')
+
+# Memoized match results kept per rule set before the memo is cleared
+MEMO_SIZE = 65536
+
+# Bits of a codepoint in the automaton's transition keys
+_CHAR_BITS = 21
+
+
+class RuleError(ValueError):
+    """Raised when a rule file cannot be parsed or compiled."""
+
+
+class SubstringAutomaton:
+    """
+    Aho-Corasick automaton over a set of substrings.
+
+    Finds every pattern occurring in a text in one pass over the text,
+    whatever the number of patterns. Transitions live in a single dict keyed
+    by (state, codepoint) and failure links in flat arrays, which keeps
+    100k-pattern automata compact.
+    """
+
+    def __init__(self, patterns):
+        """
+        Builds the automaton.
+
+        Args:
+            patterns: (substring, rule index) pairs; empty substrings are ignored.
+        """
+        goto = {}
+        children = [[]]
+        output = [None]
+        for pattern, index in patterns:
+            state = 0
+            for char in pattern:
+                code = ord(char)
+                key = (state << _CHAR_BITS) | code
+                child = goto.get(key)
+                if child is None:
+                    child = goto[key] = len(output)
+                    children[state].append((code, child))
+                    children.append([])
+                    output.append(None)
+                state = child
+            if state:
+                output[state] = (output[state] or ()) + (index,)
+
+        # Failure links, and for each state the nearest state on its failure
+        # chain that ends a pattern (0 if none), filled breadth first
+        fail = array('l', bytes(8 * len(output)))
+        suffix = array('l', bytes(8 * len(output)))
+        queue = deque(child for _, child in children[0])
+        while queue:
+            state = queue.popleft()
+            for code, child in children[state]:
+                queue.append(child)
+                target = fail[state]
+                while True:
+                    link = goto.get((target << _CHAR_BITS) | code)
+                    if link is not None:
+                        break
+                    if target == 0:
+                        link = 0
+                        break
+                    target = fail[target]
+                fail[child] = link
+                suffix[child] = link if output[link] is not None else suffix[link]
+
+        self.goto = goto
+        self.fail = fail
+        self.suffix = suffix
+        self.output = output
+
+    def __len__(self):
+        return len(self.output) - 1
+
+    def search(self, text):
+        """
+        Returns the rule indices of the patterns occurring in a text.
+
+        Returns:
+            list: Rule indices, once per occurrence.
+        """
+        goto = self.goto
+        fail = self.fail
+        suffix = self.suffix
+        output = self.output
+        found = []
+        state = 0
+        for char in text:
+            code = ord(char)
+            while True:
+                child = goto.get((state << _CHAR_BITS) | code)
+                if child is not None:
+                    state = child
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            match = state if output[state] is not None else suffix[state]
+            while match:
+                found.extend(output[match])
+                match = suffix[match]
+        return found
+
+
+class RuleSet:
+    """
+    Compiled rule set.
+
+    A rule matches a port ('ports'), a whole lowercase name ('exact'), a
+    lowercase substring ('contains') or a case-insensitive regular
+    expression ('regex'), and carries a description. Rules are numbered in
+    kind order, then in file order, and matches are returned in that order.
+    Match results are memoized per text, since the same process, interface
+    and issuer names come back every cycle.
+    """
+
+    def __init__(self, name, spec):
+        """
+        Compiles a rule set.
+
+        Args:
+            name: Rule set name, for error messages.
+            spec: Dict of kind -> {value: description}, as normalized by
+                parse_rules.
+
+        Raises:
+            RuleError: If a rule is invalid.
+        """
+        self.name = name
+        self.descriptions = []
+        self.ports = {}
+        self.exact = {}
+        self.regexes = []
+        substrings = []
+
+        for kind in KINDS:
+            for value, description in spec.get(kind, {}).items():
+                index = len(self.descriptions)
+                self.descriptions.append(description)
+                if kind == 'ports':
+                    self.ports[value] = description
+                elif kind == 'exact':
+                    self.exact[value] = self.exact.get(value, ()) + (index,)
+                elif kind == 'contains':
+                    substrings.append((value, index))
+                else:
+                    try:
+                        self.regexes.append((re.compile(value, re.IGNORECASE), index))
+                    except re.error as e:
+                        raise RuleError(f"{name}: invalid regex {value!r}: {e}")
+
+        self.automaton = SubstringAutomaton(substrings) if substrings else None
+        self.memo = {}
+
+    def __len__(self):
+        return len(self.descriptions)
+
+    def match_all(self, text):
+        """
+        Returns the descriptions of all rules matching a text.
+
+        Args:
+            text: Name to match (case-insensitive).
+
+        Returns:
+            tuple: Descriptions, in rule order.
+        """
+        result = self.memo.get(text)
+        if result is not None:
+            return result
+
+        lowered = text.lower()
+        indices = set(self.exact.get(lowered, ()))
+        if self.automaton is not None:
+            indices.update(self.automaton.search(lowered))
+        for pattern, index in self.regexes:
+            if pattern.search(lowered):
+                indices.add(index)
+        result = tuple(self.descriptions[index] for index in sorted(indices))
+
+        if len(self.memo) >= MEMO_SIZE:
+            self.memo.clear()
+        self.memo[text] = result
+        return result
+
+    def match(self, text):
+        """Returns the description of the first rule matching a text, or None."""
+        result = self.match_all(text)
+        return result[0] if result else None
+
+    def port(self, port):
+        """Returns the description of a port rule, or None."""
+        return self.ports.get(port)
+
+
+def parse_rules(document, source='<rules>'):
+    """
+    Validates a rule file and normalizes its rule sets.
+
+    Args:
+        document: Decoded JSON document.
+        source: File name, for error messages.
+
+    Returns:
+        dict: Rule set name -> {kind: {value: description or None}}, with
+              ports as ints and names and substrings in lower case. A None
+              description removes a rule defined by an earlier file.
+
+    Raises:
+        RuleError: If the document is not a valid rule file.
+    """
+    if not isinstance(document, dict) or not isinstance(document.get('rulesets'), dict):
+        raise RuleError(f"{source}: expected an object with a 'rulesets' object")
+    if document.get('version', 1) != 1:
+        raise RuleError(f"{source}: unsupported rule file version {document.get('version')!r}")
+
+    rulesets = {}
+    for name, spec in document['rulesets'].items():
+        if not isinstance(spec, dict):
+            raise RuleError(f"{source}: {name}: expected an object")
+        normalized = {}
+        for kind, rules in spec.items():
+            if kind not in KINDS:
+                raise RuleError(f"{source}: {name}: unknown rule kind {kind!r}")
+            if isinstance(rules, list):
+                rules = {value: value for value in rules}
+            if not isinstance(rules, dict):
+                raise RuleError(f"{source}: {name}.{kind}: expected an object or a list")
+            entries = normalized[kind] = {}
+            for value, description in rules.items():
+                if description is not None and not isinstance(description, str):
+                    raise RuleError(f"{source}: {name}.{kind}: description of {value!r} is not a string")
+                if kind == 'ports':
+                    try:
+                        port = int(value)
+                    except ValueError:
+                        port = -1
+                    if not 0 <= port <= 65535:
+                        raise RuleError(f"{source}: {name}.ports: invalid port {value!r}")
+                    value = port
+                elif kind != 'regex':
+                    value = value.lower()
+                entries[value] = description
+        rulesets[name] = normalized
+    return rulesets
+
+
+class RuleBook:
+    """
+    The rule sets in effect, loaded from the default rule file and any
+    additional files.
+
+    Rule files are read on first use, or by load(). reload() re-reads them
+    and recompiles only the rule sets whose rules changed; unchanged rule
+    sets keep their compiled matchers and memoized results. Detectors look
+    their rule sets up on every cycle, so a reload takes effect on the next
+    cycle without rebuilding them or their caches.
+    """
+
+    def __init__(self, paths=None):
+        """
+        Initializes the rule book.
+
+        Args:
+            paths: Rule files merged, in order, over the default file.
+        """
+        self.paths = [DEFAULT_RULES_FILE] + list(paths or [])
+        self.sets = None
+        # Rule set name -> canonical JSON of its rules, to detect changes
+        self.sources = {}
+        self.reload_requested = False
+
+    def configure(self, paths):
+        """Replaces the additional rule files; they are read on next use."""
+        self.paths = [DEFAULT_RULES_FILE] + list(paths)
+        self.sets = None
+        self.sources = {}
+
+    def load(self):
+        """
+        Reads and compiles the rule files.
+
+        Returns:
+            int: Number of rules loaded.
+
+        Raises:
+            RuleError: If a file is invalid; the rules in effect are kept.
+            OSError: If a file cannot be read; the rules in effect are kept.
+        """
+        merged = {}
+        for path in self.paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                try:
+                    document = json.load(f)
+                except ValueError as e:
+                    raise RuleError(f"{path}: {e}")
+            for name, spec in parse_rules(document, path).items():
+                target = merged.setdefault(name, {})
+                for kind, entries in spec.items():
+                    target.setdefault(kind, {}).update(entries)
+
+        sets = {}
+        sources = {}
+        for name, spec in merged.items():
+            spec = {kind: {value: description for value, description in entries.items()
+                           if description is not None}
+                    for kind, entries in spec.items()}
+            source = json.dumps({kind: list(entries.items()) for kind, entries in spec.items()},
+                                sort_keys=True)
+            if self.sets is not None and self.sources.get(name) == source:
+                sets[name] = self.sets[name]
+            else:
+                sets[name] = RuleSet(name, spec)
+            sources[name] = source
+
+        self.sets = sets
+        self.sources = sources
+        return sum(len(ruleset) for ruleset in sets.values())
+
+    def get(self, name):
+        """
+        Returns a compiled rule set (empty if no file defines it).
+
+        The rule files are loaded on first use.
+        """
+        if self.sets is None:
+            self.load()
+        ruleset = self.sets.get(name)
+        if ruleset is None:
+            ruleset = self.sets[name] = RuleSet(name, {})
+            self.sources[name] = json.dumps({})
+        return ruleset
+
+    def request_reload(self):
+        """
+        Asks for the rule files to be reloaded before the next cycle.
+
+        Only sets a flag, so it is safe to call from a signal handler.
+        """
+        self.reload_requested = True
+
+    def reload(self):
+        """
+        Reloads the rule files, keeping the rules in effect if they are invalid.
+
+        Returns:
+            int: Number of rules loaded.
+
+        Raises:
+            RuleError, OSError: As load().
+        """
+        self.reload_requested = False
+        return self.load()
+
+
+# Rule book shared by the detectors
+rules = RuleBook()
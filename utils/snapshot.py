@@ -0,0 +1,477 @@
+"""
+System Snapshot Module
+Collects the raw system state consumed by the detectors once per cycle,
+and records or replays it for offline, deterministic runs
+"""
+import json
+import os
+import socket
+import struct
+import threading
+import zlib
+from collections import namedtuple
+from datetime import datetime
+import psutil
+
+# Field layout of the psutil named tuples the detectors consume
+addr = namedtuple('addr', ['ip', 'port'])
+sconn = namedtuple('sconn', ['fd', 'family', 'type', 'laddr', 'raddr', 'status', 'pid'])
+snicstats = namedtuple('snicstats', ['isup', 'duplex', 'speed', 'mtu'])
+snetio = namedtuple('snetio', ['bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv',
+                               'errin', 'errout', 'dropin', 'dropout'])
+
+# Recording file layout: MAGIC, then frames of FRAME_HEADER + zlib(JSON)
+MAGIC = b'NMSNAP1\n'
+FRAME_HEADER = struct.Struct('<dI')  # capture timestamp, payload length
+
+
+class SnapshotMissing(LookupError):
+    """Raised when a replayed frame does not contain the requested input."""
+
+
+class SystemSnapshot:
+    """
+    Per-cycle cache of raw system inputs.
+
+    Every input is collected at most once per cycle, no matter how many
+    detectors read it. Errors are cached as well and re-raised to each
+    reader, so detectors keep their own error handling. The owner of the
+    snapshot (MonitoringService or main) calls refresh() before each cycle.
+    """
+
+    # Whether cycles should be paced by the wall-clock interval
+    realtime = True
+    # Whether the inputs are collected from this host by this process, so
+    # that another local process could collect them instead
+    local = True
+
+    def __init__(self):
+        self._cache = {}
+        # Section -> collector replacing the live one in this cycle
+        self._providers = {}
+        # Section -> lock, so that detectors running concurrently collect a section once
+        self._locks = {}
+        self.captured_at = datetime.now()
+
+    def refresh(self):
+        """
+        Starts a new cycle, discarding the cached inputs.
+
+        Returns:
+            bool: False when no further cycles are available.
+        """
+        self._cache.clear()
+        self._providers.clear()
+        self.captured_at = datetime.now()
+        return True
+
+    def provide(self, section, provider):
+        """
+        Replaces the collection of a section for the current cycle.
+
+        The first reader of the section calls provider(collect) instead of
+        collect(), e.g. to wait for a worker process that collected it;
+        collect is the live collector, to fall back to.
+
+        Args:
+            section: Input name.
+            provider: Callable taking the live collector.
+        """
+        self._providers[section] = provider
+
+    def collected(self, sections):
+        """
+        Returns the given sections collected in this cycle so far.
+
+        Args:
+            sections: Input names.
+
+        Returns:
+            dict: Section -> (ok, value or exception).
+        """
+        return {section: self._cache[section] for section in sections if section in self._cache}
+
+    def close(self):
+        """Releases any resources held by the snapshot."""
+        pass
+
+    def connections(self):
+        """Returns the inet socket table (psutil.net_connections)."""
+        return self._capture('connections', lambda: psutil.net_connections(kind='inet'))
+
+    def processes(self):
+        """Returns the process table as a list of {'pid', 'name'} dicts."""
+        return self._capture('processes', self._collect_processes)
+
+    def interfaces(self):
+        """Returns interface name -> stats (psutil.net_if_stats)."""
+        return self._capture('interfaces', psutil.net_if_stats)
+
+    def namespaces(self):
+        """Returns PID -> network namespace inode, for the processes that can be inspected."""
+        return self._capture('namespaces', self._collect_namespaces)
+
+    def local_addresses(self):
+        """Returns the addresses of this host's interfaces, as a sorted list."""
+        return self._capture('local_addresses', lambda: sorted({
+            address.address.split('%')[0]
+            for addresses in psutil.net_if_addrs().values() for address in addresses
+        }))
+
+    def io_counters(self):
+        """Returns the global network I/O counters (psutil.net_io_counters)."""
+        return self._capture('io_counters', psutil.net_io_counters)
+
+    def environment(self, names):
+        """
+        Returns the subset of this process's environment the detectors inspect.
+
+        Only the requested variables are collected, so recordings do not
+        capture unrelated secrets from the environment.
+
+        Args:
+            names: Variable names of interest.
+
+        Returns:
+            dict: Variable name -> value, for the variables that are set.
+        """
+        return self._capture('environment', lambda: {
+            name: os.environ[name] for name in names if name in os.environ
+        })
+
+    def tls_probe(self, hostname, port, probe):
+        """
+        Returns the result of a TLS probe of a target.
+
+        Args:
+            hostname: Target host name.
+            port: Target port.
+            probe: Callable performing the handshake.
+
+        Returns:
+            dict: {'certificate': getpeercert() dict, 'timings': phase -> seconds}.
+        """
+        return self._capture(f'tls_probe:{hostname}:{port}', probe)
+
+    def trust_anchors(self, scan):
+        """
+        Returns the trust anchors installed on the system.
+
+        Args:
+            scan: Callable returning the SPKI fingerprint index (TrustStore.scan).
+
+        Returns:
+            dict: SPKI SHA-256 -> {'name', 'organization', 'sources'}.
+        """
+        return self._capture('trust_store', scan)
+
+    def proxy_config(self, scan):
+        """
+        Returns the proxy settings found in configuration files.
+
+        Args:
+            scan: Callable returning the settings (ProxyConfigIndex.scan).
+
+        Returns:
+            list: {'source', 'setting', 'value'} dicts.
+        """
+        return self._capture('proxy_config', scan)
+
+    def process_environments(self, scan):
+        """
+        Returns the variables of interest set in other processes' environments.
+
+        Args:
+            scan: Callable performing the scan (ProcessEnvironmentScanner.scan).
+
+        Returns:
+            dict: {'processes': [{'pid', 'name', 'variables'}], 'denied': count}.
+        """
+        return self._capture('process_environ', scan)
+
+    def process_maps(self, scan):
+        """
+        Returns the processes mapping libraries that match a signature.
+
+        Args:
+            scan: Callable performing the scan (ProcessMapsScanner.scan).
+
+        Returns:
+            dict: {'processes': [{'pid', 'name', 'libraries'}], 'denied': count}.
+        """
+        return self._capture('process_maps', scan)
+
+    def listener_probes(self, probe):
+        """
+        Returns the local TCP listeners that behave as proxies.
+
+        Args:
+            probe: Callable probing the listeners (ListenerProber.probe).
+
+        Returns:
+            list: {'host', 'port', 'pid', 'kind'} dicts.
+        """
+        return self._capture('listener_probes', probe)
+
+    def neighbors(self, read):
+        """
+        Returns the IPv4 neighbor table and the default gateways.
+
+        Args:
+            read: Callable reading the tables (neighbors.read_neighbors).
+
+        Returns:
+            dict: {'arp': IP -> (MAC, device), 'gateways': [(device, IP), ...]}.
+        """
+        return self._capture('neighbors', read)
+
+    def conntrack(self, scan):
+        """
+        Returns the aggregated connection tracking table.
+
+        Only the aggregates are captured, so recordings stay small whatever
+        the number of tracked flows.
+
+        Args:
+            scan: Callable streaming the table (conntrack.scan_conntrack).
+
+        Returns:
+            dict: Aggregates, as ConntrackAggregator.result().
+        """
+        return self._capture('conntrack', scan)
+
+    def firewall_rules(self, read):
+        """
+        Returns the active iptables and nftables ruleset dumps.
+
+        Args:
+            read: Callable dumping the rulesets (firewall.read_rulesets).
+
+        Returns:
+            dict: {'rulesets': source -> dump text, 'denied': [source, ...]}.
+        """
+        return self._capture('firewall_rules', read)
+
+    def _collect_processes(self):
+        processes = []
+        for proc in psutil.process_iter(['pid', 'name']):
+            try:
+                processes.append({'pid': proc.info['pid'], 'name': proc.info['name'] or ''})
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return processes
+
+    def _collect_namespaces(self):
+        namespaces = {}
+        for pid in psutil.pids():
+            try:
+                # 'net:[4026531992]'
+                link = os.readlink(f'/proc/{pid}/ns/net')
+            except OSError:
+                continue
+            namespaces[pid] = int(link[link.index('[') + 1:-1])
+        return namespaces
+
+    def _capture(self, section, collect):
+        """
+        Returns a cached input, collecting it on first access in this cycle.
+
+        Args:
+            section: Input name.
+            collect: Callable collecting the input from the live system.
+        """
+        if section not in self._cache:
+            with self._locks.setdefault(section, threading.Lock()):
+                if section not in self._cache:
+                    provider = self._providers.get(section)
+                    try:
+                        self._cache[section] = (True, provider(collect) if provider else collect())
+                    except Exception as e:
+                        self._cache[section] = (False, e)
+
+        ok, value = self._cache[section]
+        if not ok:
+            raise value
+        return value
+
+
+class RecordingSnapshot(SystemSnapshot):
+    """
+    Live snapshot that also appends each cycle's inputs to a recording file.
+
+    Args:
+        path: Output file path.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC)
+        self._frame = {}
+
+    def refresh(self):
+        self._write_frame()
+        return super().refresh()
+
+    def close(self):
+        if self._file is not None:
+            self._write_frame()
+            self._file.close()
+            self._file = None
+
+    def _capture(self, section, collect):
+        first_access = section not in self._cache
+        try:
+            return super()._capture(section, collect)
+        finally:
+            if first_access:
+                ok, value = self._cache[section]
+                self._frame[section] = encode_section(section, value) if ok else encode_error(value)
+
+    def _write_frame(self):
+        # Sections provided by worker processes are recorded even if no
+        # detector in this process read them
+        for section in list(self._providers):
+            if section not in self._cache:
+                try:
+                    self._capture(section, None)
+                except Exception:
+                    pass
+        if not self._frame or self._file is None:
+            return
+        payload = zlib.compress(json.dumps(self._frame, separators=(',', ':')).encode('utf-8'))
+        self._file.write(FRAME_HEADER.pack(self.captured_at.timestamp(), len(payload)))
+        self._file.write(payload)
+        self._file.flush()
+        self._frame = {}
+
+
+class ReplaySnapshot(SystemSnapshot):
+    """
+    Snapshot that feeds recorded cycles back to the detectors.
+
+    Each refresh() advances to the next recorded frame, so the monitoring
+    loop runs at maximum speed instead of the wall-clock interval.
+
+    Args:
+        path: Recording file path.
+    """
+
+    realtime = False
+    local = False
+
+    def __init__(self, path):
+        super().__init__()
+        self._frames = iter_frames(path)
+        self._frame = {}
+
+    def refresh(self):
+        self._cache.clear()
+        frame = next(self._frames, None)
+        if frame is None:
+            self._frame = {}
+            return False
+        self.captured_at, self._frame = frame
+        return True
+
+    def close(self):
+        self._frames.close()
+
+    def _capture(self, section, collect):
+        if section not in self._cache:
+            if section in self._frame:
+                encoded = self._frame[section]
+                if isinstance(encoded, dict) and '__error__' in encoded:
+                    self._cache[section] = (False, decode_error(encoded))
+                else:
+                    self._cache[section] = (True, decode_section(section, encoded))
+            else:
+                self._cache[section] = (False, SnapshotMissing(f"{section} was not recorded in this cycle"))
+        return super()._capture(section, collect)
+
+
+def iter_frames(path):
+    """
+    Iterates over the frames of a recording file.
+
+    Args:
+        path: Recording file path.
+
+    Yields:
+        tuple: (captured_at datetime, {section: encoded input}).
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a snapshot recording")
+        while True:
+            header = f.read(FRAME_HEADER.size)
+            if len(header) < FRAME_HEADER.size:
+                return
+            timestamp, length = FRAME_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                # Truncated final frame, e.g. the recorder was killed
+                return
+            yield datetime.fromtimestamp(timestamp), json.loads(zlib.decompress(payload))
+
+
+def encode_section(section, value):
+    """Converts a collected input into a compact JSON-serializable form."""
+    if section == 'connections':
+        return [[c.fd, int(c.family), int(c.type),
+                 list(c.laddr) if c.laddr else None,
+                 list(c.raddr) if c.raddr else None,
+                 c.status, c.pid] for c in value]
+    if section == 'processes':
+        return [[p['pid'], p['name']] for p in value]
+    if section == 'interfaces':
+        return {name: [s.isup, int(s.duplex), s.speed, s.mtu] for name, s in value.items()}
+    if section == 'io_counters':
+        return list(value[:8])
+    return value
+
+
+def decode_section(section, encoded):
+    """Converts a recorded input back into the shape the detectors consume."""
+    if section == 'connections':
+        return [sconn(fd, family, kind,
+                      addr(*laddr) if laddr else (),
+                      addr(*raddr) if raddr else (),
+                      status, pid)
+                for fd, family, kind, laddr, raddr, status, pid in encoded]
+    if section == 'processes':
+        return [{'pid': pid, 'name': name} for pid, name in encoded]
+    if section == 'interfaces':
+        return {name: snicstats(*stats) for name, stats in encoded.items()}
+    if section == 'io_counters':
+        return snetio(*encoded)
+    if section == 'namespaces':
+        return {int(pid): inode for pid, inode in encoded.items()}
+    if section == 'neighbors':
+        # JSON turns the entry tuples into lists; the index hashes them
+        return {'arp': {ip: tuple(entry) for ip, entry in encoded['arp'].items()},
+                'gateways': [tuple(gateway) for gateway in encoded['gateways']]}
+    return encoded
+
+
+def encode_error(error):
+    """Records an exception raised while collecting an input."""
+    return {'__error__': type(error).__name__, 'message': str(error)}
+
+
+def decode_error(encoded):
+    """Rebuilds a recorded exception, using the original type where it matters."""
+    # Imported here: only replays need it, and ssl is slow to import
+    import ssl
+
+    if encoded['__error__'] == 'AccessDenied':
+        return psutil.AccessDenied(msg=encoded['message'])
+    error_types = {
+        'PermissionError': PermissionError,
+        'SSLError': ssl.SSLError,
+        'SSLCertVerificationError': ssl.SSLError,
+        'timeout': socket.timeout,
+        'TimeoutError': socket.timeout,
+    }
+    error_type = error_types.get(encoded['__error__'], RuntimeError)
+    return error_type(encoded['message'])
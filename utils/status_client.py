@@ -0,0 +1,59 @@
+"""
+Status Client Module
+Minimal client for the monitoring daemon's local query socket
+
+Deliberately depends on the standard library only, so that status bars
+and health checks pay for as little startup work as possible.
+"""
+import json
+import os
+import socket
+
+# Commands understood by the daemon
+COMMANDS = ('status', 'results', 'changes')
+
+
+def default_socket_path():
+    """
+    Returns the default daemon socket path for the current user.
+
+    Returns:
+        str: $XDG_RUNTIME_DIR/netmon.sock, or a per-user path in the temp directory.
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, 'netmon.sock')
+    # tempfile pulls in shutil and random; only import it when needed
+    import tempfile
+
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(tempfile.gettempdir(), f'netmon-{uid}.sock')
+
+
+def query(command='status', socket_path=None, timeout=2.0):
+    """
+    Sends one command to the daemon and returns the decoded reply.
+
+    Args:
+        command: One of COMMANDS.
+        socket_path: Daemon socket path (default: default_socket_path()).
+        timeout: Socket timeout in seconds.
+
+    Returns:
+        dict: The daemon's reply.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path or default_socket_path())
+        sock.sendall(command.encode('ascii') + b'\n')
+
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b'\n'):
+                break
+
+    return json.loads(b''.join(chunks))
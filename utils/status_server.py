@@ -0,0 +1,190 @@
+"""
+Status Server Module
+Serves the monitoring daemon's warm state over a Unix domain socket
+"""
+import asyncio
+import json
+import os
+import socket
+import threading
+from collections import deque
+from datetime import datetime
+from utils.status_client import default_socket_path
+
+RISK_ORDER = {'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
+
+
+class StatusServer:
+    """
+    Local query server for the current monitoring state.
+
+    The server runs its own asyncio event loop in a background thread, so
+    any number of clients can be served without blocking the scan loop.
+    Replies are serialized once per cycle in on_cycle() and swapped in as a
+    whole, so a query is a dictionary lookup and a single write.
+
+    Protocol: the client sends one command per line (status, results or
+    changes) and receives one JSON document per line.
+    """
+
+    def __init__(self, socket_path=None, history=50, client_timeout=10.0, backlog=1024):
+        """
+        Initializes the status server.
+
+        Args:
+            socket_path: Unix socket path (default: default_socket_path()).
+            history: Number of recent change reports kept for 'changes'.
+            client_timeout: Seconds an idle client connection is kept open.
+            backlog: Pending connection queue size, sized for bursts of clients.
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.client_timeout = client_timeout
+        self.backlog = backlog
+        self.recent_changes = deque(maxlen=history)
+        self._responses = {
+            'status': self._encode({'state': 'starting'}),
+        }
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None
+
+    def start(self):
+        """Starts serving in a background thread."""
+        self._remove_stale_socket()
+        self._thread = threading.Thread(target=self._run, name='status-server', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def stop(self):
+        """Stops serving and removes the socket file."""
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+    def on_cycle(self, service, results, changes):
+        """
+        Publishes the state of a completed monitoring cycle.
+
+        Args:
+            service: The MonitoringService that ran the cycle.
+            results: The detection results of the cycle.
+            changes: The change report, or None for the initial scan.
+        """
+        timestamp = service.snapshot.captured_at.isoformat()
+        cycle = service.cycle_count
+        overall_risk = self._overall_risk(results)
+
+        if changes and changes.get('has_changes'):
+            self.recent_changes.append(self._serializable_changes(changes))
+
+        # Build all replies first, then swap them in with a single assignment
+        self._responses = {
+            'status': self._encode({
+                'state': 'running',
+                'cycle': cycle,
+                'timestamp': timestamp,
+                'overall_risk': overall_risk,
+                'modules': [{
+                    'name': r['name'],
+                    'risk_level': r['risk_level'],
+                    'findings': len(r['findings']),
+                } for r in results],
+                'recent_changes': len(self.recent_changes),
+            }),
+            'results': self._encode({
+                'cycle': cycle,
+                'timestamp': timestamp,
+                'overall_risk': overall_risk,
+                'results': results,
+            }),
+            'changes': self._encode({
+                'cycle': cycle,
+                'changes': list(self.recent_changes),
+            }),
+        }
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._serve())
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+        finally:
+            # Let in-flight client handlers finish before closing the loop
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self._loop.close()
+
+    async def _serve(self):
+        # The state may reveal monitoring activity, keep it private to the
+        # user from the moment the socket exists
+        previous = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(
+                self._handle_client, path=self.socket_path, backlog=self.backlog)
+        finally:
+            os.umask(previous)
+        os.chmod(self.socket_path, 0o600)
+        self._ready.set()
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=self.client_timeout)
+                if not line:
+                    break
+                command = line.strip().decode('ascii', 'replace') or 'status'
+                reply = self._responses.get(command)
+                if reply is None:
+                    reply = self._encode({'error': f'unknown command: {command}'})
+                writer.write(reply)
+                await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _remove_stale_socket(self):
+        """Removes a socket file left behind by a daemon that is no longer running."""
+        if not os.path.exists(self.socket_path):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)
+                return
+        raise RuntimeError(f"Another daemon is already listening on {self.socket_path}")
+
+    def _overall_risk(self, results):
+        max_risk = max((RISK_ORDER.get(r['risk_level'], 0) for r in results), default=0)
+        for level, value in RISK_ORDER.items():
+            if value == max_risk:
+                return level
+        return 'LOW'
+
+    def _serializable_changes(self, changes):
+        serializable = dict(changes)
+        if isinstance(serializable.get('timestamp'), datetime):
+            serializable['timestamp'] = serializable['timestamp'].isoformat()
+        return serializable
+
+    def _encode(self, document):
+        return json.dumps(document, ensure_ascii=False, default=str).encode('utf-8') + b'\n'
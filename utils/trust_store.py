@@ -0,0 +1,358 @@
+"""
+Trust Store Module
+Indexes the root certificates trusted by the system and by NSS databases
+(Chromium, Firefox) by SPKI fingerprint
+
+Every source is re-parsed only when its inode, mtime or size changes, so a
+warm scan costs one stat call per bundle, trust directory and NSS database.
+"""
+import glob
+import os
+from utils.x509 import CertificateError, iter_pem_certificates, name_attribute, parse_certificate
+
+# Concatenated CA bundles of the common distributions
+DEFAULT_BUNDLES = [
+    '/etc/ssl/certs/ca-certificates.crt',                   # Debian, Ubuntu, Alpine
+    '/etc/pki/tls/certs/ca-bundle.crt',                     # Fedora, RHEL
+    '/etc/pki/ca-trust/extracted/pem/tls-ca-bundle.pem',    # Fedora, RHEL
+    '/etc/ssl/ca-bundle.pem',                               # openSUSE
+    '/etc/ssl/cert.pem',                                    # Arch, Alpine
+]
+
+# Directories of individual certificates (searched recursively)
+DEFAULT_DIRECTORIES = [
+    '/etc/ssl/certs',
+    '/usr/local/share/ca-certificates',
+    '/etc/pki/ca-trust/source/anchors',
+    '/etc/ca-certificates/trust-source/anchors',
+]
+
+# NSS databases (cert9.db) and directories holding one profile per subdirectory
+DEFAULT_NSS_DATABASES = [
+    '/etc/pki/nssdb',
+    '~/.pki/nssdb',
+]
+DEFAULT_NSS_PROFILE_ROOTS = [
+    '~/.mozilla/firefox',
+    '~/snap/firefox/common/.mozilla/firefox',
+    '~/.var/app/org.mozilla.firefox/.mozilla/firefox',
+    '~/.thunderbird',
+]
+
+# PKCS#11 constants used by the NSS sqlite schema (column "a<hex type>")
+CKO_CERTIFICATE = 0x1
+CKO_NSS_TRUST = 0xce534353
+CKT_NSS_TRUSTED_DELEGATOR = 0xce534352
+CKA_CLASS_COLUMN = 'a0'
+CKA_VALUE_COLUMN = 'a11'
+CKA_CERT_SHA1_HASH_COLUMN = 'ace5343b4'
+CKA_TRUST_SERVER_AUTH_COLUMN = 'ace536358'
+
+# Shared result for missing sources, so unchanged scans compare by identity
+NO_ENTRIES = ()
+
+
+def stat_key(path):
+    """
+    Returns the change signature of a path.
+
+    Args:
+        path: File or directory path (symlinks are followed).
+
+    Returns:
+        tuple: (inode, mtime in ns, size), or None if the path does not exist.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def describe_certificate(der):
+    """
+    Parses a DER certificate into a trust store entry.
+
+    Args:
+        der: DER encoded certificate.
+
+    Returns:
+        tuple: (SPKI SHA-256, display name, organization).
+    """
+    cert = parse_certificate(der)
+    organization = name_attribute(cert['subject'], 'organizationName')
+    name = (name_attribute(cert['subject'], 'commonName')
+            or organization
+            or name_attribute(cert['subject'], 'organizationalUnitName'))
+    return cert['spki_sha256'], name, organization
+
+
+def read_certificate_file(path):
+    """
+    Reads all certificates of a PEM bundle or DER file.
+
+    Args:
+        path: File path.
+
+    Returns:
+        list: (SPKI SHA-256, display name, organization) per certificate.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return []
+
+    entries = []
+    for der in iter_pem_certificates(data):
+        try:
+            entries.append(describe_certificate(der))
+        except CertificateError:
+            continue
+    return entries
+
+
+def read_nss_database(path):
+    """
+    Reads the certificates an NSS database trusts as server authentication roots.
+
+    Args:
+        path: Path of a cert9.db file.
+
+    Returns:
+        list: (SPKI SHA-256, display name, organization) per trusted certificate.
+    """
+    import hashlib
+    import sqlite3
+
+    try:
+        connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True, timeout=1)
+    except sqlite3.Error:
+        return []
+    try:
+        cursor = connection.execute('SELECT * FROM nssPublic')
+        columns = {description[0].lower(): index for index, description in enumerate(cursor.description)}
+        rows = cursor.fetchall()
+    except sqlite3.Error:
+        return []
+    finally:
+        connection.close()
+
+    def column(row, name):
+        index = columns.get(name)
+        value = row[index] if index is not None else None
+        return value if isinstance(value, bytes) else None
+
+    def ulong(value):
+        return int.from_bytes(value, 'big') if value and len(value) <= 8 else None
+
+    certificates = []
+    trusted_sha1 = set()
+    for row in rows:
+        object_class = ulong(column(row, CKA_CLASS_COLUMN))
+        if object_class == CKO_CERTIFICATE:
+            der = column(row, CKA_VALUE_COLUMN)
+            if der:
+                certificates.append(der)
+        elif object_class == CKO_NSS_TRUST:
+            if ulong(column(row, CKA_TRUST_SERVER_AUTH_COLUMN)) == CKT_NSS_TRUSTED_DELEGATOR:
+                sha1 = column(row, CKA_CERT_SHA1_HASH_COLUMN)
+                if sha1:
+                    trusted_sha1.add(sha1)
+
+    entries = []
+    for der in certificates:
+        if hashlib.sha1(der).digest() not in trusted_sha1:
+            continue
+        try:
+            entries.append(describe_certificate(der))
+        except CertificateError:
+            continue
+    return entries
+
+
+def load_fingerprints(path):
+    """
+    Loads a fingerprint list: one hex SPKI SHA-256 per line, '#' comments.
+
+    Args:
+        path: File path.
+
+    Returns:
+        frozenset: Lowercase hex fingerprints (empty if the file is missing).
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            return frozenset(line.split('#', 1)[0].strip().lower() for line in f
+                             if line.split('#', 1)[0].strip())
+    except OSError:
+        return frozenset()
+
+
+class TrustStore:
+    """
+    SPKI fingerprint index over the system and NSS trust stores.
+
+    Parsed entries are cached per file, keyed by the file's real path and
+    change signature. A directory is listed again only when its own
+    signature changes (installing or removing a CA, and
+    update-ca-certificates, always change it), and its files are stat'ed on
+    every scan to catch in-place rewrites, so an unchanged store costs one
+    stat call per file, directory and NSS database, and no parsing.
+    """
+
+    def __init__(self, bundles=None, directories=None, nss_databases=None, nss_profile_roots=None):
+        """
+        Initializes the trust store index.
+
+        Args:
+            bundles: CA bundle files (default: DEFAULT_BUNDLES).
+            directories: Certificate directories (default: DEFAULT_DIRECTORIES).
+            nss_databases: NSS database directories (default: DEFAULT_NSS_DATABASES).
+            nss_profile_roots: Directories of NSS profiles (default: DEFAULT_NSS_PROFILE_ROOTS).
+        """
+        self.bundles = DEFAULT_BUNDLES if bundles is None else bundles
+        self.directories = DEFAULT_DIRECTORIES if directories is None else directories
+        self.nss_databases = DEFAULT_NSS_DATABASES if nss_databases is None else nss_databases
+        self.nss_profile_roots = DEFAULT_NSS_PROFILE_ROOTS if nss_profile_roots is None else nss_profile_roots
+        self.files_parsed = 0
+        self._files = {}        # real path -> (stat key, entries)
+        self._directories = {}  # directory -> (stat key, [file real paths], [subdirectories])
+        self._profiles = {}     # profile root -> (stat key, [cert9.db paths])
+        self._last_parts = None
+        self._last_anchors = {}
+
+    def scan(self):
+        """
+        Returns the current trust anchors.
+
+        Returns:
+            dict: SPKI SHA-256 -> {'name', 'organization', 'sources'}, where
+                  sources lists every file or database the anchor was found in.
+        """
+        # Individual files first, so an anchor's first source is the most
+        # specific one. Files reached through symlinks are reported by the
+        # path they point to, so the hash links of /etc/ssl/certs collapse.
+        parts = []
+        for directory in self.directories:
+            parts.extend(self._directory_parts(directory))
+
+        for path in self._nss_database_files():
+            parts.append((path, self._file_entries(path, reader=read_nss_database,
+                                                   extra_key=stat_key(path + '-wal'))))
+
+        for path in self.bundles:
+            parts.append((path, self._file_entries(os.path.realpath(path))))
+
+        # Nothing was re-read: the previous index is still current
+        if self._last_parts is not None and len(parts) == len(self._last_parts) and all(
+                source == last_source and entries is last_entries
+                for (source, entries), (last_source, last_entries) in zip(parts, self._last_parts)):
+            return self._last_anchors
+
+        anchors = {}
+        for source, entries in parts:
+            for spki, name, organization in entries:
+                anchor = anchors.get(spki)
+                if anchor is None:
+                    anchors[spki] = {'name': name, 'organization': organization, 'sources': [source]}
+                elif source not in anchor['sources']:
+                    anchor['sources'].append(source)
+
+        self._last_parts = parts
+        self._last_anchors = anchors
+        return anchors
+
+    def _file_entries(self, real_path, reader=read_certificate_file, extra_key=None):
+        key = stat_key(real_path)
+        if key is None:
+            self._files.pop(real_path, None)
+            return NO_ENTRIES
+        key = (key, extra_key)
+        cached = self._files.get(real_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        entries = reader(real_path)
+        self.files_parsed += 1
+        self._files[real_path] = (key, entries)
+        return entries
+
+    def _directory_parts(self, directory, visited=None):
+        """Returns (real path, entries) of the certificate files below a directory."""
+        key = stat_key(directory)
+        if key is None:
+            self._directories.pop(directory, None)
+            return []
+        # Symlinked subdirectories may lead back to a directory already read
+        if visited is None:
+            visited = set()
+        real_directory = os.path.realpath(directory)
+        if real_directory in visited:
+            return []
+        visited.add(real_directory)
+
+        cached = self._directories.get(directory)
+        if cached is None or cached[0] != key:
+            files = []
+            subdirectories = []
+            try:
+                names = sorted(os.listdir(directory))
+            except OSError:
+                names = []
+            # Bundles are indexed on their own, do not read them twice
+            bundles = {os.path.realpath(path) for path in self.bundles}
+            seen = set()
+            for name in names:
+                path = os.path.join(directory, name)
+                if os.path.isdir(path):
+                    subdirectories.append(path)
+                elif os.path.isfile(path):
+                    real_path = os.path.realpath(path)
+                    if real_path not in bundles and real_path not in seen:
+                        seen.add(real_path)
+                        files.append(real_path)
+            cached = (key, files, subdirectories)
+            self._directories[directory] = cached
+
+        # Files rewritten in place leave the directory unchanged, so each
+        # one is stat'ed on every scan (and only parsed when it changed)
+        parts = [(real_path, self._file_entries(real_path)) for real_path in cached[1]]
+        for subdirectory in cached[2]:
+            parts.extend(self._directory_parts(subdirectory, visited))
+        return parts
+
+    def _nss_database_files(self):
+        """Returns the cert9.db files of the configured NSS databases and profiles."""
+        databases = [os.path.join(os.path.expanduser(path), 'cert9.db') for path in self.nss_databases]
+
+        for root in self.nss_profile_roots:
+            root = os.path.expanduser(root)
+            key = stat_key(root)
+            if key is None:
+                self._profiles.pop(root, None)
+                continue
+            cached = self._profiles.get(root)
+            if cached is None or cached[0] != key:
+                cached = (key, sorted(glob.glob(os.path.join(glob.escape(root), '*', 'cert9.db'))))
+                self._profiles[root] = cached
+            databases.extend(cached[1])
+
+        return databases
+
+
+def main(argv=None):
+    """Prints the fingerprint list of a directory of root certificates."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Print the SPKI SHA-256 fingerprints of the root certificates in a directory')
+    parser.add_argument('directory', help='e.g. /usr/share/ca-certificates/mozilla')
+    args = parser.parse_args(argv)
+
+    store = TrustStore(bundles=[], directories=[args.directory], nss_databases=[], nss_profile_roots=[])
+    for spki, anchor in sorted(store.scan().items(), key=lambda item: item[1]['name'].lower()):
+        print(f"{spki}  # {anchor['name']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,328 @@
+"""
+Worker Pool Module
+Runs CPU-bound detectors in persistent worker processes
+
+The socket and process tables are parsed and analyzed in pure Python, so
+running their detectors in threads does not help: the GIL serializes them
+with everything else. Each pooled detector gets its own process instead,
+started once and kept for the whole session, so the detector, its snapshot
+and the compiled rules stay warm between cycles. The tables a worker
+collected come back through a shared memory block in the snapshot helper's
+binary layout rather than as pickled lists, and are only decoded if a
+detector in the monitor reads them too.
+"""
+import multiprocessing
+import signal
+import threading
+import time
+from multiprocessing import shared_memory
+from detectors.registry import DETECTORS
+from utils.helper import FRAME_HEADER, FRAME_MAGIC, decode_frame, encode_frame
+from utils.i18n import TranslationManager
+from utils.rules import RuleError, rules
+from utils.snapshot import SystemSnapshot
+
+# Detector key -> snapshot sections its worker collects and hands back
+WORKER_SECTIONS = {
+    'connection': ('connections',),
+    'process': ('processes',),
+}
+
+# Smallest shared memory block; blocks grow by a quarter over the frame size
+MIN_BLOCK_BYTES = 1 << 20
+
+MESSAGE_RUN = 'run'
+MESSAGE_RELOAD = 'reload'
+
+
+class WorkerError(RuntimeError):
+    """Raised when a worker process died or did not answer in time."""
+
+
+class DetectorPool:
+    """
+    Persistent worker processes for CPU-bound detectors.
+
+    A cycle calls dispatch() with the pooled detectors that are due, runs
+    the other detectors, then collects each pooled detector's result with
+    result(). If a worker dies, result() raises WorkerError, the caller runs
+    the detector itself, and the worker is restarted on the next dispatch.
+    """
+
+    def __init__(self, keys, language, snapshot_factory=None, timeout=600.0):
+        """
+        Initializes the pool; workers are started on first use.
+
+        Args:
+            keys: Detector keys to run in workers (keys of WORKER_SECTIONS).
+            language: Language of the module names.
+            snapshot_factory: Picklable callable building each worker's
+                snapshot (default: SystemSnapshot).
+            timeout: Seconds to wait for a worker's result.
+
+        Raises:
+            ValueError: If a detector cannot run in a worker.
+        """
+        unknown = [key for key in keys if key not in WORKER_SECTIONS]
+        if unknown:
+            raise ValueError(f"detectors cannot run in workers: {', '.join(unknown)}")
+        self.keys = list(keys)
+        self.language = language
+        self.snapshot_factory = snapshot_factory
+        self.timeout = timeout
+        # Detector class name -> key
+        self.classes = {DETECTORS[key][1]: key for key in self.keys}
+        # CPU seconds used by the workers, as reported with their results
+        self.worker_cpu = 0.0
+        self._context = multiprocessing.get_context('spawn')
+        self._workers = {}
+
+    def handles(self, detector):
+        """Whether a detector instance runs in a worker."""
+        return detector.__class__.__name__ in self.classes
+
+    def cpu_clock(self):
+        """Process CPU time of the monitor plus the CPU time of its workers."""
+        return time.process_time() + self.worker_cpu
+
+    def dispatch(self, detectors, snapshot):
+        """
+        Starts a cycle of the given detectors in their workers.
+
+        The sections the workers collect are provided to the snapshot, so
+        that detectors in this process wait for them instead of collecting
+        them again.
+
+        Args:
+            detectors: Pooled detector instances that are due.
+            snapshot: The monitor's snapshot, refreshed for this cycle.
+        """
+        for detector in detectors:
+            key = self.classes[detector.__class__.__name__]
+            worker = self._workers.get(key)
+            if worker is None or not worker.alive():
+                if worker is not None:
+                    worker.close()
+                worker = self._workers[key] = _Worker(self._context, key, self.language, self.snapshot_factory)
+            if worker.pending:
+                # Result of an earlier cycle that was never collected
+                try:
+                    self._wait(worker)
+                except WorkerError:
+                    continue
+            worker.run()
+            for section in WORKER_SECTIONS[key]:
+                snapshot.provide(section, self._provider(worker, section))
+
+    def result(self, detector):
+        """
+        Waits for a pooled detector's result of the current cycle.
+
+        Args:
+            detector: Detector instance passed to dispatch().
+
+        Returns:
+            tuple: (result dict or None if the detector raised, CPU seconds,
+                wall-clock seconds).
+
+        Raises:
+            WorkerError: If the worker died or timed out.
+        """
+        worker = self._workers.get(self.classes[detector.__class__.__name__])
+        if worker is None:
+            raise WorkerError('worker not started')
+        result, error, _, _, cpu, wall = self._wait(worker)
+        return result, cpu, wall
+
+    def reload_rules(self):
+        """Has the workers reload the rule files before their next cycle."""
+        for worker in self._workers.values():
+            worker.send(MESSAGE_RELOAD)
+
+    def close(self):
+        """Stops the workers and releases the shared memory."""
+        for worker in self._workers.values():
+            worker.close()
+        self._workers = {}
+
+    def _wait(self, worker):
+        """Returns the worker's reply for the current cycle, waiting for it."""
+        with worker.lock:
+            if worker.reply is None:
+                worker.reply = worker.receive(self.timeout)
+                self.worker_cpu += worker.reply[4]
+            return worker.reply
+
+    def _provider(self, worker, section):
+        def provide(collect):
+            try:
+                sections = self._sections(worker)
+            except WorkerError:
+                return collect()
+            if section not in sections:
+                return collect()
+            ok, value = sections[section]
+            if not ok:
+                raise value
+            return value
+        return provide
+
+    def _sections(self, worker):
+        """Returns the sections the worker collected in this cycle, decoding them once."""
+        self._wait(worker)
+        with worker.lock:
+            if worker.sections is None:
+                worker.sections = worker.decode()
+            return worker.sections
+
+
+class _Worker:
+    """Main-process side of one worker process."""
+
+    def __init__(self, context, key, language, snapshot_factory):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(
+            target=_serve, args=(child, key, language, list(rules.paths[1:]), snapshot_factory),
+            name=f'netmon-worker-{key}', daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.lock = threading.Lock()
+        self.pending = False
+        self.reply = None
+        self.sections = None
+        self.block = None
+
+    def alive(self):
+        return self.process.is_alive() and not self.connection.closed
+
+    def send(self, message):
+        try:
+            self.connection.send(message)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def run(self):
+        self.reply = None
+        self.sections = None
+        self.pending = self.send(MESSAGE_RUN)
+
+    def receive(self, timeout):
+        if not self.pending:
+            raise WorkerError('worker is not running')
+        try:
+            if not self.connection.poll(timeout):
+                self.process.kill()
+                raise WorkerError(f'worker timed out after {timeout} seconds')
+            reply = self.connection.recv()
+        except (EOFError, OSError) as e:
+            raise WorkerError(f'worker exited: {e}')
+        finally:
+            self.pending = False
+        return reply
+
+    def decode(self):
+        """Decodes the frame the worker left in its shared memory block."""
+        _, _, name, length, _, _ = self.reply
+        if not length:
+            return {}
+        if self.block is None or self.block.name != name:
+            # The worker replaced its block with a larger one
+            self._detach()
+            self.block = shared_memory.SharedMemory(name=name)
+        buffer = self.block.buf
+        try:
+            magic, _, payload_length = FRAME_HEADER.unpack_from(buffer)
+            if magic != FRAME_MAGIC or FRAME_HEADER.size + payload_length > length:
+                raise WorkerError('malformed worker frame')
+            return decode_frame(buffer[FRAME_HEADER.size:FRAME_HEADER.size + payload_length])
+        except ValueError as e:
+            raise WorkerError(str(e))
+        finally:
+            del buffer
+
+    def close(self):
+        if self.process.is_alive():
+            self.send(None)
+            self.process.join(5)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+        if self.process.exitcode and self.block is not None:
+            # A killed worker could not remove its block
+            try:
+                self.block.unlink()
+            except FileNotFoundError:
+                pass
+        self.connection.close()
+        self._detach()
+
+    def _detach(self):
+        if self.block is not None:
+            try:
+                self.block.close()
+            except BufferError:
+                # A decoded view is still referenced; the mapping goes with it
+                pass
+            self.block = None
+
+
+def _serve(connection, key, language, rule_paths, snapshot_factory):
+    """
+    Worker process: runs one detector per request until the pipe closes.
+
+    Args:
+        connection: Pipe end to the monitor.
+        key: Detector key.
+        language: Language of the module names.
+        rule_paths: Additional rule files of the monitor.
+        snapshot_factory: Callable building the snapshot, or None.
+    """
+    # Ctrl+C reaches the whole process group; the monitor stops its workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    from detectors.registry import build_detectors
+
+    rules.configure(rule_paths)
+    snapshot = snapshot_factory() if snapshot_factory else SystemSnapshot()
+    (_, detector), = build_detectors([key], TranslationManager(language), snapshot)
+    block = None
+    try:
+        while True:
+            try:
+                message = connection.recv()
+            except (EOFError, OSError):
+                return
+            if message is None:
+                return
+            if message == MESSAGE_RELOAD:
+                try:
+                    rules.reload()
+                except (OSError, RuleError):
+                    # The monitor reports it and keeps the rules in effect, as we do
+                    pass
+                continue
+
+            cpu, wall = time.process_time(), time.perf_counter()
+            snapshot.refresh()
+            try:
+                result, error = detector.detect(), None
+            except Exception as e:
+                result, error = None, f"{type(e).__name__}: {e}"
+
+            frame = b''
+            sections = snapshot.collected(WORKER_SECTIONS[key])
+            if sections:
+                frame = encode_frame(sections, snapshot.captured_at)
+                if block is None or block.size < len(frame):
+                    if block is not None:
+                        block.close()
+                        block.unlink()
+                    block = shared_memory.SharedMemory(create=True, size=max(MIN_BLOCK_BYTES, len(frame) * 5 // 4))
+                block.buf[:len(frame)] = frame
+            connection.send((result, error, block.name if frame else None, len(frame),
+                             time.process_time() - cpu, time.perf_counter() - wall))
+    finally:
+        if block is not None:
+            block.close()
+            block.unlink()
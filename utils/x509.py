@@ -0,0 +1,231 @@
+"""
+X.509 Module
+Minimal DER certificate parser for trust store inspection
+
+Only the fields the detectors need are decoded: subject, issuer, validity
+and the SubjectPublicKeyInfo, whose SHA-256 is used as the certificate's
+identity (it stays the same when a CA is re-issued with the same key).
+"""
+import base64
+import binascii
+import hashlib
+import re
+
+PEM_CERTIFICATE = re.compile(
+    rb'-----BEGIN (?:TRUSTED )?CERTIFICATE-----(.+?)-----END (?:TRUSTED )?CERTIFICATE-----',
+    re.S)
+
+# Attribute names use the same spelling as ssl.SSLSocket.getpeercert()
+ATTRIBUTE_NAMES = {
+    '2.5.4.3': 'commonName',
+    '2.5.4.6': 'countryName',
+    '2.5.4.7': 'localityName',
+    '2.5.4.8': 'stateOrProvinceName',
+    '2.5.4.10': 'organizationName',
+    '2.5.4.11': 'organizationalUnitName',
+    '1.2.840.113549.1.9.1': 'emailAddress',
+}
+
+# ASN.1 universal tags
+TAG_INTEGER = 0x02
+TAG_OID = 0x06
+TAG_UTC_TIME = 0x17
+TAG_GENERALIZED_TIME = 0x18
+TAG_SEQUENCE = 0x30
+TAG_SET = 0x31
+TAG_VERSION = 0xa0
+
+STRING_ENCODINGS = {
+    0x0c: 'utf-8',       # UTF8String
+    0x13: 'ascii',       # PrintableString
+    0x14: 'latin-1',     # TeletexString
+    0x16: 'ascii',       # IA5String
+    0x1c: 'utf-32-be',   # UniversalString
+    0x1e: 'utf-16-be',   # BMPString
+}
+
+
+class CertificateError(ValueError):
+    """Raised for data that is not a well-formed DER certificate."""
+
+
+def read_tlv(data, offset):
+    """
+    Reads one DER tag-length-value element.
+
+    Args:
+        data: DER bytes.
+        offset: Offset of the element's tag.
+
+    Returns:
+        tuple: (tag, value start, value end).
+    """
+    try:
+        tag = data[offset]
+        length = data[offset + 1]
+    except IndexError:
+        raise CertificateError('truncated element')
+    start = offset + 2
+    if length & 0x80:
+        count = length & 0x7f
+        if count == 0 or count > 4:
+            raise CertificateError('unsupported length encoding')
+        length = int.from_bytes(data[start:start + count], 'big')
+        start += count
+    end = start + length
+    if end > len(data):
+        raise CertificateError('element exceeds data')
+    return tag, start, end
+
+
+def children(data, start, end):
+    """
+    Iterates over the elements inside a constructed value.
+
+    Yields:
+        tuple: (tag, element offset, value start, value end).
+    """
+    offset = start
+    while offset < end:
+        tag, value_start, value_end = read_tlv(data, offset)
+        yield tag, offset, value_start, value_end
+        offset = value_end
+
+
+def decode_oid(value):
+    """Decodes an OBJECT IDENTIFIER value into dotted form."""
+    if not value:
+        raise CertificateError('empty OID')
+    first = value[0]
+    arcs = [min(first // 40, 2), first - 40 * min(first // 40, 2)]
+    arc = 0
+    for byte in value[1:]:
+        arc = (arc << 7) | (byte & 0x7f)
+        if not byte & 0x80:
+            arcs.append(arc)
+            arc = 0
+    return '.'.join(str(a) for a in arcs)
+
+
+def decode_string(tag, value):
+    """Decodes a directory string, falling back to latin-1 for odd encodings."""
+    try:
+        return value.decode(STRING_ENCODINGS.get(tag, 'latin-1'))
+    except UnicodeDecodeError:
+        return value.decode('latin-1')
+
+
+def decode_name(data, start, end):
+    """
+    Decodes a Name into getpeercert()-style relative distinguished names.
+
+    Returns:
+        tuple: ((('commonName', 'Example CA'),), (('organizationName', 'Example'),), ...)
+    """
+    rdns = []
+    for set_tag, _, set_start, set_end in children(data, start, end):
+        if set_tag != TAG_SET:
+            raise CertificateError('malformed name')
+        rdn = []
+        for _, _, atv_start, atv_end in children(data, set_start, set_end):
+            (oid_tag, _, oid_start, oid_end), (value_tag, _, value_start, value_end) = \
+                list(children(data, atv_start, atv_end))[:2]
+            if oid_tag != TAG_OID:
+                raise CertificateError('malformed attribute')
+            oid = decode_oid(data[oid_start:oid_end])
+            rdn.append((ATTRIBUTE_NAMES.get(oid, oid),
+                        decode_string(value_tag, data[value_start:value_end])))
+        rdns.append(tuple(rdn))
+    return tuple(rdns)
+
+
+def decode_time(tag, value):
+    """Decodes UTCTime/GeneralizedTime into YYYYMMDDHHMMSSZ form."""
+    text = value.decode('ascii', 'replace')
+    if tag == TAG_UTC_TIME:
+        century = '19' if int(text[:2]) >= 50 else '20'
+        text = century + text
+    return text
+
+
+def parse_certificate(der):
+    """
+    Parses the fields of a DER certificate that the detectors use.
+
+    Args:
+        der: DER encoded certificate (trailing data is ignored).
+
+    Returns:
+        dict: subject, issuer, not_before, not_after, spki_sha256 (hex).
+
+    Raises:
+        CertificateError: If the data is not a well-formed certificate.
+    """
+    try:
+        return _parse_certificate(der)
+    except CertificateError:
+        raise
+    except (ValueError, IndexError) as e:
+        # Decoders meeting corrupt values (short sequences, bad times)
+        raise CertificateError(f'malformed certificate: {e}') from None
+
+
+def _parse_certificate(der):
+    tag, cert_start, cert_end = read_tlv(der, 0)
+    if tag != TAG_SEQUENCE:
+        raise CertificateError('not a certificate')
+    tag, tbs_start, tbs_end = read_tlv(der, cert_start)
+    if tag != TAG_SEQUENCE:
+        raise CertificateError('missing tbsCertificate')
+
+    fields = list(children(der, tbs_start, tbs_end))
+    if fields and fields[0][0] == TAG_VERSION:
+        fields = fields[1:]
+    if len(fields) < 6 or fields[0][0] != TAG_INTEGER:
+        raise CertificateError('malformed tbsCertificate')
+    # serialNumber, signature, issuer, validity, subject, subjectPublicKeyInfo
+    _, _, issuer_start, issuer_end = fields[2]
+    _, _, validity_start, validity_end = fields[3]
+    _, _, subject_start, subject_end = fields[4]
+    _, spki_offset, _, spki_end = fields[5]
+
+    times = [decode_time(t, der[s:e]) for t, _, s, e in children(der, validity_start, validity_end)]
+    if len(times) != 2:
+        raise CertificateError('malformed validity')
+
+    return {
+        'subject': decode_name(der, subject_start, subject_end),
+        'issuer': decode_name(der, issuer_start, issuer_end),
+        'not_before': times[0],
+        'not_after': times[1],
+        'spki_sha256': hashlib.sha256(der[spki_offset:spki_end]).hexdigest(),
+    }
+
+
+def iter_pem_certificates(data):
+    """
+    Iterates over the DER certificates in PEM (or single DER) data.
+
+    Args:
+        data: File contents as bytes.
+
+    Yields:
+        bytes: DER encoded certificates.
+    """
+    if data[:1] == bytes([TAG_SEQUENCE]):
+        yield data
+        return
+    for match in PEM_CERTIFICATE.finditer(data):
+        try:
+            yield base64.b64decode(match.group(1))
+        except (binascii.Error, ValueError):
+            continue
+
+
+def name_attribute(name, attribute):
+    """Returns the first value of an attribute in a decoded name, or ''."""
+    for rdn in name:
+        for key, value in rdn:
+            if key == attribute:
+                return value
+    return ''